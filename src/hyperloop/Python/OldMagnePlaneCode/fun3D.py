@@ -3,7 +3,6 @@
 # --- Python/system level imports
 import numpy as np
 from string import Template
-from scipy.optimize import fsolve
 
 # --- OpenMDAO main and library imports
 from openmdao.main.api import Component
@@ -11,31 +10,7 @@ from openmdao.lib.datatypes.api import Float
 
 # --- Local Python imports
 from StdAtm import Atmosphere
-
-
-def f(M, *data):
-    gamma, a_ratio = data
-    return (((gamma + 1) / 2)**(-(gamma + 1) / (2 * gamma - 2)) * (
-        (1 + (gamma - 1) / 2 * M**2)**(
-            (gamma + 1) / (2 * gamma - 2))) / M - a_ratio)
-
-
-def g(M2, *data):
-
-    pt2_ptL, tt2_ttL, ptL, ttL, gamma_inf, R, A2, mdot = data
-
-    pt2 = (pt2_ptL * ptL)  # Pa
-    tt2 = (tt2_ttL * ttL)  # K
-
-    ps2 = pt2 * ((1 + (gamma_inf - 1) / 2 * M2**2)**(-gamma_inf /
-                                                     (gamma_inf - 1)))  # Pa
-    ts2 = tt2 * ((1 + (gamma_inf - 1) / 2 * M2**2))** -1  # K
-
-    a2 = np.sqrt(gamma_inf * R * ts2)  # m/s
-    v2 = a2 * M2  # m/s
-    d2 = ps2 / (R * ts2)  # kg/m^3
-
-    return mdot - v2 * d2 * A2
+from hyperloop.Python.tools.compressible_flow import P_Pt, T_Tt, mach_from_area_ratio, mach_from_mass_flow
 
 
 class Fun3D(Component):
@@ -105,26 +80,20 @@ class Fun3D(Component):
         # --- Based on std. alt
 
         # Station 2 is the Engine Face Output From SUPIN
-        ptL = self.p_inf / ((1 + (gamma_inf - 1) / 2 * self.M_inf**2)**
-                            (-gamma_inf / (gamma_inf - 1)))  # Pa
-        ttL = self.t_inf / (
-            (1 + (gamma_inf - 1) / 2 * self.M_inf**2))** -1  # K
+        ptL = self.p_inf / P_Pt(self.M_inf, gamma_inf)  # Pa
+        ttL = self.t_inf / T_Tt(self.M_inf, gamma_inf)  # K
 
         # --- Assume total pressure adjustment to account for installation effects
         dP = -0.01
 
-        # Solve for adjusted engine face Mach #, pt2 and tt2
-        M2 = fsolve(g,
-                    self.M2,
-                    args=(self.pt2_ptL + dP, self.tt2_ttL, ptL, ttL, gamma_inf,
-                          self.R, self.A2, self.mdot))[0]
-
         pt2 = ((self.pt2_ptL + dP) * ptL)  # Pa
         tt2 = (self.tt2_ttL * ttL)  # K
 
-        ps2 = pt2 * ((1 + (gamma_inf - 1) / 2 * M2**2)**
-                     (-gamma_inf / (gamma_inf - 1)))  # Pa
-        ts2 = tt2 * ((1 + (gamma_inf - 1) / 2 * M2**2))** -1  # K
+        # Solve for adjusted engine face Mach # (subsonic) that passes mdot
+        M2 = mach_from_mass_flow(self.mdot, self.A2, pt2, tt2, gamma_inf, self.R)
+
+        ps2 = pt2 * P_Pt(M2, gamma_inf)  # Pa
+        ts2 = tt2 * T_Tt(M2, gamma_inf)  # K
 
         a2 = np.sqrt(gamma_inf * self.R * ts2)  # m/s
         v2 = a2 * M2  # m/s
@@ -177,10 +146,10 @@ class Fun3D(Component):
 
         # Calc area ratios
         ap_at = ap_m / at_m
-        Mp = fsolve(f, 0.5, args=(gamma_p, ap_at))[0]
+        Mp = mach_from_area_ratio(ap_at, gamma_p)
 
         ae_at = ae_m / at_m
-        Me = fsolve(f, 2.0, args=(gamma_e, ae_at))[0]
+        Me = mach_from_area_ratio(ae_at, gamma_e, supersonic=True)
 
         print("")
         print("Ap/A* = %f " % (ap_at))
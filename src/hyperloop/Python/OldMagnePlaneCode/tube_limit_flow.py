@@ -24,6 +24,7 @@ from pycycle.constants import AIR_MIX
 
 from tube_structure import TubeStructural
 from inlet import InletGeom
+from hyperloop.Python.tools.compressible_flow import area_ratio, P_Pt, T_Tt
 
 
 class AreaRatio(Component):
@@ -61,11 +62,7 @@ class AreaRatio(Component):
         tube_area = pi * (params['tube_r']**2)
         unknowns['bypass_area'] = tube_area - params['inlet_area']
         AR_target = tube_area / unknowns['bypass_area']
-        g = params['gamma']
-        g_exp = (g + 1.0) / (2.0 * (g - 1.0))
-        unknowns['AR'] = ((g + 1.0) / 2.0)**(-1.0 * g_exp) * (
-            (1.0 +
-             (g - 1.0) / 2.0 * params['Mach']**2)**g_exp) / params['Mach']
+        unknowns['AR'] = area_ratio(params['Mach'], params['gamma'])
         resids['AR_resid'] = unknowns['AR'] - AR_target
 
 
@@ -89,10 +86,8 @@ class TubeThermo(Component):
                         units='degK')
 
     def solve_nonlinear(self, params, unknowns, resids):
-        multiplier = (1.0 + (params['gamma'] - 1.0) / 2.0 * params['Mach']**2)
-        unknowns['Pt'] = params['Ps'] * multiplier**(params['gamma'] /
-                                                     (params['gamma'] - 1.0))
-        unknowns['Tt'] = params['Ts'] * multiplier
+        unknowns['Pt'] = params['Ps'] / P_Pt(params['Mach'], params['gamma'])
+        unknowns['Tt'] = params['Ts'] / T_Tt(params['Mach'], params['gamma'])
 
 
 class TubeAero(Component):
@@ -4,6 +4,28 @@ import numpy as np
 from openmdao.api import IndepVarComp, Component, Group, Problem, ExecComp
 import matplotlib.pylab as plt
 
+from hyperloop.Python.pod.pod_mach import pod_mach_sizing, SIZING_OUTPUTS
+
+# Inputs of boundary_layer_sizing, named as the BoundaryLayerSensitivity params
+BL_PARAMS = ('M_pod', 'A_pod', 'L', 'BF', 'p_tube', 'T_ambient', 'gam', 'R', 'mu', 'M_duct', 'M_diff',
+             'cp', 'prc', 'delta_star', 'length_calc')
+
+
+def boundary_layer_sizing(M_pod=.8, A_pod=3.0536, L=20.5, BF=.9, p_tube=850.0, T_ambient=320.0, gam=1.4,
+						  R=287.0, mu=1.846e-5, M_duct=.95, M_diff=.6, cp=1009.0, prc=12.5, delta_star=.14,
+						  length_calc=False):
+	"""
+	BoundaryLayerSensitivity as a function, with its defaults. Arguments broadcast against
+	each other like pod_mach_sizing, e.g. for tools.sweep.
+
+	If length_calc is True, delta_star is replaced by the flat plate estimate from the
+	Reynolds number.
+	"""
+	return pod_mach_sizing(M_pod=M_pod, A_pod=A_pod, L=L, comp_inlet_area=BF * A_pod, p_tube=p_tube,
+						   T_ambient=T_ambient, gam=gam, R=R, mu=mu, M_duct=M_duct, M_diff=M_diff, cp=cp, prc=prc,
+						   delta_star=None if length_calc else delta_star, boundary_layer='flat_plate')
+
+
 class BoundaryLayerSensitivity(Component):
 	
 	"""
@@ -128,65 +150,11 @@ class BoundaryLayerSensitivity(Component):
 		self.add_output('Re', val=0.0, desc='Reynolds Number')
 
 	def solve_nonlinear(self, params, unknowns, resids):
-		gam = params['gam']
-		BF = params['BF']
-		A_pod = params['A_pod']
-		L = params['L']
-		prc = params['prc']
-		p_tube = params['p_tube']
-		R = params['R']
-		T_ambient = params['T_ambient']
-		mu = params['mu']
-		M_duct = params['M_duct']
-		M_diff = params['M_diff']
-		cp = params['cp']
-		delta_star = params['delta_star']
-		M_pod = params['M_pod']
-
-		def mach_to_area(M1, M2, gam):
-			'''(A2/A1) = f(M2)/f(M1) where f(M) = (1/M)*((2/(gam+1))*(1+((gam-1)/2)*M**2))**((gam+1)/(2*(gam-1)))'''
-			A_ratio = (M1 / M2) * (((1.0 + ((gam - 1.0) / 2.0) * (M2**2.0)) /
-			                        (1.0 + ((gam - 1.0) / 2.0) * (M1**2.0)))**(
-			                            (gam + 1.0) / (2.0 * (gam - 1.0))))
-			return A_ratio
-
-		#Define intermediate variables
-		rho_inf = p_tube / (R *
-		                    T_ambient)  #Calculate density of free stream flow
-		U_inf = M_pod * (np.sqrt((gam * R * T_ambient)))        #Calculate velocity of free stream flow
-		r_pod = np.sqrt((A_pod / np.pi))  #Calculate pod radius
-
-		Re = (rho_inf * U_inf *
-		      L) / mu  #Calculate length based Reynolds Number
-
-
-		if params['length_calc']:
-			delta_star = (.04775*L)/(Re**.2)
-
-		A_diff = BF * A_pod  #Calculate diffuser output area based on blockage factor input
-
-		#Calculate inlet area. Inlet is necessary if free stream Mach number is greater than max compressore mach number M_diff
-		if M_pod > M_diff:
-		    A_inlet = A_diff * mach_to_area(M_diff, M_pod, gam)
-		else:
-		    A_inlet = A_diff
-
-		eps = mach_to_area(M_pod, M_duct, gam)
-		A_tube = (A_pod + np.pi * (((r_pod + delta_star)**2.0) - (r_pod**2.0)) -
-		          (eps * A_inlet)) / ((1.0 + (np.sqrt(eps))) * (1.0 - (np.sqrt(eps))))
-		pwr_comp = (rho_inf * U_inf * A_inlet) * cp * T_ambient * (1.0 + (
-		    (gam - 1) / 2.0) * (M_pod**2)) * ((prc**((gam - 1) / gam)) - 1)
-		A_bypass = A_tube - A_inlet
-		A_duct_eff = A_tube - A_pod - np.pi * ((
-		    (r_pod + delta_star)**2) - (r_pod**2))
-
-		unknowns['pwr_comp'] = pwr_comp
-		unknowns['A_inlet'] = A_inlet
-		unknowns['A_tube'] = A_tube
-		unknowns['A_bypass'] = A_bypass
-		unknowns['A_duct_eff'] = A_duct_eff
-		unknowns['A_diff'] = A_diff
-		unknowns['Re'] = Re
+
+		out = boundary_layer_sizing(**dict((name, params[name]) for name in BL_PARAMS))
+
+		for name in SIZING_OUTPUTS:
+			unknowns[name] = out[name]
 
 if __name__ == '__main__':
 
@@ -0,0 +1,167 @@
+"""
+Cost re-evaluation over a converged physics solution.
+
+The TicketCost params of a run Problem are split by where their values come from:
+
+physics
+    outputs computed by the model (pod power, vacuum power, structure cost, ...)
+pricing
+    design inputs and unconnected params (pod_period, n_passengers, ib, bm,
+    energy_cost, operating_time, ...)
+
+CostEngine freezes the physics values and evaluates cost_model vectorized over any
+number of pricing scenarios without running the model. A design input is only
+treated as physical if it feeds something outside the cost component, and the model
+is only rerun, lazily, when such an input actually changes value.
+"""
+from __future__ import print_function
+import numpy as np
+
+from openmdao.units.units import convert_units
+
+from hyperloop.Python.ticket_cost import cost_model
+
+
+class CostEngine(object):
+    """
+    Parameters
+    ----------
+    prob : Problem
+        Problem that has been set up and run
+    cost : str
+        Pathname of the TicketCost component
+
+    Attributes
+    ----------
+    physics_params : tuple
+        TicketCost params computed by the model, which scenarios can't override
+    pricing_params : tuple
+        TicketCost params that scenarios can override
+    physics_runs : int
+        Number of times the engine has rerun the model
+    """
+
+    def __init__(self, prob, cost='TubeAndPod.cost'):
+        self.prob = prob
+        self.cost = cost
+        self.physics_runs = 0
+
+        root = prob.root
+        self._comp = root.find_subsystem(cost)
+        to_prom = root._sysdata.to_prom_name
+
+        # source of each connected cost param, and all the targets of every source
+        targets = {}
+        for tgt, (src, idx) in root.connections.items():
+            targets.setdefault(src, []).append(tgt)
+
+        physics = []
+        pricing = []
+        self._inputs = {}
+        for name in self._comp.params.keys():
+            conn = root.connections.get(cost + '.' + name)
+            if conn is None:
+                pricing.append(name)
+                continue
+            src = to_prom[conn[0]]
+            if root.unknowns.metadata(src).get('_canset_'):
+                pricing.append(name)
+                # design inputs used only by the cost component never need a rerun
+                cost_only = all(t.startswith(cost + '.') for t in targets[conn[0]])
+                self._inputs.setdefault(src, []).append((name, cost_only))
+            else:
+                physics.append(name)
+
+        self.physics_params = tuple(physics)
+        self.pricing_params = tuple(pricing)
+        self._dirty = False
+        self._freeze()
+
+    def _freeze(self):
+        params = self._comp.params
+        self._frozen = dict((name, np.array(params[name], dtype=float)) for name in params.keys())
+
+    def set(self, name, value):
+        """
+        Set a design input of the problem, by the name used with prob[name]. The
+        model is marked for a rerun only if the input feeds something besides the
+        cost component and its value changed.
+        """
+        if np.array_equal(self.prob[name], value):
+            return
+
+        self.prob[name] = value
+        if name not in self._inputs or not all(cost_only for _, cost_only in self._inputs[name]):
+            self._dirty = True
+            return
+
+        src_units = self.prob.root.unknowns.metadata(name).get('units')
+        for param, _ in self._inputs[name]:
+            tgt_units = self._comp.params.metadata(param).get('units')
+            val = np.array(value, dtype=float)
+            if src_units and tgt_units and src_units != tgt_units:
+                val = convert_units(val, src_units, tgt_units)
+            self._frozen[param] = val
+
+    def physics(self):
+        """
+        Frozen TicketCost params, rerunning the model first if a physical input changed.
+        """
+        if self._dirty:
+            self.prob.run()
+            self.physics_runs += 1
+            self._dirty = False
+            self._freeze()
+        return self._frozen
+
+    def evaluate(self, **scenarios):
+        """
+        TicketCost outputs for arrays of pricing params, broadcast against each other,
+        with the other params from the frozen physics solution. Scenario values only
+        enter the cost model; inputs that should also change the physics go through set().
+
+        Returns
+        -------
+        dict
+            num_pods (fleet size), ticket_cost, prop_energy_cost, tube_energy_cost
+            and total_energy_cost, all with the broadcast shape of the scenarios
+        """
+        for name in scenarios:
+            if name in self.physics_params:
+                raise ValueError("'%s' is computed by the physics model and can't be set by a scenario" % name)
+            if name not in self.pricing_params:
+                raise KeyError("'%s' is not a param of %s" % (name, self.cost))
+
+        p = dict(self.physics())
+        p.update((name, np.asarray(val, dtype=float)) for name, val in scenarios.items())
+        out = cost_model(p)
+
+        # outputs independent of some scenario axis still get the full scenario shape
+        shape = np.broadcast(*out.values()).shape
+        return dict((name, np.broadcast_to(val, shape)) for name, val in out.items())
+
+
+if __name__ == '__main__':
+    import os
+    import time
+    from hyperloop.Python.tools.startup_benchmark import tube_and_pod_problem
+
+    prob = tube_and_pod_problem(thermo='ideal')
+    prob.setup(check=False, out_stream=open(os.devnull, 'w'))
+    prob.run()
+
+    engine = CostEngine(prob)
+
+    n = 1000000
+    rng = np.random.RandomState(0)
+    t0 = time.time()
+    out = engine.evaluate(pod_period=rng.uniform(60.0, 300.0, n),
+                          n_passengers=rng.uniform(20.0, 40.0, n),
+                          energy_cost=rng.uniform(.08, .20, n),
+                          ib=rng.uniform(.02, .06, n))
+    t1 = time.time()
+
+    print('\n')
+    print('%d cost scenarios in %f s' % (n, t1 - t0))
+    print('ticket cost 5/50/95 percentiles    %s USD' % np.percentile(out['ticket_cost'], [5, 50, 95]))
+    print('fleet size range                   %d - %d pods' % (out['num_pods'].min(), out['num_pods'].max()))
@@ -0,0 +1,190 @@
+"""
+Monte Carlo uncertainty propagation through the ticket cost model.
+
+Uncertain TicketCost params are sampled from declared distributions and pushed
+through cost_model on arrays, chunk by chunk, so memory stays bounded by the chunk
+size however many samples are drawn. The result holds quantiles of the output and a
+tornado table of one-at-a-time sensitivities.
+
+Distributions are either tuples
+
+    ('uniform', low, high)
+    ('normal', mean, std)
+    ('triangular', low, mode, high)
+    ('lognormal', median, sigma)
+
+or any object with an rvs(size, random_state) method, such as a frozen scipy.stats
+distribution. Uncertainty in the physics can be added with a physics callable that
+samples TicketCost params from a surrogate, e.g. CyclePowerUncertainty.
+"""
+from __future__ import print_function
+import numpy as np
+
+from openmdao.units.units import convert_units
+
+from hyperloop.Python.ticket_cost import TicketCost, cost_model
+from hyperloop.Python.pod.cycle.cycle_surrogate import CYCLE_INPUTS
+
+
+def default_params():
+    """
+    TicketCost params at their default values.
+    """
+    return dict((name, meta['val']) for name, meta in TicketCost()._init_params_dict.items())
+
+
+def sample(dist, n, rng):
+    """
+    n samples of a distribution, declared as a tuple or as an object with rvs.
+    """
+    if hasattr(dist, 'rvs'):
+        return np.asarray(dist.rvs(size=n, random_state=rng), dtype=float)
+
+    kind, args = dist[0], dist[1:]
+    if kind == 'uniform':
+        return rng.uniform(args[0], args[1], n)
+    elif kind == 'normal':
+        return rng.normal(args[0], args[1], n)
+    elif kind == 'triangular':
+        return rng.triangular(args[0], args[1], args[2], n)
+    elif kind == 'lognormal':
+        return rng.lognormal(np.log(args[0]), args[1], n)
+    raise ValueError("Unknown distribution '%s'" % kind)
+
+
+class CyclePowerUncertainty(object):
+    """
+    Physics uncertainty from the cycle surrogate: samples the cycle inputs, interpolates
+    the pod compressor power from a CycleTable and, optionally, scatters it by the
+    holdout error of the table.
+
+    Parameters
+    ----------
+    table : CycleTable
+        Cycle surrogate
+    distributions : dict
+        Distributions of the uncertain cycle inputs, keyed by CYCLE_INPUTS name
+    fixed : dict
+        Values of the other cycle inputs. Defaults are those of CycleTableComp
+    table_error : bool
+        Multiply the power by a uniform factor within the largest holdout relative error
+    """
+
+    defaults = {'pod_mach': .8, 'tube_pressure': 850., 'tube_temp': 320.,
+                'comp_inlet_area': 2.3884, 'PRdes': 12.6}
+
+    def __init__(self, table, distributions, fixed=None, table_error=True):
+        self.table = table
+        self.distributions = distributions
+        self.fixed = dict(self.defaults, **(fixed or {}))
+        self.table_error = table_error
+
+    def __call__(self, n, rng):
+        points = np.empty((n, len(CYCLE_INPUTS)))
+        for k, (name, path, units) in enumerate(CYCLE_INPUTS):
+            if name in self.distributions:
+                points[:, k] = sample(self.distributions[name], n, rng)
+            else:
+                points[:, k] = self.fixed[name]
+
+        power = self.table.evaluate(points)[:, 0]
+        if self.table_error and self.table.max_rel_err is not None:
+            rel = self.table.max_rel_err[0]
+            power = power * (1.0 + rng.uniform(-rel, rel, n))
+
+        return {'pod_power': convert_units(power, 'hp', 'W')}
+
+
+def monte_carlo(distributions, base=None, n=1000000, chunk_size=100000, quantiles=(.05, .25, .5, .75, .95),
+                tornado=(.05, .95), physics=None, output='ticket_cost', seed=0):
+    """
+    Propagate input uncertainty to a TicketCost output.
+
+    Parameters
+    ----------
+    distributions : dict
+        Distributions of the uncertain TicketCost params, keyed by param name
+    base : dict
+        Values of all TicketCost params, e.g. CostEngine.physics(). Default is default_params()
+    n : int
+        Number of samples
+    chunk_size : int
+        Number of samples evaluated at once
+    quantiles : tuple
+        Quantiles of the output to return
+    tornado : tuple
+        Low and high quantiles of each input used for the tornado table
+    physics : callable
+        Optional physics(m, rng) returning a dict of sampled TicketCost params for m samples
+    output : str
+        Output of cost_model to propagate
+    seed : int
+        Seed of the random number generator
+
+    Returns
+    -------
+    dict
+        samples (the n output values), mean, std, quantiles (dict keyed by quantile) and
+        tornado, a list of (name, input_low, input_high, output_low, output_high) sorted by
+        decreasing swing. The tornado varies one input at a time from its low to its high
+        quantile with the others at their medians.
+    """
+    p = dict(default_params() if base is None else base)
+    rng = np.random.RandomState(seed)
+
+    samples = np.empty(n)
+    inputs = None
+    for start in range(0, n, chunk_size):
+        m = min(chunk_size, n - start)
+        chunk = dict((name, sample(dist, m, rng)) for name, dist in distributions.items())
+        if physics is not None:
+            chunk.update(physics(m, rng))
+
+        # input quantiles for the tornado table, from the first chunk
+        if inputs is None:
+            inputs = dict((name, np.percentile(val, [50.0, 100.0 * tornado[0], 100.0 * tornado[1]]))
+                          for name, val in chunk.items())
+
+        p.update(chunk)
+        samples[start:start + m] = np.broadcast_to(cost_model(p)[output], (m,))
+
+    # one call for the whole tornado table: the center, then a low and a high case per input
+    names = sorted(inputs)
+    k = len(names)
+    for j, name in enumerate(names):
+        val = np.repeat(inputs[name][0], 2 * k + 1)
+        val[1 + 2 * j] = inputs[name][1]
+        val[2 + 2 * j] = inputs[name][2]
+        p[name] = val
+    out = np.broadcast_to(cost_model(p)[output], (2 * k + 1,))
+
+    table = [(name, inputs[name][1], inputs[name][2], out[1 + 2 * j], out[2 + 2 * j])
+             for j, name in enumerate(names)]
+    table.sort(key=lambda row: -abs(row[4] - row[3]))
+
+    return {'samples': samples,
+            'mean': np.mean(samples),
+            'std': np.std(samples),
+            'quantiles': dict(zip(quantiles, np.percentile(samples, [100.0 * q for q in quantiles]))),
+            'tornado': table}
+
+
+if __name__ == '__main__':
+    import time
+
+    distributions = {'land_cost': ('triangular', 2.0e6, 2.437e6, 3.5e6),
+                     'energy_cost': ('uniform', .08, .20),
+                     'ib': ('normal', .04, .005),
+                     'bm': ('uniform', 15.0, 30.0),
+                     'capital_cost': ('lognormal', 1.0e10, .3)}
+
+    t0 = time.time()
+    res = monte_carlo(distributions)
+    t1 = time.time()
+
+    print('%d samples in %f s' % (len(res['samples']), t1 - t0))
+    for q in sorted(res['quantiles']):
+        print('ticket cost %2d%% quantile          %f USD' % (100 * q, res['quantiles'][q]))
+    print('\n%-14s %12s %12s' % ('tornado', 'low (USD)', 'high (USD)'))
+    for name, lo, hi, out_lo, out_hi in res['tornado']:
+        print('%-14s %12f %12f' % (name, out_lo, out_hi))
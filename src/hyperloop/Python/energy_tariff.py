@@ -0,0 +1,136 @@
+"""
+Hourly electricity price curves and time-of-use energy costing.
+
+A tariff is an array of 8760 hourly prices (USD/kWh) for one year, or a stack of
+them with the hours on the last axis. Demand is an array of the same hours in kW,
+so the annual cost of any number of tariffs and demand profiles is one vectorized
+sum over the hours.
+
+Time resolved demand, e.g. the booster power of tube.booster_power or pod charging
+at the terminals, is reduced to a 24 hour profile with hourly_profile and repeated
+over the year with annual_demand.
+"""
+from __future__ import print_function
+import numpy as np
+
+HOURS_PER_YEAR = 8760
+
+
+def flat_tariff(price):
+    """
+    Hourly prices of a single energy price (USD/kWh). Arrays of prices give a stack of tariffs.
+    """
+    return np.asarray(price, dtype=float)[..., np.newaxis] * np.ones(HOURS_PER_YEAR)
+
+
+def time_of_use_tariff(off_peak=.08, peak=.20, peak_hours=(16.0, 21.0), shoulder=None, shoulder_hours=(7.0, 16.0),
+                       weekend_off_peak=True, first_weekday=0):
+    """
+    Hourly prices of a tariff with peak and shoulder windows on weekdays.
+
+    Parameters
+    ----------
+    off_peak, peak : float
+        Prices outside and inside the peak window (USD/kWh)
+    peak_hours : tuple
+        Start and end hour of the peak window
+    shoulder : float
+        Price in the shoulder window (USD/kWh). Default is off_peak
+    shoulder_hours : tuple
+        Start and end hour of the shoulder window
+    weekend_off_peak : bool
+        Charge off_peak all day on Saturdays and Sundays
+    first_weekday : int
+        Day of the week of January 1st, 0 for Monday
+    """
+    hour = np.arange(24)
+    day = np.full(24, off_peak, dtype=float)
+    if shoulder is not None:
+        day[(hour >= shoulder_hours[0]) & (hour < shoulder_hours[1])] = shoulder
+    day[(hour >= peak_hours[0]) & (hour < peak_hours[1])] = peak
+
+    price = np.tile(day, (365, 1))
+    if weekend_off_peak:
+        weekday = (first_weekday + np.arange(365)) % 7
+        price[weekday >= 5] = off_peak
+    return price.ravel()
+
+
+def operating_hours(operating_time=16.0 * 3600.0, start_hour=6.0):
+    """
+    Fraction of every hour of the year inside the daily operating window, which starts
+    at start_hour and may run past midnight. Arrays of operating times or start hours
+    give a stack of windows.
+    """
+    start = np.asarray(start_hour, dtype=float)[..., np.newaxis] % 24.0
+    end = start + np.asarray(operating_time, dtype=float)[..., np.newaxis] / 3600.0
+    hour = np.arange(25.0)
+
+    # overlap of each hour with the window and with its wrap past midnight
+    day = 0.0
+    for shift in (0.0, 24.0):
+        day = day + np.diff(np.clip(hour + shift, start, end), axis=-1)
+    return np.tile(day, 365)
+
+
+def hourly_profile(t, power, start_hour=6.0):
+    """
+    Average power (kW) in each hour of the day of a power series (W) on a uniform
+    time grid t (s) that starts at start_hour. Series longer than a day wrap around.
+    """
+    t = np.asarray(t, dtype=float)
+    dt = t[1] - t[0] if len(t) > 1 else 1.0
+    hour = np.floor(start_hour + t / 3600.0).astype(int) % 24
+    energy = np.bincount(hour, weights=np.asarray(power, dtype=float) * dt, minlength=24)
+    return energy / 3.6e6
+
+
+def annual_demand(daily, weekly=None):
+    """
+    Hourly demand (kW) over the year from a 24 hour profile, optionally scaled by one
+    factor per day of the week starting on January 1st.
+    """
+    demand = np.tile(np.asarray(daily, dtype=float), (365, 1))
+    if weekly is not None:
+        demand *= np.asarray(weekly, dtype=float)[np.arange(365) % 7, np.newaxis]
+    return demand.ravel()
+
+
+def annual_energy_cost(price, demand):
+    """
+    Annual cost (USD) of an hourly demand (kW) under an hourly tariff (USD/kWh).
+    Leading axes of price and demand broadcast, so stacks of tariffs and demand
+    profiles are costed in one call.
+    """
+    return np.einsum('...h,...h->...', np.asarray(price, dtype=float), np.asarray(demand, dtype=float))
+
+
+def mean_price(price, weights):
+    """
+    Average price (USD/kWh) of a tariff over the hours, weighted by a demand shape.
+    """
+    return annual_energy_cost(price, weights) / np.sum(weights)
+
+
+if __name__ == '__main__':
+    import time
+    from hyperloop.Python.mission.fleet_simulation import simulate_fleet
+    from hyperloop.Python.tube.booster_power import booster_power
+
+    fleet = simulate_fleet()
+    res = booster_power(fleet['depart'], fleet['direction'], np.linspace(25.0e3, 575.0e3, 24), launch_energy=1.0e8)
+    # boosters and terminal launches, plus the vacuum pumps over the operating hours
+    demand = annual_demand(hourly_profile(res['t'], res['total_power'])) + 950.0 * operating_hours()
+
+    # off peak and peak prices on a grid of tariffs
+    off_peak, peak = np.meshgrid(np.linspace(.05, .12, 100), np.linspace(.15, .40, 100))
+    tariffs = np.array([time_of_use_tariff(lo, hi) for lo, hi in zip(off_peak.ravel(), peak.ravel())])
+
+    t0 = time.time()
+    cost = annual_energy_cost(tariffs, demand)
+    t1 = time.time()
+
+    print('%d tariffs costed in %f s' % (len(tariffs), t1 - t0))
+    print('annual energy                      %f GWh' % (demand.sum() / 1.0e6))
+    print('annual cost at a flat .13 USD/kWh  %f MUSD' % (annual_energy_cost(flat_tariff(.13), demand) / 1.0e6))
+    print('annual cost range of the tariffs   %f - %f MUSD' % (cost.min() / 1.0e6, cost.max() / 1.0e6))
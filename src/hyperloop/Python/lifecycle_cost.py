@@ -0,0 +1,181 @@
+"""
+Lifecycle cash flows and net present value of the route.
+
+TicketCost folds capital, bond interest and maturity into a single closed form
+ticket cost. lifecycle_model instead lays out the yearly cash flows of the project:
+
+- construction of the tube and the overhead capital, phased evenly over the
+  construction years
+- operations and maintenance as a fraction of the construction cost, and the
+  energy cost of cost_model, both escalating every year
+- the pod fleet, bought when operations start and replaced every pod_life years,
+  with battery packs replaced every battery_life years in between
+- ticket revenue
+
+The flows are discounted to the start of construction. Every param may be an array of
+scenarios: the flows are arrays of (years x scenarios), so 10^5 financing scenarios
+are a single call.
+"""
+from __future__ import print_function
+import numpy as np
+
+from hyperloop.Python.ticket_cost import TicketCost, cost_model
+
+# params of lifecycle_model on top of those of cost_model
+LIFECYCLE_PARAMS = ('construction_years', 'operating_years', 'discount_rate', 'om_fraction', 'escalation',
+                    'pod_life', 'battery_cost', 'battery_life', 'ticket_price', 'load_factor')
+
+
+def lifecycle_model(p):
+    """
+    Lifecycle outputs from a mapping p of the params of LifecycleCost, in the same units.
+
+    Returns
+    -------
+    dict
+        years (from the start of construction), the yearly construction, operations,
+        fleet and revenue flows and the net cash_flow with shape (years,) + scenario
+        shape, and per scenario npv, break_even_ticket (the ticket price with zero npv)
+        and payback_year (the first year with a positive cumulative discounted cash
+        flow, inf if never)
+    """
+    out = cost_model(p)
+    construction_years = p['construction_years']
+    operating_years = p['operating_years']
+    rate = p['discount_rate']
+    pod_life = p['pod_life']
+    battery_life = p['battery_life']
+
+    build_cost = p['land_cost'] * (p['land_length'] / 1000.0) + p['water_cost'] * (p['water_length'] / 1000.0) + \
+        p['capital_cost']
+    passengers = p['n_passengers'] * p['load_factor'] * (p['operating_time'] / p['pod_period']) * 365.0
+
+    shape = np.broadcast(out['total_energy_cost'], out['num_pods'], build_cost, passengers,
+                         *[p[name] for name in LIFECYCLE_PARAMS]).shape
+    num_years = int(np.max(construction_years + operating_years))
+    years = np.arange(num_years, dtype=float)
+    y = years.reshape((num_years,) + (1,) * len(shape))
+
+    # years since the start of operations
+    age = y - construction_years
+    building = age < 0.0
+    operating = (age >= 0.0) & (age < operating_years)
+
+    construction = np.where(building, build_cost / construction_years, 0.0)
+    operations = np.where(operating, (p['om_fraction'] * build_cost + out['total_energy_cost']) *
+                          (1.0 + p['escalation'])**np.maximum(age, 0.0), 0.0)
+
+    new_pods = operating & (np.mod(age, pod_life) == 0.0)
+    new_batteries = operating & ~new_pods & (np.mod(age, battery_life) == 0.0)
+    fleet = out['num_pods'] * (np.where(new_pods, p['pod_cost'], 0.0) + np.where(new_batteries, p['battery_cost'], 0.0))
+
+    riders = np.where(operating, passengers, 0.0)
+    revenue = p['ticket_price'] * riders
+    costs = construction + operations + fleet
+    cash_flow = revenue - costs
+
+    discount = (1.0 + rate)**-y
+    cumulative = np.cumsum(discount * cash_flow, axis=0)
+    paid_back = (cumulative >= 0.0) & ~building
+
+    shape = (num_years,) + shape
+    return {'years': years,
+            'construction': np.broadcast_to(construction, shape),
+            'operations': np.broadcast_to(operations, shape),
+            'fleet': np.broadcast_to(fleet, shape),
+            'revenue': np.broadcast_to(revenue, shape),
+            'cash_flow': np.broadcast_to(cash_flow, shape),
+            'npv': cumulative[-1],
+            'break_even_ticket': np.sum(discount * costs, axis=0) / np.sum(discount * riders, axis=0),
+            'payback_year': np.where(np.any(paid_back, axis=0), np.argmax(paid_back, axis=0), np.inf)}
+
+
+class LifecycleCost(TicketCost):
+    """
+    Params
+    ------
+    construction_years : float
+        Years of construction, with the cost spread evenly. Default value is 5 yr
+    operating_years : float
+        Years of operation. Default value is 30 yr
+    discount_rate : float
+        Yearly discount rate of the cash flows. Default value is .04
+    om_fraction : float
+        Yearly operations and maintenance cost as a fraction of the construction cost. Default value is .02
+    escalation : float
+        Yearly increase of the operations and energy costs. Default value is .02
+    pod_life : float
+        Years between replacements of the fleet. Default value is 10 yr
+    battery_cost : float
+        Cost of the battery pack of one pod. Default value is 50.0e3 USD
+    battery_life : float
+        Years between replacements of the battery packs. Default value is 4 yr
+    ticket_price : float
+        Ticket price for the revenue. Default value is 100.0 USD
+    load_factor : float
+        Fraction of the seats sold. Default value is .8
+
+    Returns
+    -------
+    npv : float
+        Net present value at the start of construction (USD)
+    break_even_ticket : float
+        Ticket price with zero net present value (USD)
+    payback_year : float
+        Years from the start of construction until the discounted cash flow turns positive
+
+    Notes
+    -----
+    TicketCost with the lifecycle cash flows of lifecycle_model. It has the params and
+    outputs of TicketCost as well, so it can replace the cost component of TubeAndPod.
+    """
+
+    def __init__(self, tariff=False):
+
+        super(LifecycleCost, self).__init__(tariff=tariff)
+
+        self.add_param('construction_years', val=5.0, desc='Years of construction', units='yr')
+        self.add_param('operating_years', val=30.0, desc='Years of operation', units='yr')
+        self.add_param('discount_rate', val=.04, desc='Yearly discount rate', units='unitless')
+        self.add_param('om_fraction', val=.02, desc='Yearly O&M cost per construction cost', units='unitless')
+        self.add_param('escalation', val=.02, desc='Yearly increase of operating costs', units='unitless')
+        self.add_param('pod_life', val=10.0, desc='Years between fleet replacements', units='yr')
+        self.add_param('battery_cost', val=50.0e3, desc='Cost of the battery pack of a pod', units='USD')
+        self.add_param('battery_life', val=4.0, desc='Years between battery replacements', units='yr')
+        self.add_param('ticket_price', val=100.0, desc='Ticket price', units='USD')
+        self.add_param('load_factor', val=.8, desc='Fraction of seats sold', units='unitless')
+
+        self.add_output('npv', val=0.0, desc='Net present value', units='USD')
+        self.add_output('break_even_ticket', val=0.0, desc='Ticket price with zero net present value', units='USD')
+        self.add_output('payback_year', val=0.0, desc='Years until the discounted cash flow turns positive', units='yr')
+
+    def solve_nonlinear(self, p, u, r):
+
+        super(LifecycleCost, self).solve_nonlinear(p, u, r)
+
+        res = lifecycle_model(p)
+        for name in ('npv', 'break_even_ticket', 'payback_year'):
+            u[name] = res[name]
+
+
+if __name__ == '__main__':
+    import time
+
+    p = dict((name, meta['val']) for name, meta in LifecycleCost()._init_params_dict.items())
+
+    # financing and demand scenarios
+    n = 100000
+    rng = np.random.RandomState(0)
+    p['discount_rate'] = rng.uniform(.02, .08, n)
+    p['construction_years'] = rng.randint(3, 9, n).astype(float)
+    p['escalation'] = rng.uniform(0.0, .04, n)
+    p['load_factor'] = rng.uniform(.5, 1.0, n)
+    p['ticket_price'] = 300.0
+
+    t0 = time.time()
+    res = lifecycle_model(p)
+    t1 = time.time()
+
+    print('%d scenarios x %d years in %f s' % (n, len(res['years']), t1 - t0))
+    print('break even ticket 5/50/95 percentiles %s USD' % np.percentile(res['break_even_ticket'], [5, 50, 95]))
+    print('fraction of scenarios with npv > 0    %f' % np.mean(res['npv'] > 0.0))
@@ -0,0 +1,318 @@
+"""
+Forward simulation of a batch of MagnePlane trajectories.
+
+MagnePlaneRHS chains MagneplaneEOM, PodThrustAndDrag, LatLong and TerrainElevationComp
+as OpenMDAO components. Here the same equations are NumPy functions of arrays of M
+trajectories, and an adaptive Dormand-Prince 5(4) integrator advances all of them at
+once, each with its own step size. No Problem is set up, so thousands of control
+histories or dispersed params (Monte Carlo) are a single call, e.g. to generate
+initial guesses for a CollocationPhase.
+
+States are ordered as STATES, (x, y, z, v), with x north, y east and z down (m) and v
+the speed (m/s). Controls are theta (elevation angle, up from horizontal) and psi
+(azimuth, clockwise from north) in rad, given as a function controls(t, X) of the
+times (M,) and states (4, M) of the batch, e.g. from control_history.
+
+Outputs are interpolated to common times t_eval with the dense output of the
+integrator, so the steps never have to land on them.
+"""
+from __future__ import print_function
+import numpy as np
+from scipy import interpolate
+
+STATES = ('x', 'y', 'z', 'v')
+
+# params of the pod and the tube, as the defaults of the components and the straight track test
+PARAMS = {'g': 9.80665,
+          'mass': 3100.0,
+          'S': 1.4,
+          'p_tube': 850.0,
+          'T_ambient': 298.0,
+          'R': 287.0,
+          'D_magnetic': 150.0,
+          'F_thrust': 30000.0}
+
+# Dormand-Prince 5(4) tableau, error weights and 4th order dense output
+_C = np.array([0.0, 1.0 / 5, 3.0 / 10, 4.0 / 5, 8.0 / 9, 1.0])
+_A = [[],
+      [1.0 / 5],
+      [3.0 / 40, 9.0 / 40],
+      [44.0 / 45, -56.0 / 15, 32.0 / 9],
+      [19372.0 / 6561, -25360.0 / 2187, 64448.0 / 6561, -212.0 / 729],
+      [9017.0 / 3168, -355.0 / 33, 46732.0 / 5247, 49.0 / 176, -5103.0 / 18656]]
+_B = np.array([35.0 / 384, 0.0, 500.0 / 1113, 125.0 / 192, -2187.0 / 6784, 11.0 / 84, 0.0])
+_E = _B - np.array([5179.0 / 57600, 0.0, 7571.0 / 16695, 393.0 / 640, -92097.0 / 339200, 187.0 / 2100, 1.0 / 40])
+_P = np.array([[1.0, -8048581381.0 / 2820520608, 8663915743.0 / 2820520608, -12715105075.0 / 11282082432],
+               [0.0, 0.0, 0.0, 0.0],
+               [0.0, 131558114200.0 / 32700410799, -68118460800.0 / 10900136933, 87487479700.0 / 32700410799],
+               [0.0, -1754552775.0 / 470086768, 14199869525.0 / 1410260304, -10690763975.0 / 1880347072],
+               [0.0, 127303824393.0 / 49829197408, -318862633887.0 / 49829197408, 701980252875.0 / 199316789632],
+               [0.0, -282668133.0 / 205662961, 2019193451.0 / 616988883, -1453857185.0 / 822651844],
+               [0.0, 40617522.0 / 29380423, -110615467.0 / 29380423, 69997945.0 / 29380423]])
+
+
+def eom(v, theta, psi, g, F_thrust, F_drag, mass):
+    """
+    Rates of (x, y, z, v) of MagneplaneEOM.
+    """
+    ctheta = np.cos(theta)
+    stheta = np.sin(theta)
+    return np.array([v * ctheta * np.cos(psi),
+                     v * ctheta * np.sin(psi),
+                     -v * stheta,
+                     -g * stheta + (F_thrust - F_drag) / mass])
+
+
+def drag(v, S, p_tube, T_ambient, R, D_magnetic):
+    """
+    Drag force of PodThrustAndDrag (N), which takes but does not use a drag coefficient.
+    """
+    rho = p_tube / (R * T_ambient)
+    return .5 * rho * v**2 * S + D_magnetic
+
+
+def lat_long(x, y, Re=6378.137, lon_origin=-121.0, lat_origin=35.0):
+    """
+    Latitude and longitude (deg) of LatLong, with x and y in m.
+    """
+    lat = np.radians(lat_origin) + x / (1000.0 * Re)
+    lon = np.radians(lon_origin) + y / (1000.0 * Re * np.cos(lat))
+    return np.degrees(lat), np.degrees(lon)
+
+
+class Terrain(object):
+    """
+    Terrain elevation (m) of TerrainElevationComp at arrays of latitudes and longitudes
+    (deg). The USGS grid stores latitudes along the rows.
+    """
+
+    def __init__(self, lat=None, lon=None, elevation=None):
+        if elevation is None:
+            from hyperloop.Python.mission.route_search import load_usgs
+            lat, lon, elevation = load_usgs()
+        self.interpolant = interpolate.RectBivariateSpline(lat, lon, elevation)
+
+    def __call__(self, lat, lon):
+        return self.interpolant.ev(lat, lon)
+
+
+def control_history(t, theta=0.0, psi=0.0):
+    """
+    Controls interpolated linearly in time from tables at times t (K,), each of theta and
+    psi (rad) shared by the batch (K,) or one row per trajectory (M, K). Controls are
+    held constant outside t.
+    """
+    t = np.asarray(t, dtype=float)
+    table = np.array(np.broadcast_arrays(np.asarray(theta, dtype=float), np.asarray(psi, dtype=float), t)[:2])
+
+    def controls(time, X):
+        time = np.broadcast_to(time, X.shape[1:])
+        i = np.clip(np.searchsorted(t, time) - 1, 0, len(t) - 2)
+        w = np.clip((time - t[i]) / (t[i + 1] - t[i]), 0.0, 1.0)
+        if table.ndim == 3:
+            rows = np.arange(table.shape[1]).reshape((-1,) + (1,) * (time.ndim - 1))
+            lo, hi = table[:, rows, i], table[:, rows, i + 1]
+        else:
+            lo, hi = table[:, i], table[:, i + 1]
+        return lo + w * (hi - lo)
+
+    return controls
+
+
+class BatchSimulation(object):
+    """
+    Parameters
+    ----------
+    controls : callable
+        controls(t, X) returning theta and psi (rad) of the batch, each broadcastable to (M,)
+    terrain : callable
+        terrain(lat, lon) returning the terrain elevation (m). Default is the USGS grid.
+        False skips the terrain outputs
+    params
+        Params of PARAMS, each a float or an array (M,) of dispersed values
+
+    Attributes
+    ----------
+    nfev : int
+        Number of batch evaluations of the equations of motion
+    """
+
+    def __init__(self, controls=None, terrain=None, Re=6378.137, lon_origin=-121.0, lat_origin=35.0, **params):
+        for name in params:
+            if name not in PARAMS:
+                raise KeyError("Unknown param '%s'" % name)
+        self.params = dict(PARAMS)
+        self.params.update(params)
+        self.controls = controls if controls is not None else control_history([0.0, 1.0])
+        self.terrain = Terrain() if terrain is None else terrain
+        self.origin = (Re, lon_origin, lat_origin)
+        self.nfev = 0
+
+    def _param(self, name, ndim=1):
+        val = np.asarray(self.params[name], dtype=float)
+        return val.reshape(val.shape + (1,) * (ndim - 1)) if val.ndim else val
+
+    def rates(self, t, X):
+        """
+        Rates (4, M) of the states X (4, M) at times t (M,).
+        """
+        self.nfev += 1
+        p = self._param
+        theta, psi = self.controls(t, X)
+        F_drag = drag(X[3], p('S'), p('p_tube'), p('T_ambient'), p('R'), p('D_magnetic'))
+        return eom(X[3], theta, psi, p('g'), p('F_thrust'), F_drag, p('mass'))
+
+    def outputs(self, t, X):
+        """
+        Controls and algebraic outputs of MagnePlaneRHS at times t and states X (4, ...).
+        """
+        p = lambda name: self._param(name, X.ndim - 1)
+        theta, psi = self.controls(t, X)
+        out = {'theta': np.broadcast_to(theta, X.shape[1:]),
+               'psi': np.broadcast_to(psi, X.shape[1:]),
+               'F_drag': drag(X[3], p('S'), p('p_tube'), p('T_ambient'), p('R'), p('D_magnetic')),
+               'F_thrust': np.broadcast_to(p('F_thrust'), X.shape[1:])}
+        if self.terrain is not False:
+            Re, lon_origin, lat_origin = self.origin
+            out['lat'], out['long'] = lat_long(X[0], X[1], Re, lon_origin, lat_origin)
+            out['elev'] = self.terrain(out['lat'], out['long'])
+            out['alt'] = -X[2] - out['elev']
+        return out
+
+    def simulate(self, X0, t_end, t_eval=None, event=None, rtol=1.0e-6, atol=1.0e-6, h0=None, max_steps=100000):
+        """
+        Integrate the batch from t = 0.
+
+        Parameters
+        ----------
+        X0 : ndarray
+            Initial states, (4,) shared by the batch or (4, M)
+        t_end : float or ndarray
+            Final time of every trajectory (s)
+        t_eval : ndarray
+            Common output times (K,). Default is 101 times up to the largest t_end
+        event : callable
+            event(X) of the states (4, M). A trajectory stops where its event changes sign
+        rtol, atol : float
+            Relative and absolute tolerance of the local error
+        h0 : float
+            First step (s). Default is 1e-3 of t_end
+        max_steps : int
+            Most steps of the batch
+
+        Returns
+        -------
+        dict
+            t (K,), the states and the outputs of outputs as arrays (M, K), NaN past the
+            end of a trajectory, and per trajectory t_stop (s), the final states X
+            (4, M), steps and rejected
+        """
+        X = np.array(X0, dtype=float)
+        shape = np.broadcast(X[0], *[np.asarray(val) for val in self.params.values()]).shape
+        m = int(np.prod(shape)) if shape else 1
+        X = np.array(np.broadcast_to(X.reshape(4, -1), (4, m)))
+        t_end = np.array(np.broadcast_to(t_end, (m,)), dtype=float)
+        if t_eval is None:
+            t_eval = np.linspace(0.0, np.max(t_end), 101)
+        t_eval = np.asarray(t_eval, dtype=float)
+
+        n = len(t_eval)
+        Y = np.full((4, m, n), np.nan)
+        k = np.searchsorted(t_eval, 0.0, side='right')
+        Y[:, :, :k] = np.where(t_eval[:k] == 0.0, X[:, :, np.newaxis], np.nan)
+        k = np.full(m, k)
+
+        t = np.zeros(m)
+        h = np.full(m, 1.0e-3) * t_end if h0 is None else np.full(m, float(h0))
+        steps = np.zeros(m, dtype=int)
+        rejected = np.zeros(m, dtype=int)
+        g_old = event(X) if event is not None else None
+        K = np.empty((7, 4, m))
+        K[0] = self.rates(t, X)
+        cols = np.arange(m)
+
+        for it in range(max_steps):
+            active = t < t_end
+            if not np.any(active):
+                break
+            h = np.where(active, np.minimum(h, t_end - t), 0.0)
+
+            for s in range(1, 6):
+                dX = sum(a * K[j] for j, a in enumerate(_A[s]))
+                K[s] = self.rates(t + _C[s] * h, X + h * dX)
+            X_new = X + h * np.tensordot(_B[:6], K[:6], axes=1)
+            K[6] = self.rates(t + h, X_new)
+
+            scale = atol + rtol * np.maximum(np.abs(X), np.abs(X_new))
+            err = np.sqrt(np.mean((h * np.tensordot(_E, K, axes=1) / scale)**2, axis=0))
+            accept = active & (err <= 1.0)
+            with np.errstate(divide='ignore'):
+                factor = np.clip(.9 * err**-.2, .2, np.where(accept, 10.0, 1.0))
+
+            t_new = t + h
+            Q = np.einsum('sim,sp->pim', K, _P)
+            if event is not None:
+                g_new = event(X_new)
+                hit = accept & (np.sign(g_new) != np.sign(g_old)) & (g_old != 0.0)
+                if np.any(hit):
+                    # the root of the event on the dense output, by bisection
+                    lo, hi = np.zeros(m), np.ones(m)
+                    for _ in range(50):
+                        mid = .5 * (lo + hi)
+                        g_mid = event(X + h * _dense(Q, mid))
+                        left = np.sign(g_mid) != np.sign(g_old)
+                        lo, hi = np.where(left, lo, mid), np.where(left, mid, hi)
+                    t_new = np.where(hit, t + hi * h, t_new)
+                    X_new = np.where(hit, X + h * _dense(Q, hi), X_new)
+                    t_end = np.where(hit, t_new, t_end)
+                g_old = np.where(accept, g_new, g_old)
+
+            # dense output at the output times of the step
+            while True:
+                kk = np.minimum(k, n - 1)
+                due = accept & (k < n) & (t_eval[kk] <= t_new)
+                if not np.any(due):
+                    break
+                theta = np.where(due, (t_eval[kk] - t) / np.where(h > 0.0, h, 1.0), 0.0)
+                Y[:, cols[due], kk[due]] = (X + h * _dense(Q, theta))[:, due]
+                k = k + due
+
+            t = np.where(accept, t_new, t)
+            X = np.where(accept, X_new, X)
+            K[0] = np.where(accept, K[6], K[0])
+            h = h * factor
+            steps += accept
+            rejected += active & ~accept
+        else:
+            raise RuntimeError('The batch did not reach t_end in %d steps' % max_steps)
+
+        res = dict(zip(STATES, Y))
+        res.update(self.outputs(t_eval, Y))
+        res.update({'t': t_eval, 't_stop': t, 'X': X, 'steps': steps, 'rejected': rejected})
+        return res
+
+
+def _dense(Q, theta):
+    """
+    Dense output increment per unit step, at fractions theta (M,) of the step.
+    """
+    powers = theta**np.arange(1, 5)[:, np.newaxis]
+    return np.einsum('pim,pm->im', Q, powers)
+
+
+if __name__ == '__main__':
+    import time
+
+    # 10^4 pods launched on a gently climbing and turning track, with dispersed mass and magnetic drag
+    m = 10000
+    rng = np.random.RandomState(0)
+    sim = BatchSimulation(control_history([0.0, 60.0], theta=[0.0, .01], psi=np.outer(rng.normal(.1, .02, m), [0.0, 1.0])),
+                          mass=rng.normal(3100.0, 100.0, m), D_magnetic=rng.uniform(100.0, 200.0, m))
+
+    t0 = time.time()
+    res = sim.simulate([0.0, 0.0, 0.0, 0.0], 120.0, event=lambda X: X[3] - 335.0)
+    t1 = time.time()
+
+    print('%d trajectories in %f s, %d batch evaluations' % (m, t1 - t0, sim.nfev))
+    print('time to 335 m/s 5/50/95 percentiles   %s s' % np.percentile(res['t_stop'], [5, 50, 95]))
+    print('distance 5/50/95 percentiles          %s km' % (np.percentile(res['X'][0], [5, 50, 95]) / 1000.0))
@@ -0,0 +1,284 @@
+"""
+Discrete-event simulation of the pod fleet over an operating day.
+
+One route links two terminals, with one tube per direction. Each terminal
+dispatches a pod every pod_period from opening until operating_time. Several
+constraints apply:
+
+- A departure must come at least headway after the previous one in the same
+  direction.
+- A pod boosts to vf at a_boost, coasts, and brakes at a_brake.
+- On arrival the pod needs one of num_berths platforms for turnaround_time.
+  Until a platform frees up it holds in the tube.
+- After turnaround the pod waits in the terminal yard for its next departure.
+
+With fleet_size=None the fleet is sized to the timetable: a new pod is added
+whenever a departure finds no pod waiting. With a fixed fleet, departures wait
+for a pod and the delays are reported.
+
+Events are kept in a heap, so a day with thousands of departures takes a
+fraction of a second.
+"""
+from __future__ import print_function
+import heapq
+from collections import deque
+
+import numpy as np
+from openmdao.api import Component, Group, Problem
+
+# Event kinds, in the order they are handled at equal times
+_READY, _ARRIVE, _DEPART, _HEADWAY = range(4)
+
+
+def trip_profile(track_length, vf, a_boost=9.81, a_brake=9.81):
+    """
+    Durations (s) of the boost, coast and braking phases of one trip. Tracks too short
+    to reach vf get a triangular speed profile with no coast.
+    """
+    d_min = .5 * vf**2 * (1.0 / a_boost + 1.0 / a_brake)
+    if track_length >= d_min:
+        return vf / a_boost, (track_length - d_min) / vf, vf / a_brake
+    v_peak = np.sqrt(2.0 * track_length / (1.0 / a_boost + 1.0 / a_brake))
+    return v_peak / a_boost, 0.0, v_peak / a_brake
+
+
+def simulate_fleet(operating_time=16.0 * 3600.0, pod_period=120.0, track_length=600.0e3, vf=286.86,
+                   a_boost=9.81, a_brake=9.81, turnaround_time=300.0, headway=30.0, num_berths=4,
+                   fleet_size=None, dt=60.0):
+    """
+    Run the fleet over one operating day.
+
+    Parameters
+    ----------
+    operating_time : float
+        Length of the timetable, from the first departure (s)
+    pod_period : float
+        Time between scheduled departures from each terminal (s)
+    track_length : float
+        Length of the route (m)
+    vf : float
+        Cruise speed (m/s)
+    a_boost, a_brake : float
+        Launch acceleration and braking deceleration (m/s**2)
+    turnaround_time : float
+        Time a pod occupies a platform after arriving (s)
+    headway : float
+        Smallest time between departures in the same direction (s)
+    num_berths : int
+        Number of platforms at each terminal
+    fleet_size : int
+        Number of pods, split evenly between the terminals. None sizes the fleet to the timetable
+    dt : float
+        Spacing of the time grid of the pods-in-tube counts (s)
+
+    Returns
+    -------
+    dict
+        fleet_size, departures, utilization (fraction of pod time spent in the tube),
+        mean_delay and max_delay of departures against the timetable (s), the time grid t
+        with pods_in_tube and pods_boosting counts, and per trip arrays pod, direction,
+        scheduled, depart, arrive (end of the tube) and dock (start of turnaround)
+    """
+    t_boost, t_coast, t_brake = trip_profile(track_length, vf, a_boost, a_brake)
+    t_trip = t_boost + t_coast + t_brake
+
+    heap = []
+    seq = [0]
+
+    def push(t, kind, data):
+        seq[0] += 1
+        heapq.heappush(heap, (t, kind, seq[0], data))
+
+    waiting = [deque(), deque()]
+    idle = [deque(), deque()]
+    hold = [deque(), deque()]
+    berths = [num_berths, num_berths]
+    last_dep = [-np.inf, -np.inf]
+    headway_pending = [False, False]
+
+    # number of pods in service, a list so that try_depart can add pods
+    n_pods = [0]
+    if fleet_size is not None:
+        for pod in range(fleet_size):
+            idle[pod % 2].append(pod)
+        n_pods[0] = fleet_size
+
+    schedule = np.arange(0.0, operating_time, pod_period)
+    for k in (0, 1):
+        for t in schedule:
+            push(t, _DEPART, k)
+
+    trips = []
+    dock = {}
+
+    def try_depart(k, t):
+        while waiting[k]:
+            if t < last_dep[k] + headway:
+                if not headway_pending[k]:
+                    headway_pending[k] = True
+                    push(last_dep[k] + headway, _HEADWAY, k)
+                return
+            if idle[k]:
+                pod = idle[k].popleft()
+            elif fleet_size is None:
+                pod = n_pods[0]
+                n_pods[0] += 1
+            else:
+                return
+            scheduled = waiting[k].popleft()
+            last_dep[k] = t
+            trips.append([pod, k, scheduled, t, t + t_trip])
+            push(t + t_trip, _ARRIVE, (pod, 1 - k, len(trips) - 1))
+
+    def dock_pod(pod, k, trip, t):
+        berths[k] -= 1
+        dock[trip] = t
+        push(t + turnaround_time, _READY, (pod, k))
+
+    while heap:
+        t, kind, _, data = heapq.heappop(heap)
+        if kind == _DEPART:
+            waiting[data].append(t)
+            try_depart(data, t)
+        elif kind == _HEADWAY:
+            headway_pending[data] = False
+            try_depart(data, t)
+        elif kind == _ARRIVE:
+            pod, k, trip = data
+            if berths[k] > 0:
+                dock_pod(pod, k, trip, t)
+            else:
+                hold[k].append((pod, trip))
+        else:
+            pod, k = data
+            berths[k] += 1
+            idle[k].append(pod)
+            if hold[k]:
+                held, trip = hold[k].popleft()
+                dock_pod(held, k, trip, t)
+            try_depart(k, t)
+
+    trips = np.array(trips).reshape(-1, 5)
+    pod, direction, scheduled, depart, arrive = trips.T
+    dock = np.array([dock[i] for i in range(len(trips))])
+    n_pods = n_pods[0]
+
+    # pods in the tube are those that have departed and not yet docked
+    t_end = dock.max() if len(dock) else 0.0
+    t = np.arange(0.0, t_end + dt, dt)
+    pods_in_tube = np.searchsorted(np.sort(depart), t, side='right') - np.searchsorted(np.sort(dock), t, side='right')
+    pods_boosting = (np.searchsorted(np.sort(depart), t, side='right') -
+                     np.searchsorted(np.sort(depart + t_boost), t, side='right'))
+
+    delay = depart - scheduled
+    return {'fleet_size': n_pods,
+            'departures': len(depart),
+            'utilization': np.sum(dock - depart) / (n_pods * t_end) if n_pods else 0.0,
+            'mean_delay': np.mean(delay) if len(delay) else 0.0,
+            'max_delay': np.max(delay) if len(delay) else 0.0,
+            't': t,
+            'pods_in_tube': pods_in_tube,
+            'pods_boosting': pods_boosting,
+            'pod': pod.astype(int),
+            'direction': direction.astype(int),
+            'scheduled': scheduled,
+            'depart': depart,
+            'arrive': arrive,
+            'dock': dock}
+
+
+class FleetSimulation(Component):
+    """
+    Params
+    ------
+    operating_time : float
+        Operating time per day (s)
+    pod_period : float
+        Time between departures from each terminal (s)
+    track_length : float
+        Length of the route (m)
+    vf : float
+        Pod top speed (m/s)
+    a_boost : float
+        Launch acceleration (m/s**2)
+    a_brake : float
+        Braking deceleration (m/s**2)
+    turnaround_time : float
+        Platform time of a pod at each terminal (s)
+    headway : float
+        Smallest time between departures in the same direction (s)
+    num_berths : float
+        Number of platforms at each terminal
+
+    Returns
+    -------
+    num_pods : float
+        Fleet size needed to fly the timetable
+    flights_per_pod : float
+        Average number of trips per pod per day
+    utilization : float
+        Fraction of the day a pod spends in the tube
+    max_pods_in_tube : float
+        Largest number of pods in the tubes at once
+    mean_pods_in_tube : float
+        Time averaged number of pods in the tubes
+
+    Notes
+    -----
+    Wraps simulate_fleet with the fleet sized to the timetable. The outputs are
+    piecewise constant in the params, so the component uses finite differences.
+    """
+
+    def __init__(self):
+        super(FleetSimulation, self).__init__()
+        self.deriv_options['type'] = 'fd'
+
+        self.add_param('operating_time', val=16.0 * 3600.0, units='s', desc='operating time per day')
+        self.add_param('pod_period', val=120.0, units='s', desc='time between departures')
+        self.add_param('track_length', val=600.0e3, units='m', desc='track length')
+        self.add_param('vf', val=286.86, units='m/s', desc='pod top speed')
+        self.add_param('a_boost', val=9.81, units='m/s**2', desc='launch acceleration')
+        self.add_param('a_brake', val=9.81, units='m/s**2', desc='braking deceleration')
+        self.add_param('turnaround_time', val=300.0, units='s', desc='platform time at terminals')
+        self.add_param('headway', val=30.0, units='s', desc='smallest time between departures')
+        self.add_param('num_berths', val=4.0, desc='number of platforms per terminal')
+
+        self.add_output('num_pods', val=0.0, desc='fleet size')
+        self.add_output('flights_per_pod', val=0.0, desc='trips per pod per day')
+        self.add_output('utilization', val=0.0, desc='fraction of time in the tube')
+        self.add_output('max_pods_in_tube', val=0.0, desc='largest number of pods in the tubes')
+        self.add_output('mean_pods_in_tube', val=0.0, desc='average number of pods in the tubes')
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        res = simulate_fleet(params['operating_time'], params['pod_period'], params['track_length'],
+                             params['vf'], params['a_boost'], params['a_brake'], params['turnaround_time'],
+                             params['headway'], int(params['num_berths']))
+
+        unknowns['num_pods'] = res['fleet_size']
+        unknowns['flights_per_pod'] = res['departures'] / float(res['fleet_size'])
+        unknowns['utilization'] = res['utilization']
+        unknowns['max_pods_in_tube'] = np.max(res['pods_in_tube'])
+        unknowns['mean_pods_in_tube'] = np.mean(res['pods_in_tube'])
+
+
+if __name__ == '__main__':
+    import time
+
+    t0 = time.time()
+    res = simulate_fleet(pod_period=30.0, num_berths=12)
+    t1 = time.time()
+
+    print('%d departures simulated in %f s' % (res['departures'], t1 - t0))
+    print('fleet size                         %d pods' % res['fleet_size'])
+    print('utilization                        %f' % res['utilization'])
+    print('most pods in the tubes             %d' % np.max(res['pods_in_tube']))
+
+    top = Problem()
+    root = top.root = Group()
+    root.add('p', FleetSimulation())
+    top.setup()
+    top.run()
+
+    print('\n')
+    print('fleet size at the default timetable %d pods' % top['p.num_pods'])
+    print('trips per pod per day               %f' % top['p.flights_per_pod'])
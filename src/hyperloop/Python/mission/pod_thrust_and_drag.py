@@ -37,14 +37,29 @@ class PodThrustAndDrag(EOMComp):
     -------
     Drag : float
         Total drag force acting on pod. Default value is 0.0.
+    Thrust : float
+        Net compressor thrust at each node. 30000 N unless a cycle is given.
+    Compressor Power : float
+        Shaft power of the compressor at each node, only with a cycle (W)
+
+    Notes
+    -----
+    cycle is an optional pod.cycle.off_design.OffDesignCycle, sized at the design
+    point. With it, the thrust of every node comes from the off-design cycle at the
+    node's velocity and tube conditions, each solve starting from the pressure ratios
+    of the previous one.
     """
 
-    def __init__(self, grid_data):
+    def __init__(self, grid_data, cycle=None):
         super(PodThrustAndDrag, self).__init__(grid_data, time_units='s')
 
         self.deriv_options['type'] = 'fd'
         nn = grid_data['num_nodes']
 
+        self.cycle = cycle
+        if cycle is not None:
+            self.PR_guess = cycle.PR_des*np.ones(nn)
+
         self.add_param('Cd',
                        val=.2*np.ones(nn),
                        desc='Drag Coefficient')
@@ -89,12 +104,25 @@ class PodThrustAndDrag(EOMComp):
                         units='N',
                         desc='Thrust Force')
 
+        if cycle is not None:
+            self.add_output('comp_power',
+                            val=0.0*np.ones(nn),
+                            units='W',
+                            desc='Compressor shaft power')
+
     def solve_nonlinear(self, params, unknowns, resids):
         #  dCalculate air density and drag force
         rho = params['p_tube']/(params['R']*params['T_ambient'])
         unknowns['F_drag'][:] = (.5*rho*(params['v']**2)*params['S']) + params['D_magnetic']
-        unknowns['F_thrust'][:] = 30000.0
-        # TODO: thrust value as determined by cycle analysis
+
+        if self.cycle is None:
+            unknowns['F_thrust'][:] = 30000.0
+        else:
+            op = self.cycle.evaluate(params['v'], params['p_tube'], params['T_ambient'],
+                                     PR_guess=self.PR_guess)
+            self.PR_guess = np.where(op['converged'], op['PR'], self.PR_guess)
+            unknowns['F_thrust'][:] = op['F_net']
+            unknowns['comp_power'][:] = op['power']
 
 if __name__ == '__main__':
 
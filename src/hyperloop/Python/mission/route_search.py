@@ -0,0 +1,305 @@
+"""
+Terrain aware search for the route alignment over the USGS elevation grid.
+
+Every cell of the grid gets a cost per km of track, computed once for the whole grid:
+
+- The track follows the terrain smoothed over smoothing_km, so it runs on pylons
+  over valleys and in tunnels under ridges.
+- Where the track is above the ground, the elevated tube costs the tube material
+  plus pylons of the local height. That cost is linear in the height and comes from
+  two runs of TubeAndPylon.
+- Where the ground is above the track, or where the pylons would cost more, the
+  track is tunnelled at the per-km cost of the TunnelCost regression.
+
+The search runs Dijkstra (scipy.sparse.csgraph) on a graph of (cell, heading)
+nodes with 8 headings. Steps are charged for the cell costs and the grade of the
+track above max_grade, and turns are charged turn_cost per 45 degree step squared.
+The graph is built from arrays in one go and stored as a sparse matrix.
+
+The grid is first searched coarsened by a factor coarsen. The full resolution search
+then only covers a corridor of cells around the coarse route, so grids much larger
+than the 480 x 480 USGS data stay small graphs.
+"""
+from __future__ import print_function
+import os
+
+import numpy as np
+from scipy import ndimage
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import dijkstra
+
+from hyperloop.Python.tube.tunnel_cost import tunnel_cost
+
+# row and column steps of the 8 headings, 45 degrees apart
+_DI = np.array([-1, -1, 0, 1, 1, 1, 0, -1])
+_DJ = np.array([0, 1, 1, 1, 0, -1, -1, -1])
+
+
+def load_usgs():
+    """
+    Latitudes (deg, rows), longitudes (deg, columns) and elevations (m) of the USGS grid.
+    """
+    data = np.load(os.path.join(os.path.dirname(os.path.realpath(__file__)), 'usgs_data.npz'))
+    return data['Latitude'], data['Longitude'], data['Elevation']
+
+
+def pylon_cost(**params):
+    """
+    Cost per km of the elevated tube as c0 + c1*h for pylons of height h (m), from
+    TubeAndPylon with the given params. The cost is linear in h, so two runs give it.
+    """
+    from openmdao.api import Group, Problem
+    from hyperloop.Python.tube.tube_and_pylon import TubeAndPylon
+
+    prob = Problem(root=Group())
+    prob.root.add('comp', TubeAndPylon())
+    prob.setup(check=False, out_stream=open(os.devnull, 'w'))
+    for name, val in params.items():
+        prob['comp.' + name] = val
+
+    cost = []
+    for h in (0.0, 1.0):
+        prob['comp.h'] = h
+        prob.run()
+        cost.append(float(prob['comp.total_material_cost']) * 1000.0)
+    return cost[0], cost[1] - cost[0]
+
+
+def cell_costs(elevation, cell_km=1.0, smoothing_km=10.0, h_min=5.0, pylon=None,
+               tunnel_per_km=None, tunnel_diameter=2.23, tunnel_length=100.0):
+    """
+    Track elevation and cost per km of every cell.
+
+    Parameters
+    ----------
+    elevation : ndarray
+        Terrain elevation (m)
+    cell_km : float
+        Typical cell size (km), to convert smoothing_km to cells
+    smoothing_km : float
+        Length over which the track smooths the terrain (km)
+    h_min : float
+        Smallest pylon height (m)
+    pylon : tuple
+        Cost per km of the elevated tube and its increase per m of pylon height (USD/km,
+        USD/km/m). Default is pylon_cost of the default TubeAndPylon
+    tunnel_per_km : float
+        Cost per km of tunnel (USD/km). Default is the TunnelCost regression for a tunnel
+        of tunnel_diameter (m) and tunnel_length (km)
+
+    Returns
+    -------
+    dict
+        z_track (m), h (pylon height, m), tunnel (bool) and cost (USD/km) per cell
+    """
+    if pylon is None:
+        pylon = pylon_cost()
+    if tunnel_per_km is None:
+        tunnel_per_km = tunnel_cost(tunnel_length, tunnel_diameter) / tunnel_length
+
+    size = max(int(round(smoothing_km / cell_km)), 1)
+    z_track = ndimage.uniform_filter(np.asarray(elevation, dtype=float), size=size, mode='nearest')
+    h = z_track - elevation
+
+    elevated = pylon[0] + pylon[1] * np.maximum(h, h_min)
+    tunnel = (h < 0.0) | (elevated > tunnel_per_km)
+    return {'z_track': z_track,
+            'h': np.where(tunnel, 0.0, np.maximum(h, h_min)),
+            'tunnel': tunnel,
+            'cost': np.where(tunnel, tunnel_per_km, elevated)}
+
+
+def _cell_size(lat, lon, Re=6378.137):
+    """
+    North-south size (km) of the cells and east-west size (km) of each row.
+    """
+    dy = Re * np.radians(abs(lat[1] - lat[0]))
+    dx = Re * np.radians(abs(lon[1] - lon[0])) * np.cos(np.radians(lat))
+    return dy, dx
+
+
+def search_grid(cost, z_track, dy, dx, start, end, mask=None, turn_cost=1.0e6, max_turn=2,
+                max_grade=.06, grade_cost=1.0e7):
+    """
+    Cheapest route between two cells of a grid.
+
+    Parameters
+    ----------
+    cost : ndarray
+        Cost per km of every cell (USD/km)
+    z_track : ndarray
+        Track elevation of every cell (m)
+    dy : float
+        Row spacing (km)
+    dx : ndarray
+        Column spacing of every row (km)
+    start, end : tuple
+        (row, column) of the ends of the route
+    mask : ndarray
+        Cells the route may use. Default is every cell
+    turn_cost : float
+        Cost of a turn of n 45 degree steps is turn_cost*n**2 (USD)
+    max_turn : int
+        Largest turn between two steps, in 45 degree steps
+    max_grade : float
+        Grade of the track above which steps are penalized
+    grade_cost : float
+        Penalty per km of a step at twice max_grade (USD/km), quadratic in the excess grade
+
+    Returns
+    -------
+    dict
+        rows and cols of the route cells, cost (USD) and length (km)
+    """
+    ni, nj = cost.shape
+    if mask is None:
+        mask = np.ones(cost.shape, dtype=bool)
+    mask = mask.copy()
+    mask[start] = mask[end] = True
+
+    cells = np.flatnonzero(mask)
+    index = np.full(ni * nj, -1)
+    index[cells] = np.arange(len(cells))
+    ia, ja = cells // nj, cells % nj
+    flat_cost = cost.ravel()
+    flat_z = z_track.ravel()
+
+    rows, cols, weights = [], [], []
+    for e in range(8):
+        ib, jb = ia + _DI[e], ja + _DJ[e]
+        ok = (ib >= 0) & (ib < ni) & (jb >= 0) & (jb < nj)
+        a, ib, jb = cells[ok], ib[ok], jb[ok]
+        b = ib * nj + jb
+        ok = index[b] >= 0
+        a, b, ib = a[ok], b[ok], ib[ok]
+
+        length = np.hypot(_DI[e] * dy, _DJ[e] * .5 * (dx[a // nj] + dx[ib]))
+        grade = np.abs(flat_z[b] - flat_z[a]) / (1000.0 * length)
+        excess = np.maximum(grade / max_grade - 1.0, 0.0)
+        step = length * (.5 * (flat_cost[a] + flat_cost[b]) + grade_cost * excess**2)
+
+        for d in range(8):
+            turn = min(abs(e - d), 8 - abs(e - d))
+            if turn > max_turn:
+                continue
+            rows.append(index[a] * 8 + d)
+            cols.append(index[b] * 8 + e)
+            weights.append(step + turn_cost * turn**2)
+
+    # the route may leave the start in any heading, so an extra source node n links to
+    # the 8 start headings at no cost
+    n = 8 * len(cells)
+    s = index[start[0] * nj + start[1]]
+    t = index[end[0] * nj + end[1]]
+    rows.append(np.full(8, n))
+    cols.append(8 * s + np.arange(8))
+    weights.append(np.zeros(8))
+    graph = coo_matrix((np.concatenate(weights), (np.concatenate(rows), np.concatenate(cols))),
+                       shape=(n + 1, n + 1)).tocsr()
+    dist, pred = dijkstra(graph, indices=n, return_predecessors=True)
+
+    node = 8 * t + np.argmin(dist[8 * t:8 * t + 8])
+    total = dist[node]
+    if not np.isfinite(total):
+        raise ValueError('No route between %s and %s' % (start, end))
+    path = [node]
+    while pred[path[-1]] != n:
+        path.append(pred[path[-1]])
+    path = cells[np.array(path[::-1]) // 8]
+
+    i, j = path // nj, path % nj
+    length = np.sum(np.hypot(np.diff(i) * dy, np.diff(j) * .5 * (dx[i[1:]] + dx[i[:-1]])))
+    return {'rows': i, 'cols': j, 'cost': total, 'length': length}
+
+
+def route_search(start, end, lat=None, lon=None, elevation=None, coarsen=4, corridor=6, costs=None, **options):
+    """
+    Cheapest route alignment between two points of an elevation grid.
+
+    Parameters
+    ----------
+    start, end : tuple
+        (latitude, longitude) of the ends of the route (deg)
+    lat, lon, elevation : ndarray
+        Grid latitudes and longitudes (deg) and elevations (m, latitude x longitude).
+        Default is the USGS grid of SF to LA
+    coarsen : int
+        Coarsening factor of the first search. 1 searches the full grid directly
+    corridor : int
+        Half width of the full resolution search around the coarse route, in coarse cells
+    costs : dict
+        Cell costs from cell_costs. Default is cell_costs with the cell size of the grid
+    options
+        Options of search_grid
+
+    Returns
+    -------
+    dict
+        lat, lon and elevation of the route cells, z_track, h (pylon height) and tunnel
+        along the route, cost (USD), length (km) and tunnel_length (km)
+    """
+    if elevation is None:
+        lat, lon, elevation = load_usgs()
+    dy, dx = _cell_size(lat, lon)
+    if costs is None:
+        costs = cell_costs(elevation, cell_km=dy)
+    cost, z_track = costs['cost'], costs['z_track']
+
+    ni, nj = cost.shape
+    ends = [(int(np.argmin(np.abs(lat - p[0]))), int(np.argmin(np.abs(lon - p[1])))) for p in (start, end)]
+
+    mask = None
+    if coarsen > 1:
+        # blocks of coarsen x coarsen cells, with the edges of the grid folded into the last ones
+        ci = np.minimum(np.arange(ni) // coarsen, max(ni // coarsen - 1, 0))
+        cj = np.minimum(np.arange(nj) // coarsen, max(nj // coarsen - 1, 0))
+        shape = (ci[-1] + 1, cj[-1] + 1)
+        label = (ci[:, np.newaxis] * shape[1] + cj).ravel()
+
+        # the cheapest cell of a block, so that narrow passes stay open on the coarse grid
+        block_cost = np.full(shape[0] * shape[1], np.inf)
+        np.minimum.at(block_cost, label, cost.ravel())
+        block_z = np.bincount(label, weights=z_track.ravel()) / np.bincount(label)
+
+        coarse_dx = np.bincount(ci, weights=dx) / np.bincount(ci) * coarsen
+        coarse = search_grid(block_cost.reshape(shape), block_z.reshape(shape), dy * coarsen, coarse_dx,
+                             (ci[ends[0][0]], cj[ends[0][1]]), (ci[ends[1][0]], cj[ends[1][1]]), **options)
+
+        band = np.zeros(shape, dtype=bool)
+        band[coarse['rows'], coarse['cols']] = True
+        band = ndimage.binary_dilation(band, structure=np.ones((3, 3), dtype=bool), iterations=corridor)
+        mask = band[ci][:, cj]
+
+    res = search_grid(cost, z_track, dy, dx, ends[0], ends[1], mask=mask, **options)
+    i, j = res['rows'], res['cols']
+    steps = np.hypot(np.diff(i) * dy, np.diff(j) * .5 * (dx[i[1:]] + dx[i[:-1]]))
+    tunnel = costs['tunnel'][i, j]
+    return {'lat': lat[i],
+            'lon': lon[j],
+            'elevation': elevation[i, j],
+            'z_track': z_track[i, j],
+            'h': costs['h'][i, j],
+            'tunnel': tunnel,
+            'cost': res['cost'],
+            'length': res['length'],
+            'tunnel_length': np.sum(steps * .5 * (tunnel[1:] + tunnel[:-1]))}
+
+
+if __name__ == '__main__':
+    import time
+
+    lat, lon, elevation = load_usgs()
+    dy, dx = _cell_size(lat, lon)
+
+    t0 = time.time()
+    costs = cell_costs(elevation, cell_km=dy)
+    t1 = time.time()
+    res = route_search((37.77, -121.9), (34.1, -118.3), lat, lon, elevation, costs=costs)
+    t2 = time.time()
+
+    print('cell costs of %d x %d grid in %f s' % (elevation.shape + (t1 - t0,)))
+    print('route search in %f s' % (t2 - t1))
+    print('route length                       %f km' % res['length'])
+    print('route cost                         %f BUSD' % (res['cost'] / 1.0e9))
+    print('tunnel length                      %f km' % res['tunnel_length'])
+    print('tallest pylon                      %f m' % np.max(res['h']))
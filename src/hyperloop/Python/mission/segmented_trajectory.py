@@ -0,0 +1,328 @@
+"""
+Minimum time trajectory of a long route, solved as overlapping segments.
+
+A single CollocationPhase over a 600 km route needs thousands of nodes, and the dense
+linear algebra of SLSQP grows with the cube of that. Here the route is split at the
+booster stations into segments, each extended by an overlap into its neighbours, and
+every segment is solved on its own with its end speeds fixed. The segments of a sweep
+are independent, so solve can also hand them to a pool of worker processes.
+
+The end speeds of a segment lie inside its neighbours, and after every sweep they are
+updated to the speeds the neighbours found there (overlapping Schwarz iteration). The
+sweeps stop when no end speed changes by more than tol. The trajectory is then
+stitched from the segments without their overlaps.
+
+A segment solver is a picklable callable solver(segment) of a segment dict with start
+and end (m along the route) and v_start and v_end (m/s), returning s (m along the
+route), v (m/s) and t (s from the start of the segment) along it:
+
+- SpeedProfileSegments solves it exactly with the forward-backward speed profile
+- PointerSegments solves it as a pointer CollocationPhase of MagnePlaneRHS. pointer
+  is only imported in the workers, when a segment is solved
+"""
+from __future__ import print_function
+from multiprocessing import Pool
+
+import numpy as np
+
+from hyperloop.Python.mission.speed_profile import speed_profile, collocation_guess, seed_phase
+
+
+def split_route(length, stations, overlap):
+    """
+    Segments of a route of length (m) split at the stations (m along the route), each
+    extended by overlap (m) on both sides and clipped to the route.
+
+    Returns
+    -------
+    list
+        dicts with core_start and core_end, the part of the route the segment owns, and
+        start and end, the part it is solved over
+    """
+    if overlap <= 0.0:
+        raise ValueError('Segments must overlap to exchange their end speeds')
+    cuts = np.unique(np.concatenate(([0.0, length], np.asarray(stations, dtype=float))))
+    cuts = cuts[(cuts >= 0.0) & (cuts <= length)]
+    return [{'core_start': a,
+             'core_end': b,
+             'start': max(a - overlap, 0.0),
+             'end': min(b + overlap, length)} for a, b in zip(cuts[:-1], cuts[1:])]
+
+
+class SpeedProfileSegments(object):
+    """
+    Segments solved by speed_profile on a slice of an alignment.
+
+    Parameters
+    ----------
+    geometry : dict
+        s, curvature, vertical_curvature and grade of the alignment, see alignment_geometry
+    options
+        Options of speed_profile, e.g. v_max or a_boost
+    """
+
+    def __init__(self, geometry, **options):
+        self.geometry = geometry
+        self.options = options
+
+    def __call__(self, segment):
+        s = self.geometry['s']
+        i0 = np.searchsorted(s, segment['start'])
+        i1 = np.searchsorted(s, segment['end'], side='right')
+        res = speed_profile(s[i0:i1], self.geometry['curvature'][i0:i1], self.geometry['vertical_curvature'][i0:i1],
+                            self.geometry['grade'][i0:i1 - 1], v0=segment['v_start'], vf=segment['v_end'],
+                            **self.options)
+        return {'s': s[i0:i1], 'v': res['v'], 't': res['t']}
+
+
+class PointerSegments(object):
+    """
+    Segments solved as a pointer CollocationPhase of MagnePlaneRHS, minimizing the
+    time of the segment.
+
+    The pitch theta and heading psi of the phase are dynamic controls taken from the
+    grade and heading of the segment's slice of the alignment, at the distance the
+    speed profile guess reaches at every node. The x state runs along the chord of the
+    segment, with psi the heading relative to the chord, and y and z are the lateral
+    and (downward) vertical offsets from it. The phase starts at v_start and ends at
+    the far end of the chord. The thrust of MagnePlaneRHS is fixed, so v_end only
+    seeds the guess.
+
+    Parameters
+    ----------
+    geometry : dict
+        s, grade and heading of the alignment, see alignment_geometry
+    num_seg, seg_ncn : int
+        Number of collocation segments and nodes per segment of every phase
+    static_controls : dict
+        Values of the static controls (mass, g, Cd, S, p_tube, T_ambient, R,
+        D_magnetic), in the units of test_straight_track
+    v_max, a_boost, a_brake : float
+        Speed profile used for the initial guess of every phase
+    """
+
+    def __init__(self, geometry, num_seg=10, seg_ncn=2, static_controls=None, v_max=335.0, a_boost=9.0,
+                 a_brake=9.0, maxiter=500):
+        self.geometry = geometry
+        self.num_seg = num_seg
+        self.seg_ncn = seg_ncn
+        self.static_controls = {'mass': (3100.0, 'kg'),
+                                'g': (9.80665, 'm/s/s'),
+                                'Cd': (.2, 'unitless'),
+                                'S': (1.4, 'm**2'),
+                                'p_tube': (850.0, 'Pa'),
+                                'T_ambient': (298.0, 'K'),
+                                'R': (287.0, 'J/(kg*K)'),
+                                'D_magnetic': (150.0, 'N')}
+        for name, val in (static_controls or {}).items():
+            self.static_controls[name] = (val, self.static_controls[name][1])
+        self.guess = {'v_max': v_max, 'a_boost': a_boost, 'a_brake': a_brake}
+        self.maxiter = maxiter
+
+    def _slice(self, segment):
+        """
+        Points of the segment's slice of the alignment: s, their east, north and up
+        coordinates from the start of the slice, and the grade and heading (unwrapped)
+        of the segments between them.
+        """
+        s = self.geometry['s']
+        i0 = np.searchsorted(s, segment['start'])
+        i1 = np.searchsorted(s, segment['end'], side='right')
+        grade = self.geometry['grade'][i0:i1 - 1]
+        heading = np.unwrap(self.geometry['heading'][i0:i1 - 1])
+        run = np.diff(s[i0:i1]) / np.sqrt(1.0 + grade**2)
+        east, north, up = [np.concatenate(([0.0], np.cumsum(run * d)))
+                           for d in (np.cos(heading), np.sin(heading), grade)]
+        return s[i0:i1], east, north, up, grade, heading
+
+    def __call__(self, segment):
+        from openmdao.api import ScipyOptimizer
+        from pointer.components import Problem, Trajectory, CollocationPhase
+        from hyperloop.Python.mission.rhs import MagnePlaneRHS
+
+        s, east, north, up, grade, heading = self._slice(segment)
+        chord = np.arctan2(north[-1], east[-1])
+        along = east * np.cos(chord) + north * np.sin(chord)
+
+        prob = Problem()
+        prob.add_traj(Trajectory('traj0'))
+        prob.driver = ScipyOptimizer()
+        prob.driver.options['tol'] = 1.0E-6
+        prob.driver.options['maxiter'] = self.maxiter
+        prob.trajectories['traj0'].add_objective(name='t', phase='phase0', place='end', scaler=1.0)
+
+        phase0 = CollocationPhase(name='phase0', rhs_class=MagnePlaneRHS, num_seg=self.num_seg,
+                                  seg_ncn=self.seg_ncn, rel_lengths='lgl',
+                                  dynamic_controls=[{'name': 'theta', 'units': 'rad'},
+                                                    {'name': 'psi', 'units': 'rad'}],
+                                  static_controls=[{'name': name, 'units': units}
+                                                   for name, (val, units) in self.static_controls.items()])
+        prob.trajectories['traj0'].add_phase(phase0)
+
+        profile = speed_profile(s, grade=grade, v0=segment['v_start'], vf=segment['v_end'], **self.guess)
+        seed_phase(phase0, profile, along,
+                   time={'t0_val': 0, 't0_lower': 0, 't0_upper': 0, 'tp_lower': 0.5,
+                         'tp_upper': 10.0 * profile['travel_time']},
+                   x={'lower': 0, 'upper': along[-1], 'ic_fix': True, 'fc_fix': True, 'defect_scaler': 0.1},
+                   v={'lower': 0, 'upper': np.inf, 'ic_fix': True, 'fc_fix': False, 'defect_scaler': 0.1})
+        for name, offset in (('y', north * np.cos(chord) - east * np.sin(chord)), ('z', -up)):
+            phase0.set_state_options(name, lower=s[0] - s[-1], upper=s[-1] - s[0], ic_val=0, ic_fix=True,
+                                     fc_val=offset[-1], fc_fix=False, defect_scaler=0.1)
+
+        # the slice of the alignment where the guess is at every node
+        s_mid = .5 * (s[1:] + s[:-1])
+        at = collocation_guess(profile, s, phase0.node_space(-1.0, 1.0))['x']
+        phase0.set_dynamic_control_options('theta', val=np.arctan(np.interp(at, s_mid, grade)), opt=False)
+        phase0.set_dynamic_control_options('psi', val=np.interp(at, s_mid, heading) - chord, opt=False)
+        for name, (val, units) in self.static_controls.items():
+            phase0.set_static_control_options(name=name, val=val, opt=False)
+
+        prob.setup(check=False)
+        prob.run()
+
+        return {'s': np.interp(np.array(prob['traj0.phase0.rhs_c.x']), along, s),
+                'v': np.array(prob['traj0.phase0.rhs_c.v']),
+                't': np.array(prob['traj0.phase0.rhs_c.t'])}
+
+
+_worker_solver = None
+
+
+def _init_worker(solver):
+    """
+    Keep the solver in a worker process, so that it is sent once and not with every segment.
+    """
+    global _worker_solver
+    _worker_solver = solver
+
+
+def _solve_segment(segment):
+    """
+    Solve one segment in a worker. A module level function, so that it can be sent to a process pool.
+    """
+    return _worker_solver(segment)
+
+
+class SegmentedTrajectory(object):
+    """
+    Parameters
+    ----------
+    solver : callable
+        Segment solver, e.g. SpeedProfileSegments or PointerSegments
+    length : float
+        Length of the route (m)
+    stations : ndarray
+        Booster stations where the route is split (m along the route)
+    overlap : float
+        Length by which every segment extends into its neighbours (m)
+    v0, vf : float
+        Speed at the start and the end of the route (m/s)
+    v_guess : float
+        Initial guess of the end speeds of the segments inside the route (m/s)
+
+    Attributes
+    ----------
+    segments : list
+        Segments of split_route, with their current end speeds v_start and v_end
+    """
+
+    def __init__(self, solver, length, stations, overlap=5.0e3, v0=0.0, vf=0.0, v_guess=286.86):
+        self.solver = solver
+        self.segments = split_route(length, stations, overlap)
+        for seg in self.segments:
+            seg['v_start'] = v0 if seg['start'] == 0.0 else v_guess
+            seg['v_end'] = vf if seg['end'] == length else v_guess
+
+    def _sweep(self, pool):
+        jobs = [dict(seg) for seg in self.segments]
+        if pool is not None:
+            return pool.map(_solve_segment, jobs)
+        return [self.solver(job) for job in jobs]
+
+    def solve(self, processes=1, tol=1.0e-3, max_iter=50):
+        """
+        Solve the segments until their end speeds agree with their neighbours.
+
+        Parameters
+        ----------
+        processes : int
+            Number of worker processes. 1 solves in this process
+        tol : float
+            Largest change of an end speed of the last sweep (m/s)
+        max_iter : int
+            Most sweeps
+
+        Returns
+        -------
+        dict
+            s (m), v (m/s) and t (s) along the route, travel_time (s), iterations and
+            change (the largest change of an end speed of every sweep, m/s)
+        """
+        pool = Pool(processes, _init_worker, (self.solver,)) if processes > 1 else None
+        change = []
+        try:
+            for it in range(max_iter):
+                results = self._sweep(pool)
+
+                # end speeds from the neighbours' solutions, at the first and last node of the segment
+                delta = 0.0
+                for i, seg in enumerate(self.segments):
+                    ends = results[i]['s'][[0, -1]]
+                    for key, j, at in (('v_start', i - 1, ends[0]), ('v_end', i + 1, ends[1])):
+                        if 0 <= j < len(self.segments):
+                            v = np.interp(at, results[j]['s'], results[j]['v'])
+                            delta = max(delta, abs(v - seg[key]))
+                            seg[key] = v
+                change.append(delta)
+                if delta <= tol:
+                    break
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        return dict(self._stitch(results), iterations=len(change), change=np.array(change))
+
+    def _stitch(self, results):
+        s, v, t = [], [], []
+        t0 = 0.0
+        for seg, res in zip(self.segments, results):
+            a, b = seg['core_start'], seg['core_end']
+            inside = (res['s'] > a) & (res['s'] < b)
+            ta = np.interp(a, res['s'], res['t'])
+            s.append(np.concatenate(([a], res['s'][inside])))
+            v.append(np.concatenate(([np.interp(a, res['s'], res['v'])], res['v'][inside])))
+            t.append(t0 + np.concatenate(([0.0], res['t'][inside] - ta)))
+            t0 += np.interp(b, res['s'], res['t']) - ta
+        last = self.segments[-1]['core_end']
+        s.append([last])
+        v.append([np.interp(last, results[-1]['s'], results[-1]['v'])])
+        t.append([t0])
+        return {'s': np.concatenate(s), 'v': np.concatenate(v), 't': np.concatenate(t), 'travel_time': t0}
+
+
+if __name__ == '__main__':
+    import time
+
+    from hyperloop.Python.mission.speed_profile import alignment_geometry
+
+    # 600 km over a range of 800 m with a bend of 10 km radius, boosters every 50 km
+    n = 600001
+    theta = np.linspace(0.0, 1.0, n)
+    x = 600.0e3 * theta
+    y = 20.0e3 * np.exp(-((x - 300.0e3) / 20.0e3)**2)
+    z = 800.0 * np.sin(np.pi * np.clip((theta - .4) / .3, 0.0, 1.0))**2
+    geometry = alignment_geometry(x, y, z)
+    solver = SpeedProfileSegments(geometry)
+
+    t0 = time.time()
+    whole = speed_profile(geometry['s'], geometry['curvature'], geometry['vertical_curvature'], geometry['grade'])
+    t1 = time.time()
+    traj = SegmentedTrajectory(solver, geometry['s'][-1], np.arange(50.0e3, 600.0e3, 50.0e3))
+    res = traj.solve()
+    t2 = time.time()
+
+    print('single phase travel time           %f min in %f s' % (whole['travel_time'] / 60.0, t1 - t0))
+    print('%d segments travel time            %f min in %f s' % (len(traj.segments), res['travel_time'] / 60.0,
+                                                                 t2 - t1))
+    print('sweeps                             %d' % res['iterations'])
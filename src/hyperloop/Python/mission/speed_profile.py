@@ -0,0 +1,190 @@
+"""
+Fastest speed profile of a pod along a fixed alignment.
+
+The speed at every point of the alignment is limited by the top speed and by the
+comfort limits on lateral (horizontal curvature) and vertical (vertical curvature)
+acceleration. Between points the pod speeds up at most at the booster acceleration,
+less the grade, and slows down at most at the braking deceleration, helped by the
+grade.
+
+The profile is the classic forward-backward pass: the fastest profile accelerating
+from the start, capped by the fastest profile braking into the end. In terms of
+u = v**2 each pass is the recurrence u[i+1] = min(L[i+1], u[i] + c[i]), which unrolls
+to u[i] = C[i] + min(u[0], min over k <= i of L[k] - C[k]) with C the cumulative sum
+of c. Both passes are therefore a cumsum and a np.minimum.accumulate, vectorized and
+O(N) in the number of points.
+
+The profile gives the travel time directly, and its states make an initial guess for
+a pointer CollocationPhase.
+"""
+from __future__ import print_function
+import numpy as np
+
+
+def alignment_geometry(x, y, z=None):
+    """
+    Arc length, curvatures and grade of a polyline alignment.
+
+    Parameters
+    ----------
+    x, y : ndarray
+        Horizontal coordinates of the points (m)
+    z : ndarray
+        Elevation of the points, positive up (m). Default is a level alignment
+
+    Returns
+    -------
+    dict
+        s (arc length at each point, m), curvature (horizontal, 1/m), vertical_curvature
+        (1/m, positive in sags) at each point, and grade (rise over run) and heading
+        (rad from the x axis) of each segment
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    z = np.zeros_like(x) if z is None else np.asarray(z, dtype=float)
+
+    dx, dy, dz = np.diff(x), np.diff(y), np.diff(z)
+    run = np.hypot(dx, dy)
+    ds = np.hypot(run, dz)
+    s = np.concatenate(([0.0], np.cumsum(ds)))
+
+    # turning angles at the inner points over the mean length of the adjacent segments
+    heading = np.arctan2(dy, dx)
+    turn = np.angle(np.exp(1j * np.diff(heading)))
+    pitch = np.arctan2(dz, run)
+    mean_ds = .5 * (ds[1:] + ds[:-1])
+
+    curvature = np.zeros_like(s)
+    vertical_curvature = np.zeros_like(s)
+    curvature[1:-1] = np.abs(turn) / mean_ds
+    vertical_curvature[1:-1] = np.diff(pitch) / mean_ds
+
+    return {'s': s,
+            'curvature': curvature,
+            'vertical_curvature': vertical_curvature,
+            'grade': dz / np.where(run > 0.0, run, 1.0),
+            'heading': heading}
+
+
+def _pass(limit, v0, gain):
+    """
+    Largest u = v**2 with u[0] <= v0**2, u <= limit and u[i+1] - u[i] <= gain[i].
+    """
+    C = np.concatenate(([0.0], np.cumsum(gain)))
+    M = limit - C
+    M[0] = min(limit[0], v0**2)
+    return C + np.minimum.accumulate(M)
+
+
+def speed_profile(s, curvature=0.0, vertical_curvature=0.0, grade=0.0, v_max=286.86, v0=0.0, vf=0.0,
+                  a_lat=.5 * 9.81, a_vert=.2 * 9.81, a_boost=9.81, a_brake=9.81, a_drag=0.0, boost=None,
+                  g=9.81):
+    """
+    Fastest speed profile along an alignment.
+
+    Parameters
+    ----------
+    s : ndarray
+        Arc length of the points (m)
+    curvature, vertical_curvature : ndarray
+        Horizontal and vertical curvature at the points (1/m)
+    grade : ndarray
+        Grade of the segments between the points
+    v_max : float
+        Top speed (m/s)
+    v0, vf : float
+        Speed at the start and the end (m/s)
+    a_lat, a_vert : float
+        Comfort limits of the lateral and vertical acceleration (m/s**2)
+    a_boost, a_brake : float
+        Largest propulsive acceleration and braking deceleration (m/s**2)
+    a_drag : float
+        Deceleration of drag while coasting or boosting (m/s**2)
+    boost : ndarray
+        Segments with propulsion. Default is every segment. The pod coasts elsewhere
+
+    Returns
+    -------
+    dict
+        v (m/s) and t (s) at each point, v_limit (the speed limit at each point),
+        a (mean acceleration of each segment, m/s**2) and travel_time (s)
+    """
+    s = np.asarray(s, dtype=float)
+    ds = np.diff(s)
+    n = len(s)
+    curvature = np.broadcast_to(np.abs(curvature), (n,))
+    vertical_curvature = np.broadcast_to(np.abs(vertical_curvature), (n,))
+    slope = np.sin(np.arctan(np.broadcast_to(grade, (n - 1,))))
+
+    # the speed limit of every point, as v**2
+    limit = np.full(n, v_max**2)
+    limit = np.minimum(limit, a_lat / np.maximum(curvature, 1.0e-300))
+    limit = np.minimum(limit, a_vert / np.maximum(vertical_curvature, 1.0e-300))
+
+    thrust = a_boost if boost is None else np.where(boost, a_boost, 0.0)
+    forward = _pass(limit, v0, 2.0 * ds * (thrust - a_drag - g * slope))
+    backward = _pass(limit[::-1], vf, (2.0 * ds * (a_brake + a_drag + g * slope))[::-1])[::-1]
+
+    u = np.minimum(forward, backward)
+    if np.any(u < 0.0):
+        raise ValueError('The pod stalls %f m along the alignment' % s[np.argmax(u < 0.0)])
+
+    v = np.sqrt(u)
+    v_mean = .5 * (v[1:] + v[:-1])
+    dt = ds / np.where(v_mean > 0.0, v_mean, np.inf)
+    t = np.concatenate(([0.0], np.cumsum(dt)))
+    return {'v': v,
+            't': t,
+            'v_limit': np.sqrt(limit),
+            'a': np.diff(u) / (2.0 * ds),
+            'travel_time': t[-1]}
+
+
+def collocation_guess(profile, s, tau):
+    """
+    States of a speed profile at normalized times tau in [-1, 1] of a phase, an initial
+    guess for a pointer CollocationPhase.
+
+    Returns
+    -------
+    dict
+        tp (duration of the phase, s), and x (distance along the alignment, m) and v
+        (m/s) at tau
+    """
+    t = (np.asarray(tau, dtype=float) + 1.0) * .5 * profile['travel_time']
+    return {'tp': profile['travel_time'],
+            'x': np.interp(t, profile['t'], s),
+            'v': np.interp(t, profile['t'], profile['v'])}
+
+
+def seed_phase(phase, profile, s, **options):
+    """
+    Seed the duration and the end values of the x and v states of a pointer
+    CollocationPhase with a speed profile. Other state options of the phase, e.g.
+    bounds or scalers, are passed per state as dicts in options.
+    """
+    guess = collocation_guess(profile, s, [-1.0, 1.0])
+    phase.set_time_options(tp_val=guess['tp'], **options.get('time', {}))
+    for name in ('x', 'v'):
+        phase.set_state_options(name, ic_val=guess[name][0], fc_val=guess[name][1], **options.get(name, {}))
+
+
+if __name__ == '__main__':
+    import time
+
+    # 600 km winding over a range of 800 m, with curves of 50 km radius
+    n = 100000
+    theta = np.linspace(0.0, 1.0, n)
+    x = 600.0e3 * theta
+    y = 80.0e3 * np.sin(3.0 * np.pi * theta)
+    z = 800.0 * np.sin(np.pi * np.clip((theta - .4) / .3, 0.0, 1.0))**2
+
+    t0 = time.time()
+    geometry = alignment_geometry(x, y, z)
+    res = speed_profile(geometry['s'], geometry['curvature'], geometry['vertical_curvature'], geometry['grade'])
+    t1 = time.time()
+
+    print('%d point profile in %f s' % (n, t1 - t0))
+    print('route length                       %f km' % (geometry['s'][-1] / 1000.0))
+    print('travel time                        %f min' % (res['travel_time'] / 60.0))
+    print('lowest cruise speed                %f m/s' % np.min(res['v'][n // 20:-n // 20]))
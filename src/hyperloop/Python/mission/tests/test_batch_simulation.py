@@ -0,0 +1,50 @@
+import numpy as np
+from scipy.integrate import ode
+
+from hyperloop.Python.mission import batch_simulation
+
+class TestBatchSimulation(object):
+    def test_case1_straight_track(self):
+
+        # the time to 335 m/s of test_straight_track
+        sim = batch_simulation.BatchSimulation(terrain=False)
+        res = sim.simulate([0.0, 0.0, 0.0, 0.0], 100.0, event=lambda X: X[3] - 335.0, rtol=1.0e-9, atol=1.0e-9)
+
+        assert np.isclose(res['t_stop'][0], 35.09879341, atol=1.0e-6)
+        assert np.isclose(res['X'][3, 0], 335.0)
+        assert np.all(np.isnan(res['v'][0, res['t'] > res['t_stop'][0]]))
+        assert np.nanmax(res['v']) <= 335.0
+
+    def test_case2_matches_dopri5(self):
+
+        mass = np.array([3000.0, 3500.0, 4000.0])
+        controls = batch_simulation.control_history([0.0, 20.0, 40.0], theta=np.outer([.05, .1, -.05], [0.0, 1.0, .5]),
+                                                    psi=[0.0, .3, .6])
+        sim = batch_simulation.BatchSimulation(controls, mass=mass)
+        t_eval = np.linspace(0.0, 40.0, 81)
+        res = sim.simulate([0.0, 0.0, 0.0, 10.0], 40.0, t_eval=t_eval, rtol=1.0e-9, atol=1.0e-9)
+
+        assert res['x'].shape == (3, 81) and res['alt'].shape == (3, 81)
+        for m in range(3):
+            def rates(t, X):
+                theta, psi = controls(np.full(3, t), np.tile(X[:, np.newaxis], 3))
+                F_drag = batch_simulation.drag(X[3], 1.4, 850.0, 298.0, 287.0, 150.0)
+                return batch_simulation.eom(X[3], theta[m], psi[m], 9.80665, 30000.0, F_drag, mass[m])
+
+            r = ode(rates).set_integrator('dopri5', rtol=1.0e-11, atol=1.0e-11, max_step=.5, nsteps=100000)
+            r.set_initial_value([0.0, 0.0, 0.0, 10.0], 0.0)
+            ref = np.array([[0.0, 0.0, 0.0, 10.0]] + [r.integrate(t) for t in t_eval[1:]]).T
+            for i, name in enumerate(batch_simulation.STATES):
+                assert np.allclose(res[name][m], ref[i], rtol=1.0e-6, atol=1.0e-4)
+
+        assert np.allclose(res['alt'], -res['z'] - res['elev'])
+        assert np.allclose(res['theta'][:, -1], [.025, .05, -.025])
+
+    def test_case3_end_times(self):
+
+        sim = batch_simulation.BatchSimulation(terrain=False, F_thrust=np.array([10000.0, 20000.0]))
+        res = sim.simulate([0.0, 0.0, 0.0, 0.0], np.array([5.0, 10.0]), t_eval=[0.0, 5.0, 10.0])
+
+        assert np.allclose(res['t_stop'], [5.0, 10.0])
+        assert np.isnan(res['v'][0, 2]) and not np.any(np.isnan(res['v'][1]))
+        assert np.allclose(res['v'][:, 0], 0.0)
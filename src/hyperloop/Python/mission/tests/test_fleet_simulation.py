@@ -0,0 +1,54 @@
+import numpy as np
+from openmdao.api import Group, Problem
+
+from hyperloop.Python.mission import fleet_simulation
+from hyperloop.Python.ticket_cost import TicketCost
+
+def create_problem(component):
+    root = Group()
+    prob = Problem(root)
+    prob.root.add('comp', component)
+    return prob
+
+class TestFleetSimulation(object):
+    def test_case1_sized_fleet(self):
+
+        res = fleet_simulation.simulate_fleet()
+        t_trip = sum(fleet_simulation.trip_profile(600.0e3, 286.86))
+
+        assert res['departures'] == 2 * 480
+        assert res['max_delay'] == 0.0
+        assert np.allclose(res['arrive'] - res['depart'], t_trip)
+        assert np.all(res['dock'] >= res['arrive'])
+
+        # each departure slot ties up a pod for a round trip and two turnarounds
+        cycle = 2.0 * (t_trip + 300.0)
+        assert res['fleet_size'] >= np.floor(cycle / 120.0)
+
+        # no pod flies two trips at once
+        for pod in range(res['fleet_size']):
+            mine = res['pod'] == pod
+            assert np.all(res['depart'][mine][1:] >= res['dock'][mine][:-1] + 300.0)
+
+    def test_case2_fixed_fleet(self):
+
+        sized = fleet_simulation.simulate_fleet()
+        same = fleet_simulation.simulate_fleet(fleet_size=sized['fleet_size'])
+        assert same['max_delay'] == 0.0
+
+        short = fleet_simulation.simulate_fleet(fleet_size=sized['fleet_size'] - 12)
+        assert short['fleet_size'] == sized['fleet_size'] - 12
+        assert short['max_delay'] > 0.0
+        assert short['utilization'] > sized['utilization']
+
+    def test_case3_ticket_cost(self):
+
+        prob = create_problem(fleet_simulation.FleetSimulation())
+        prob.root.add('cost', TicketCost())
+        prob.root.connect('comp.num_pods', 'cost.fleet_size')
+        prob.setup(check=False)
+        prob.run()
+
+        assert np.isclose(prob['comp.num_pods'], 42.0)
+        assert np.isclose(prob['cost.num_pods'], prob['comp.num_pods'])
+        assert prob['comp.max_pods_in_tube'] <= prob['comp.num_pods']
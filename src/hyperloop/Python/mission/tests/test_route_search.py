@@ -0,0 +1,60 @@
+import numpy as np
+from openmdao.api import Group, Problem
+
+from hyperloop.Python.mission import route_search
+from hyperloop.Python.tube.tunnel_cost import TunnelCost, tunnel_cost
+
+def ridge_grid():
+    # a flat 60 x 60 grid with a high ridge across it, open in one pass
+    lat = np.linspace(34.0, 34.5, 60)
+    lon = np.linspace(-119.0, -118.4, 60)
+    elevation = np.zeros((60, 60))
+    elevation[28:32, :] = 2000.0
+    elevation[28:32, 45:48] = 0.0
+    return lat, lon, elevation
+
+class TestRouteSearch(object):
+    def test_case1_component_costs(self):
+
+        prob = Problem(root=Group())
+        prob.root.add('comp', TunnelCost())
+        prob.setup(check=False)
+        prob.run()
+        assert np.isclose(prob['comp.cost'], tunnel_cost(563.0, 2.23))
+
+        c0, c1 = route_search.pylon_cost()
+        c0_thick, c1_thick = route_search.pylon_cost(t=.1)
+        assert c0 > 0.0 and c1 > 0.0
+        assert c0_thick > c0
+
+    def test_case2_pass(self):
+
+        lat, lon, elevation = ridge_grid()
+        dy, dx = route_search._cell_size(lat, lon)
+        costs = route_search.cell_costs(elevation, cell_km=dy, smoothing_km=5.0)
+        assert np.all(costs['tunnel'][28:32, :43]) and not np.any(costs['tunnel'][:26])
+
+        full = route_search.route_search((34.05, -118.95), (34.45, -118.95), lat, lon, elevation,
+                                         coarsen=1, costs=costs)
+        assert full['tunnel_length'] == 0.0
+        on_ridge = (full['lat'] > lat[27]) & (full['lat'] < lat[32])
+        assert np.all((full['lon'][on_ridge] >= lon[45]) & (full['lon'][on_ridge] <= lon[47]))
+
+        # the coarse to fine search finds the same route
+        fine = route_search.route_search((34.05, -118.95), (34.45, -118.95), lat, lon, elevation,
+                                         coarsen=4, costs=costs)
+        assert np.isclose(fine['cost'], full['cost'])
+        assert np.isclose(fine['length'], full['length'])
+
+    def test_case3_tunnel(self):
+
+        # with expensive pylons, cheap tunnels and no grade limit the route goes straight through the ridge
+        lat, lon, elevation = ridge_grid()
+        dy, dx = route_search._cell_size(lat, lon)
+        costs = route_search.cell_costs(elevation, cell_km=dy, smoothing_km=20.0, tunnel_per_km=1.0e6,
+                                        pylon=(5.0e6, 0.0))
+        res = route_search.route_search((34.05, -118.95), (34.45, -118.95), lat, lon, elevation,
+                                        coarsen=1, costs=costs, grade_cost=0.0)
+        assert np.all(res['tunnel'])
+        assert np.isclose(res['length'], dy * 47.0)
+        assert np.isclose(res['cost'], 1.0e6 * res['length'])
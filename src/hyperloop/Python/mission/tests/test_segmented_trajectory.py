@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from hyperloop.Python.mission import segmented_trajectory
+from hyperloop.Python.mission.speed_profile import alignment_geometry, speed_profile
+
+def bend_geometry():
+    # 100 km with a bend of 2 km radius in the middle
+    x = np.linspace(0.0, 100.0e3, 20001)
+    y = 4.0e3 * np.exp(-((x - 50.0e3) / 4.0e3)**2)
+    return alignment_geometry(x, y)
+
+class TestSegmentedTrajectory(object):
+    def test_case1_split_route(self):
+
+        segments = segmented_trajectory.split_route(100.0e3, [30.0e3, 60.0e3, 150.0e3], 5.0e3)
+        assert [(seg['core_start'], seg['core_end']) for seg in segments] == \
+            [(0.0, 30.0e3), (30.0e3, 60.0e3), (60.0e3, 100.0e3)]
+        assert [(seg['start'], seg['end']) for seg in segments] == \
+            [(0.0, 35.0e3), (25.0e3, 65.0e3), (55.0e3, 100.0e3)]
+
+        with pytest.raises(ValueError):
+            segmented_trajectory.split_route(100.0e3, [50.0e3], 0.0)
+
+    def test_case2_matches_single_phase(self):
+
+        # braking gently for the bend takes several segments, so it needs several sweeps
+        geometry = bend_geometry()
+        options = {'a_lat': 4.9, 'a_brake': 1.0}
+        whole = speed_profile(geometry['s'], geometry['curvature'], geometry['vertical_curvature'], geometry['grade'],
+                              **options)
+
+        solver = segmented_trajectory.SpeedProfileSegments(geometry, **options)
+        traj = segmented_trajectory.SegmentedTrajectory(solver, geometry['s'][-1], np.arange(10.0e3, 100.0e3, 10.0e3),
+                                                         overlap=2.0e3)
+        res = traj.solve()
+
+        assert res['iterations'] > 3 and res['change'][-1] <= 1.0e-3
+        assert np.isclose(res['travel_time'], whole['travel_time'])
+        assert np.allclose(res['v'], np.interp(res['s'], geometry['s'], whole['v']))
+        assert np.allclose(res['t'], np.interp(res['s'], geometry['s'], whole['t']))
+        assert np.all(np.diff(res['s']) > 0.0)
+
+    def test_case3_processes(self):
+
+        geometry = bend_geometry()
+        solver = segmented_trajectory.SpeedProfileSegments(geometry, a_lat=4.9)
+        stations = [25.0e3, 50.0e3, 75.0e3]
+
+        serial = segmented_trajectory.SegmentedTrajectory(solver, geometry['s'][-1], stations).solve()
+        parallel = segmented_trajectory.SegmentedTrajectory(solver, geometry['s'][-1], stations).solve(processes=2)
+        assert np.allclose(serial['v'], parallel['v'])
+        assert serial['iterations'] == parallel['iterations']
+
+    def test_case4_segment_slice(self):
+
+        # the coordinates of a slice, from its grade and heading
+        x = np.linspace(0.0, 20.0e3, 4001)
+        y = 4.0e3 * np.sin(x / 4.0e3)
+        z = 100.0 * np.sin(x / 2.0e3)
+        solver = segmented_trajectory.PointerSegments(alignment_geometry(x, y, z))
+        s, east, north, up, grade, heading = solver._slice({'start': 5.0e3, 'end': 15.0e3})
+
+        i0 = np.searchsorted(alignment_geometry(x, y, z)['s'], 5.0e3)
+        n = len(s)
+        assert np.allclose(east, x[i0:i0 + n] - x[i0])
+        assert np.allclose(north, y[i0:i0 + n] - y[i0])
+        assert np.allclose(up, z[i0:i0 + n] - z[i0])
+
+    def test_case5_pointer_segments(self):
+
+        pytest.importorskip('pointer.components')
+
+        # the same 2 km segment level and climbing at 5 percent
+        x = np.linspace(0.0, 2.0e3, 201)
+        res = []
+        for z in (0.0 * x, .05 * x):
+            geometry = alignment_geometry(x, 0.0 * x, z)
+            segment = {'start': 0.0, 'end': geometry['s'][-1], 'v_start': 100.0, 'v_end': 100.0}
+            res.append(segmented_trajectory.PointerSegments(geometry)(segment))
+            assert np.isclose(res[-1]['s'][0], 0.0) and np.isclose(res[-1]['s'][-1], geometry['s'][-1])
+            assert np.isclose(res[-1]['v'][0], 100.0)
+            assert np.all(np.diff(res[-1]['s']) >= 0.0)
+
+        level, climb = res
+        assert climb['v'][-1] < level['v'][-1]
+        assert climb['t'][-1] > level['t'][-1]
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from hyperloop.Python.mission import speed_profile
+
+def sequential_profile(s, limit, grade, a_boost, a_brake, g=9.81):
+    # the forward-backward pass point by point
+    ds = np.diff(s)
+    slope = np.sin(np.arctan(grade))
+    u = np.minimum(limit**2, 0.0)
+    for i in range(len(ds)):
+        u[i + 1] = min(limit[i + 1]**2, u[i] + 2.0 * ds[i] * (a_boost[i] - g * slope[i]))
+    u[-1] = 0.0
+    for i in range(len(ds) - 1, -1, -1):
+        u[i] = min(u[i], u[i + 1] + 2.0 * ds[i] * (a_brake + g * slope[i]))
+    return np.sqrt(u)
+
+class TestSpeedProfile(object):
+    def test_case1_straight_track(self):
+
+        s = np.linspace(0.0, 600.0e3, 60001)
+        res = speed_profile.speed_profile(s, v_max=300.0, a_boost=3.0, a_brake=5.0)
+
+        assert res['v'][0] == 0.0 and res['v'][-1] == 0.0
+        assert np.isclose(np.max(res['v']), 300.0)
+        assert np.isclose(res['travel_time'], 600.0e3 / 300.0 + 300.0 / 6.0 + 300.0 / 10.0)
+        assert np.allclose(res['a'][:100], 3.0) and np.allclose(res['a'][-100:], -5.0)
+
+    def test_case2_matches_sequential(self):
+
+        rng = np.random.RandomState(0)
+        n = 2000
+        s = np.cumsum(rng.uniform(10.0, 100.0, n)) - 10.0
+        s[0] = 0.0
+        limit = rng.uniform(50.0, 300.0, n)
+        grade = rng.uniform(-.05, .05, n - 1)
+        boost = rng.uniform(size=n - 1) < .3
+
+        res = speed_profile.speed_profile(s, curvature=4.9 / limit**2, grade=grade, v_max=1000.0, a_lat=4.9,
+                                          a_boost=5.0, a_brake=8.0, boost=boost)
+        ref = sequential_profile(s, limit, grade, np.where(boost, 5.0, 0.0), 8.0)
+        assert np.allclose(res['v'], ref)
+
+        # a coasting pod stalls on a long climb
+        with pytest.raises(ValueError):
+            speed_profile.speed_profile(s, grade=.05, v0=50.0, boost=np.arange(n - 1) < 10)
+
+    def test_case3_curved_alignment(self):
+
+        # straight, a quarter circle of 2 km radius, and straight again
+        angle = np.linspace(0.0, np.pi / 2.0, 1001)
+        x = np.concatenate((np.linspace(-20.0e3, 0.0, 1001)[:-1], 2.0e3 * np.sin(angle),
+                            np.full(1000, 2.0e3)))
+        y = np.concatenate((np.zeros(1000), 2.0e3 * (1.0 - np.cos(angle)), 2.0e3 + np.linspace(0.0, 20.0e3, 1001)[1:]))
+        geometry = speed_profile.alignment_geometry(x, y)
+
+        assert np.isclose(geometry['s'][-1], 40.0e3 + np.pi * 1.0e3)
+        assert np.allclose(geometry['curvature'][1100:1900], 1.0 / 2.0e3)
+        assert np.all(geometry['vertical_curvature'] == 0.0)
+
+        res = speed_profile.speed_profile(geometry['s'], geometry['curvature'], a_lat=4.9)
+        assert np.allclose(res['v'][1100:1900], np.sqrt(4.9 * 2.0e3))
+        assert np.max(res['v']) > 200.0
+
+        guess = speed_profile.collocation_guess(res, geometry['s'], [-1.0, 0.0, 1.0])
+        assert guess['tp'] == res['travel_time']
+        assert np.allclose(guess['x'][[0, 2]], [0.0, geometry['s'][-1]])
+        assert np.allclose(guess['v'][[0, 2]], 0.0)
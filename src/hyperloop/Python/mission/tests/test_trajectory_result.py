@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from hyperloop.Python.mission.trajectory_result import TrajectoryResult
+
+def cubic_phase(num_seg=5):
+    # nodes of segments with shared ends, and a cubic in every segment
+    tau = np.array([-1.0, -np.sqrt(.2), np.sqrt(.2), 1.0])
+    ends = np.linspace(0.0, 50.0, num_seg + 1)**1.2
+    t = (ends[:-1, np.newaxis] + .5 * (tau + 1.0) * np.diff(ends)[:, np.newaxis]).ravel()
+    x = 2.0 * t**3 - t**2 + 3.0
+    v = 6.0 * t**2 - 2.0 * t
+    return t, {'x': x, 'v': v}
+
+class TestTrajectoryResult(object):
+    def test_case1_segment_polynomials(self):
+
+        t, values = cubic_phase()
+        res = TrajectoryResult.from_nodes(t, values)
+        assert res.coeffs.shape == (2, 5, 4)
+
+        times = np.linspace(0.0, t[-1], 301).reshape(7, 43)
+        out = res(times)
+        assert out['x'].shape == (7, 43)
+        assert np.allclose(out['x'], 2.0 * times**3 - times**2 + 3.0)
+        assert np.allclose(res(times, ['x'], derivative=1)['x'], 6.0 * times**2 - 2.0 * times)
+        assert np.allclose(res(times, derivative=3)['x'], 12.0)
+        assert np.allclose(res(times, derivative=4)['v'], 0.0)
+
+        outside = res([-1.0, t[-1] + 1.0])
+        assert np.all(np.isnan(outside['x']))
+
+        # equal segments given without repeated nodes
+        keep = np.concatenate(([True], np.diff(t) > 0.0))
+        with pytest.raises(ValueError):
+            TrajectoryResult.from_nodes(t[keep], dict((k, val[keep]) for k, val in values.items()), num_seg=5)
+        same = TrajectoryResult.from_nodes(t, values, num_seg=5)
+        assert np.allclose(same(times)['v'], out['v'])
+
+    def test_case2_linear_nodes(self):
+
+        t = np.cumsum(np.random.RandomState(0).uniform(.1, 1.0, 1000))
+        v = np.sin(t)
+        res = TrajectoryResult.from_nodes(t, {'v': v})
+        times = np.linspace(t[0], t[-1], 5000)
+        assert np.allclose(res(times)['v'], np.interp(times, t, v))
+
+    def test_case3_save_and_load(self, tmpdir):
+
+        t, values = cubic_phase(num_seg=40)
+        res = TrajectoryResult.from_nodes(t, values)
+        times = np.linspace(0.0, t[-1], 1001)
+
+        fname = str(tmpdir.join('trajectory.bin'))
+        res.save(fname)
+        mapped = TrajectoryResult.load(fname)
+        assert isinstance(mapped.coeffs, np.memmap)
+        assert mapped.names == ['v', 'x'] and mapped.tf == res.tf
+        assert np.array_equal(mapped(times)['x'], res(times)['x'])
+        assert np.array_equal(TrajectoryResult.load(fname, mmap=False)(times)['v'], res(times)['v'])
+
+        small = str(tmpdir.join('trajectory32.bin'))
+        res.save(small, dtype='float32')
+        assert tmpdir.join('trajectory32.bin').size() < tmpdir.join('trajectory.bin').size()
+        assert np.allclose(TrajectoryResult.load(small)(times)['x'], res(times)['x'], rtol=1.0e-6)
+
+        tmpdir.join('other.bin').write('not a trajectory')
+        with pytest.raises(ValueError):
+            TrajectoryResult.load(str(tmpdir.join('other.bin')))
+
+    def test_case4_state_rates(self):
+
+        # 2 nodes per segment, as pointer with seg_ncn=2, so only the rates make it a cubic
+        ends = np.linspace(0.0, 50.0, 11)**1.2
+        t = np.repeat(ends, 2)[1:-1]
+        path = 'traj0.phase0.rhs_c.'
+        prob = {path + 't': t,
+                path + 'x': 2.0 * t**3 - t**2 + 3.0,
+                path + 'dXdt:x': 6.0 * t**2 - 2.0 * t,
+                path + 'theta': .01 * t}
+        res = TrajectoryResult.from_problem(prob, names=['x'], controls=['theta'])
+        assert res.coeffs.shape == (2, 10, 4)
+
+        times = np.linspace(0.0, t[-1], 301)
+        assert np.allclose(res(times)['x'], 2.0 * times**3 - times**2 + 3.0)
+        assert np.allclose(res(times, derivative=1)['x'], 6.0 * times**2 - 2.0 * times)
+        assert np.allclose(res(times, derivative=2)['x'], 12.0 * times - 2.0)
+        assert np.allclose(res(times)['theta'], .01 * times)
+        assert np.allclose(res(times, derivative=2)['theta'], 0.0)
+
+        # the rates only reach the states they are given for
+        both = TrajectoryResult.from_nodes(t, {'x': prob[path + 'x'], 'v': prob[path + 'dXdt:x']},
+                                           rates={'x': prob[path + 'dXdt:x']})
+        assert np.allclose(both(times)['x'], res(times)['x'])
+        assert np.allclose(both(times)['v'], np.interp(times, t, prob[path + 'dXdt:x']))
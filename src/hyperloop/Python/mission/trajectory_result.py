@@ -0,0 +1,257 @@
+"""
+Dense output of a solved trajectory, and a compact binary file of it.
+
+Pointer gives the states and controls at the collocation nodes only, e.g.
+prob['traj0.phase0.rhs_c.x']. Within a segment of a phase they are a polynomial in
+time, so TrajectoryResult fits that polynomial once per segment and variable and keeps
+the coefficients. States are Hermite polynomials through their values and rates,
+e.g. prob['traj0.phase0.rhs_c.dXdt:x'], so a segment of 2 nodes is still a cubic. Any array of times is then evaluated in one vectorized Horner pass,
+with derivatives (e.g. acceleration and jerk for passenger comfort) from the same
+coefficients, without simulating the phase again.
+
+Segments are found where the node times repeat, as at the shared ends of the segments
+of a phase, or given as the number of equal segments. Nodes without either, e.g. a
+speed profile, are interpolated linearly between every two nodes.
+
+save writes a small JSON header and the coefficients as raw arrays, so load can map
+the file into memory and only the pages that are evaluated are read from disk.
+"""
+from __future__ import print_function
+import json
+
+import numpy as np
+
+_MAGIC = b'MAGTRAJ1'
+_ALIGN = 64
+
+
+def _segments(t, num_seg=None):
+    """
+    Node indices of every segment, as a list of arrays.
+    """
+    n = len(t)
+    if num_seg is not None:
+        if n % num_seg:
+            raise ValueError('%d nodes do not split into %d equal segments' % (n, num_seg))
+        return list(np.arange(n).reshape(num_seg, -1))
+
+    cuts = np.flatnonzero(np.diff(t) == 0.0) + 1
+    if len(cuts):
+        return np.split(np.arange(n), cuts)
+    return list(np.stack((np.arange(n - 1), np.arange(1, n)), axis=1))
+
+
+class TrajectoryResult(object):
+    """
+    Parameters
+    ----------
+    names : list
+        Names of the variables
+    t_lo, t_hi : ndarray
+        Time of the first and last node of every segment (s)
+    coeffs : ndarray
+        Coefficients (variables, segments, order + 1) of every segment's polynomial in
+        tau, -1 at t_lo and 1 at t_hi, lowest power first
+
+    Attributes
+    ----------
+    t0, tf : float
+        Times of the ends of the trajectory (s). Times outside are NaN
+    """
+
+    def __init__(self, names, t_lo, t_hi, coeffs):
+        self.names = list(names)
+        self.t_lo = t_lo
+        self.t_hi = t_hi
+        self.coeffs = coeffs
+        self.t0 = float(t_lo[0])
+        self.tf = float(t_hi[-1])
+
+    @classmethod
+    def from_nodes(cls, t, values, num_seg=None, rates=None):
+        """
+        Fit the polynomials of every segment through values at node times t.
+
+        Parameters
+        ----------
+        t : ndarray
+            Node times (s), increasing
+        values : dict
+            Arrays of every variable at the nodes
+        num_seg : int
+            Number of equal segments, if the segment ends are not repeated nodes
+        rates : dict
+            Arrays of the time derivatives of some of the variables at the nodes. Those
+            are fitted through their values and rates, with twice the order
+        """
+        t = np.asarray(t, dtype=float).ravel()
+        rates = {} if rates is None else rates
+        names = sorted(values)
+        Y = np.array([np.asarray(values[name], dtype=float).ravel() for name in names])
+        rated = np.array([name in rates for name in names], dtype=bool)
+        R = np.array([np.asarray(rates[name], dtype=float).ravel() for name in names if name in rates])
+
+        segments = _segments(t, num_seg)
+        sizes = np.array([len(seg) for seg in segments])
+        order = (2 if np.any(rated) else 1) * sizes.max() - 1
+        t_lo = np.array([t[seg[0]] for seg in segments])
+        t_hi = np.array([t[seg[-1]] for seg in segments])
+        coeffs = np.zeros((len(names), len(segments), order + 1))
+
+        # segments with the same number of nodes are fitted together
+        for size in np.unique(sizes):
+            which = np.flatnonzero(sizes == size)
+            idx = np.array([segments[k] for k in which])
+            span = (t_hi - t_lo)[which, np.newaxis, np.newaxis]
+            tau = 2.0 * (t[idx] - t_lo[which, np.newaxis]) / span[:, :, 0] - 1.0
+
+            if not np.all(rated):
+                V = tau[:, :, np.newaxis]**np.arange(size)
+                rhs = np.transpose(Y[~rated][:, idx], (1, 2, 0))
+                fit = np.transpose(np.linalg.solve(V, rhs), (2, 0, 1))
+                coeffs[np.ix_(~rated, which, np.arange(size))] = fit
+
+            if np.any(rated):
+                # values and time derivatives at every node
+                power = np.arange(2 * size)
+                V = tau[:, :, np.newaxis]**power
+                D = power * tau[:, :, np.newaxis]**np.maximum(power - 1, 0) * (2.0 / span)
+                rhs = np.transpose(np.concatenate((Y[rated][:, idx], R[:, idx]), axis=2), (1, 2, 0))
+                fit = np.transpose(np.linalg.solve(np.concatenate((V, D), axis=1), rhs), (2, 0, 1))
+                coeffs[np.ix_(rated, which, power)] = fit
+
+        return cls(names, t_lo, t_hi, coeffs)
+
+    @classmethod
+    def from_problem(cls, prob, names=('x', 'y', 'z', 'v'), traj='traj0', phase='phase0', num_seg=None,
+                     controls=()):
+        """
+        Fit the polynomials through the collocation nodes of a phase of a solved pointer
+        Problem. The states in names are fitted with their rates dXdt, the controls
+        through their values only.
+        """
+        path = '%s.%s.rhs_c.' % (traj, phase)
+        values = dict((name, np.array(prob[path + name])) for name in tuple(names) + tuple(controls))
+        rates = dict((name, np.array(prob[path + 'dXdt:' + name])) for name in names)
+        return cls.from_nodes(np.array(prob[path + 't']), values, num_seg, rates)
+
+    def __call__(self, t, names=None, derivative=0):
+        """
+        Variables at times t.
+
+        Parameters
+        ----------
+        t : ndarray
+            Times (s), any shape
+        names : list
+            Variables to evaluate. Default is every variable
+        derivative : int
+            Order of the time derivative
+
+        Returns
+        -------
+        dict
+            Arrays of the shape of t of every variable
+        """
+        t = np.asarray(t, dtype=float)
+        rows = [self.names.index(name) for name in (self.names if names is None else names)]
+
+        t_lo = np.asarray(self.t_lo)
+        t_hi = np.asarray(self.t_hi)
+        flat = t.ravel()
+        seg = np.clip(np.searchsorted(t_lo, flat, side='right') - 1, 0, len(t_lo) - 1)
+        span = t_hi[seg] - t_lo[seg]
+        tau = 2.0 * (flat - t_lo[seg]) / span - 1.0
+
+        # only the coefficients of the segments in use, so a mapped file is read where needed
+        used, seg = np.unique(seg, return_inverse=True)
+        c = np.asarray(self.coeffs)[np.ix_(rows, used)].astype(float)
+
+        # polynomials of the derivatives, in tau
+        for _ in range(derivative):
+            c = c[:, :, 1:] * np.arange(1, c.shape[2])
+        if c.shape[2] == 0:
+            c = np.zeros(c.shape[:2] + (1,))
+
+        val = c[:, seg, -1]
+        for k in range(c.shape[2] - 2, -1, -1):
+            val = val * tau + c[:, seg, k]
+        val = val * (2.0 / span)**derivative
+        val[:, (flat < self.t0) | (flat > self.tf)] = np.nan
+
+        return dict((self.names[row], v.reshape(t.shape)) for row, v in zip(rows, val))
+
+    def save(self, path, dtype='float64'):
+        """
+        Write the trajectory to a binary file, with the coefficients in dtype, e.g.
+        float32 for half the size.
+        """
+        dtype = np.dtype(dtype)
+        header = json.dumps({'names': self.names,
+                             'num_seg': len(self.t_lo),
+                             'order': self.coeffs.shape[2] - 1,
+                             'dtype': dtype.str}).encode('utf-8')
+        size = len(_MAGIC) + 4 + len(header)
+        header += b' ' * (-size % _ALIGN)
+
+        with open(path, 'wb') as f:
+            f.write(_MAGIC)
+            f.write(np.array(len(header), dtype='<u4').tobytes())
+            f.write(header)
+            np.asarray(self.t_lo, dtype='<f8').tofile(f)
+            np.asarray(self.t_hi, dtype='<f8').tofile(f)
+            np.asarray(self.coeffs, dtype=dtype).tofile(f)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Read a trajectory written by save. With mmap, the arrays are mapped read-only
+        from the file instead of read into memory.
+        """
+        with open(path, 'rb') as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError("'%s' is not a trajectory file" % path)
+            size = int(np.frombuffer(f.read(4), dtype='<u4')[0])
+            header = json.loads(f.read(size).decode('utf-8'))
+
+        n = header['num_seg']
+        shapes = [('<f8', (n,)), ('<f8', (n,)), (header['dtype'], (len(header['names']), n, header['order'] + 1))]
+        offset = len(_MAGIC) + 4 + size
+        arrays = []
+        if mmap:
+            for dtype, shape in shapes:
+                arrays.append(np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape))
+                offset += int(np.prod(shape)) * np.dtype(dtype).itemsize
+        else:
+            # the arrays follow the header, so they are read in turn from the open file
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                for dtype, shape in shapes:
+                    arrays.append(np.fromfile(f, dtype=dtype, count=int(np.prod(shape))).reshape(shape))
+        return cls(header['names'], *arrays)
+
+
+if __name__ == '__main__':
+    import os
+    import tempfile
+    import time
+
+    # nodes of 2000 segments of 4 nodes, as a phase with shared segment ends
+    tau = np.array([-1.0, -np.sqrt(.2), np.sqrt(.2), 1.0])
+    ends = np.linspace(0.0, 2000.0, 2001)
+    t = (ends[:-1, np.newaxis] + .5 * (tau + 1.0) * np.diff(ends)[:, np.newaxis]).ravel()
+    res = TrajectoryResult.from_nodes(t, {'x': 100.0 * t + 50.0 * np.sin(t / 50.0), 'v': 100.0 + np.cos(t / 50.0)})
+
+    times = np.linspace(0.0, 2000.0, 1000000)
+    t0 = time.time()
+    out = res(times, derivative=1)
+    t1 = time.time()
+
+    path = os.path.join(tempfile.mkdtemp(), 'trajectory.bin')
+    res.save(path, dtype='float32')
+    played = TrajectoryResult.load(path)
+
+    print('10^6 times in %f s' % (t1 - t0))
+    print('largest error of dx/dt             %e m/s' % np.max(np.abs(out['x'] - 100.0 - np.cos(times / 50.0))))
+    print('file size                          %d bytes' % os.path.getsize(path))
+    print('mapped x at t = 1234.5 s           %f m' % played(1234.5)['x'])
@@ -0,0 +1,258 @@
+"""
+Evaluation of multi-city networks from per-km corridor results.
+
+A network is a graph of cities with candidate links between them. Every link has a
+length and a corridor type, e.g. 'land' or 'water', whose per-km cost and travel time
+come from the physics model. The physics is solved once per corridor type and cached,
+so adding candidate links of a known type never reruns it.
+
+Candidate topologies, subsets of the links, are then evaluated with networkx: the
+fastest route of every origin-destination pair with demand, the flow this puts on
+every link (links shared by several routes are trunk segments) and the build cost.
+Topologies are independent, so they can be evaluated by a pool of processes.
+
+Only the parts of the networkx API common to 1.x and 2.x are used.
+"""
+from __future__ import print_function
+import os
+from multiprocessing import Pool
+
+import numpy as np
+import networkx as nx
+
+
+def _link(a, b):
+    return tuple(sorted((a, b)))
+
+
+class TubeAndPodCorridor(object):
+    """
+    Per-km results of a corridor type from a TubeAndPod problem.
+
+    The attributes of a corridor type are the fraction of it under water,
+    water_fraction, and values of design variables of tools.startup_benchmark.DES_VARS
+    (e.g. tube_pressure, pod_mach or depth). Design variables not given keep their
+    defaults. The problem is set up once and rerun for every corridor type.
+
+    Returns
+    -------
+    dict
+        cost_per_km (USD/km), time_per_km (s/km) and ticket_cost (USD)
+    """
+
+    def __init__(self, thermo='ideal'):
+        from hyperloop.Python.tools.startup_benchmark import DES_VARS, tube_and_pod_problem
+
+        self.prob = tube_and_pod_problem(thermo=thermo)
+        self.prob.setup(check=False, out_stream=open(os.devnull, 'w'))
+        self.defaults = dict((name, val) for name, val, units, target in DES_VARS)
+
+    def __call__(self, attrs):
+        prob = self.prob
+        for name, val in self.defaults.items():
+            prob['des_vars.' + name] = attrs.get(name, val)
+        prob.run()
+
+        water = attrs.get('water_fraction', 0.0)
+        cost_per_km = (1.0 - water) * prob['TubeAndPod.cost.land_cost'] + water * prob['TubeAndPod.cost.water_cost']
+        return {'cost_per_km': float(cost_per_km),
+                'time_per_km': 1000.0 / float(prob['TubeAndPod.cost.vf']),
+                'ticket_cost': float(prob['TubeAndPod.cost.ticket_cost'])}
+
+
+def _evaluate_topology(args):
+    """
+    Routes, link flows and build cost of one topology. A module level function, so
+    that it can be sent to a process pool.
+    """
+    links, demand = args
+
+    g = nx.Graph()
+    cost = 0.0
+    for (a, b), (length, link_cost, time) in links.items():
+        g.add_edge(a, b, time=time)
+        cost += link_cost
+
+    flow = dict((link, 0.0) for link in links)
+    pairs = dict((link, 0) for link in links)
+    routes = {}
+    served = 0.0
+    weighted_time = 0.0
+    origins = sorted(set(a for a, b in demand))
+    for a in origins:
+        if a in g:
+            dist, paths = nx.single_source_dijkstra(g, a, weight='time')
+        else:
+            dist, paths = {}, {}
+        for (orig, b), trips in demand.items():
+            if orig != a:
+                continue
+            if b not in dist:
+                routes[(a, b)] = (np.inf, None)
+                continue
+            path = paths[b]
+            routes[(a, b)] = (dist[b], path)
+            served += trips
+            weighted_time += trips * dist[b]
+            for u, v in zip(path[:-1], path[1:]):
+                flow[_link(u, v)] += trips
+                pairs[_link(u, v)] += 1
+
+    return {'build_cost': cost,
+            'served': served,
+            'mean_time': weighted_time / served if served else np.inf,
+            'routes': routes,
+            'flow': flow,
+            'trunk': sorted(link for link, n in pairs.items() if n > 1)}
+
+
+class NetworkPlanner(object):
+    """
+    Parameters
+    ----------
+    solve : callable
+        solve(attrs) returning cost_per_km (USD/km) and time_per_km (s/km) of a corridor
+        type from its attributes, e.g. a TubeAndPodCorridor or a surrogate
+    corridors : dict
+        Attributes of every corridor type, keyed by type
+    demand : dict
+        Trips per day between cities, keyed by (origin, destination)
+    known : dict
+        Per-km results already solved, keyed by corridor type
+
+    Attributes
+    ----------
+    links : list
+        Candidate links as (city, city) pairs, in the order they were added
+    physics_runs : int
+        Number of calls to solve
+    """
+
+    def __init__(self, solve, corridors, demand, known=None):
+        self.solve = solve
+        self.corridors = dict(corridors)
+        self.demand = dict(demand)
+        self.physics = dict(known or {})
+        self.physics_runs = 0
+
+        self.links = []
+        self._link_data = {}
+
+    def add_corridor(self, corridor, attrs):
+        """
+        Add a corridor type, or change the attributes of one, which drops its cached results.
+        """
+        if self.corridors.get(corridor) != attrs:
+            self.physics.pop(corridor, None)
+        self.corridors[corridor] = attrs
+
+    def add_link(self, a, b, length, corridor):
+        """
+        Add a candidate link of length (km) between two cities.
+        """
+        if corridor not in self.corridors:
+            raise KeyError("Unknown corridor type '%s'" % corridor)
+        link = _link(a, b)
+        if link not in self._link_data:
+            self.links.append(link)
+        self._link_data[link] = (length, corridor)
+
+    def per_km(self, corridor):
+        """
+        Per-km results of a corridor type, solving the physics only the first time.
+        """
+        if corridor not in self.physics:
+            self.physics[corridor] = self.solve(self.corridors[corridor])
+            self.physics_runs += 1
+        return self.physics[corridor]
+
+    def _topology_links(self, topology):
+        if isinstance(topology, np.ndarray) and topology.dtype == bool:
+            topology = [link for link, used in zip(self.links, topology) if used]
+
+        links = {}
+        for a, b in topology:
+            link = _link(a, b)
+            length, corridor = self._link_data[link]
+            res = self.per_km(corridor)
+            links[link] = (length, length * res['cost_per_km'], length * res['time_per_km'])
+        return links
+
+    def evaluate(self, topologies, processes=1):
+        """
+        Evaluate candidate topologies.
+
+        Parameters
+        ----------
+        topologies : list
+            Topologies, each an iterable of (city, city) links or a boolean mask over
+            self.links. A 2-D boolean array is a stack of masks
+        processes : int
+            Number of worker processes. 1 evaluates in this process
+
+        Returns
+        -------
+        dict
+            build_cost (USD), served (trips per day with a route) and mean_time (s,
+            weighted by demand) as arrays over the topologies, and per topology lists
+            of routes ((time, path) per demand pair), flow (trips per day per link) and
+            trunk (links on the routes of more than one demand pair)
+        """
+        # every corridor type is solved here, before the topologies are sent to workers
+        jobs = [(self._topology_links(topology), self.demand) for topology in topologies]
+
+        if processes > 1:
+            pool = Pool(processes)
+            try:
+                results = pool.map(_evaluate_topology, jobs)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            results = [_evaluate_topology(job) for job in jobs]
+
+        out = {}
+        for name in ('build_cost', 'served', 'mean_time'):
+            out[name] = np.array([res[name] for res in results])
+        for name in ('routes', 'flow', 'trunk'):
+            out[name] = [res[name] for res in results]
+        return out
+
+
+if __name__ == '__main__':
+    import itertools
+    import time
+
+    corridors = {'land': {'water_fraction': 0.0},
+                 'coast': {'water_fraction': .5, 'depth': 20.0},
+                 'bay': {'water_fraction': 1.0, 'depth': 30.0}}
+    demand = {('San Francisco', 'Los Angeles'): 20000.0,
+              ('San Francisco', 'Sacramento'): 6000.0,
+              ('Sacramento', 'Los Angeles'): 5000.0,
+              ('Oakland', 'Los Angeles'): 8000.0,
+              ('San Francisco', 'Fresno'): 3000.0,
+              ('Fresno', 'Los Angeles'): 4000.0}
+
+    t0 = time.time()
+    planner = NetworkPlanner(TubeAndPodCorridor(), corridors, demand)
+    planner.add_link('San Francisco', 'Oakland', 15.0, 'bay')
+    planner.add_link('Oakland', 'Sacramento', 130.0, 'land')
+    planner.add_link('Oakland', 'Fresno', 250.0, 'land')
+    planner.add_link('San Francisco', 'Fresno', 300.0, 'coast')
+    planner.add_link('Sacramento', 'Fresno', 270.0, 'land')
+    planner.add_link('Fresno', 'Los Angeles', 350.0, 'land')
+    planner.add_link('San Francisco', 'Los Angeles', 610.0, 'coast')
+
+    # every subset of the candidate links
+    masks = np.array(list(itertools.product([False, True], repeat=len(planner.links))))
+    res = planner.evaluate(masks)
+    t1 = time.time()
+
+    full = res['served'] == sum(demand.values())
+    best = np.argmin(np.where(full, res['build_cost'] + 1.0e6 * res['mean_time'], np.inf))
+    print('%d topologies with %d physics runs in %f s' % (len(masks), planner.physics_runs, t1 - t0))
+    print('topologies serving all demand      %d' % np.sum(full))
+    print('best topology links                %s' % [link for link, used in zip(planner.links, masks[best]) if used])
+    print('build cost                         %f BUSD' % (res['build_cost'][best] / 1.0e9))
+    print('mean travel time                   %f min' % (res['mean_time'][best] / 60.0))
+    print('trunk segments                     %s' % res['trunk'][best])
@@ -0,0 +1,380 @@
+"""
+Integral boundary layer along the pod, marched from the nose to the tail in the
+bypass flow.
+
+The edge Mach number rises from M_pod at the nose to M_duct at the end of the inlet
+(L_nose) along a smooth cosine ramp, and stays at M_duct along the constant section
+of the pod. Edge conditions are isentropic from the free stream. The boundary layer is
+laminar (Thwaites) up to the transition point x_tr and turbulent (Head's entrainment
+method with the Ludwieg-Tillmann skin friction) after it. The momentum integral keeps
+the -M_e**2 compressibility term; the closure relations are the incompressible ones,
+evaluated with edge properties.
+
+Every input broadcasts, and the results have a trailing axis of stations, so a grid of
+design points is solved in one pass. A single design point is marched in plain floats.
+"""
+from __future__ import print_function
+import math
+
+import numpy as np
+
+from openmdao.api import Component, Group, Problem
+
+from hyperloop.Python.tools.compressible_flow import T_Tt
+
+
+def edge_mach(x, L_nose, M_pod, M_duct):
+    """
+    Edge Mach number at distance x (m) from the nose.
+    """
+    s = np.minimum(np.maximum(x / L_nose, 0.0), 1.0)
+    return M_pod + (M_duct - M_pod) * .5 * (1.0 - np.cos(np.pi * s))
+
+
+class _ArrayOps(object):
+    """
+    The numpy functions used by the march. Powers are taken as exp and log, which numpy
+    evaluates much faster.
+    """
+    maximum = staticmethod(np.maximum)
+    minimum = staticmethod(np.minimum)
+    where = staticmethod(np.where)
+    exp = staticmethod(np.exp)
+    log = staticmethod(np.log)
+
+    @staticmethod
+    def power(a, b):
+        return np.exp(b * np.log(a))
+
+
+class _FloatOps(object):
+    """
+    The functions used by the march, for plain floats.
+    """
+    maximum = staticmethod(max)
+    minimum = staticmethod(min)
+    power = staticmethod(pow)
+    exp = staticmethod(math.exp)
+    log = staticmethod(math.log)
+
+    @staticmethod
+    def where(cond, a, b):
+        return a if cond else b
+
+
+def _head_H1(H):
+    """Head's entrainment shape factor H1 = (delta - delta_star)/theta as a function of H"""
+    return np.where(H <= 1.6, 3.3 + .8234 * np.abs(H - 1.1)**-1.287, 3.3 + 1.5501 * np.abs(H - .6778)**-3.064)
+
+
+_H1_START = float(_head_H1(1.4))
+_LT_H = -.678 * math.log(10.0)
+
+
+def _head_H(H1, ops=_ArrayOps):
+    """Inverse of _head_H1, for H1 > 3.3"""
+    return ops.where(H1 >= 5.3, 1.1 + ops.power((H1 - 3.3) / .8234, -1.0 / 1.287),
+                     .6778 + ops.power((H1 - 3.3) / 1.5501, -1.0 / 3.064))
+
+
+def _thwaites_H(lam, ops=_ArrayOps):
+    """Laminar shape factor from the Thwaites pressure gradient parameter"""
+    lam = ops.minimum(ops.maximum(lam, -.0899), .25)
+    return ops.where(lam >= 0.0, 2.61 - 3.75 * lam + 5.24 * lam**2, 2.088 + .0731 / (lam + .14))
+
+
+_N_LAM = 9
+_grids = {}
+_ramps = {}
+
+
+def _stations(num_stations):
+    """
+    Unit laminar stations followed by the unit turbulent stations, whose quadratic
+    spacing puts them where the layer grows fastest. Built once per station count.
+    """
+    if num_stations not in _grids:
+        _grids[num_stations] = (np.linspace(0.0, 1.0, _N_LAM), np.linspace(0.0, 1.0, num_stations)**2)
+    return _grids[num_stations]
+
+
+def _ramp(L, L_nose, x_tr, num_stations, ndim=0):
+    """
+    Laminar and turbulent stations (m), and the fraction of the rise of the edge Mach
+    number from M_pod to M_duct at each of them, along the first axis followed by ndim
+    axes of the geometry. Only depends on the pod geometry.
+    """
+    s_lam, s_turb = [s.reshape((-1,) + (1,) * ndim) for s in _stations(num_stations)]
+    x_lam, x_turb = x_tr * s_lam, x_tr + (L - x_tr) * s_turb
+    geometry = np.broadcast(x_lam[0], x_turb[0]).shape
+    x = np.concatenate((np.broadcast_to(x_lam, x_lam.shape[:1] + geometry),
+                        np.broadcast_to(x_turb, x_turb.shape[:1] + geometry)), axis=0)
+    return x, edge_mach(x, L_nose, 0.0, 1.0)
+
+
+def _float_ramp(L, L_nose, x_tr, num_stations):
+    """
+    _ramp of a single pod as lists of floats, with the turbulent stations and their
+    spacing, kept for each geometry and station count
+    """
+    key = (L, L_nose, x_tr, num_stations)
+    if key not in _ramps:
+        if len(_ramps) >= 1024:
+            _ramps.clear()
+        x, f = _ramp(L, L_nose, x_tr, num_stations)
+        _ramps[key] = (f.tolist(), x[_N_LAM:].tolist(), np.diff(x[_N_LAM:]).tolist())
+    return _ramps[key]
+
+
+def _head_march(th, E, steps, ops):
+    """
+    Head's method from station 1 on, with Heun's method in theta and the entrainment
+    thickness E = theta*H1, which keeps the explicit steps stable where theta is small.
+
+    Only uses arithmetic and the functions of ops, _ArrayOps or _FloatOps, so the same
+    code marches arrays of design points, or plain floats, which is much faster for a
+    single point. Each step is (h, U/nu at both ends, dlnU/dx, dln(rho*U)/dx, M**2 at
+    both ends). Returns theta, E and H at every station.
+    """
+    def rates(th, E, U_nu, dlnU, dlnrhoU, M2):
+        H1 = ops.maximum(E / th, 3.31)
+        H = _head_H(H1, ops)
+        # Ludwieg-Tillmann, .246*10**(-.678*H)*Re_theta**-.268
+        Cf = .246 * ops.exp(_LT_H * H - .268 * ops.log(ops.maximum(U_nu * th, 10.0)))
+        # momentum integral, and d(rho*U*E)/dx = rho*U*F
+        return .5 * Cf - (2.0 + H - M2) * th * dlnU, .0306 * ops.power(H1 - 3.0, -.6169) - E * dlnrhoU, H
+
+    thetas = [th]
+    Es = [E]
+    Hs = []
+    for h, U_nu0, U_nu1, dlnU, dlnrhoU, M2_0, M2_1 in steps:
+        k1_th, k1_E, H = rates(th, E, U_nu0, dlnU, dlnrhoU, M2_0)
+        k2_th, k2_E, _ = rates(th + h * k1_th, E + h * k1_E, U_nu1, dlnU, dlnrhoU, M2_1)
+        th = th + .5 * h * (k1_th + k2_th)
+        E = E + .5 * h * (k1_E + k2_E)
+        thetas.append(th)
+        Es.append(E)
+        Hs.append(H)
+    Hs.append(_head_H(ops.maximum(E / th, 3.31), ops))
+
+    return thetas, Es, Hs
+
+
+def _march_float(L, M_pod, M_duct, p_tube, T_ambient, gam, R, mu, L_nose, x_tr, num_stations):
+    """
+    boundary_layer_march of a single design point in plain floats, as lists over the
+    turbulent stations of x, M_e, theta and H.
+    """
+    x_tr = min(max(x_tr, 0.0), .99 * L)
+    f_all, x, dx = _float_ramp(L, L_nose, x_tr, num_stations)
+
+    # edge conditions, isentropic from the free stream, as in boundary_layer_march
+    k = .5 * (gam - 1.0)
+    Tt = 1.0 + k * M_pod * M_pod
+    ln_a = .5 * math.log(gam * R * T_ambient)
+    ln_rho = math.log(p_tube / (R * T_ambient))
+    M_all = [M_pod + (M_duct - M_pod) * f for f in f_all]
+
+    M_e = M_all[_N_LAM:]
+    lnU = []
+    lnrhoU = []
+    for M in M_e:
+        lnT = math.log(Tt / (1.0 + k * M * M))
+        lnU.append(math.log(M) + ln_a + .5 * lnT)
+        lnrhoU.append(ln_rho + lnT / (gam - 1.0) + lnU[-1])
+    U_nu = [math.exp(v) / mu for v in lnrhoU]
+    dlnU = [(v1 - v0) / h for v0, v1, h in zip(lnU[:-1], lnU[1:], dx)]
+    dlnrhoU = [(v1 - v0) / h for v0, v1, h in zip(lnrhoU[:-1], lnrhoU[1:], dx)]
+    M2 = [M * M for M in M_e]
+
+    # Laminar layer at x_tr, Thwaites
+    theta_tr = 0.0
+    if x_tr > 0.0:
+        U5 = [math.exp(5.0 * (math.log(M) + ln_a) + 2.5 * math.log(Tt / (1.0 + k * M * M))) for M in M_all[:_N_LAM]]
+        I = (sum(U5) - .5 * (U5[0] + U5[-1])) * x_tr / (_N_LAM - 1.0)
+        theta_tr = math.sqrt(.45 * I / (U_nu[0] * U5[-1]))
+    H_tr = _thwaites_H(theta_tr**2 * U_nu[0] * dlnU[0], _FloatOps)
+
+    x_v = (theta_tr / .036 * U_nu[0]**.2)**1.25
+    th = .036 * (x_v + x[1] - x_tr)**.8 * U_nu[1]**-.2
+
+    steps = zip(dx[1:], U_nu[1:-1], U_nu[2:], dlnU[1:], dlnrhoU[1:], M2[1:-1], M2[2:])
+    thetas, Es, Hs = _head_march(th, th * _H1_START, steps, _FloatOps)
+
+    return x, M_e, [theta_tr] + thetas, [H_tr] + Hs
+
+
+def boundary_layer_march(L, M_pod=.8, M_duct=.95, p_tube=850.0, T_ambient=298.0, gam=1.4, R=287.0,
+                         mu=1.846e-5, L_nose=2.5, x_tr=0.0, num_stations=11):
+    """
+    March the integral boundary layer along the pod.
+
+    Parameters
+    ----------
+    L : float or ndarray
+        Pod length (m)
+    M_pod, M_duct : float or ndarray
+        Free stream and bypass Mach numbers (unitless)
+    p_tube, T_ambient : float or ndarray
+        Free stream static pressure (Pa) and temperature (K)
+    gam, R, mu : float or ndarray
+        Ratio of specific heats, gas constant (J/(kg*K)) and dynamic viscosity (kg/(m*s))
+    L_nose : float or ndarray
+        Length over which the edge flow accelerates to M_duct (m)
+    x_tr : float or ndarray
+        Transition location (m), at most .99*L. The default of 0 is fully turbulent
+        from the nose.
+    num_stations : int
+        Number of turbulent stations from x_tr to the tail, clustered toward x_tr
+
+    Returns
+    -------
+    dict
+        x, M_e, theta, H and delta_star at the turbulent stations, each with the broadcast
+        shape of the inputs plus a trailing axis of num_stations. The first station is the
+        laminar state at x_tr. Lengths are in m.
+
+    Notes
+    -----
+    The laminar layer is only needed at x_tr, where Thwaites' integral is evaluated in
+    closed form on its own stations. The turbulent layer starts at the second station from
+    the 1/7 power law flat plate, with its virtual origin placed to match the laminar
+    momentum thickness at x_tr, so every design point marches the same number of steps.
+
+    A single design point is marched in plain floats, with the stations and edge Mach
+    ramp of its geometry kept between calls.
+    """
+    inputs = (L, M_pod, M_duct, p_tube, T_ambient, gam, R, mu, L_nose, x_tr)
+    if all(isinstance(a, float) or np.ndim(a) == 0 for a in inputs):
+        x, M_e, theta, H = np.array(_march_float(*([float(a) for a in inputs] + [num_stations])))
+        return {'x': x, 'M_e': M_e, 'theta': theta, 'H': H, 'delta_star': H * theta}
+
+    inputs = [np.asarray(a, dtype=float) for a in inputs]
+    shape = np.broadcast(*inputs).shape
+    L, M_pod, M_duct, p_tube, T_ambient, gam, R, mu, L_nose, x_tr = inputs
+    x_tr = np.minimum(np.maximum(x_tr, 0.0), .99 * L)
+
+    # edge conditions, isentropic from the free stream, along the first axis. The stations
+    # and ramp only broadcast over the geometry
+    x_all, f_all = _ramp(L, L_nose, x_tr, num_stations, len(shape))
+    ln_a = np.log(np.sqrt(gam * R * T_ambient))
+
+    def edge(f):
+        M = M_pod + (M_duct - M_pod) * f
+        lnT = np.log(T_Tt(M, gam) / T_Tt(M_pod, gam))
+        return M, lnT, np.log(M) + (ln_a + .5 * lnT)
+
+    x = x_all[_N_LAM:]
+    M_e, lnT, lnU = edge(f_all[_N_LAM:])
+    lnrhoU = (np.log(p_tube / (R * T_ambient)) + lnT / (gam - 1.0)) + lnU
+    U_nu = np.exp(lnrhoU) / mu
+    dx = x[1:] - x[:-1]
+    dlnU = (lnU[1:] - lnU[:-1]) / dx
+
+    # Laminar layer at x_tr, Thwaites: theta**2 = .45*nu/U**6 * int(U**5 dx)
+    if np.any(x_tr > 0.0):
+        U5 = np.exp(5.0 * edge(f_all[:_N_LAM])[2])
+        I = np.sum(.5 * (U5[1:] + U5[:-1]), axis=0) * x_tr / (_N_LAM - 1.0)
+        theta_tr = np.sqrt(.45 * I / (U_nu[0] * np.exp(5.0 * lnU[0])))
+    else:
+        theta_tr = np.zeros(U_nu[0].shape)
+    H_tr = _thwaites_H(theta_tr**2 * U_nu[0] * dlnU[0])
+
+    # turbulent flat plate theta = .036*x**.8*(U/nu)**-.2 from the virtual origin x_tr - x_v
+    x_v = (theta_tr / .036 * U_nu[0]**.2)**1.25
+    th = .036 * (x_v + x[1] - x_tr)**.8 * U_nu[1]**-.2
+
+    M2 = M_e * M_e
+    dlnrhoU = (lnrhoU[2:] - lnrhoU[1:-1]) / dx[1:]
+    steps = zip(dx[1:], U_nu[1:-1], U_nu[2:], dlnU[1:], dlnrhoU, M2[1:-1], M2[2:])
+    thetas, Es, Hs = _head_march(th, th * _H1_START, steps, _ArrayOps)
+
+    theta = np.stack([theta_tr] + thetas, axis=-1)
+    H = np.stack([H_tr] + Hs, axis=-1)
+    x = np.moveaxis(np.broadcast_to(x, (num_stations,) + shape), 0, -1)
+    M_e = np.moveaxis(np.broadcast_to(M_e, (num_stations,) + shape), 0, -1)
+
+    return {'x': x, 'M_e': M_e, 'theta': theta, 'H': H, 'delta_star': H * theta}
+
+
+class PodBoundaryLayer(Component):
+    """
+    Params
+    ------
+    L : float
+        Pod length (m)
+    M_pod : float
+        Pod Mach number (unitless)
+    M_duct : float
+        Bypass Mach number (unitless)
+    p_tube : float
+        Tube pressure (Pa)
+    T_ambient : float
+        Tube temperature (K)
+    gam : float
+        Ratio of specific heats (unitless)
+    R : float
+        Ideal gas constant (J/(kg*K))
+    mu : float
+        Dynamic viscosity (kg/(m*s))
+    L_nose : float
+        Length of the inlet, where the bypass flow accelerates (m)
+    x_tr : float
+        Transition location from the nose (m)
+
+    Returns
+    -------
+    delta_star : float
+        Displacement thickness at the tail (m)
+    theta : float
+        Momentum thickness at the tail (m)
+    H : float
+        Shape factor at the tail (unitless)
+
+    Notes
+    -----
+    Wraps boundary_layer_march.
+    """
+
+    def __init__(self, num_stations=11):
+        super(PodBoundaryLayer, self).__init__()
+        self.num_stations = num_stations
+
+        self.add_param('L', val=20.5, units='m', desc='pod length')
+        self.add_param('M_pod', val=.8, desc='pod mach number')
+        self.add_param('M_duct', val=.95, desc='bypass mach number')
+        self.add_param('p_tube', val=850.0, units='Pa', desc='tube pressure')
+        self.add_param('T_ambient', val=298.0, units='K', desc='tube temperature')
+        self.add_param('gam', val=1.4, desc='ratio of specific heats')
+        self.add_param('R', val=287.0, units='J/(kg*K)', desc='ideal gas constant')
+        self.add_param('mu', val=1.846e-5, units='kg/(m*s)', desc='dynamic viscosity')
+        self.add_param('L_nose', val=2.5, units='m', desc='inlet length')
+        self.add_param('x_tr', val=0.0, units='m', desc='transition location')
+
+        self.add_output('delta_star', val=0.0, units='m', desc='displacement thickness at the tail')
+        self.add_output('theta', val=0.0, units='m', desc='momentum thickness at the tail')
+        self.add_output('H', val=0.0, desc='shape factor at the tail')
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        bl = boundary_layer_march(params['L'], params['M_pod'], params['M_duct'], params['p_tube'],
+                                  params['T_ambient'], params['gam'], params['R'], params['mu'],
+                                  params['L_nose'], params['x_tr'], num_stations=self.num_stations)
+
+        unknowns['delta_star'] = bl['delta_star'][..., -1]
+        unknowns['theta'] = bl['theta'][..., -1]
+        unknowns['H'] = bl['H'][..., -1]
+
+
+if __name__ == '__main__':
+    top = Problem()
+    root = top.root = Group()
+    root.add('p', PodBoundaryLayer())
+    top.setup()
+    top.run()
+
+    Re = (850.0 / (287.0 * 298.0)) * .8 * np.sqrt(1.4 * 287.0 * 298.0) * 20.5 / 1.846e-5
+
+    print('\n')
+    print('Displacement thickness at the tail  %f m' % top['p.delta_star'])
+    print('Flat plate correlation              %f m' % (.04775 * 20.5 / Re**.2))
+    print('Shape factor at the tail            %f' % top['p.H'])
@@ -14,12 +14,6 @@ from openmdao.solvers.scipy_gmres import ScipyGMRES
 from openmdao.units.units import convert_units as cu
 from openmdao.api import Problem, LinearGaussSeidel
 
-from pycycle.components import Compressor, Shaft, FlowStart, Inlet, Nozzle, Duct, Splitter, FlightConditions
-from pycycle.species_data import janaf
-from pycycle.connect_flow import connect_flow
-from pycycle.constants import AIR_FUEL_MIX, AIR_MIX
-from pycycle.constants import R_UNIVERSAL_ENG, R_UNIVERSAL_SI
-
 from openmdao.solvers.ln_gauss_seidel import LinearGaussSeidel
 from openmdao.solvers.ln_direct import DirectSolver
 from openmdao.api import SqliteRecorder
@@ -71,15 +65,20 @@ class Cycle(Group):
     ----------
     .. [1] Miceahal Tong Correlation used.
 	.. [2] NASA-Glenn NPSS compressor cycle model.
+
+    Notes
+    -----
+    thermo is passed on to FlowPath, 'janaf' (pycycle chemical equilibrium) or 'ideal'
+    (frozen air).
     """
 
-    def __init__(self):
+    def __init__(self, thermo='janaf'):
         super(Cycle, self).__init__()
 
         self.add('CompressorLen', CompressorLen(), promotes=['comp_len'])
         self.add('CompressorMass', CompressorMass(), promotes=['comp_mass'])
         self.add('FlowPathInputs', FlowPathInputs(), promotes=['pod_mach', 'tube_pressure', 'tube_temp', 'comp_inlet_area'])
-        self.add('FlowPath', FlowPath(), promotes=['comp.trq', 'comp.power', 'nozzle.Fg', 'inlet.F_ram',
+        self.add('FlowPath', FlowPath(thermo=thermo), promotes=['comp.trq', 'comp.power', 'nozzle.Fg', 'inlet.F_ram',
                                                     'nozzle.Fl_O:stat:W', 'comp.Fl_O:stat:area', 'comp.map.PRdes', 
                                                     'nozzle.Ps_exhaust', 'nozzle.Fl_O:tot:T'])
         
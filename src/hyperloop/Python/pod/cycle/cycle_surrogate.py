@@ -0,0 +1,375 @@
+"""
+Tabulated surrogate of the compressor Cycle group. Tables are built offline
+by running the full pycycle FlowPath over a grid of operating points, and
+CycleSurrogate interpolates them with the same promoted variable names as Cycle.
+"""
+from __future__ import print_function
+import numpy as np
+import multiprocessing
+from scipy.interpolate import RegularGridInterpolator
+
+from openmdao.api import Group, Component, IndepVarComp, Problem
+
+from hyperloop.Python.pod.cycle.flow_path_inputs import FlowPathInputs
+
+# Table axes, in order, and the Cycle variables they set
+CYCLE_INPUTS = (('pod_mach', 'Cycle.pod_mach', 'unitless'),
+                ('tube_pressure', 'Cycle.tube_pressure', 'Pa'),
+                ('tube_temp', 'Cycle.tube_temp', 'K'),
+                ('comp_inlet_area', 'Cycle.comp_inlet_area', 'm**2'),
+                ('PRdes', 'Cycle.comp.map.PRdes', 'unitless'))
+
+# Tabulated outputs, the Cycle variables they come from, and their pycycle units
+CYCLE_OUTPUTS = (('power', 'Cycle.comp.power', 'hp'),
+                 ('trq', 'Cycle.comp.trq', 'ft*lbf'),
+                 ('A_duct', 'Cycle.comp.Fl_O:stat:area', 'inch**2'),
+                 ('Fg', 'Cycle.nozzle.Fg', 'lbf'),
+                 ('F_ram', 'Cycle.inlet.F_ram', 'lbf'),
+                 ('Tt_exit', 'Cycle.nozzle.Fl_O:tot:T', 'degR'),
+                 ('W_exit', 'Cycle.nozzle.Fl_O:stat:W', 'lbm/s'),
+                 ('comp_len', 'Cycle.comp_len', 'm'),
+                 ('comp_mass', 'Cycle.comp_mass', 'kg'))
+
+_worker_prob = None
+
+
+def _cycle_problem(Ps_exhaust, settings):
+    # pycycle is only needed to build tables, not to use them
+    from hyperloop.Python.pod.cycle.cycle_group import Cycle
+
+    prob = Problem()
+    root = prob.root = Group()
+    root.add('Cycle', Cycle())
+
+    params = tuple((name, 1.0, {'units': units}) for name, path, units in CYCLE_INPUTS)
+    params += (('Ps_exhaust', Ps_exhaust, {'units': 'psi'}),)
+    root.add('des_vars', IndepVarComp(params))
+
+    for name, path, units in CYCLE_INPUTS:
+        root.connect('des_vars.' + name, path)
+    root.connect('des_vars.Ps_exhaust', 'Cycle.nozzle.Ps_exhaust')
+
+    prob.setup(check=False)
+    for path, val in settings.items():
+        prob[path] = val
+
+    return prob
+
+
+def _init_worker(Ps_exhaust, settings):
+    global _worker_prob
+    _worker_prob = _cycle_problem(Ps_exhaust, settings)
+
+
+def _run_point(point):
+    prob = _worker_prob
+    for (name, path, units), val in zip(CYCLE_INPUTS, point):
+        prob['des_vars.' + name] = val
+    try:
+        prob.run()
+    except Exception:
+        return np.nan * np.ones(len(CYCLE_OUTPUTS))
+    return np.array([prob[path] for name, path, units in CYCLE_OUTPUTS], dtype=float)
+
+
+def run_cycle_points(points, Ps_exhaust=0.05588, settings=None, processes=None):
+    """
+    Runs the full Cycle at every row of points, split over a pool of worker processes.
+    Each worker sets up its Problem once and reuses it for all of its points.
+
+    Parameters
+    ----------
+    points : ndarray
+        Operating points, shape (n, 5), columns ordered as CYCLE_INPUTS
+    Ps_exhaust : float
+        Nozzle exit static pressure (psi)
+    settings : dict
+        Additional Cycle variables to fix, keyed by path in the Problem (e.g. 'Cycle.CompressorMass.comp_eff')
+    processes : int
+        Number of worker processes. Default is the number of CPUs
+
+    Returns
+    -------
+    values : ndarray
+        Outputs ordered as CYCLE_OUTPUTS, shape (n, 9). Points that fail to converge are NaN
+    """
+    settings = settings or {}
+    pool = multiprocessing.Pool(processes, initializer=_init_worker,
+                                initargs=(Ps_exhaust, settings))
+    try:
+        values = pool.map(_run_point, [tuple(p) for p in points], chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+    return np.array(values)
+
+
+def build_cycle_table(fname, pod_mach, tube_pressure, tube_temp, comp_inlet_area, PRdes,
+                      Ps_exhaust=0.05588, settings=None, n_holdout=50, seed=0, processes=None):
+    """
+    Builds a cycle table over the full grid of the given axes and saves it to fname (.npz).
+
+    After the grid is run, n_holdout random points inside the grid bounds are run with the
+    full cycle and compared against the interpolated table. The largest absolute and
+    relative errors of each output are stored with the table.
+
+    Parameters
+    ----------
+    fname : str
+        Output file name
+    pod_mach, tube_pressure, tube_temp, comp_inlet_area, PRdes : ndarray
+        Increasing grid values of each axis, in the units of CYCLE_INPUTS
+
+    Returns
+    -------
+    table : dict
+        Contents of the saved file
+    """
+    axes = [np.asarray(a, dtype=float) for a in (pod_mach, tube_pressure, tube_temp,
+                                                 comp_inlet_area, PRdes)]
+    grid = np.array(np.meshgrid(*axes, indexing='ij')).reshape(len(axes), -1).T
+    shape = tuple(len(a) for a in axes)
+
+    values = run_cycle_points(grid, Ps_exhaust, settings, processes)
+
+    table = {}
+    for (name, path, units), a in zip(CYCLE_INPUTS, axes):
+        table[name] = a
+    for k, (name, path, units) in enumerate(CYCLE_OUTPUTS):
+        table['out_' + name] = values[:, k].reshape(shape)
+    table['Ps_exhaust'] = np.array(Ps_exhaust)
+
+    if n_holdout > 0:
+        rng = np.random.RandomState(seed)
+        lo = np.array([a[0] for a in axes])
+        hi = np.array([a[-1] for a in axes])
+        points = lo + (hi - lo) * rng.rand(n_holdout, len(axes))
+
+        exact = run_cycle_points(points, Ps_exhaust, settings, processes)
+        approx = CycleTable(table).evaluate(points)
+
+        ok = np.all(np.isfinite(exact), axis=1)
+        err = np.abs(approx[ok] - exact[ok])
+        table['max_abs_err'] = np.nanmax(err, axis=0)
+        table['max_rel_err'] = np.nanmax(err / np.maximum(np.abs(exact[ok]), 1.0e-12), axis=0)
+
+    np.savez(fname, **table)
+    return table
+
+
+class CycleTable(object):
+    """
+    Multilinear interpolation of a cycle table built by build_cycle_table.
+
+    Parameters
+    ----------
+    table : str or dict
+        File name of a saved table, or the table itself
+    """
+
+    def __init__(self, table):
+        if not isinstance(table, dict):
+            with np.load(table) as data:
+                table = dict((k, data[k]) for k in data.files)
+
+        self.axes = [table[name] for name, path, units in CYCLE_INPUTS]
+        self.Ps_exhaust = float(table['Ps_exhaust'])
+        self.max_abs_err = table.get('max_abs_err')
+        self.max_rel_err = table.get('max_rel_err')
+
+        values = np.stack([table['out_' + name] for name, path, units in CYCLE_OUTPUTS], axis=-1)
+        self._interp = RegularGridInterpolator(self.axes, values, method='linear',
+                                               bounds_error=True)
+
+    def evaluate(self, points):
+        """
+        Interpolated outputs, ordered as CYCLE_OUTPUTS, at points of shape (..., 5).
+        """
+        return self._interp(np.asarray(points, dtype=float))
+
+    def error_bounds(self):
+        """
+        Holdout errors of each output against the full cycle, keyed by output name.
+        """
+        if self.max_rel_err is None:
+            return {}
+        return dict((name, (self.max_abs_err[k], self.max_rel_err[k]))
+                    for k, (name, path, units) in enumerate(CYCLE_OUTPUTS))
+
+
+class CycleTableComp(Component):
+    """
+    Params
+    ------
+    pod_mach : float
+        Vehicle mach number (unitless)
+    tube_pressure : float
+        Tube total pressure (Pa)
+    tube_temp : float
+        Tube total temperature (K)
+    comp_inlet_area : float
+        Inlet area of compressor. (m**2)
+    PRdes : float
+        Pressure ratio of compressor (unitless)
+
+    Returns
+    -------
+    Interpolated table outputs, named as in CYCLE_OUTPUTS with the units of the full cycle
+    """
+
+    def __init__(self, table):
+        super(CycleTableComp, self).__init__()
+
+        self.table = table
+        self.deriv_options['type'] = 'fd'
+
+        defaults = {'pod_mach': .8, 'tube_pressure': 850., 'tube_temp': 320.,
+                    'comp_inlet_area': 2.3884, 'PRdes': 12.6}
+        for name, path, units in CYCLE_INPUTS:
+            self.add_param(name, val=defaults[name], units=units)
+        for name, path, units in CYCLE_OUTPUTS:
+            self.add_output(name, val=0.0, units=units)
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        point = [params[name] for name, path, units in CYCLE_INPUTS]
+        values = self.table.evaluate(np.array(point, dtype=float).reshape(1, -1))[0]
+        for k, (name, path, units) in enumerate(CYCLE_OUTPUTS):
+            unknowns[name] = values[k]
+
+
+class _Passthrough(Component):
+    """
+    Copies table outputs onto the variable names used by the pycycle elements.
+    """
+
+    def __init__(self, names, fixed_Ps_exhaust=None):
+        super(_Passthrough, self).__init__()
+
+        self.names = names
+        self.fixed_Ps_exhaust = fixed_Ps_exhaust
+        self.deriv_options['type'] = 'fd'
+
+        for name, table_name, units in names:
+            self.add_param('table_' + table_name, val=0.0, units=units)
+            self.add_output(name, val=0.0, units=units)
+        if fixed_Ps_exhaust is not None:
+            self.add_param('Ps_exhaust', val=fixed_Ps_exhaust, units='psi')
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        if self.fixed_Ps_exhaust is not None and not np.isclose(params['Ps_exhaust'],
+                                                                self.fixed_Ps_exhaust):
+            raise ValueError('Cycle table was built for Ps_exhaust = %f psi, got %f psi' %
+                             (self.fixed_Ps_exhaust, params['Ps_exhaust']))
+        for name, table_name, units in self.names:
+            unknowns[name] = params['table_' + table_name]
+
+
+class CycleSurrogate(Group):
+    """
+    Drop in replacement for Cycle that interpolates a table built by build_cycle_table.
+
+    Exposes the same promoted variables as Cycle, so it can be connected the same way.
+    nozzle.Ps_exhaust is fixed at the value the table was built with.
+
+    Params
+    ------
+    pod_mach : float
+        Vehicle mach number (unitless)
+    tube_pressure : float
+        Tube total pressure (Pa)
+    tube_temp : float
+        Tube total temperature (K)
+    comp_inlet_area : float
+        Inlet area of compressor. (m**2)
+    comp.map.PRdes : float
+        Pressure ratio of compressor (unitless)
+    nozzle.Ps_exhaust : float
+        Exit pressure of nozzle (psi)
+
+    Returns
+    -------
+    comp_len : float
+        Length of Compressor (m)
+    comp_mass : float
+        Mass of compressor (kg)
+    comp.trq : float
+        Total torque required by motor (ft*lbf)
+    comp.power : float
+        Total power required by motor (hp)
+    comp.Fl_O:stat:area : float
+        Area of the duct (in**2)
+    nozzle.Fg : float
+        Nozzle thrust (lbf)
+    inlet.F_ram : float
+        Ram drag (lbf)
+    nozzle.Fl_O:tot:T : float
+        Total temperature at nozzle exit (degR)
+    nozzle.Fl_O:stat:W : float
+        Total mass flow rate at nozzle exit (lbm/s)
+    FlowPathInputs.m_dot : float
+        Mass flow rate into the compressor (kg/s), from FlowPathInputs as in Cycle
+    """
+
+    def __init__(self, table):
+        super(CycleSurrogate, self).__init__()
+
+        if not isinstance(table, CycleTable):
+            table = CycleTable(table)
+        self.table = table
+
+        units = dict((name, u) for name, path, u in CYCLE_OUTPUTS)
+
+        comp = Group()
+        comp.add('map', CycleTableComp(table),
+                 promotes=['pod_mach', 'tube_pressure', 'tube_temp', 'comp_inlet_area',
+                           'comp_len', 'comp_mass'])
+        comp.add('perf', _Passthrough((('power', 'power', units['power']),
+                                       ('trq', 'trq', units['trq']),
+                                       ('Fl_O:stat:area', 'A_duct', units['A_duct']))),
+                 promotes=['power', 'trq', 'Fl_O:stat:area'])
+        comp.connect('map.power', 'perf.table_power')
+        comp.connect('map.trq', 'perf.table_trq')
+        comp.connect('map.A_duct', 'perf.table_A_duct')
+
+        inlet = Group()
+        inlet.add('perf', _Passthrough((('F_ram', 'F_ram', units['F_ram']),)),
+                  promotes=['F_ram'])
+
+        nozzle = Group()
+        nozzle.add('perf', _Passthrough((('Fg', 'Fg', units['Fg']),
+                                         ('Fl_O:tot:T', 'Tt_exit', units['Tt_exit']),
+                                         ('Fl_O:stat:W', 'W_exit', units['W_exit'])),
+                                        fixed_Ps_exhaust=table.Ps_exhaust),
+                   promotes=['Fg', 'Fl_O:tot:T', 'Fl_O:stat:W', 'Ps_exhaust'])
+
+        self.add('comp', comp, promotes=['pod_mach', 'tube_pressure', 'tube_temp',
+                                         'comp_inlet_area', 'comp_len', 'comp_mass'])
+        self.add('inlet', inlet)
+        self.add('nozzle', nozzle)
+        self.add('FlowPathInputs', FlowPathInputs(), promotes=['pod_mach', 'tube_pressure', 'tube_temp',
+                                                             'comp_inlet_area'])
+
+        self.connect('comp.map.F_ram', 'inlet.perf.table_F_ram')
+        self.connect('comp.map.Fg', 'nozzle.perf.table_Fg')
+        self.connect('comp.map.Tt_exit', 'nozzle.perf.table_Tt_exit')
+        self.connect('comp.map.W_exit', 'nozzle.perf.table_W_exit')
+
+if __name__ == "__main__":
+    import time
+
+    # Settings of the NPSS comparison case in test_cycle_group
+    settings = {'Cycle.CompressorMass.comp_eff': 91.0,
+                'Cycle.CompressorLen.h_stage': 58.2}
+
+    t0 = time.time()
+    table = build_cycle_table('cycle_table.npz',
+                              pod_mach=np.linspace(.6, 1.0, 5),
+                              tube_pressure=np.linspace(500., 1500., 5),
+                              tube_temp=np.linspace(290., 330., 3),
+                              comp_inlet_area=np.linspace(1.5, 3.0, 4),
+                              PRdes=np.linspace(6., 14., 5),
+                              settings=settings)
+    print('built %d point table in %f s' % (table['out_power'].size, time.time() - t0))
+
+    for name, (abs_err, rel_err) in CycleTable(table).error_bounds().items():
+        print('%-10s max abs err %12.4f  max rel err %8.4f %%' % (name, abs_err, 100. * rel_err))
@@ -6,6 +6,8 @@ import numpy as np
 
 from openmdao.api import Group, Component, IndepVarComp, Problem
 
+from hyperloop.Python.tools.compressible_flow import T_Tt, P_Pt, rho_rhot
+
 class FlowPathInputs(Component):
     """
 	Params
@@ -96,16 +98,16 @@ class FlowPathInputs(Component):
         R = params['R']
         eta = params['eta']
 
-        Tt = tube_temp*(1+((gamma-1)/2)*(pod_mach**2))
-        Pt = tube_pressure*((1+((gamma-1)/2)*(pod_mach**2))**(gamma/(gamma-1.0)))
+        Tt = tube_temp/T_Tt(pod_mach, gamma)
+        Pt = tube_pressure/P_Pt(pod_mach, gamma)
         rho = tube_pressure/(R*tube_temp)
-        rho_t = rho*((1+((gamma-1)/2))**(1/(gamma-1)))
+        rho_t = rho/rho_rhot(1.0, gamma)
 
         p02 = tube_pressure*((1 + eta*((Tt/tube_temp)-1))**(gamma/(gamma-1)))
         rho_2 = rho_t*((p02/Pt)**(1/gamma))
 
-        rho_comp = rho_t/((1+((gamma-1)/2)*(comp_mach**2))**(1/(gamma-1)))
-        T_comp = Tt/(1+((gamma-1)/2)*(comp_mach**2))
+        rho_comp = rho_t*rho_rhot(comp_mach, gamma)
+        T_comp = Tt*T_Tt(comp_mach, gamma)
         m_dot = rho_comp*comp_inlet_area*comp_mach*np.sqrt(gamma*R*T_comp)
 
         unknowns['Pt'] = Pt
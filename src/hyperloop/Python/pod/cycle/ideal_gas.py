@@ -0,0 +1,479 @@
+"""
+Frozen composition ideal gas thermodynamics for air, and flow elements built on it.
+An alternative to the janaf chemical equilibrium thermo of pycycle for flow paths
+that only ever carry unreacted air at a few hundred K. Each flow station is
+solved explicitly from cached h(T) and s(T) tables instead of by a Newton
+solve of the equilibrium composition.
+
+Variable names and units of the elements follow the pycycle elements they replace
+(FlowStart, Inlet, Compressor, Duct, Nozzle), so the two can be swapped in a group.
+"""
+from __future__ import print_function
+import numpy as np
+
+from openmdao.api import Group, Component
+
+from hyperloop.Python.pod.cycle.thermo_tables import shared_tables, table_key
+
+R_UNIVERSAL_SI = 8.3144598  # J/(mol*K)
+
+# NASA 7 coefficient polynomials (GRI-Mech 3.0), cp/R = a0 + a1*T + a2*T**2 + a3*T**3 + a4*T**4
+# rows are (low range, high range), switching at 1000 K
+NASA7 = {
+    'N2': np.array([[3.298677, 1.4082404e-03, -3.963222e-06, 5.641515e-09, -2.444854e-12,
+                     -1.0208999e+03, 3.950372],
+                    [2.92664, 1.4879768e-03, -5.68476e-07, 1.0097038e-10, -6.753351e-15,
+                     -9.227977e+02, 5.980528]]),
+    'O2': np.array([[3.78245636, -2.99673416e-03, 9.84730201e-06, -9.68129509e-09, 3.24372837e-12,
+                     -1.06394356e+03, 3.65767573],
+                    [3.28253784, 1.48308754e-03, -7.57966669e-07, 2.09470555e-10, -2.16717794e-14,
+                     -1.08845772e+03, 5.45323129]]),
+    'Ar': np.array([[2.5, 0.0, 0.0, 0.0, 0.0, -7.45375e+02, 4.366],
+                    [2.5, 0.0, 0.0, 0.0, 0.0, -7.45375e+02, 4.366]]),
+    'CO2': np.array([[2.35677352, 8.98459677e-03, -7.12356269e-06, 2.45919022e-09, -1.43699548e-13,
+                      -4.83719697e+04, 9.90105222],
+                     [3.85746029, 4.41437026e-03, -2.21481404e-06, 5.23490188e-10, -4.72084164e-14,
+                      -4.87591660e+04, 2.27163806]])}
+
+MOLAR_MASS = {'N2': 28.0134e-3, 'O2': 31.9988e-3, 'Ar': 39.948e-3, 'CO2': 44.0095e-3}
+
+# Dry air mole fractions
+AIR_COMPOSITION = (('N2', .78084), ('O2', .209476), ('Ar', .00934), ('CO2', .000314))
+
+P_REF = 101325.0
+
+# pycycle English units
+PSI = 6894.75729317
+DEGR = 5.0 / 9.0
+BTU_LBM = 2326.0
+LBM = .45359237
+FT = .3048
+IN2 = .00064516
+LBF = 4.44822162
+FTLBF = 1.3558179497760001
+HP = 745.7
+RPM = 2.0 * np.pi / 60.0
+
+
+def _a(coeffs, T):
+    T = np.asarray(T, dtype=float)
+    a = np.where((T < 1000.0)[..., np.newaxis], coeffs[0], coeffs[1])
+    return np.moveaxis(a, -1, 0)
+
+
+def _h(coeffs, R, T):
+    a = _a(coeffs, T)
+    return R * T * (a[0] + T * (a[1] / 2.0 + T * (a[2] / 3.0 + T * (a[3] / 4.0 + T * a[4] / 5.0)))) + R * a[5]
+
+
+def _s0(coeffs, R, T):
+    a = _a(coeffs, T)
+    return R * (a[0] * np.log(T) + T * (a[1] + T * (a[2] / 2.0 + T * (a[3] / 3.0 + T * a[4] / 4.0))) + a[6])
+
+
+def _air_tables(composition, T_min, T_max, dT):
+    """
+    Gas constant, mixed NASA coefficients and the h(T) and s0(T) inversion tables of a composition.
+    """
+    x = np.array([frac for name, frac in composition])
+    x = x / np.sum(x)
+    M = np.sum(x * np.array([MOLAR_MASS[name] for name, frac in composition]))
+    R = R_UNIVERSAL_SI / M
+
+    coeffs = np.einsum('i,ijk->jk', x, np.array([NASA7[name] for name, frac in composition]))
+    T_table = np.arange(T_min, T_max + dT, dT)
+    return {'R': R, 'coeffs': coeffs, 'T_table': T_table,
+            'h_table': _h(coeffs, R, T_table), 's0_table': _s0(coeffs, R, T_table)}
+
+
+class FrozenAirThermo(object):
+    """
+    Ideal gas properties of air with a fixed composition.
+
+    cp(T) comes from the NASA polynomials of each species, mixed by mole fraction.
+    h(T) and the standard state entropy s0(T) are tabulated once on a fine temperature
+    grid, so T(h) and T(s0) are a table lookup followed by Newton steps on the
+    polynomials. The tables come from the thermo_tables registry, so every instance
+    with the same composition and grid uses the same read-only arrays.
+
+    Parameters
+    ----------
+    composition : tuple
+        (species, mole fraction) pairs
+    T_min, T_max : float
+        Temperature range of the inversion tables (K)
+    dT : float
+        Spacing of the inversion tables (K)
+    """
+
+    def __init__(self, composition=AIR_COMPOSITION, T_min=150.0, T_max=5000.0, dT=1.0):
+        key = table_key('frozen_air', composition, T_min, T_max, dT)
+        tables = shared_tables(key, lambda: _air_tables(composition, T_min, T_max, dT))
+
+        self.R = float(tables['R'])
+        self.coeffs = tables['coeffs']
+        self.T_table = tables['T_table']
+        self.h_table = tables['h_table']
+        self.s0_table = tables['s0_table']
+
+    def cp(self, T):
+        """Specific heat at constant pressure (J/(kg*K))"""
+        a = _a(self.coeffs, T)
+        return self.R * (a[0] + T * (a[1] + T * (a[2] + T * (a[3] + T * a[4]))))
+
+    def gamma(self, T):
+        """Ratio of specific heats"""
+        cp = self.cp(T)
+        return cp / (cp - self.R)
+
+    def h(self, T):
+        """Specific enthalpy, including heat of formation (J/kg)"""
+        return _h(self.coeffs, self.R, T)
+
+    def s0(self, T):
+        """Specific entropy at the reference pressure P_REF (J/(kg*K))"""
+        return _s0(self.coeffs, self.R, T)
+
+    def T_from_h(self, h, steps=2):
+        """Temperature at a given specific enthalpy (K)"""
+        T = np.interp(h, self.h_table, self.T_table)
+        for _ in range(steps):
+            T = T - (self.h(T) - h) / self.cp(T)
+        return T
+
+    def T_from_s0(self, s0, steps=2):
+        """Temperature at a given standard state entropy (K)"""
+        T = np.interp(s0, self.s0_table, self.T_table)
+        for _ in range(steps):
+            T = T - (self.s0(T) - s0) * T / self.cp(T)
+        return T
+
+    def static_from_MN(self, Pt, Tt, MN, tol=1.0e-12, maxiter=20):
+        """
+        Static temperature, static pressure and velocity of a flow at Mach number MN,
+        from its total pressure (Pa) and temperature (K).
+        """
+        Pt, Tt, MN = np.broadcast_arrays(np.asarray(Pt, dtype=float), np.asarray(Tt, dtype=float),
+                                         np.asarray(MN, dtype=float))
+        ht = self.h(Tt)
+        Ts = Tt / (1.0 + .2 * MN**2)
+        for _ in range(maxiter):
+            gam = self.gamma(Ts)
+            f = ht - self.h(Ts) - .5 * MN**2 * gam * self.R * Ts
+            dT = f / (self.cp(Ts) + .5 * MN**2 * gam * self.R)
+            Ts = Ts + dT
+            if np.all(np.abs(dT) < tol * Tt):
+                break
+        Ps = Pt * np.exp((self.s0(Ts) - self.s0(Tt)) / self.R)
+        V = MN * np.sqrt(self.gamma(Ts) * self.R * Ts)
+        return Ts, Ps, V
+
+    def static_from_Ps(self, Pt, Tt, Ps):
+        """
+        Static temperature and velocity of a flow isentropically expanded from its total
+        conditions to static pressure Ps (Pa).
+        """
+        Ts = self.T_from_s0(self.s0(Tt) + self.R * np.log(Ps / Pt))
+        V = np.sqrt(2.0 * np.maximum(self.h(Tt) - self.h(Ts), 0.0))
+        return Ts, V
+
+def get_air_thermo():
+    """
+    FrozenAirThermo for dry air, on the tables shared by every element of the process.
+    """
+    return FrozenAirThermo()
+
+
+def connect_ideal_flow(group, fl_src, fl_dst):
+    """
+    Connects the flow station of one ideal gas element to the next, like pycycle's connect_flow.
+    """
+    for v in ('tot:P', 'tot:h', 'stat:W', 'stat:V'):
+        group.connect('%s:%s' % (fl_src, v), '%s:%s' % (fl_dst, v))
+
+
+class _IdealElement(Component):
+    """
+    Base class for the ideal gas flow elements. Adds the incoming and outgoing flow stations.
+    """
+
+    def __init__(self, flow_in=True):
+        super(_IdealElement, self).__init__()
+
+        self.thermo = get_air_thermo()
+        self.deriv_options['type'] = 'fd'
+
+        if flow_in:
+            self.add_param('Fl_I:tot:P', val=1.0, units='psi', desc='total pressure')
+            self.add_param('Fl_I:tot:h', val=1.0, units='Btu/lbm', desc='total enthalpy')
+            self.add_param('Fl_I:stat:W', val=1.0, units='lbm/s', desc='mass flow')
+            self.add_param('Fl_I:stat:V', val=0.0, units='ft/s', desc='velocity')
+
+        self.add_output('Fl_O:tot:P', val=1.0, units='psi', desc='total pressure')
+        self.add_output('Fl_O:tot:T', val=500.0, units='degR', desc='total temperature')
+        self.add_output('Fl_O:tot:h', val=1.0, units='Btu/lbm', desc='total enthalpy')
+        self.add_output('Fl_O:stat:P', val=1.0, units='psi', desc='static pressure')
+        self.add_output('Fl_O:stat:T', val=500.0, units='degR', desc='static temperature')
+        self.add_output('Fl_O:stat:V', val=0.0, units='ft/s', desc='velocity')
+        self.add_output('Fl_O:stat:MN', val=0.0, desc='Mach number')
+        self.add_output('Fl_O:stat:area', val=1.0, units='inch**2', desc='flow area')
+        self.add_output('Fl_O:stat:W', val=1.0, units='lbm/s', desc='mass flow')
+        self.add_output('Fl_O:stat:rho', val=1.0, units='lbm/ft**3', desc='static density')
+        self.add_output('Fl_O:stat:gamma', val=1.4, desc='ratio of specific heats')
+
+    def _flow_in(self, params):
+        Pt = params['Fl_I:tot:P'] * PSI
+        ht = params['Fl_I:tot:h'] * BTU_LBM
+        W = params['Fl_I:stat:W'] * LBM
+        return Pt, ht, W
+
+    def _set_flow_out(self, unknowns, Pt, Tt, W, Ts, Ps, V):
+        thermo = self.thermo
+        rho = Ps / (thermo.R * Ts)
+        gam = thermo.gamma(Ts)
+        with np.errstate(divide='ignore'):
+            area = W / (rho * V)
+
+        unknowns['Fl_O:tot:P'] = Pt / PSI
+        unknowns['Fl_O:tot:T'] = Tt / DEGR
+        unknowns['Fl_O:tot:h'] = thermo.h(Tt) / BTU_LBM
+        unknowns['Fl_O:stat:P'] = Ps / PSI
+        unknowns['Fl_O:stat:T'] = Ts / DEGR
+        unknowns['Fl_O:stat:V'] = V / FT
+        unknowns['Fl_O:stat:MN'] = V / np.sqrt(gam * thermo.R * Ts)
+        unknowns['Fl_O:stat:area'] = area / IN2
+        unknowns['Fl_O:stat:W'] = W / LBM
+        unknowns['Fl_O:stat:rho'] = rho / (LBM / FT**3)
+        unknowns['Fl_O:stat:gamma'] = gam
+
+
+class IdealFlowStart(_IdealElement):
+    """
+    Params
+    ------
+    P : float
+        Total pressure (psi)
+    T : float
+        Total temperature (degR)
+    W : float
+        Mass flow (lbm/s)
+    MN_target : float
+        Mach number of the flow (unitless)
+
+    Returns
+    -------
+    Fl_O : flow station
+        Total and static conditions of the flow
+    """
+
+    def __init__(self):
+        super(IdealFlowStart, self).__init__(flow_in=False)
+
+        self.add_param('P', val=1.0, units='psi', desc='total pressure')
+        self.add_param('T', val=500.0, units='degR', desc='total temperature')
+        self.add_param('W', val=1.0, units='lbm/s', desc='mass flow')
+        self.add_param('MN_target', val=.5, desc='Mach number')
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        Pt = params['P'] * PSI
+        Tt = params['T'] * DEGR
+        W = params['W'] * LBM
+
+        Ts, Ps, V = self.thermo.static_from_MN(Pt, Tt, params['MN_target'])
+        self._set_flow_out(unknowns, Pt, Tt, W, Ts, Ps, V)
+
+
+class IdealInlet(_IdealElement):
+    """
+    Params
+    ------
+    Fl_I : flow station
+        Incoming flow, its velocity is the flight velocity
+    ram_recovery : float
+        Total pressure recovery of the inlet (unitless)
+    MN_target : float
+        Exit Mach number (unitless)
+
+    Returns
+    -------
+    Fl_O : flow station
+        Flow at the compressor face
+    F_ram : float
+        Ram drag (lbf)
+    """
+
+    def __init__(self):
+        super(IdealInlet, self).__init__()
+
+        self.add_param('ram_recovery', val=1.0, desc='total pressure recovery')
+        self.add_param('MN_target', val=.5, desc='exit Mach number')
+        self.add_output('F_ram', val=0.0, units='lbf', desc='ram drag')
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        Pt, ht, W = self._flow_in(params)
+        Pt = Pt * params['ram_recovery']
+        Tt = self.thermo.T_from_h(ht)
+
+        Ts, Ps, V = self.thermo.static_from_MN(Pt, Tt, params['MN_target'])
+        self._set_flow_out(unknowns, Pt, Tt, W, Ts, Ps, V)
+        unknowns['F_ram'] = W * params['Fl_I:stat:V'] * FT / LBF
+
+
+class IdealCompressorMap(Component):
+    """
+    Design point map of the compressor, passes the design pressure ratio and efficiency on.
+    """
+
+    def __init__(self):
+        super(IdealCompressorMap, self).__init__()
+
+        self.add_param('PRdes', val=2.0, desc='design pressure ratio')
+        self.add_param('effDes', val=1.0, desc='design adiabatic efficiency')
+        self.add_output('PR', val=2.0, desc='pressure ratio')
+        self.add_output('eff', val=1.0, desc='adiabatic efficiency')
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        unknowns['PR'] = params['PRdes']
+        unknowns['eff'] = params['effDes']
+
+
+class IdealCompressorPerf(_IdealElement):
+    """
+    Params
+    ------
+    Fl_I : flow station
+        Incoming flow
+    PR : float
+        Total pressure ratio (unitless)
+    eff : float
+        Adiabatic efficiency (unitless)
+    MN_target : float
+        Exit Mach number (unitless)
+    Nmech : float
+        Shaft speed (rpm)
+
+    Returns
+    -------
+    Fl_O : flow station
+        Compressor exit flow
+    power : float
+        Shaft power, negative for power absorbed (hp)
+    trq : float
+        Shaft torque (ft*lbf)
+    """
+
+    def __init__(self):
+        super(IdealCompressorPerf, self).__init__()
+
+        self.add_param('PR', val=2.0, desc='pressure ratio')
+        self.add_param('eff', val=1.0, desc='adiabatic efficiency')
+        self.add_param('MN_target', val=.5, desc='exit Mach number')
+        self.add_param('Nmech', val=10000.0, units='rpm', desc='shaft speed')
+        self.add_output('power', val=0.0, units='hp', desc='shaft power')
+        self.add_output('trq', val=0.0, units='ft*lbf', desc='shaft torque')
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        thermo = self.thermo
+        Pt_in, ht_in, W = self._flow_in(params)
+        Tt_in = thermo.T_from_h(ht_in)
+
+        Pt = Pt_in * params['PR']
+        T_ideal = thermo.T_from_s0(thermo.s0(Tt_in) + thermo.R * np.log(params['PR']))
+        ht = ht_in + (thermo.h(T_ideal) - ht_in) / params['eff']
+        Tt = thermo.T_from_h(ht)
+
+        Ts, Ps, V = thermo.static_from_MN(Pt, Tt, params['MN_target'])
+        self._set_flow_out(unknowns, Pt, Tt, W, Ts, Ps, V)
+
+        power = W * (ht_in - ht)
+        unknowns['power'] = power / HP
+        unknowns['trq'] = power / (params['Nmech'] * RPM) / FTLBF
+
+
+class IdealCompressor(Group):
+    """
+    Compressor with the map/performance split of the pycycle Compressor, so that
+    map.PRdes and map.effDes keep their names.
+    """
+
+    def __init__(self):
+        super(IdealCompressor, self).__init__()
+
+        self.add('map', IdealCompressorMap())
+        self.add('perf', IdealCompressorPerf(),
+                 promotes=['Fl_I:tot:P', 'Fl_I:tot:h', 'Fl_I:stat:W', 'Fl_I:stat:V', 'MN_target',
+                           'Nmech', 'power', 'trq', 'Fl_O:*'])
+        self.connect('map.PR', 'perf.PR')
+        self.connect('map.eff', 'perf.eff')
+
+
+class IdealDuct(_IdealElement):
+    """
+    Params
+    ------
+    Fl_I : flow station
+        Incoming flow
+    dPqP : float
+        Fractional total pressure loss (unitless)
+    MN_target : float
+        Exit Mach number (unitless)
+
+    Returns
+    -------
+    Fl_O : flow station
+        Duct exit flow
+    """
+
+    def __init__(self):
+        super(IdealDuct, self).__init__()
+
+        self.add_param('dPqP', val=0.0, desc='fractional total pressure loss')
+        self.add_param('MN_target', val=.5, desc='exit Mach number')
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        Pt, ht, W = self._flow_in(params)
+        Pt = Pt * (1.0 - params['dPqP'])
+        Tt = self.thermo.T_from_h(ht)
+
+        Ts, Ps, V = self.thermo.static_from_MN(Pt, Tt, params['MN_target'])
+        self._set_flow_out(unknowns, Pt, Tt, W, Ts, Ps, V)
+
+
+class IdealNozzle(_IdealElement):
+    """
+    Params
+    ------
+    Fl_I : flow station
+        Incoming flow
+    Ps_exhaust : float
+        Static pressure the nozzle expands to (psi)
+    Cfg : float
+        Gross thrust coefficient (unitless)
+    dPqP : float
+        Fractional total pressure loss (unitless)
+
+    Returns
+    -------
+    Fl_O : flow station
+        Nozzle exit flow, fully expanded to Ps_exhaust
+    Fg : float
+        Gross thrust (lbf)
+    """
+
+    def __init__(self):
+        super(IdealNozzle, self).__init__()
+
+        self.add_param('Ps_exhaust', val=1.0, units='psi', desc='exhaust static pressure')
+        self.add_param('Cfg', val=1.0, desc='gross thrust coefficient')
+        self.add_param('dPqP', val=0.0, desc='fractional total pressure loss')
+        self.add_output('Fg', val=0.0, units='lbf', desc='gross thrust')
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        Pt, ht, W = self._flow_in(params)
+        Pt = Pt * (1.0 - params['dPqP'])
+        Tt = self.thermo.T_from_h(ht)
+        Ps = params['Ps_exhaust'] * PSI
+
+        Ts, V = self.thermo.static_from_Ps(Pt, Tt, Ps)
+        self._set_flow_out(unknowns, Pt, Tt, W, Ts, Ps, V)
+        unknowns['Fg'] = params['Cfg'] * W * V / LBF
@@ -0,0 +1,284 @@
+"""
+Off-design evaluation of a sized compressor cycle at many operating points at once.
+
+Cycle sizes the flow path at one design point. Once it is sized, the compressor face
+area and the nozzle exit area are fixed, and at another pod velocity or tube pressure
+the compressor pressure ratio has to adjust until the nozzle passes the flow the
+inlet takes in. OffDesignCycle solves that balance for a whole batch of operating points
+with a vectorized Newton iteration on the frozen air thermo of ideal_gas, starting
+from the converged design pressure ratio (or from the previous solution of neighbouring
+points), so the compressor thrust can be evaluated at every node of a trajectory.
+"""
+from __future__ import print_function
+import numpy as np
+
+from openmdao.api import Component, Group, Problem, IndepVarComp
+from openmdao.units.units import convert_units as cu
+
+from hyperloop.Python.pod.cycle.ideal_gas import get_air_thermo
+
+
+class OffDesignCycle(object):
+    """
+    Sized compressor flow path (inlet, compressor, duct, nozzle) of Cycle.
+
+    Parameters
+    ----------
+    A_inlet : float
+        Flow area at the compressor face (m**2)
+    A_nozzle : float
+        Nozzle exit area (m**2)
+    PR_des : float
+        Design compressor pressure ratio (unitless)
+    Ps_exhaust : float
+        Design nozzle exit static pressure (Pa)
+    p_tube_des : float
+        Design tube pressure (Pa). Off-design, the nozzle exit pressure keeps its design
+        ratio to the tube pressure.
+    ram_recovery, eff, inlet_MN, duct_dPqP, nozzle_Cfg, nozzle_dPqP : float
+        Flow path settings, as the input_vars of FlowPath
+    Nmech : float
+        Shaft speed (rpm)
+    """
+
+    def __init__(self, A_inlet, A_nozzle, PR_des, Ps_exhaust, p_tube_des, ram_recovery=.99,
+                 eff=.9, inlet_MN=.6, duct_dPqP=0., nozzle_Cfg=1.0, nozzle_dPqP=0., Nmech=10000.):
+        self.A_inlet = A_inlet
+        self.A_nozzle = A_nozzle
+        self.PR_des = PR_des
+        self.Ps_exhaust = Ps_exhaust
+        self.p_tube_des = p_tube_des
+        self.ram_recovery = ram_recovery
+        self.eff = eff
+        self.inlet_MN = inlet_MN
+        self.duct_dPqP = duct_dPqP
+        self.nozzle_Cfg = nozzle_Cfg
+        self.nozzle_dPqP = nozzle_dPqP
+        self.Nmech = Nmech
+
+        self.thermo = get_air_thermo()
+
+    @classmethod
+    def from_problem(cls, prob, path='Cycle'):
+        """
+        Reads the sizing of a converged Cycle group (either thermo) from a Problem.
+        """
+        fp = path + '.FlowPath.'
+        return cls(A_inlet=cu(prob[fp + 'inlet.Fl_O:stat:area'], 'inch**2', 'm**2'),
+                   A_nozzle=cu(prob[fp + 'nozzle.Fl_O:stat:area'], 'inch**2', 'm**2'),
+                   PR_des=float(prob[fp + 'comp.map.PRdes']),
+                   Ps_exhaust=cu(prob[fp + 'nozzle.Ps_exhaust'], 'psi', 'Pa'),
+                   p_tube_des=float(prob[path + '.FlowPathInputs.tube_pressure']),
+                   ram_recovery=float(prob[fp + 'input_vars.ram_recovery']),
+                   eff=float(prob[fp + 'input_vars.effDes']),
+                   inlet_MN=float(prob[fp + 'input_vars.inlet_MN']),
+                   duct_dPqP=float(prob[fp + 'input_vars.duct_dPqP']),
+                   nozzle_Cfg=float(prob[fp + 'input_vars.nozzle_Cfg']),
+                   nozzle_dPqP=float(prob[fp + 'input_vars.nozzle_dPqP']),
+                   Nmech=float(prob[fp + 'input_vars.shaft_Nmech']))
+
+    @classmethod
+    def from_design(cls, pod_mach=.8, tube_pressure=850., tube_temp=320., comp_inlet_area=2.3884,
+                    PRdes=12.6, Ps_exhaust=0.05588):
+        """
+        Sizes the flow path by running the frozen air Cycle at a design point.
+        Ps_exhaust is in psi, like the Cycle variable.
+        """
+        from hyperloop.Python.pod.cycle.cycle_group import Cycle
+
+        prob = Problem()
+        root = prob.root = Group()
+        root.add('Cycle', Cycle(thermo='ideal'))
+
+        params = (('pod_mach', pod_mach, {'units': 'unitless'}),
+                  ('tube_pressure', tube_pressure, {'units': 'Pa'}),
+                  ('tube_temp', tube_temp, {'units': 'K'}),
+                  ('comp_inlet_area', comp_inlet_area, {'units': 'm**2'}),
+                  ('PRdes', PRdes, {'units': 'unitless'}),
+                  ('Ps_exhaust', Ps_exhaust, {'units': 'psi'}))
+        root.add('des_vars', IndepVarComp(params))
+        root.connect('des_vars.pod_mach', 'Cycle.pod_mach')
+        root.connect('des_vars.tube_pressure', 'Cycle.tube_pressure')
+        root.connect('des_vars.tube_temp', 'Cycle.tube_temp')
+        root.connect('des_vars.comp_inlet_area', 'Cycle.comp_inlet_area')
+        root.connect('des_vars.PRdes', 'Cycle.comp.map.PRdes')
+        root.connect('des_vars.Ps_exhaust', 'Cycle.nozzle.Ps_exhaust')
+
+        prob.setup(check=False)
+        prob.run()
+
+        return cls.from_problem(prob)
+
+    def _nozzle_flow(self, Pt_face, ht_face, Ps, lnPR):
+        """
+        Flow the nozzle passes at compressor pressure ratio exp(lnPR), with the
+        compressor exit total enthalpy, nozzle exit temperature and velocity.
+        """
+        thermo = self.thermo
+        Tt_face = thermo.T_from_h(ht_face)
+        T_ideal = thermo.T_from_s0(thermo.s0(Tt_face) + thermo.R * lnPR)
+        ht = ht_face + (thermo.h(T_ideal) - ht_face) / self.eff
+
+        Pt = Pt_face * np.exp(lnPR) * (1.0 - self.duct_dPqP) * (1.0 - self.nozzle_dPqP)
+        Ts, V = thermo.static_from_Ps(Pt, thermo.T_from_h(ht), Ps)
+        W = Ps / (thermo.R * Ts) * V * self.A_nozzle
+        return W, ht, V
+
+    def evaluate(self, V, p_tube, T_tube, PR_guess=None, PR_min=1.0, PR_max=100.0,
+                 tol=1.0e-10, maxiter=30):
+        """
+        Operating points of the sized flow path.
+
+        Parameters
+        ----------
+        V : array_like
+            Pod velocity (m/s)
+        p_tube : array_like
+            Tube static pressure (Pa)
+        T_tube : array_like
+            Tube static temperature (K)
+        PR_guess : array_like, optional
+            Starting pressure ratios, e.g. the solution at neighbouring points.
+            Defaults to the design pressure ratio.
+        PR_min, PR_max : float
+            Bounds of the compressor pressure ratio
+        tol : float
+            Convergence tolerance on ln(PR)
+        maxiter : int
+            Maximum number of Newton iterations
+
+        Returns
+        -------
+        dict
+            Arrays of the broadcast shape of the inputs: W (kg/s), PR, Fg, F_ram and
+            F_net (N), power (W, negative for power absorbed, like pycycle), trq (N*m),
+            Tt_exit (K), plus converged (bool) and the number of iterations.
+        """
+        thermo = self.thermo
+        V, p_tube, T_tube = np.broadcast_arrays(np.asarray(V, dtype=float), np.asarray(p_tube, dtype=float),
+                                                np.asarray(T_tube, dtype=float))
+
+        # Freestream total conditions and the flow swallowed at the compressor face
+        ht0 = thermo.h(T_tube) + .5 * V**2
+        Tt0 = thermo.T_from_h(ht0)
+        Pt_face = p_tube * np.exp((thermo.s0(Tt0) - thermo.s0(T_tube)) / thermo.R) * self.ram_recovery
+        Ts_face, Ps_face, V_face = thermo.static_from_MN(Pt_face, Tt0, self.inlet_MN)
+        W = Ps_face / (thermo.R * Ts_face) * V_face * self.A_inlet
+
+        Ps = self.Ps_exhaust * p_tube / self.p_tube_des
+
+        if PR_guess is None:
+            lnPR = np.log(self.PR_des) * np.ones(V.shape)
+        else:
+            lnPR = np.log(np.broadcast_to(np.asarray(PR_guess, dtype=float), V.shape)).copy()
+        lo, hi = np.log(PR_min), np.log(PR_max)
+        lnPR = np.clip(lnPR, lo, hi)
+
+        # Newton on ln(W_nozzle/W) = 0, which increases monotonically with ln(PR)
+        step = 1.0e-6
+        converged = np.zeros(V.shape, dtype=bool)
+        for iteration in range(1, maxiter + 1):
+            W_noz, ht, V_exit = self._nozzle_flow(Pt_face, ht0, Ps, lnPR)
+            r = np.log(W_noz / W)
+            dr = (np.log(self._nozzle_flow(Pt_face, ht0, Ps, lnPR + step)[0] / W) - r) / step
+
+            lnPR_new = np.clip(lnPR - r / dr, lo, hi)
+            dx = lnPR_new - lnPR
+            lnPR = lnPR_new
+
+            converged = np.abs(dx) < tol
+            if np.all(converged):
+                break
+
+        W_noz, ht, V_exit = self._nozzle_flow(Pt_face, ht0, Ps, lnPR)
+        # points pinned at a bound don't balance the nozzle
+        converged &= np.abs(np.log(W_noz / W)) < 1.0e-8
+
+        Fg = self.nozzle_Cfg * W * V_exit
+        F_ram = W * V
+        power = W * (ht0 - ht)
+
+        return {'W': W,
+                'PR': np.exp(lnPR),
+                'Fg': Fg,
+                'F_ram': F_ram,
+                'F_net': Fg - F_ram,
+                'power': power,
+                'trq': power / (self.Nmech * 2.0 * np.pi / 60.0),
+                'Tt_exit': thermo.T_from_h(ht),
+                'converged': converged,
+                'iterations': iteration}
+
+
+class OffDesignCycleComp(Component):
+    """
+    Params
+    ------
+    v : float
+        Pod velocity at each point (m/s)
+    p_tube : float
+        Tube pressure at each point (Pa)
+    T_tube : float
+        Tube temperature at each point (K)
+
+    Returns
+    -------
+    Fg : float
+        Nozzle gross thrust (N)
+    F_ram : float
+        Ram drag (N)
+    F_net : float
+        Net compressor thrust, Fg - F_ram (N)
+    W : float
+        Mass flow through the compressor (kg/s)
+    PR : float
+        Compressor pressure ratio (unitless)
+    power : float
+        Shaft power, negative for power absorbed (W)
+
+    Notes
+    -----
+    Every call starts the Newton iteration from the pressure ratios of the previous call,
+    which are usually the converged solution of nearby points during a driver or
+    solver iteration.
+    """
+
+    def __init__(self, cycle, num_points=1):
+        super(OffDesignCycleComp, self).__init__()
+        self.cycle = cycle
+        self.deriv_options['type'] = 'fd'
+
+        n = num_points
+        self.PR_guess = cycle.PR_des * np.ones(n)
+
+        self.add_param('v', val=335.0 * np.ones(n), units='m/s', desc='pod velocity')
+        self.add_param('p_tube', val=850.0 * np.ones(n), units='Pa', desc='tube pressure')
+        self.add_param('T_tube', val=320.0 * np.ones(n), units='K', desc='tube temperature')
+
+        self.add_output('Fg', val=np.zeros(n), units='N', desc='gross thrust')
+        self.add_output('F_ram', val=np.zeros(n), units='N', desc='ram drag')
+        self.add_output('F_net', val=np.zeros(n), units='N', desc='net thrust')
+        self.add_output('W', val=np.zeros(n), units='kg/s', desc='mass flow')
+        self.add_output('PR', val=np.ones(n), desc='compressor pressure ratio')
+        self.add_output('power', val=np.zeros(n), units='W', desc='shaft power')
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        op = self.cycle.evaluate(params['v'], params['p_tube'], params['T_tube'], PR_guess=self.PR_guess)
+        self.PR_guess = np.where(op['converged'], op['PR'], self.PR_guess)
+
+        for name in ('Fg', 'F_ram', 'F_net', 'W', 'PR', 'power'):
+            unknowns[name] = op[name]
+
+
+if __name__ == '__main__':
+
+    cycle = OffDesignCycle.from_design()
+
+    v = np.linspace(150.0, 320.0, 8)
+    op = cycle.evaluate(v, 850.0, 320.0)
+
+    print('Newton iterations %d' % op['iterations'])
+    print('%10s %10s %10s %10s %10s %12s' % ('v (m/s)', 'W (kg/s)', 'PR', 'Fg (N)', 'F_ram (N)', 'power (kW)'))
+    for i in range(len(v)):
+        print('%10.1f %10.3f %10.3f %10.1f %10.1f %12.1f' % (v[i], op['W'][i], op['PR'][i], op['Fg'][i],
+                                                             op['F_ram'][i], op['power'][i] / 1000.0))
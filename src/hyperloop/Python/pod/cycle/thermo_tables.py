@@ -0,0 +1,80 @@
+"""
+Process wide registry of read-only thermodynamic tables.
+
+Components ask for their tables by key instead of building them in their
+constructor, so e.g. the ideal gas air thermo of every FlowPath, SteadyStateVacuum
+and off-design element in a TubeAndPod, or every KantrowitzMap with the same grid,
+uses the same arrays. The arrays are frozen (not writeable), so sharing them is safe,
+and workers forked from a process that already holds them (multiprocessing on Linux)
+share the parent's pages instead of rebuilding them. Call preload() before creating a
+Pool to get that.
+
+Setting SHARED to False builds the tables for every caller instead, which
+tools/startup_benchmark uses to measure what sharing saves.
+"""
+from __future__ import print_function
+import hashlib
+import numpy as np
+
+SHARED = True
+
+_tables = {}
+
+
+def table_key(name, *args):
+    """
+    Key for a set of tables, from a name and the arguments used to build them.
+    """
+    digest = hashlib.sha1(repr(args).encode('utf-8')).hexdigest()[:12]
+    return '%s_%s' % (name, digest)
+
+
+def freeze(arrays):
+    """
+    Returns the dict of arrays as contiguous float arrays that can't be written to.
+    """
+    frozen = {}
+    for name, val in arrays.items():
+        val = np.array(val, dtype=float, order='C')
+        val.setflags(write=False)
+        frozen[name] = val
+    return frozen
+
+
+def shared_tables(key, build):
+    """
+    Tables for key, built at most once per process.
+
+    Parameters
+    ----------
+    key : str
+        Registry key, see table_key
+    build : callable
+        Function with no arguments returning a dict of arrays
+
+    Returns
+    -------
+    dict
+        Read-only arrays, shared with every other caller asking for the same key
+    """
+    if not SHARED:
+        return freeze(build())
+    if key not in _tables:
+        _tables[key] = freeze(build())
+    return _tables[key]
+
+
+def preload():
+    """
+    Builds the tables of the flow elements in this process, so that workers forked
+    from it afterwards inherit them.
+    """
+    from hyperloop.Python.pod.cycle.ideal_gas import get_air_thermo
+    get_air_thermo()
+
+
+def clear():
+    """
+    Drops every table from the registry of this process.
+    """
+    _tables.clear()
@@ -0,0 +1,229 @@
+"""
+Kantrowitz (choking) limit of a pod in a tube.
+
+The flow that doesn't enter the pod inlet accelerates through the bypass between the
+pod and the tube wall. With the isentropic stream tube relation used by PodMach, the
+bypass reaches M_duct when the effective blockage ratio
+
+    BR = (A_pod - A_inlet) / (A_tube - A_inlet)
+
+reaches 1 - A_bypass/A_stream = 1 - mach_to_area(M_pod, M_duct). A_pod includes
+the boundary layer displacement area. With M_duct = 1 this is the Kantrowitz limit.
+
+The limit is available in closed form (limit_blockage, tube_area), and its inverse,
+the limit pod Mach number at a given blockage, both as a vectorized Newton solve
+(limit_mach) and as a precomputed KantrowitzMap table, built once per process and
+shared, for sweeps and optimizers that query it many times.
+"""
+from __future__ import print_function
+import numpy as np
+
+from openmdao.api import Component, Group, Problem, IndepVarComp
+
+from hyperloop.Python.tools.compressible_flow import area_ratio, mach_to_area, mach_from_area_ratio
+from hyperloop.Python.pod.cycle.thermo_tables import shared_tables, table_key
+
+
+def limit_blockage(M_pod, M_duct=1.0, gam=1.4):
+    """
+    Largest effective blockage ratio at pod Mach number M_pod before the bypass reaches M_duct.
+    """
+    return 1.0 - mach_to_area(M_pod, M_duct, gam)
+
+
+def limit_mach(BR, M_duct=1.0, gam=1.4):
+    """
+    Pod Mach number at which the bypass reaches M_duct for effective blockage ratio BR.
+    Inverse of limit_blockage on the subsonic branch.
+    """
+    return mach_from_area_ratio(area_ratio(M_duct, gam) / (1.0 - BR), gam)
+
+
+def tube_area(A_pod, A_inlet, M_pod, M_duct=1.0, gam=1.4):
+    """
+    Smallest tube area (m**2) that keeps the bypass at or below M_duct.
+    Same as A_tube of PodMach.
+    """
+    return A_inlet + (A_pod - A_inlet) / limit_blockage(M_pod, M_duct, gam)
+
+
+def _trilinear(table, lo, step, x, y, z):
+    """
+    Trilinear interpolation in a table on a uniform grid with origin lo and spacing step,
+    clamped to the grid.
+    """
+    idx = []
+    frac = []
+    for ax, v in enumerate((x, y, z)):
+        n = table.shape[ax]
+        u = np.clip((v - lo[ax]) / step[ax], 0.0, n - 1.0)
+        i = np.minimum(u.astype(int), n - 2)
+        idx.append(i)
+        frac.append(u - i)
+
+    (i, j, k), (fx, fy, fz) = idx, frac
+    c00 = table[i, j, k] * (1.0 - fx) + table[i + 1, j, k] * fx
+    c01 = table[i, j, k + 1] * (1.0 - fx) + table[i + 1, j, k + 1] * fx
+    c10 = table[i, j + 1, k] * (1.0 - fx) + table[i + 1, j + 1, k] * fx
+    c11 = table[i, j + 1, k + 1] * (1.0 - fx) + table[i + 1, j + 1, k + 1] * fx
+    return (c00 * (1.0 - fy) + c10 * fy) * (1.0 - fz) + (c01 * (1.0 - fy) + c11 * fy) * fz
+
+
+class KantrowitzMap(object):
+    """
+    Tabulated inverse of the limit surface, the limit pod Mach number over (BR, M_duct, gam).
+
+    Parameters
+    ----------
+    BR_range, M_duct_range, gam_range : tuple
+        (min, max) of each table axis
+    n : tuple
+        Number of grid points along the BR, M_duct and gam axes
+    n_holdout : int
+        Number of random points, between grid nodes, used to estimate the interpolation error
+
+    Notes
+    -----
+    The grid is uniform in sqrt(BR), where the limit Mach number is close to linear, and is
+    interpolated trilinearly. max_abs_err is the largest error on the holdout points,
+    compared with limit_mach. The forward direction, limit_blockage, is closed form
+    and cheaper than any table lookup, so it isn't tabulated.
+    """
+
+    def __init__(self, BR_range=(0.0, .98), M_duct_range=(.5, 1.0), gam_range=(1.2, 1.67),
+                 n=(201, 51, 48), n_holdout=2000):
+        x_BR = np.sqrt(BR_range)
+        self._lo = np.array([x_BR[0], M_duct_range[0], gam_range[0]])
+        self._step = (np.array([x_BR[1], M_duct_range[1], gam_range[1]]) - self._lo) / (np.array(n) - 1.0)
+
+        def build():
+            B = np.linspace(x_BR[0], x_BR[1], n[0])[:, np.newaxis, np.newaxis]**2
+            Md = np.linspace(M_duct_range[0], M_duct_range[1], n[1])[np.newaxis, :, np.newaxis]
+            g = np.linspace(gam_range[0], gam_range[1], n[2])[np.newaxis, np.newaxis, :]
+            return {'M_table': limit_mach(B, Md, g)}
+
+        key = table_key('kantrowitz', BR_range, M_duct_range, gam_range, n)
+        self.tables = shared_tables(key, build)
+
+        self.max_abs_err = 0.0
+        if n_holdout:
+            rng = np.random.RandomState(0)
+            B = rng.uniform(BR_range[0], BR_range[1], n_holdout)
+            Md = rng.uniform(M_duct_range[0], M_duct_range[1], n_holdout)
+            g = rng.uniform(gam_range[0], gam_range[1], n_holdout)
+            self.max_abs_err = np.max(np.abs(self.mach(B, Md, g) - limit_mach(B, Md, g)))
+
+    def mach(self, BR, M_duct=1.0, gam=1.4):
+        """Tabulated limit_mach"""
+        return _trilinear(self.tables['M_table'], self._lo, self._step,
+                          np.sqrt(BR), np.asarray(M_duct, dtype=float), np.asarray(gam, dtype=float))
+
+
+_maps = {}
+
+
+def get_kantrowitz_map():
+    """
+    KantrowitzMap on the default grid, built once per process.
+    """
+    if 'default' not in _maps:
+        _maps['default'] = KantrowitzMap()
+    return _maps['default']
+
+
+class KantrowitzLimit(Component):
+    """
+    Params
+    ------
+    A_pod : float
+        Pod cross sectional area including the boundary layer displacement area (m**2)
+    A_inlet : float
+        Capture area of the pod inlet (m**2)
+    A_tube : float
+        Tube cross sectional area (m**2)
+    M_pod : float
+        Pod Mach number (unitless)
+    M_duct : float
+        Largest allowed bypass Mach number, 1 for the Kantrowitz limit (unitless)
+    gam : float
+        Ratio of specific heats (unitless)
+
+    Returns
+    -------
+    BR : float
+        Effective blockage ratio of the pod (unitless)
+    BR_limit : float
+        Largest effective blockage ratio at M_pod (unitless)
+    M_limit : float
+        Pod Mach number at which the bypass reaches M_duct (unitless)
+    A_tube_min : float
+        Smallest tube area at M_pod (m**2)
+
+    Notes
+    -----
+    use_table selects the interpolated KantrowitzMap for M_limit instead of the Newton solve.
+    """
+
+    def __init__(self, use_table=False):
+        super(KantrowitzLimit, self).__init__()
+        self.kmap = get_kantrowitz_map() if use_table else None
+
+        self.add_param('A_pod', val=3.0536, units='m**2', desc='pod area with boundary layer')
+        self.add_param('A_inlet', val=2.3884, units='m**2', desc='inlet capture area')
+        self.add_param('A_tube', val=20.0, units='m**2', desc='tube area')
+        self.add_param('M_pod', val=.8, desc='pod Mach number')
+        self.add_param('M_duct', val=1.0, desc='bypass Mach number limit')
+        self.add_param('gam', val=1.4, desc='ratio of specific heats')
+
+        self.add_output('BR', val=0.0, desc='effective blockage ratio')
+        self.add_output('BR_limit', val=0.0, desc='limit effective blockage ratio')
+        self.add_output('M_limit', val=0.0, desc='limit pod Mach number')
+        self.add_output('A_tube_min', val=0.0, units='m**2', desc='smallest tube area')
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        A_pod = params['A_pod']
+        A_inlet = params['A_inlet']
+        M_pod = params['M_pod']
+        M_duct = params['M_duct']
+        gam = params['gam']
+
+        BR = (A_pod - A_inlet) / (params['A_tube'] - A_inlet)
+        BR_limit = limit_blockage(M_pod, M_duct, gam)
+        if self.kmap is None:
+            M_limit = limit_mach(BR, M_duct, gam)
+        else:
+            M_limit = self.kmap.mach(BR, M_duct, gam)
+
+        unknowns['BR'] = BR
+        unknowns['BR_limit'] = BR_limit
+        unknowns['M_limit'] = M_limit
+        unknowns['A_tube_min'] = A_inlet + (A_pod - A_inlet) / BR_limit
+
+
+if __name__ == '__main__':
+    import time
+
+    t0 = time.time()
+    kmap = get_kantrowitz_map()
+    print('map built in %f s' % (time.time() - t0))
+    print('max abs error of M_pod %e' % kmap.max_abs_err)
+
+    BR = np.linspace(.05, .9, 100000)
+    t0 = time.time()
+    M_table = kmap.mach(BR)
+    t1 = time.time()
+    M_exact = limit_mach(BR)
+    t2 = time.time()
+    print('inverse of %d points, table %f s, Newton %f s' % (len(BR), t1 - t0, t2 - t1))
+
+    top = Problem()
+    root = top.root = Group()
+    root.add('p', KantrowitzLimit())
+    top.setup()
+    top.run()
+
+    print('\n')
+    print('Effective blockage ratio            %f' % top['p.BR'])
+    print('Limit blockage ratio at M_pod       %f' % top['p.BR_limit'])
+    print('Kantrowitz limit Mach number        %f' % top['p.M_limit'])
+    print('Smallest tube area                  %f m^2' % top['p.A_tube_min'])
@@ -8,6 +8,7 @@ from hyperloop.Python.pod.pod_mass import PodMass
 from hyperloop.Python.pod.drivetrain.drivetrain import Drivetrain
 from hyperloop.Python.pod.pod_mach import PodMach
 from hyperloop.Python.pod.cycle.cycle_group import Cycle
+from hyperloop.Python.pod.cycle.cycle_surrogate import CycleSurrogate
 from hyperloop.Python.pod.pod_geometry import PodGeometry
 from hyperloop.Python.pod.magnetic_levitation.levitation_group import LevGroup
 from openmdao.api import Newton, ScipyGMRES
@@ -77,16 +78,27 @@ class PodGroup(Group):
     total_pod_mass : float
             Pod Mass (kg)
 
+    Notes
+    -----
+    Passing cycle_table (a table file from cycle_surrogate.build_cycle_table) replaces
+    the pycycle Cycle group with the interpolating CycleSurrogate. Otherwise thermo selects
+    the thermodynamics of Cycle, 'janaf' or 'ideal'.
+
     References
     ----------
     .. [1] Friend, Paul. Magnetic Levitation Train Technology 1. Thesis.
        Bradley University, 2004. N.p.: n.p., n.d. Print.
     """
-    def __init__(self):
+    def __init__(self, cycle_table=None, thermo='janaf'):
         super(PodGroup, self).__init__()
 
+        if cycle_table is None:
+            cycle = Cycle(thermo=thermo)
+        else:
+            cycle = CycleSurrogate(cycle_table)
+
         self.add('drag', Drag(), promotes = ['pod_mach', 'Cd'])
-        self.add('cycle', Cycle(), promotes=['comp.map.PRdes', 'nozzle.Ps_exhaust', 'comp_inlet_area',
+        self.add('cycle', cycle, promotes=['comp.map.PRdes', 'nozzle.Ps_exhaust', 'comp_inlet_area',
                                              'nozzle.Fg', 'inlet.F_ram', 'nozzle.Fl_O:tot:T', 'nozzle.Fl_O:stat:W',
                                              'tube_pressure', 'tube_temp'])
         self.add('pod_mach', PodMach(), promotes=['A_tube'])
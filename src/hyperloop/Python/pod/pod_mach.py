@@ -9,12 +9,75 @@ from __future__ import print_function
 import numpy as np
 from openmdao.api import IndepVarComp, Component, Group, Problem, ExecComp
 
+from hyperloop.Python.tools.compressible_flow import mach_to_area
+from hyperloop.Python.pod.kantrowitz import tube_area
+from hyperloop.Python.pod.boundary_layer import boundary_layer_march
+
+# Inputs of pod_mach_sizing, named as the PodMach params, and its outputs
+SIZING_PARAMS = ('M_pod', 'A_pod', 'L', 'comp_inlet_area', 'p_tube', 'T_ambient', 'gam', 'R', 'mu',
+                 'M_duct', 'M_diff', 'cp', 'prc', 'L_nose', 'x_tr')
+SIZING_OUTPUTS = ('pwr_comp', 'A_inlet', 'A_tube', 'A_bypass', 'A_duct_eff', 'A_diff', 'Re')
+
+
+def pod_mach_sizing(M_pod=.8, A_pod=3.0536, L=20.5, comp_inlet_area=2.3884, p_tube=850.0, T_ambient=298.0,
+                    gam=1.4, R=287.0, mu=1.846e-5, M_duct=.95, M_diff=.6, cp=1009.0, prc=12.5,
+                    L_nose=2.5, x_tr=0.0, delta_star=None, boundary_layer='march'):
+    """
+    Tube and inlet sizing of PodMach as a function. Every argument can be an array, and
+    the results broadcast against each other, so a whole grid of designs is one call.
+
+    delta_star is the boundary layer displacement thickness (m). If it is None, it comes
+    from boundary_layer: 'march' (default) takes the largest local displacement
+    thickness of the integral boundary layer marched along the pod (see
+    pod.boundary_layer), and 'flat_plate' the turbulent flat plate estimate
+    .04775*L/Re**.2 at the tail, which is cheaper still.
+
+    Returns
+    -------
+    dict
+        pwr_comp (W), A_inlet, A_tube, A_bypass, A_duct_eff, A_diff (m**2) and Re
+    """
+    rho_inf = p_tube / (R * T_ambient)  #Calculate density of free stream flow
+    U_inf = M_pod * (np.sqrt((gam * R * T_ambient)))        #Calculate velocity of free stream flow
+    r_pod = np.sqrt((A_pod / np.pi))  #Calculate pod radius
+
+    Re = (rho_inf * U_inf * L) / mu  #Calculate length based Reynolds Number
+    if delta_star is None:
+        if boundary_layer == 'march':
+            delta_star = boundary_layer_march(L, M_pod, M_duct, p_tube, T_ambient, gam, R, mu, L_nose,
+                                              x_tr)['delta_star'].max(axis=-1)
+        elif boundary_layer == 'flat_plate':
+            delta_star = (.04775*L)/(Re**.2)    #Calculate displacement boundary layer thickness
+        else:
+            raise ValueError("boundary_layer must be 'march' or 'flat_plate', got '%s'" % boundary_layer)
+
+    BF = comp_inlet_area/A_pod           #Calculate diffuser based blockage factor
+    A_diff = BF * A_pod  #Calculate diffuser output area based on blockage factor input
+
+    #Calculate inlet area. Inlet is necessary if free stream Mach number is greater than max compressore mach number M_diff
+    A_inlet = np.where(M_pod > M_diff, A_diff * mach_to_area(M_diff, M_pod, gam), A_diff)
+
+    A_bl = np.pi * (((r_pod + delta_star)**2.0) - (r_pod**2.0))
+    A_tube = tube_area(A_pod + A_bl, A_inlet, M_pod, M_duct, gam)
+    pwr_comp = (rho_inf * U_inf * A_inlet) * cp * T_ambient * (1.0 + (
+        (gam - 1) / 2.0) * (M_pod**2)) * ((prc**((gam - 1) / gam)) - 1)
+
+    return {'pwr_comp': pwr_comp,
+            'A_inlet': A_inlet,
+            'A_tube': A_tube,
+            'A_bypass': A_tube - A_inlet,
+            'A_duct_eff': A_tube - A_pod - A_bl,
+            'A_diff': A_diff,
+            'Re': Re}
+
+
 class PodMach(Component):
     """
     Notes
     ------
     Uses isentropic mach-area relationships to determine the cross sectional area of the tube to prevent choking and super sonic flow.
     Takes pod mach number and tunnel pressure from user, then takes pod area and bloackage factor from geometry.s
+    boundary_layer selects the displacement thickness of pod_mach_sizing, 'march' (default) or 'flat_plate'.
 
     Params
     ------
@@ -44,6 +107,10 @@ class PodMach(Component):
         Specific heat of fluid. Default value is 1009 J/(kg*K)
     M_pod : float
         pod Mach number. Default value is .8
+    L_nose : float
+        Inlet length, over which the bypass flow accelerates to M_duct. Default value is 2.5 m
+    x_tr : float
+        Boundary layer transition location from the nose. Default value is 0 m, turbulent from the nose
 
     Returns
     -------
@@ -63,8 +130,9 @@ class PodMach(Component):
         returns free stream Reynolds number
     """
 
-    def __init__(self):
+    def __init__(self, boundary_layer='march'):
         super(PodMach, self).__init__()
+        self.boundary_layer = boundary_layer
 
         self.add_param('gam', val=1.4, desc='ratio of specific heats')
         self.add_param('R',
@@ -105,6 +173,8 @@ class PodMach(Component):
         #                desc='Boundary layer displacement thickness')
 
         self.add_param('M_pod', val=.8, desc='pod mach number')
+        self.add_param('L_nose', val=2.5, units='m', desc='inlet length')
+        self.add_param('x_tr', val=0.0, units='m', desc='boundary layer transition location')
 
         self.add_output('pwr_comp',
                         val=0.0,
@@ -128,64 +198,11 @@ class PodMach(Component):
 
     def solve_nonlinear(self, params, unknowns, resids):
 
-        gam = params['gam']
-        comp_inlet_area = params['comp_inlet_area']
-        A_pod = params['A_pod']
-        L = params['L']
-        prc = params['prc']
-        p_tube = params['p_tube']
-        R = params['R']
-        T_ambient = params['T_ambient']
-        mu = params['mu']
-        M_duct = params['M_duct']
-        M_diff = params['M_diff']
-        cp = params['cp']
-        #delta_star = params['delta_star']
-        M_pod = params['M_pod']
-
-        def mach_to_area(M1, M2, gam):
-            '''(A2/A1) = f(M2)/f(M1) where f(M) = (1/M)*((2/(gam+1))*(1+((gam-1)/2)*M**2))**((gam+1)/(2*(gam-1)))'''
-            A_ratio = (M1 / M2) * (((1.0 + ((gam - 1.0) / 2.0) * (M2**2.0)) /
-                                    (1.0 + ((gam - 1.0) / 2.0) * (M1**2.0)))**(
-                                        (gam + 1.0) / (2.0 * (gam - 1.0))))
-            return A_ratio
-
-        #Define intermediate variables
-        rho_inf = p_tube / (R *
-                            T_ambient)  #Calculate density of free stream flow
-        U_inf = M_pod * (np.sqrt((gam * R * T_ambient)))        #Calculate velocity of free stream flow
-        r_pod = np.sqrt((A_pod / np.pi))  #Calculate pod radius
-
-        Re = (rho_inf * U_inf *
-              L) / mu  #Calculate length based Reynolds Number
-        delta_star = (.04775*L)/(Re**.2)    #Calculate displacement boundary layer thickness
-
-        BF = comp_inlet_area/A_pod           #Calculate diffuser based blockage factor
-        A_diff = BF * A_pod  #Calculate diffuser output area based on blockage factor input
-
-        #Calculate inlet area. Inlet is necessary if free stream Mach number is greater than max compressore mach number M_diff
-        if M_pod > M_diff:
-            A_inlet = A_diff * mach_to_area(M_diff, M_pod, gam)
-        else:
-            A_inlet = A_diff
-
-        eps = mach_to_area(M_pod, M_duct, gam)
-
-        A_tube = (A_pod + np.pi * (((r_pod + delta_star)**2.0) - (r_pod**2.0)) -
-                  (eps * A_inlet)) / ((1.0 + (np.sqrt(eps))) * (1.0 - (np.sqrt(eps))))
-        pwr_comp = (rho_inf * U_inf * A_inlet) * cp * T_ambient * (1.0 + (
-            (gam - 1) / 2.0) * (M_pod**2)) * ((prc**((gam - 1) / gam)) - 1)
-        A_bypass = A_tube - A_inlet
-        A_duct_eff = A_tube - A_pod - np.pi * ((
-            (r_pod + delta_star)**2) - (r_pod**2))
-
-        unknowns['pwr_comp'] = pwr_comp
-        unknowns['A_inlet'] = A_inlet
-        unknowns['A_tube'] = A_tube
-        unknowns['A_bypass'] = A_bypass
-        unknowns['A_duct_eff'] = A_duct_eff
-        unknowns['A_diff'] = A_diff
-        unknowns['Re'] = Re
+        out = pod_mach_sizing(boundary_layer=self.boundary_layer,
+                              **dict((name, params[name]) for name in SIZING_PARAMS))
+
+        for name in SIZING_OUTPUTS:
+            unknowns[name] = out[name]
 
 if __name__ == '__main__':
     top = Problem()
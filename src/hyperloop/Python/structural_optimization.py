@@ -255,6 +255,252 @@ class StructuralOptimization(Component):
             (4.0 * dp * (1.0 - (v_tube**2))) / E_tube)**(1.0 / 3.0))
 
 
+def _structural_cost(t, tube_area, m_pod, rho_tube, E_tube, Su_tube, sf, g, unit_cost_tube,
+                     p_tunnel, p_ambient, alpha_tube, dT_tube, rho_pylon, Su_pylon,
+                     unit_cost_pylon, h):
+    """
+    Material cost per unit length for a given tube thickness with the pylon radius
+    sized so the tube von Mises stress is at its allowable. Complex step safe in t.
+    """
+    r = np.sqrt(tube_area / np.pi)
+    dp = p_ambient - p_tunnel
+    s = Su_tube / sf
+    W = m_pod * g
+
+    m_prime = rho_tube * np.pi * (((r + t)**2) - (r**2))
+    q = m_prime * g
+    I_tube = (np.pi / 4.0) * (((r + t)**4) - (r**4))
+
+    # Largest axial stress that keeps von Mises at the allowable for the given hoop stress
+    sig_theta = (dp * r) / t
+    sig_axial = .5 * (sig_theta + np.sqrt(4.0 * (s**2) - 3.0 * (sig_theta**2)))
+    M = (sig_axial - ((dp * r) / (2 * t)) - alpha_tube * E_tube * dT_tube) * I_tube / r
+
+    # Pylon spacing that produces that moment, and the pylon radius that carries it
+    dx = (4.0 / q) * (np.sqrt(.25 * (W**2) + .5 * q * M) - .5 * W)
+    r_pylon = np.sqrt((dx * q + W) / (2.0 * (Su_pylon / sf) * np.pi))
+
+    m_pylon = rho_pylon * np.pi * (r_pylon**2) * h
+    cost = (unit_cost_tube * m_prime) + (unit_cost_pylon * m_pylon) / dx
+
+    return cost, r_pylon, dx
+
+
+def _pylon_spacing(t, r_pylon, tube_area, m_pod, rho_tube, g, Su_pylon, sf):
+    """
+    Pylon spacing of StructuralOptimization, the span a pylon of radius r_pylon carries.
+    """
+    r = np.sqrt(tube_area / np.pi)
+    q = rho_tube * np.pi * (((r + t)**2) - (r**2)) * g
+    return ((2 * (Su_pylon / sf) * np.pi * (r_pylon**2)) - m_pod * g) / q
+
+
+def _von_mises(t, dx, tube_area, m_pod, rho_tube, E_tube, g, p_tunnel, p_ambient, alpha_tube, dT_tube):
+    """
+    Von Mises stress of the tube of StructuralOptimization for thickness t and pylon spacing dx.
+    """
+    r = np.sqrt(tube_area / np.pi)
+    dp = p_ambient - p_tunnel
+    q = rho_tube * np.pi * (((r + t)**2) - (r**2)) * g
+    I_tube = (np.pi / 4.0) * (((r + t)**4) - (r**4))
+    M = (q * ((dx**2) / 8.0)) + (m_pod * g * (dx / 2.0))
+    sig_theta = (dp * r) / t
+    sig_axial = ((dp * r) / (2 * t)) + ((M * r) / I_tube) + alpha_tube * E_tube * dT_tube
+    return np.sqrt((((sig_theta**2) + (sig_axial**2) + ((sig_axial - sig_theta)**2)) / 2.0))
+
+
+def optimize_structure(tube_area,
+                       m_pod,
+                       rho_tube=7820.0,
+                       E_tube=200.0e9,
+                       v_tube=.3,
+                       Su_tube=152.0e6,
+                       sf=1.5,
+                       g=9.81,
+                       unit_cost_tube=.3307,
+                       p_tunnel=100.0,
+                       p_ambient=101300.0,
+                       alpha_tube=0.0,
+                       dT_tube=0.0,
+                       rho_pylon=2400.0,
+                       E_pylon=41.0e9,
+                       Su_pylon=40.0e6,
+                       unit_cost_pylon=.05,
+                       h=10.0,
+                       t_min=.001,
+                       r_pylon_min=.1,
+                       tol=1.0e-12,
+                       verify=False):
+    """
+    Cost minimal tube thickness and pylon radius for StructuralOptimization, evaluated
+    for whole arrays of inputs at once instead of one SLSQP run per point.
+
+    Pylon cost per unit length falls as the pylon radius grows, so at the optimum the
+    tube yield constraint is active. For a given thickness the allowable moment follows
+    from the von Mises condition, the pylon spacing from the moment, and the pylon
+    radius from the spacing, which leaves cost as a function of thickness only. Its
+    stationary point is found with a vectorized bisection on the complex step derivative,
+    bounded below by the tube buckling thickness t_crit. Where that pylon is thinner than
+    r_pylon_min, the minimum radius sets the spacing instead and the tube is the thinnest
+    one that stays below yield at that spacing.
+
+    Parameters
+    ----------
+    tube_area : float or ndarray
+        Inner tube area (m**2)
+    m_pod : float or ndarray
+        Total mass of pod (kg), broadcast against tube_area
+    verify : bool
+        Also solves every point with the SLSQP problem of the StructuralOptimization
+        example and returns those results with a '_slsqp' suffix
+
+    Remaining parameters and their defaults are those of StructuralOptimization.
+
+    Returns
+    -------
+    results : dict
+        't', 'r_pylon', 'dx', 'total_material_cost', 'von_mises' and 't_crit' arrays
+        with the broadcast shape of the inputs
+    """
+    tube_area, m_pod = np.broadcast_arrays(np.asarray(tube_area, dtype=float),
+                                           np.asarray(m_pod, dtype=float))
+
+    args = (tube_area, m_pod, rho_tube, E_tube, Su_tube, sf, g, unit_cost_tube, p_tunnel,
+            p_ambient, alpha_tube, dT_tube, rho_pylon, Su_pylon, unit_cost_pylon, h)
+
+    def dcost(t):
+        step = 1.0e-30
+        return np.imag(_structural_cost(t + step * 1j, *args)[0]) / step
+
+    r = np.sqrt(tube_area / np.pi)
+    dp = p_ambient - p_tunnel
+    s = Su_tube / sf
+    t_crit = r * (((4.0 * dp * (1.0 - (v_tube**2))) / E_tube)**(1.0 / 3.0))
+
+    # von Mises is only satisfiable once the hoop stress is below 2s/sqrt(3)
+    t_hoop = np.sqrt(3.0) * dp * r / (2.0 * s)
+    t_lo = np.maximum(np.maximum(t_crit, t_min), t_hoop * (1.0 + 1.0e-9))
+
+    # Buckling thickness is optimal wherever cost already increases there
+    active = dcost(t_lo) < 0.0
+    t_hi = 2.0 * t_lo
+    for _ in range(60):
+        grow = active & (dcost(t_hi) < 0.0)
+        if not np.any(grow):
+            break
+        t_hi = np.where(grow, 2.0 * t_hi, t_hi)
+
+    a, b = t_lo.copy(), t_hi.copy()
+    for _ in range(200):
+        mid = .5 * (a + b)
+        neg = dcost(mid) < 0.0
+        a = np.where(neg, mid, a)
+        b = np.where(neg, b, mid)
+        if np.all((b - a) <= tol * b):
+            break
+    t = np.where(active, .5 * (a + b), t_lo)
+
+    cost, r_pylon, dx = _structural_cost(t, *args)
+
+    # Where the pylon would be thinner than r_pylon_min it is clamped, and it then sets the
+    # spacing as in StructuralOptimization. Cost rises with t at a fixed pylon, so the
+    # thinnest tube that stays below yield at that spacing is optimal
+    clamp = r_pylon < r_pylon_min
+    if np.any(clamp):
+        spacing = (tube_area, m_pod, rho_tube, g, Su_pylon, sf)
+        stress = (tube_area, m_pod, rho_tube, E_tube, g, p_tunnel, p_ambient, alpha_tube, dT_tube)
+
+        def excess(t):
+            return _von_mises(t, _pylon_spacing(t, r_pylon_min, *spacing), *stress) - s
+
+        a = t_lo.copy()
+        b = np.where(excess(t_lo) <= 0.0, t_lo, 2.0 * t_lo)
+        for _ in range(60):
+            grow = excess(b) > 0.0
+            if not np.any(grow):
+                break
+            a = np.where(grow, b, a)
+            b = np.where(grow, 2.0 * b, b)
+        for _ in range(200):
+            mid = .5 * (a + b)
+            over = excess(mid) > 0.0
+            a = np.where(over, mid, a)
+            b = np.where(over, b, mid)
+            if np.all((b - a) <= tol * b):
+                break
+
+        t = np.where(clamp, b, t)
+        r_pylon = np.where(clamp, r_pylon_min, r_pylon)
+        dx = np.where(clamp, _pylon_spacing(t, r_pylon_min, *spacing), dx)
+        cost = np.where(clamp, (unit_cost_tube * rho_tube * np.pi * (((r + t)**2) - (r**2))) +
+                        (unit_cost_pylon * rho_pylon * np.pi * (r_pylon_min**2) * h) / dx, cost)
+
+    results = {}
+    results['t'] = t
+    results['r_pylon'] = r_pylon
+    results['dx'] = dx
+    results['total_material_cost'] = cost
+    results['von_mises'] = _von_mises(t, dx, tube_area, m_pod, rho_tube, E_tube, g, p_tunnel, p_ambient,
+                                      alpha_tube, dT_tube)
+    results['t_crit'] = t_crit
+
+    if verify:
+        top = Problem()
+        root = top.root = Group()
+        root.add('input_vars', IndepVarComp((('tube_area', 1.0, {'units': 'm**2'}),
+                                             ('t', .05, {'units': 'm'}),
+                                             ('r_pylon', 1.1, {'units': 'm'}))))
+        root.add('p', StructuralOptimization())
+        root.add('con1', ExecComp('c1 = ((Su_tube/sf) - von_mises)',
+                                  Su_tube=Su_tube, sf=sf))
+        root.add('con2', ExecComp('c2 = t - t_crit'))
+        root.connect('input_vars.tube_area', 'p.tube_area')
+        root.connect('input_vars.t', 'p.t')
+        root.connect('input_vars.r_pylon', 'p.r_pylon')
+        root.connect('p.von_mises', 'con1.von_mises')
+        root.connect('input_vars.t', 'con2.t')
+        root.connect('p.t_crit', 'con2.t_crit')
+
+        root.p.deriv_options['type'] = "cs"
+        root.p.deriv_options['step_size'] = 1.0e-10
+
+        top.driver = ScipyOptimizer()
+        top.driver.options['optimizer'] = 'SLSQP'
+        top.driver.options['disp'] = False
+        top.driver.add_desvar('input_vars.t', lower=t_min, scaler=100.0)
+        top.driver.add_desvar('input_vars.r_pylon', lower=r_pylon_min)
+        top.driver.add_objective('p.total_material_cost', scaler=1.0e-4)
+        top.driver.add_constraint('con1.c1', lower=0.0, scaler=1000.0)
+        top.driver.add_constraint('con2.c2', lower=0.0)
+
+        top.setup(check=False)
+        for name, val in (('rho_tube', rho_tube), ('E_tube', E_tube), ('v_tube', v_tube),
+                          ('Su_tube', Su_tube), ('sf', sf), ('g', g),
+                          ('unit_cost_tube', unit_cost_tube), ('p_tunnel', p_tunnel),
+                          ('p_ambient', p_ambient), ('alpha_tube', alpha_tube),
+                          ('dT_tube', dT_tube), ('rho_pylon', rho_pylon),
+                          ('E_pylon', E_pylon), ('Su_pylon', Su_pylon),
+                          ('unit_cost_pylon', unit_cost_pylon), ('h', h)):
+            top['p.' + name] = val
+
+        for key in ['t', 'r_pylon', 'dx', 'total_material_cost']:
+            results[key + '_slsqp'] = np.zeros(tube_area.shape)
+
+        for idx in np.ndindex(tube_area.shape):
+            top['input_vars.tube_area'] = tube_area[idx]
+            top['p.m_pod'] = m_pod[idx]
+            top['input_vars.t'] = .05
+            top['input_vars.r_pylon'] = 1.1
+            top.run()
+
+            results['t_slsqp'][idx] = top['p.t']
+            results['r_pylon_slsqp'][idx] = top['p.r_pylon']
+            results['dx_slsqp'][idx] = top['p.dx']
+            results['total_material_cost_slsqp'][idx] = top['p.total_material_cost']
+
+    return results
+
+
 if __name__ == '__main__':
 
     top = Problem()
@@ -323,24 +569,20 @@ if __name__ == '__main__':
     m_pod = np.linspace(10000.0, 20000, num = 3)
     A_tube = np.linspace(20.0, 50.0, num = 30)
 
-    dx = np.zeros((len(m_pod), len(A_tube)))
-    t_tube = np.zeros((len(m_pod), len(A_tube)))
-    r_pylon = np.zeros((len(m_pod), len(A_tube)))
-    cost = np.zeros((1, len(A_tube)))
-
-    for i in range(len(A_tube)):
-        for j in range(len(m_pod)):
-            top['input_vars.tube_area'] = A_tube[i]
-            top['p.m_pod'] = m_pod[j]
+    # Whole trade grid in one evaluation, rows are pod mass and columns tube area
+    res = optimize_structure(A_tube[np.newaxis, :], m_pod[:, np.newaxis], p_tunnel=850.0)
 
-            top.run()
+    dx = res['dx']
+    t_tube = res['t']
+    r_pylon = res['r_pylon']
+    cost = res['total_material_cost'][-1:, :]
 
-            dx[j,i] = top['p.dx']
-            t_tube[j,i] = top['p.t']
-            r_pylon[j,i] = top['p.r_pylon']
-        cost[0,i] = top['p.total_material_cost']
+    # writer.writerow((A_tube[i], dx[0,i], dx[1,i], dx[2,i], cost[0,i]))
 
-        # writer.writerow((A_tube[i], dx[0,i], dx[1,i], dx[2,i], cost[0,i]))
+    # Single point SLSQP solve at the last grid point for the summary below
+    top['input_vars.tube_area'] = A_tube[-1]
+    top['p.m_pod'] = m_pod[-1]
+    top.run()
 
     # f.close()
     plt.hold(True)
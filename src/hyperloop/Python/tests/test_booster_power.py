@@ -0,0 +1,59 @@
+import numpy as np
+from openmdao.api import Group, Problem
+
+from hyperloop.Python.tube import booster_power
+from hyperloop.Python.mission.fleet_simulation import simulate_fleet, trip_profile
+
+def create_problem(component):
+    root = Group()
+    prob = Problem(root)
+    prob.root.add('comp', component)
+    return prob
+
+class TestBoosterPower(object):
+    def test_case1_single_pass(self):
+
+        # passes straddling bin edges are split exactly between the bins
+        res = booster_power.booster_power([0.3, 10.0], [0, 1], [300.0e3])
+        power = res['station_power'][0]
+        assert np.isclose(res['energy'], 2 * 350.0e3 * 1.5)
+        assert np.isclose(power.max(), 350.0e3)
+        assert np.count_nonzero(power) == 6
+
+        t_mid = booster_power.time_at(300.0e3, 600.0e3, 286.86)
+        assert np.isclose(np.sum(res['t'] * power) / np.sum(power), t_mid + .3 - .5 + 5.0, atol=1.0)
+
+        t_trip = sum(trip_profile(600.0e3, 286.86))
+        assert np.isclose(booster_power.time_at(600.0e3, 600.0e3, 286.86), t_trip)
+        assert np.isclose(booster_power.time_at(0.0, 600.0e3, 286.86), 0.0)
+
+    def test_case2_schedule(self):
+
+        fleet = simulate_fleet()
+        station_x = np.linspace(25.0e3, 575.0e3, 12)
+        res = booster_power.booster_power(fleet['depart'], fleet['direction'], station_x, launch_energy=1.0e8)
+
+        # every trip passes every station once and launches once
+        departures = len(fleet['depart'])
+        assert np.isclose(res['energy'], departures * (12 * 350.0e3 * 1.5 + 1.0e8))
+        assert res['station_power'].shape == (12, len(res['t']))
+        assert np.allclose(res['station_power'].sum(axis=1), departures * 350.0e3 * 1.5)
+        assert res['peak_power'] > res['mean_power']
+
+        # the vectorized stations match one station at a time
+        single = booster_power.booster_power(fleet['depart'], fleet['direction'], station_x[3:4])
+        assert np.allclose(single['station_power'][0], res['station_power'][3])
+
+    def test_case3_component(self):
+
+        prob = create_problem(booster_power.BoosterPower())
+        prob.setup(check=False)
+        prob.run()
+
+        # pods of the two directions pass a station at different times
+        assert np.isclose(prob['comp.peak_station_power'], 350.0e3)
+        assert prob['comp.peak_power'] > prob['comp.peak_station_power']
+
+        # the day runs from the first departure to the last arrival
+        t_end = np.ceil(16.0 * 3600.0 - 120.0 + sum(trip_profile(600.0e3, 286.86)))
+        assert np.isclose(prob['comp.mean_power'] * t_end, 960 * 10 * 350.0e3 * 1.5)
@@ -0,0 +1,61 @@
+import numpy as np
+from openmdao.api import Group, Problem
+
+from hyperloop.Python.pod import boundary_layer
+from hyperloop.Python.pod.pod_mach import PodMach, pod_mach_sizing
+
+def create_problem(component):
+    root = Group()
+    prob = Problem(root)
+    prob.root.add('comp', component)
+    return prob
+
+class TestBoundaryLayer(object):
+    def test_case1_flat_plate(self):
+
+        # No acceleration along the pod, fully turbulent
+        bl = boundary_layer.boundary_layer_march(20.5, M_pod=.8, M_duct=.8)
+        Re = (850.0 / (287.0 * 298.0)) * .8 * np.sqrt(1.4 * 287.0 * 298.0) * 20.5 / 1.846e-5
+
+        assert np.isclose(bl['delta_star'][-1], .04775 * 20.5 / Re**.2, rtol=.05)
+        assert np.all(np.diff(bl['delta_star'][1:]) > 0.0)
+        assert np.isclose(bl['H'][-1], 1.38, atol=.03)
+
+        fine = boundary_layer.boundary_layer_march(20.5, M_pod=.8, M_duct=.8, num_stations=201)
+        assert np.isclose(bl['delta_star'][-1], fine['delta_star'][-1], rtol=.01)
+
+    def test_case2_vectorized(self):
+
+        L = np.array([15.0, 20.5, 30.0])
+        x_tr = np.array([[0.0], [4.0]])
+        bl = boundary_layer.boundary_layer_march(L, M_pod=.8, M_duct=.95, x_tr=x_tr)
+        assert bl['delta_star'].shape == (2, 3, 11)
+
+        for i in range(2):
+            for j in range(3):
+                single = boundary_layer.boundary_layer_march(L[j], M_pod=.8, M_duct=.95, x_tr=x_tr[i, 0])
+                assert np.allclose(bl['delta_star'][i, j], single['delta_star'], rtol=1.0e-10)
+
+        # a laminar run ahead of the turbulent layer leaves a thinner layer at the tail
+        assert np.all(bl['delta_star'][1, :, -1] < bl['delta_star'][0, :, -1])
+
+    def test_case3_pod_mach(self):
+
+        prob = create_problem(PodMach(boundary_layer='march'))
+        prob.setup(check=False)
+        prob.run()
+
+        bl = boundary_layer.boundary_layer_march(20.5)
+        r_pod = np.sqrt(3.0536 / np.pi)
+        A_bl = np.pi * ((r_pod + bl['delta_star'][-1])**2 - r_pod**2)
+        assert np.isclose(prob['comp.A_tube'] - prob['comp.A_duct_eff'], 3.0536 + A_bl, rtol=1.0e-10)
+
+        flat = pod_mach_sizing(boundary_layer='flat_plate')
+        assert np.isclose(prob['comp.A_tube'], flat['A_tube'], rtol=.05)
+
+        # the marched boundary layer is the default
+        default = create_problem(PodMach())
+        default.setup(check=False)
+        default.run()
+        assert np.isclose(default['comp.A_tube'], prob['comp.A_tube'], rtol=1.0e-12)
+        assert np.isclose(pod_mach_sizing()['A_tube'], prob['comp.A_tube'], rtol=1.0e-12)
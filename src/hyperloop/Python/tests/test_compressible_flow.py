@@ -0,0 +1,56 @@
+import numpy as np
+
+from hyperloop.Python.tools import compressible_flow as cf
+from hyperloop.Python.pod.pod_mach import PodMach
+
+class TestCompressibleFlow(object):
+    def test_case1_vs_tables(self):
+
+        # Isentropic, normal shock and Fanno tables at M = 2, gam = 1.4
+        assert np.isclose(cf.area_ratio(2.0), 1.6875, rtol=1.0e-4)
+        assert np.isclose(cf.P_Pt(2.0), .12780, rtol=1.0e-4)
+        assert np.isclose(cf.T_Tt(2.0), .55556, rtol=1.0e-4)
+
+        M2, P2_P1, T2_T1, rho2_rho1, Pt2_Pt1 = cf.normal_shock(2.0)
+        assert np.isclose(M2, .57735, rtol=1.0e-4)
+        assert np.isclose(P2_P1, 4.5, rtol=1.0e-10)
+        assert np.isclose(T2_T1, 1.6875, rtol=1.0e-4)
+        assert np.isclose(Pt2_Pt1, .72087, rtol=1.0e-4)
+
+        fL_D, P_Pstar, T_Tstar, Pt_Ptstar, V_Vstar = cf.fanno(2.0)
+        assert np.isclose(fL_D, .30500, rtol=1.0e-3)
+        assert np.isclose(P_Pstar, .40825, rtol=1.0e-4)
+        assert np.isclose(Pt_Ptstar, 1.6875, rtol=1.0e-4)
+
+    def test_case2_inverse(self):
+
+        gam = np.array([1.2, 1.3, 1.4, 1.67])[:, np.newaxis]
+        M_sub = np.linspace(.01, .99, 50)
+        M_sup = np.linspace(1.01, 8.0, 50)
+
+        assert np.allclose(cf.mach_from_area_ratio(cf.area_ratio(M_sub, gam), gam), M_sub, rtol=1.0e-8)
+        assert np.allclose(cf.mach_from_area_ratio(cf.area_ratio(M_sup, gam), gam, supersonic=True),
+                           M_sup, rtol=1.0e-8)
+        assert np.all(cf.mach_from_area_ratio(np.array([.5, 1.0]), 1.4) == 1.0)
+
+        # mass flow through a 1 m**2 duct at M = .6
+        Pt, Tt, R = 850.0, 320.0, 287.0
+        W = cf.mass_flow_param(.6) * Pt / np.sqrt(R * Tt)
+        assert np.isclose(cf.mach_from_mass_flow(W, 1.0, Pt, Tt), .6, rtol=1.0e-10)
+
+    def test_case3_pod_mach_on_arrays(self):
+
+        comp = PodMach()
+        params = dict((name, meta['val']) for name, meta in comp._init_params_dict.items())
+        M_pod = np.array([.5, .7, .8, .9])
+        params['M_pod'] = M_pod
+
+        unknowns = {}
+        comp.solve_nonlinear(params, unknowns, {})
+
+        for i, M in enumerate(M_pod):
+            params['M_pod'] = M
+            single = {}
+            comp.solve_nonlinear(params, single, {})
+            assert np.isclose(unknowns['A_tube'][i], single['A_tube'], rtol=1.0e-12)
+            assert np.isclose(unknowns['A_inlet'][i], single['A_inlet'], rtol=1.0e-12)
@@ -0,0 +1,59 @@
+import numpy as np
+from openmdao.api import Group, Problem
+
+from hyperloop.Python.tube import continuous_beam
+
+def create_problem(component):
+    root = Group()
+    prob = Problem(root)
+    prob.root.add('comp', component)
+    return prob
+
+class TestContinuousBeam(object):
+    def test_case1_single_span(self):
+
+        # One span reduces to the simply supported formulas used by TubeAndPylon
+        L = 50.0
+        EI = 1.0e10
+        q = 1.0e4
+        P = 1.0e5
+        solver = continuous_beam.ContinuousBeamSolver(1, L, EI, q, elems_per_span=3)
+        res = solver.solve(np.array([0.0, .5 * L]), P)
+
+        assert np.isclose(res['delta'][0], 5.0 * q * L**4 / (384.0 * EI), rtol=1.0e-10)
+        assert np.isclose(res['M_sag'][0], q * L**2 / 8.0, rtol=1.0e-10)
+        assert np.isclose(res['delta'][1], 5.0 * q * L**4 / (384.0 * EI) + P * L**3 / (48.0 * EI),
+                          rtol=1.0e-10)
+        assert np.isclose(res['M_sag'][1], q * L**2 / 8.0 + P * L / 4.0, rtol=1.0e-10)
+
+    def test_case2_two_spans(self):
+
+        # Two equal spans, hogging moment qL**2/8 and reaction 1.25qL over the middle pylon
+        L = 50.0
+        q = 1.0e4
+        solver = continuous_beam.ContinuousBeamSolver(2, L, 1.0e10, q)
+        res = solver.solve(np.array([0.0]), 0.0)
+
+        assert np.isclose(res['M_hog'][0], q * L**2 / 8.0, rtol=1.0e-10)
+        assert np.isclose(res['M_sag'][0], 9.0 * q * L**2 / 128.0, rtol=1.0e-10)
+        assert np.allclose(res['R'][0], [.375 * q * L, 1.25 * q * L, .375 * q * L], rtol=1.0e-10)
+
+    def test_case3_component(self):
+
+        component = continuous_beam.ContinuousBeam(num_spans=8, num_loads=41)
+        prob = create_problem(component)
+        prob.setup(check=False)
+
+        prob['comp.pod_x'] = np.linspace(0.0, 400.0, 41)
+        prob['comp.m_pod'] = 15000.0
+        prob.run()
+
+        r = np.sqrt(41.0 / np.pi)
+        q = 7820.0 * np.pi * (((r + .05)**2) - (r**2)) * 9.81
+
+        # Pylon reactions balance the tube and pod weight in every load case
+        res = component._solver.solve(prob['comp.pod_x'], 15000.0 * 9.81)
+        assert np.allclose(np.sum(res['R'], axis=1), q * 400.0 + 15000.0 * 9.81, rtol=1.0e-10)
+        assert prob['comp.max_moment'] < q * 50.0**2 / 8.0 + 15000.0 * 9.81 * 50.0 / 4.0
+        assert prob['comp.max_R'] > q * 50.0
+        assert prob['comp.von_mises'] > 0.0
@@ -0,0 +1,56 @@
+import os
+import numpy as np
+import pytest
+
+from hyperloop.Python.cost_engine import CostEngine
+from hyperloop.Python.ticket_cost import cost_model
+from hyperloop.Python.tools.startup_benchmark import tube_and_pod_problem
+
+@pytest.fixture(scope='module')
+def engine():
+    prob = tube_and_pod_problem(thermo='ideal')
+    prob.setup(check=False, out_stream=open(os.devnull, 'w'))
+    prob.run()
+    return CostEngine(prob)
+
+class TestCostEngine(object):
+    def test_case1_frozen_solution(self, engine):
+
+        prob = engine.prob
+        assert np.isclose(engine.evaluate()['ticket_cost'], prob['TubeAndPod.cost.ticket_cost'], rtol=1.0e-12)
+        assert 'pod_power' in engine.physics_params
+        assert 'n_passengers' in engine.pricing_params
+
+        pod_period = np.linspace(60.0, 300.0, 7)
+        energy_cost = np.array([[.1], [.13], [.2]])
+        out = engine.evaluate(pod_period=pod_period, energy_cost=energy_cost)
+        assert out['ticket_cost'].shape == (3, 7)
+        single = engine.evaluate(pod_period=pod_period[4], energy_cost=.2)
+        assert np.isclose(out['ticket_cost'][2, 4], single['ticket_cost'], rtol=1.0e-12)
+        assert np.isclose(out['num_pods'][2, 4], single['num_pods'])
+
+        with pytest.raises(ValueError):
+            engine.evaluate(pod_power=1.0e6)
+
+    def test_case2_invalidation(self, engine):
+
+        prob = engine.prob
+
+        # bond terms only reach the cost component
+        engine.set('des_vars.ib', .05)
+        engine.set('des_vars.bm', 30.0)
+        assert engine.physics_runs == 0
+        ticket = engine.evaluate()['ticket_cost']
+        prob.run()
+        assert np.isclose(ticket, prob['TubeAndPod.cost.ticket_cost'], rtol=1.0e-10)
+
+        # setting the same tube pressure again isn't a change
+        engine.set('des_vars.tube_pressure', prob['des_vars.tube_pressure'])
+        engine.evaluate()
+        assert engine.physics_runs == 0
+
+        engine.set('des_vars.tube_pressure', 900.0)
+        ticket = engine.evaluate()['ticket_cost']
+        assert engine.physics_runs == 1
+        assert np.isclose(ticket, prob['TubeAndPod.cost.ticket_cost'], rtol=1.0e-12)
+        assert np.isclose(engine.physics()['p_tunnel'], 900.0)
@@ -0,0 +1,43 @@
+import numpy as np
+
+from hyperloop.Python import cost_uncertainty
+from hyperloop.Python.ticket_cost import cost_model
+from hyperloop.Python.pod.cycle import cycle_surrogate
+from hyperloop.Python.tests.test_cycle_surrogate import linear_table
+
+class TestCostUncertainty(object):
+    def test_case1_quantiles(self):
+
+        # ticket cost is linear in capital_cost, so its quantiles map directly
+        dist = {'capital_cost': ('uniform', 5.0e9, 1.5e10)}
+        res = cost_uncertainty.monte_carlo(dist, n=25000, chunk_size=10000)
+
+        assert len(res['samples']) == 25000
+        p = cost_uncertainty.default_params()
+        for q in (.05, .5, .95):
+            p['capital_cost'] = 5.0e9 + q * 1.0e10
+            assert np.isclose(res['quantiles'][q], cost_model(p)['ticket_cost'], rtol=.01)
+
+    def test_case2_tornado(self):
+
+        dist = {'capital_cost': ('lognormal', 1.0e10, .3),
+                'ib': ('normal', .04, .001),
+                'bm': ('triangular', 15.0, 20.0, 30.0)}
+        res = cost_uncertainty.monte_carlo(dist, n=20000)
+
+        names = [row[0] for row in res['tornado']]
+        assert names == ['capital_cost', 'bm', 'ib']
+        name, lo, hi, out_lo, out_hi = res['tornado'][0]
+        assert lo < hi and out_lo < out_hi
+        name, lo, hi, out_lo, out_hi = res['tornado'][1]
+        assert out_lo > out_hi
+
+    def test_case3_surrogate_physics(self):
+
+        table = cycle_surrogate.CycleTable(linear_table())
+        table.max_rel_err = np.array([.01])
+        physics = cost_uncertainty.CyclePowerUncertainty(table, {'tube_temp': ('uniform', 295.0, 325.0)})
+
+        res = cost_uncertainty.monte_carlo({'energy_cost': ('uniform', .1, .15)}, n=5000, physics=physics)
+        assert res['std'] > 0.0
+        assert 'pod_power' in [row[0] for row in res['tornado']]
@@ -0,0 +1,90 @@
+"""
+Test for cycle_surrogate.py. Uses a synthetic table that is linear in every input,
+so interpolated values are exact.
+"""
+from __future__ import print_function
+
+import numpy as np
+from openmdao.api import Group, Problem, IndepVarComp
+
+from hyperloop.Python.pod.cycle import cycle_surrogate
+from hyperloop.Python.pod.cycle.flow_path_inputs import FlowPathInputs
+
+def create_problem(GroupName):
+    root = Group()
+    prob = Problem(root)
+    prob.root.add('Cycle', GroupName)
+    return prob
+
+def linear_table():
+    axes = (np.linspace(.6, 1.0, 3), np.linspace(500., 1500., 3), np.linspace(290., 330., 2),
+            np.linspace(1.5, 3.0, 3), np.linspace(6., 14., 3))
+    M, p, T, A, PR = np.meshgrid(*axes, indexing='ij')
+
+    table = {}
+    for (name, path, units), a in zip(cycle_surrogate.CYCLE_INPUTS, axes):
+        table[name] = a
+    for k, (name, path, units) in enumerate(cycle_surrogate.CYCLE_OUTPUTS):
+        table['out_' + name] = (k + 1.0) * (M + p / 1000.0 + T / 300.0 + A + PR / 10.0)
+    table['Ps_exhaust'] = np.array(0.05588)
+    return table
+
+class TestCycleSurrogate(object):
+    def test_case1_interpolation(self):
+
+        prob = create_problem(cycle_surrogate.CycleSurrogate(linear_table()))
+
+        params = (('comp_PR', 12.6, {'units': 'unitless'}),
+              ('PsE', 0.05588, {'units': 'psi'}),
+              ('pod_mach_number', .8, {'units': 'unitless'}),
+              ('tube_pressure', 850., {'units': 'Pa'}),
+              ('tube_temp', 320., {'units': 'K'}),
+              ('comp_inlet_area', 2.3884, {'units': 'm**2'}))
+
+        prob.root.add('des_vars', IndepVarComp(params))
+
+        prob.root.connect('des_vars.comp_PR', 'Cycle.comp.map.PRdes')
+        prob.root.connect('des_vars.PsE', 'Cycle.nozzle.Ps_exhaust')
+        prob.root.connect('des_vars.pod_mach_number', 'Cycle.pod_mach')
+        prob.root.connect('des_vars.tube_pressure', 'Cycle.tube_pressure')
+        prob.root.connect('des_vars.tube_temp', 'Cycle.tube_temp')
+        prob.root.connect('des_vars.comp_inlet_area', 'Cycle.comp_inlet_area')
+
+        prob.setup(check=False)
+        prob.run()
+
+        f = .8 + .85 + 320.0 / 300.0 + 2.3884 + 1.26
+
+        assert np.isclose(prob['Cycle.comp.power'], f, rtol=1.0e-10)
+        assert np.isclose(prob['Cycle.comp.trq'], 2.0 * f, rtol=1.0e-10)
+        assert np.isclose(prob['Cycle.comp.Fl_O:stat:area'], 3.0 * f, rtol=1.0e-10)
+        assert np.isclose(prob['Cycle.nozzle.Fg'], 4.0 * f, rtol=1.0e-10)
+        assert np.isclose(prob['Cycle.inlet.F_ram'], 5.0 * f, rtol=1.0e-10)
+        assert np.isclose(prob['Cycle.nozzle.Fl_O:tot:T'], 6.0 * f, rtol=1.0e-10)
+        assert np.isclose(prob['Cycle.nozzle.Fl_O:stat:W'], 7.0 * f, rtol=1.0e-10)
+        assert np.isclose(prob['Cycle.comp_len'], 8.0 * f, rtol=1.0e-10)
+        assert np.isclose(prob['Cycle.comp_mass'], 9.0 * f, rtol=1.0e-10)
+
+        # mass flow comes from FlowPathInputs, as in Cycle
+        ref = Problem(Group())
+        ref.root.add('comp', FlowPathInputs())
+        ref.setup(check=False)
+        ref['comp.pod_mach'] = .8
+        ref['comp.tube_pressure'] = 850.
+        ref['comp.tube_temp'] = 320.
+        ref['comp.comp_inlet_area'] = 2.3884
+        ref.run()
+        assert np.isclose(prob['Cycle.FlowPathInputs.m_dot'], ref['comp.m_dot'], rtol=1.0e-10)
+
+    def test_case2_saved_table(self, tmpdir):
+
+        fname = str(tmpdir.join('cycle_table.npz'))
+        np.savez(fname, **linear_table())
+        table = cycle_surrogate.CycleTable(fname)
+
+        points = np.array([[.7, 600., 300., 2.0, 8.0], [.95, 1400., 310., 2.9, 13.0]])
+        values = table.evaluate(points)
+        f = points[:, 0] + points[:, 1] / 1000.0 + points[:, 2] / 300.0 + points[:, 3] + points[:, 4] / 10.0
+
+        assert np.allclose(values, f[:, np.newaxis] * np.arange(1.0, 10.0), rtol=1.0e-10)
+        assert table.error_bounds() == {}
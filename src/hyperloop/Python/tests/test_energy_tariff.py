@@ -0,0 +1,119 @@
+import numpy as np
+from openmdao.api import Group, Problem
+
+from hyperloop.Python import energy_tariff
+from hyperloop.Python.ticket_cost import TicketCost, cost_model
+from hyperloop.Python.tube.tube_vacuum import Vacuum
+
+def create_problem(component):
+    root = Group()
+    prob = Problem(root)
+    prob.root.add('comp', component)
+    return prob
+
+class TestEnergyTariff(object):
+    def test_case1_tariffs(self):
+
+        price = energy_tariff.time_of_use_tariff(.08, .20, shoulder=.12)
+        assert price.shape == (8760,)
+
+        # Monday January 1st and Saturday January 6th
+        assert price[17] == .20 and price[8] == .12 and price[3] == .08
+        assert price[5 * 24 + 17] == .08
+
+        hours = energy_tariff.operating_hours(16.0 * 3600.0, 20.5)
+        assert np.isclose(hours.sum(), 16.0 * 365)
+        assert hours[20] == .5 and hours[12] == .5 and hours[0] == 1.0 and hours[15] == 0.0
+
+        stack = energy_tariff.operating_hours(np.array([3600.0, 7200.0]))
+        assert np.allclose(stack.sum(axis=-1), [365.0, 730.0])
+
+    def test_case2_annual_cost(self):
+
+        rng = np.random.RandomState(0)
+        demand = energy_tariff.annual_demand(rng.uniform(100.0, 500.0, 24), weekly=[1, 1, 1, 1, 1, .5, .5])
+        tariffs = np.array([energy_tariff.time_of_use_tariff(lo, hi) for lo, hi in [(.05, .3), (.1, .2)]])
+
+        cost = energy_tariff.annual_energy_cost(tariffs, demand)
+        assert cost.shape == (2,)
+        assert np.isclose(cost[1], sum(tariffs[1, h] * demand[h] for h in range(8760)))
+        assert np.isclose(energy_tariff.annual_energy_cost(energy_tariff.flat_tariff(.13), demand), .13 * demand.sum())
+
+        # one day of 1 MW at 1 s resolution, starting at 6:00
+        t = np.arange(24 * 3600.0)
+        daily = energy_tariff.hourly_profile(t, np.where(t < 3600.0, 1.0e6, 0.0))
+        assert np.isclose(daily[6], 1000.0) and np.isclose(daily.sum(), 1000.0)
+
+    def test_case3_ticket_cost(self):
+
+        prob = create_problem(TicketCost(tariff=True))
+        prob.setup(check=False)
+        prob.run()
+        flat = prob['comp.ticket_cost']
+
+        # a flat curve reproduces energy_cost, a curve charging only outside the operating window is free
+        ref = create_problem(TicketCost())
+        ref.setup(check=False)
+        ref.run()
+        assert np.isclose(flat, ref['comp.ticket_cost'])
+
+        prob['comp.hourly_energy_cost'] = .13 * (1.0 - energy_tariff.operating_hours(16.0 * 3600.0, 6.0))
+        prob.run()
+        assert np.isclose(prob['comp.total_energy_cost'], 0.0)
+        assert np.isclose(prob['comp.tube_energy_cost'], 0.0)
+
+        # propulsion drawn only from 17:00 to 19:00 is costed at the peak price
+        price = energy_tariff.time_of_use_tariff(.10, .30, peak_hours=(16.0, 21.0), weekend_off_peak=False)
+        prob['comp.hourly_energy_cost'] = price
+        prob['comp.prop_demand'] = np.where((np.arange(24) >= 17) & (np.arange(24) < 19), 500.0, 0.0)
+        prob.run()
+        assert np.isclose(prob['comp.prop_energy_cost'], ref['comp.prop_energy_cost'] * .30 / .13)
+
+        # and is costed with annual_energy_cost against the hourly demand
+        daily = ref['comp.prop_energy_cost'] / (.13 * 365.0)
+        demand = energy_tariff.annual_demand(prob['comp.prop_demand'] * daily / 1000.0)
+        assert np.isclose(prob['comp.prop_energy_cost'], energy_tariff.annual_energy_cost(price, demand))
+
+    def test_case4_vacuum(self):
+
+        # pumps running 12 hours a day from 18:00, all of it in the peak hours 18:00 to 6:00
+        price = np.tile(np.where((np.arange(24) >= 6) & (np.arange(24) < 18), .10, .20), 365)
+        prob = create_problem(Vacuum(tariff=True))
+        prob.setup(check=False)
+        prob['comp.hourly_electricity_price'] = price
+        prob['comp.gamma'] = .5
+        prob['comp.start_hour'] = 18.0
+        prob.run()
+
+        ref = create_problem(Vacuum())
+        ref.setup(check=False)
+        ref['comp.gamma'] = .5
+        ref['comp.electricity_price'] = .20
+        ref.run()
+        assert np.isclose(prob['comp.cost_annual'], ref['comp.cost_annual'])
+
+        # the same pumps running all day pay the mean price
+        prob['comp.gamma'] = 1.0
+        prob.run()
+        ref['comp.gamma'] = 1.0
+        ref['comp.electricity_price'] = .15
+        ref.run()
+        assert np.isclose(prob['comp.cost_annual'], ref['comp.cost_annual'])
+
+    def test_case5_tariff_scenarios(self):
+
+        # many pod_period scenarios priced by one tariff in one call
+        prob = create_problem(TicketCost(tariff=True))
+        prob.setup(check=False)
+        prob['comp.hourly_energy_cost'] = energy_tariff.time_of_use_tariff(.08, .25)
+        prob['comp.prop_demand'] = np.linspace(100.0, 500.0, 24)
+        p = dict((name, prob['comp.' + name]) for name in prob.root.comp.params.keys())
+        p['pod_period'] = np.linspace(60.0, 600.0, 2000)
+        out = cost_model(p)
+        assert out['total_energy_cost'].shape == (2000,)
+
+        for i in (0, 1234):
+            prob['comp.pod_period'] = p['pod_period'][i]
+            prob.run()
+            for name in ('prop_energy_cost', 'tube_energy_cost', 'total_energy_cost', 'ticket_cost'):
+                assert np.isclose(out[name][i], prob['comp.' + name], rtol=1.0e-12)
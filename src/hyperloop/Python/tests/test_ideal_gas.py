@@ -0,0 +1,70 @@
+"""
+Test for ideal_gas.py. The frozen air Cycle is compared with the NPSS values used in test_cycle_group.
+"""
+from __future__ import print_function
+
+import numpy as np
+from openmdao.api import Group, Problem, IndepVarComp
+from openmdao.units.units import convert_units as cu
+
+from hyperloop.Python.pod.cycle import cycle_group, ideal_gas
+
+def create_problem(GroupName):
+    root = Group()
+    prob = Problem(root)
+    prob.root.add('Cycle', GroupName)
+    return prob
+
+class TestIdealGas(object):
+    def test_case1_thermo(self):
+
+        thermo = ideal_gas.get_air_thermo()
+        T = np.linspace(200.0, 3000.0, 50)
+
+        assert np.isclose(thermo.R, 287.05, rtol=1.0e-4)
+        assert np.isclose(thermo.cp(300.0), 1005.0, rtol=.005)
+        assert np.allclose(thermo.T_from_h(thermo.h(T)), T, rtol=1.0e-10)
+        assert np.allclose(thermo.T_from_s0(thermo.s0(T)), T, rtol=1.0e-10)
+
+        # Isentropic relations of a calorically perfect gas at low temperature
+        Ts, Ps, V = thermo.static_from_MN(1000.0, 250.0, .5)
+        gam = thermo.gamma(Ts)
+        assert np.isclose(Ts, 250.0 / (1.0 + .5 * (gam - 1.0) * .25), rtol=1.0e-3)
+        assert np.isclose(V, .5 * np.sqrt(gam * thermo.R * Ts), rtol=1.0e-10)
+
+    def test_case2_cycle_vs_npss(self):
+
+        prob = create_problem(cycle_group.Cycle(thermo='ideal'))
+
+        params = (('comp_PR', 12.6, {'units': 'unitless'}),
+              ('PsE', 0.05588, {'units': 'psi'}),
+              ('pod_mach_number', .8, {'units': 'unitless'}),
+              ('tube_pressure', 850., {'units': 'Pa'}),
+              ('tube_temp', 320., {'units': 'K'}),
+              ('comp_inlet_area', 2.3884, {'units': 'm**2'}))
+
+        prob.root.add('des_vars', IndepVarComp(params))
+
+        prob.root.connect('des_vars.comp_PR', 'Cycle.comp.map.PRdes')
+        prob.root.connect('des_vars.PsE', 'Cycle.nozzle.Ps_exhaust')
+        prob.root.connect('des_vars.pod_mach_number', 'Cycle.pod_mach')
+        prob.root.connect('des_vars.tube_pressure', 'Cycle.tube_pressure')
+        prob.root.connect('des_vars.tube_temp', 'Cycle.tube_temp')
+        prob.root.connect('des_vars.comp_inlet_area', 'Cycle.comp_inlet_area')
+
+        prob.setup(check=False)
+
+        prob['Cycle.CompressorMass.comp_eff'] = 91.0
+        prob['Cycle.CompressorLen.h_stage'] = 58.2
+
+        prob.run()
+
+        assert np.isclose(prob['Cycle.comp_len'], 3.579, rtol=.005)
+        assert np.isclose(prob['Cycle.comp_mass'], 774.18, rtol=.005)
+        assert np.isclose(cu(prob['Cycle.comp.trq'], 'ft*lbf', 'N*m'), -2622.13, rtol=.005)
+        assert np.isclose(cu(prob['Cycle.comp.power'], 'hp', 'W'), -2745896.44, rtol=.005)
+        assert np.isclose(cu(prob['Cycle.comp.Fl_O:stat:area'], 'inch**2', 'm**2'), 0.314, rtol=.005)
+        assert np.isclose(cu(prob['Cycle.nozzle.Fg'], 'lbf', 'N'), 6562.36, rtol=.005)
+        assert np.isclose(cu(prob['Cycle.inlet.F_ram'], 'lbf', 'N'), 1855.47, rtol=.005)
+        assert np.isclose(cu(prob['Cycle.nozzle.Fl_O:tot:T'], 'degR', 'K'), 767.132, rtol=.005)
+        assert np.isclose(cu(prob['Cycle.nozzle.Fl_O:stat:W'], 'lbm/s', 'kg/s'), 6.467, rtol=.005)
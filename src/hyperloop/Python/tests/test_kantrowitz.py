@@ -0,0 +1,51 @@
+import numpy as np
+from openmdao.api import Group, Problem
+
+from hyperloop.Python.pod import kantrowitz
+from hyperloop.Python.pod.pod_mach import PodMach
+
+def create_problem(component):
+    root = Group()
+    prob = Problem(root)
+    prob.root.add('comp', component)
+    return prob
+
+class TestKantrowitz(object):
+    def test_case1_limit_surface(self):
+
+        M_pod = np.linspace(.1, .95, 50)[:, np.newaxis]
+        gam = np.array([1.3, 1.4, 1.67])
+
+        BR = kantrowitz.limit_blockage(M_pod, 1.0, gam)
+        assert np.all(np.diff(BR, axis=0) < 0.0)
+        assert np.allclose(kantrowitz.limit_mach(BR, 1.0, gam), M_pod, rtol=1.0e-8)
+
+        kmap = kantrowitz.get_kantrowitz_map()
+        assert kmap is kantrowitz.get_kantrowitz_map()
+        assert kmap.max_abs_err < 2.0e-4
+        assert np.allclose(kmap.mach(BR, 1.0, gam), M_pod, atol=2.0e-4)
+
+    def test_case2_tube_area_vs_pod_mach(self):
+
+        prob = create_problem(PodMach())
+        prob.setup(check=False)
+        prob.run()
+
+        A_tube = prob['comp.A_tube']
+
+        # PodMach sizes the tube so the bypass runs at M_duct
+        A_pod = prob['comp.A_tube'] - prob['comp.A_duct_eff']
+        assert np.isclose(kantrowitz.tube_area(A_pod, prob['comp.A_inlet'], .8, .95), A_tube, rtol=1.0e-12)
+
+        for use_table in (False, True):
+            prob = create_problem(kantrowitz.KantrowitzLimit(use_table=use_table))
+            prob.setup(check=False)
+            prob['comp.A_pod'] = A_pod
+            prob['comp.A_inlet'] = 2.3884 * kantrowitz.mach_to_area(.6, .8)
+            prob['comp.A_tube'] = A_tube
+            prob['comp.M_duct'] = .95
+            prob.run()
+
+            assert np.isclose(prob['comp.M_limit'], .8, atol=2.0e-4)
+            assert np.isclose(prob['comp.A_tube_min'], A_tube, rtol=1.0e-12)
+            assert np.isclose(prob['comp.BR'], prob['comp.BR_limit'], rtol=1.0e-12)
@@ -0,0 +1,76 @@
+import numpy as np
+from openmdao.api import Group, Problem
+
+from hyperloop.Python import lifecycle_cost
+from hyperloop.Python.ticket_cost import cost_model
+
+def create_problem(component):
+    root = Group()
+    prob = Problem(root)
+    prob.root.add('comp', component)
+    return prob
+
+def default_params():
+    return dict((name, meta['val']) for name, meta in lifecycle_cost.LifecycleCost()._init_params_dict.items())
+
+class TestLifecycleCost(object):
+    def test_case1_cash_flows(self):
+
+        p = default_params()
+        res = lifecycle_cost.lifecycle_model(p)
+        out = cost_model(p)
+        build = 2.437e6 * 600.0 + 1.0e10
+
+        assert res['cash_flow'].shape == (35,)
+        assert np.isclose(res['construction'].sum(), build)
+        assert np.isclose(res['operations'][5], .02 * build + out['total_energy_cost'])
+        assert np.isclose(res['operations'][6], 1.02 * res['operations'][5])
+
+        # fleet bought in years 5, 15 and 25, batteries in years 9, 13, 17, 21, 29 and 33
+        pods = np.nonzero(res['fleet'] >= out['num_pods'] * 1.0e6)[0]
+        batteries = np.nonzero((res['fleet'] > 0.0) & (res['fleet'] < out['num_pods'] * 1.0e6))[0]
+        assert list(pods) == [5, 15, 25]
+        assert list(batteries) == [9, 13, 17, 21, 29, 33]
+
+        discount = 1.04**-np.arange(35.0)
+        assert np.isclose(res['npv'], np.sum(discount * res['cash_flow']))
+
+    def test_case2_scenarios(self):
+
+        p = default_params()
+        p['discount_rate'] = np.array([.02, .05, .08])
+        p['construction_years'] = np.array([3.0, 5.0, 8.0])
+        p['ticket_price'] = 400.0
+        res = lifecycle_cost.lifecycle_model(p)
+        assert res['cash_flow'].shape == (38, 3)
+
+        for k in range(3):
+            single = default_params()
+            single['discount_rate'] = p['discount_rate'][k]
+            single['construction_years'] = p['construction_years'][k]
+            single['ticket_price'] = 400.0
+            ref = lifecycle_cost.lifecycle_model(single)
+            n = len(ref['years'])
+            assert np.allclose(res['cash_flow'][:n, k], ref['cash_flow'])
+            assert np.allclose(res['cash_flow'][n:, k], 0.0)
+            assert np.isclose(res['npv'][k], ref['npv'])
+            assert res['payback_year'][k] == ref['payback_year']
+
+        # selling at the break even price gives zero npv
+        p['ticket_price'] = res['break_even_ticket']
+        assert np.allclose(lifecycle_cost.lifecycle_model(p)['npv'], 0.0, atol=1.0)
+
+    def test_case3_component(self):
+
+        prob = create_problem(lifecycle_cost.LifecycleCost())
+        prob.setup(check=False)
+        prob['comp.ticket_price'] = 400.0
+        prob.run()
+
+        p = default_params()
+        p['ticket_price'] = 400.0
+        res = lifecycle_cost.lifecycle_model(p)
+        assert np.isclose(prob['comp.npv'], res['npv'])
+        assert np.isclose(prob['comp.break_even_ticket'], res['break_even_ticket'])
+        assert prob['comp.payback_year'] > 5.0
+        assert np.isclose(prob['comp.ticket_cost'], cost_model(p)['ticket_cost'])
@@ -0,0 +1,70 @@
+import numpy as np
+
+from hyperloop.Python import network_planner
+
+corridors = {'land': {'water_fraction': 0.0},
+             'water': {'water_fraction': 1.0, 'depth': 20.0}}
+demand = {('A', 'C'): 100.0, ('B', 'C'): 50.0, ('A', 'D'): 10.0}
+
+def per_km(attrs):
+    # a surrogate of the physics, with underwater corridors dearer and slower
+    water = attrs['water_fraction']
+    return {'cost_per_km': 1.0e6 * (1.0 + water), 'time_per_km': 4.0 * (1.0 + .5 * water)}
+
+def create_planner():
+    planner = network_planner.NetworkPlanner(per_km, corridors, demand)
+    planner.add_link('A', 'B', 100.0, 'land')
+    planner.add_link('B', 'C', 100.0, 'land')
+    planner.add_link('A', 'C', 150.0, 'water')
+    planner.add_link('C', 'D', 50.0, 'land')
+    return planner
+
+class TestNetworkPlanner(object):
+    def test_case1_routes(self):
+
+        planner = create_planner()
+        res = planner.evaluate([planner.links, [('A', 'B'), ('C', 'B'), ('C', 'D')]])
+
+        assert np.allclose(res['build_cost'], [250.0e6 + 300.0e6, 250.0e6])
+        assert np.allclose(res['served'], 160.0)
+
+        # across the water is shorter but slower than the land route through B
+        time, path = res['routes'][0][('A', 'C')]
+        assert path == ['A', 'B', 'C'] and np.isclose(time, 800.0)
+        assert res['trunk'][0] == [('A', 'B'), ('B', 'C')]
+        assert np.isclose(res['flow'][0][('B', 'C')], 160.0)
+        assert res['flow'][0][('A', 'C')] == 0.0
+        assert np.isclose(res['mean_time'][1], (100.0 * 800.0 + 50.0 * 400.0 + 10.0 * 1000.0) / 160.0)
+
+    def test_case2_cached_physics(self):
+
+        planner = create_planner()
+        masks = np.array([[True, True, False, True], [False, True, True, True], [True, False, False, False]])
+        res = planner.evaluate(masks)
+        assert planner.physics_runs == 2
+
+        # unserved demand pairs have no route
+        assert res['served'][2] == 0.0
+        assert res['routes'][2][('A', 'C')] == (np.inf, None)
+
+        # new links of known corridor types don't rerun the physics
+        planner.add_link('B', 'D', 120.0, 'land')
+        planner.add_link('A', 'D', 300.0, 'water')
+        planner.evaluate([planner.links])
+        assert planner.physics_runs == 2
+
+        planner.add_corridor('tunnel', {'water_fraction': .5})
+        planner.add_link('B', 'D', 120.0, 'tunnel')
+        planner.evaluate([planner.links])
+        assert planner.physics_runs == 3
+
+    def test_case3_processes(self):
+
+        planner = create_planner()
+        masks = np.array([[True, True, False, True], [False, True, True, True], [True, True, True, True]])
+        serial = planner.evaluate(masks)
+        pool = planner.evaluate(masks, processes=2)
+
+        assert np.allclose(serial['build_cost'], pool['build_cost'])
+        assert np.allclose(serial['mean_time'], pool['mean_time'])
+        assert serial['routes'] == pool['routes']
@@ -0,0 +1,60 @@
+import numpy as np
+from openmdao.api import Group, Problem
+
+from hyperloop.Python.pod.cycle import off_design, ideal_gas
+
+def create_problem(component):
+    root = Group()
+    prob = Problem(root)
+    prob.root.add('comp', component)
+    return prob
+
+class TestOffDesign(object):
+    def test_case1_design_point(self):
+
+        cycle = off_design.OffDesignCycle.from_design(pod_mach=.8, tube_pressure=850., tube_temp=320.,
+                                                      comp_inlet_area=2.3884, PRdes=12.6)
+
+        thermo = ideal_gas.get_air_thermo()
+        V = .8 * np.sqrt(thermo.gamma(320.0) * thermo.R * 320.0)
+        op = cycle.evaluate(np.array([V]), 850.0, 320.0)
+
+        # Same values as the frozen air Cycle in test_ideal_gas
+        assert op['converged'][0]
+        assert np.isclose(op['PR'][0], 12.6, rtol=.005)
+        assert np.isclose(op['W'][0], 6.467, rtol=.005)
+        assert np.isclose(op['Fg'][0], 6562.36, rtol=.005)
+        assert np.isclose(op['F_ram'][0], 1855.47, rtol=.005)
+        assert np.isclose(op['power'][0], -2745896.44, rtol=.01)
+
+    def test_case2_batched_trajectory(self):
+
+        cycle = off_design.OffDesignCycle.from_design()
+
+        v = np.linspace(100.0, 330.0, 24)
+        p = np.linspace(600.0, 1200.0, 24)
+        op = cycle.evaluate(v, p, 320.0)
+
+        assert np.all(op['converged'])
+        assert np.all(np.diff(op['F_net']) > 0.0)
+
+        single = cycle.evaluate(v[7], p[7], 320.0)
+        assert np.isclose(single['F_net'], op['F_net'][7], rtol=1.0e-10)
+
+        # Restarting from the converged solution takes fewer iterations
+        warm = cycle.evaluate(v * 1.001, p, 320.0, PR_guess=op['PR'])
+        assert warm['iterations'] < op['iterations']
+        assert np.allclose(warm['PR'], cycle.evaluate(v * 1.001, p, 320.0)['PR'], rtol=1.0e-8)
+
+    def test_case3_component(self):
+
+        cycle = off_design.OffDesignCycle.from_design()
+        prob = create_problem(off_design.OffDesignCycleComp(cycle, num_points=5))
+        prob.setup(check=False)
+
+        prob['comp.v'] = np.linspace(200.0, 300.0, 5)
+        prob.run()
+
+        op = cycle.evaluate(np.linspace(200.0, 300.0, 5), 850.0, 320.0)
+        assert np.allclose(prob['comp.F_net'], op['F_net'], rtol=1.0e-8)
+        assert np.allclose(prob['comp.power'], op['power'], rtol=1.0e-8)
@@ -0,0 +1,60 @@
+import numpy as np
+from openmdao.api import Group, Problem
+
+from hyperloop.Python.tube import pressure_distribution
+
+def create_problem(component):
+    root = Group()
+    prob = Problem(root)
+    prob.root.add('comp', component)
+    return prob
+
+class TestTubePressureDistribution(object):
+    def test_case1_vs_analytic(self):
+
+        component = pressure_distribution.TubePressureDistribution(num_nodes=101, num_pumps=1)
+        prob = create_problem(component)
+        prob.setup(check=False)
+
+        prob['comp.tube_area'] = .01
+        prob['comp.tube_length'] = 1000.0
+        prob['comp.T'] = 320.0
+        prob['comp.R'] = 287.0
+        prob['comp.mu'] = 1.846e-5
+        prob['comp.leak_rate'] = 1.0e-9 * np.ones(101)
+        prob['comp.pump_x'] = np.array([500.0])
+        prob['comp.pump_speed'] = np.array([.01])
+
+        prob.run()
+
+        # Single pump removes the total leakage, p**2 is parabolic either side of it
+        q = 1.0e-9 * 287.0 * 320.0
+        K = np.pi * ((.01 / np.pi)**2) / (16.0 * 1.846e-5)
+        p_pump = q * 1000.0 / .01
+        p_end = np.sqrt(p_pump**2 + q * (1000.0**2) / (8.0 * K))
+
+        assert np.isclose(prob['comp.pump_W'][0], 1.0e-6, rtol=1.0e-6)
+        assert np.isclose(prob['comp.p'][50], p_pump, rtol=1.0e-6)
+        assert np.isclose(prob['comp.p_max'], p_end, rtol=1.0e-6)
+
+    def test_case2_mass_balance(self):
+
+        component = pressure_distribution.TubePressureDistribution(num_nodes=501, num_pumps=7)
+        prob = create_problem(component)
+        prob.setup(check=False)
+
+        prob['comp.tube_area'] = 2.0
+        prob['comp.tube_length'] = 100.0e3
+        prob['comp.leak_rate'] = 1.0e-6 * (1.0 + np.sin(np.linspace(0.0, 6.0, 501))**2)
+        prob['comp.pump_x'] = np.array([3.0e3, 11.0e3, 31.7e3, 50.0e3, 62.2e3, 80.0e3, 99.0e3])
+        prob['comp.pump_speed'] = np.array([1.0, 2.0, 1.0, 3.0, 1.0, 2.0, 1.0])
+
+        prob.run()
+
+        x = prob['comp.x']
+        leak = prob['comp.leak_rate']
+        W_leak = np.sum(.5 * (leak[1:] + leak[:-1]) * np.diff(x))
+
+        assert np.isclose(np.sum(prob['comp.pump_W']), W_leak, rtol=1.0e-8)
+        assert np.all(prob['comp.p'] > 0.0)
+        assert prob['comp.pump_power'] > 0.0
@@ -0,0 +1,114 @@
+import numpy as np
+from openmdao.api import Group, Problem
+
+from hyperloop.Python.tube import route_structure, tube_and_pylon
+
+def create_problem(component):
+    root = Group()
+    prob = Problem(root)
+    prob.root.add('comp', component)
+    return prob
+
+class TestRouteStructure(object):
+    def test_case1_flat_route_vs_tube_and_pylon(self):
+
+        # On flat ground with short pylons the spans reduce to TubeAndPylon
+        prob = create_problem(tube_and_pylon.TubeAndPylon())
+        prob.setup(check=False)
+        prob['comp.tube_area'] = 41.0
+        prob['comp.t'] = .05
+        prob['comp.r_pylon'] = .3
+        prob['comp.m_pod'] = 15000.0
+        prob['comp.p_tunnel'] = 850.0
+        prob['comp.h'] = 2.0
+        prob.run()
+
+        spans = route_structure.evaluate_route_spans(np.array([0.0, 100.0e3]),
+                                                     np.zeros(2), 2.0 * np.ones(2),
+                                                     41.0, .05, .3, 15000.0, p_tunnel=850.0)
+
+        assert np.isclose(spans['dx'][0], prob['comp.dx'], rtol=1.0e-10)
+        assert np.isclose(spans['von_mises'][0], prob['comp.von_mises'], rtol=1.0e-10)
+        assert np.isclose(spans['delta'][0], prob['comp.delta'], rtol=1.0e-10)
+        assert not np.any(spans['buckling'])
+        assert np.isclose(spans['R'][1], prob['comp.R'], rtol=1.0e-10)
+        assert not np.any(spans['pylon_yielding'])
+        assert np.isclose(spans['m_pylon'][1], prob['comp.m_pylon'], rtol=1.0e-10)
+
+        cost = np.sum(spans['tube_cost']) + np.sum(spans['pylon_cost'])
+        assert np.isclose(cost / 100.0e3, prob['comp.total_material_cost'], rtol=.01)
+
+    def test_case2_terrain_profile(self):
+
+        n = 101
+        x = np.linspace(0.0, 50.0e3, n)
+        ground = 200.0 * np.exp(-((x - 25.0e3) / 5.0e3)**2)
+
+        component = route_structure.RouteStructure(num_points=n)
+        prob = create_problem(component)
+        prob.setup(check=False)
+
+        prob['comp.x'] = x
+        prob['comp.ground_elev'] = -ground
+        prob['comp.track_elev'] = 10.0 * np.ones(n)
+        prob['comp.r_pylon'] = .3
+        prob['comp.m_pod'] = 15000.0
+
+        prob.run()
+
+        assert np.isclose(prob['comp.max_h'], 210.0, rtol=.01)
+        assert np.isclose(np.sum(prob['comp.segment_cost'] * np.diff(x)),
+                          prob['comp.total_material_cost'], rtol=1.0e-10)
+        assert prob['comp.num_buckling'] > 0
+        assert prob['comp.num_buckling'] < prob['comp.num_pylons']
+
+    def test_case3_binned_cost_and_yield(self):
+
+        prob = create_problem(route_structure.RouteStructure())
+        prob.setup(check=False)
+        prob.run()
+
+        # spans of about 2.3 km cost every 1 km interval its share of tube
+        cost = prob['comp.segment_cost']
+        assert np.all(cost > 0.0)
+        assert np.max(cost) / np.min(cost) < 1.01
+        assert np.isclose(np.sum(cost * 1000.0), prob['comp.total_material_cost'], rtol=1.0e-10)
+
+        # the long default spans overstress the tube, short ones do not
+        assert prob['comp.num_yielding'] == prob['comp.num_pylons'] - 1
+        spans = route_structure.evaluate_route_spans(np.array([0.0, 10.0e3]), np.zeros(2), 10.0 * np.ones(2),
+                                                     41.0, .05, .02, 3100.0)
+        assert not np.any(spans['yielding'])
+        assert np.isclose(prob['comp.t_crit'], spans['t_crit'])
+
+    def test_case4_pylon_compressive_stress(self):
+
+        # interior pylons at the derived spacing sit on the pylon compressive limit
+        r_pylon = .3
+        limit = (40.0e6 / 1.5) * np.pi * (r_pylon**2)
+        spans = route_structure.evaluate_route_spans(np.array([0.0, 100.0e3]), np.zeros(2), 10.0 * np.ones(2),
+                                                     41.0, .05, r_pylon, 15000.0)
+        assert np.allclose(spans['R'][1:-2], limit, rtol=1.0e-10)
+        assert np.all(spans['R'] <= limit * (1.0 + 1.0e-10))
+        assert not np.any(spans['pylon_yielding'])
+
+        # a steep grade lengthens the tube between short pylons and overloads them
+        n = 101
+        x = np.linspace(0.0, 20.0e3, n)
+        track = 10.0 + np.where(x < 10.0e3, .2 * x, 2.0e3)
+
+        prob = create_problem(route_structure.RouteStructure(num_points=n))
+        prob.setup(check=False)
+        prob['comp.x'] = x
+        prob['comp.ground_elev'] = track - 2.0
+        prob['comp.track_elev'] = track
+        prob['comp.r_pylon'] = r_pylon
+        prob['comp.m_pod'] = 15000.0
+        prob.run()
+
+        spans = route_structure.evaluate_route_spans(x, track - 2.0, track, 41.0, .05, r_pylon, 15000.0)
+        graded = spans['x_pylon'] < 10.0e3 - np.max(spans['dx'])
+        assert np.all(spans['pylon_yielding'][1:][graded[1:]])
+        assert not np.any(spans['pylon_yielding'][spans['x_pylon'] > 10.0e3 + np.max(spans['dx'])][:-2])
+        assert prob['comp.num_pylon_yielding'] == np.sum(spans['pylon_yielding'])
+        assert 0 < prob['comp.num_pylon_yielding'] < prob['comp.num_pylons']
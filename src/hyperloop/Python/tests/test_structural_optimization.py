@@ -0,0 +1,54 @@
+import numpy as np
+
+from hyperloop.Python import structural_optimization
+
+class TestStructuralOptimization(object):
+    def test_case1_vs_slsqp(self):
+
+        A_tube, m_pod = np.meshgrid(np.linspace(20.0, 50.0, 3), np.array([10000.0, 20000.0]))
+        res = structural_optimization.optimize_structure(A_tube, m_pod, p_tunnel=850.0,
+                                                         unit_cost_pylon=500.0, verify=True)
+
+        assert np.allclose(res['t'], res['t_slsqp'], rtol=1.0e-6)
+        assert np.allclose(res['r_pylon'], res['r_pylon_slsqp'], rtol=1.0e-4)
+        assert np.allclose(res['total_material_cost'], res['total_material_cost_slsqp'],
+                           rtol=1.0e-6)
+
+    def test_case2_active_constraints(self):
+
+        res = structural_optimization.optimize_structure(np.linspace(20.0, 50.0, 30), 15000.0,
+                                                         p_tunnel=850.0)
+
+        assert np.allclose(res['von_mises'], 152.0e6 / 1.5, rtol=1.0e-8)
+        assert np.all(res['t'] >= res['t_crit'])
+        assert np.all(res['r_pylon'] >= .1)
+
+    def test_case3_minimum_pylon_radius(self):
+
+        # default inputs, and a minimum pylon radius larger than the one yield asks for
+        for r_pylon_min in (.1, 1.0):
+            res = structural_optimization.optimize_structure(np.linspace(20.0, 50.0, 7), 15000.0,
+                                                             r_pylon_min=r_pylon_min)
+
+            assert np.all(res['von_mises'] <= 152.0e6 / 1.5 * (1.0 + 1.0e-8))
+            assert np.all(res['t'] >= res['t_crit'])
+            assert np.all(res['r_pylon'] >= r_pylon_min)
+
+            # the pylons carry their spans
+            r = np.sqrt(np.linspace(20.0, 50.0, 7) / np.pi)
+            q = 7820.0 * np.pi * ((r + res['t'])**2 - r**2) * 9.81
+            carried = 2.0 * 40.0e6 / 1.5 * np.pi * res['r_pylon']**2
+            assert np.all(carried * (1.0 + 1.0e-9) >= res['dx'] * q + 15000.0 * 9.81)
+
+    def test_case4_minimum_pylon_radius_vs_slsqp(self):
+
+        # the minimum pylon radius sets the spacing, and the tube is sized for yield there
+        res = structural_optimization.optimize_structure(np.array([20.0, 35.0, 50.0]),
+                                                         np.array([3100.0, 15000.0, 15000.0]),
+                                                         r_pylon_min=1.0, verify=True)
+
+        assert np.allclose(res['r_pylon'], 1.0)
+        assert np.allclose(res['t'], res['t_slsqp'], rtol=1.0e-6)
+        assert np.allclose(res['dx'], res['dx_slsqp'], rtol=1.0e-6)
+        assert np.allclose(res['total_material_cost'], res['total_material_cost_slsqp'],
+                           rtol=1.0e-6)
@@ -0,0 +1,52 @@
+import numpy as np
+from openmdao.api import Group, Problem
+
+from hyperloop.Python.tube import submerged_tube
+
+def create_problem(component):
+    root = Group()
+    prob = Problem(root)
+    prob.root.add('comp', component)
+    return prob
+
+class TestSubmergedTube(object):
+    def test_case1_profile_vs_single_depth(self):
+
+        depth = np.array([20.0, 60.0, 200.0])
+        t = np.zeros(3)
+        m_prime = np.zeros(3)
+
+        prob = create_problem(submerged_tube.SubmergedTube())
+        prob.setup(check=False)
+        for i in range(3):
+            prob['comp.depth'] = depth[i]
+            prob.run()
+            t[i] = prob['comp.t']
+            m_prime[i] = prob['comp.m_prime']
+
+        crossing = submerged_tube.evaluate_crossing(np.array([0.0, 1.0, 2.0]), depth, 30.0)
+
+        assert np.allclose(crossing['t'], t, rtol=1.0e-12)
+        assert np.allclose(crossing['m_prime'], m_prime, rtol=1.0e-12)
+
+    def test_case2_crossing(self):
+
+        n = 2001
+        x = np.linspace(0.0, 10.0e3, n)
+        depth = 30.0 + 20.0 * np.sin(np.pi * x / 10.0e3)
+
+        prob = create_problem(submerged_tube.SubmergedCrossing(num_points=n))
+        prob.setup(check=False)
+        prob['comp.x'] = x
+        prob['comp.depth'] = depth
+        prob.run()
+
+        crossing = submerged_tube.evaluate_crossing(x, depth, 30.0)
+
+        # Constant cost per unit length integrates exactly
+        assert np.isclose(prob['comp.total_cost'],
+                          prob['comp.tube_cost'] + prob['comp.anchor_cost'], rtol=1.0e-12)
+        assert np.isclose(prob['comp.total_cost'], np.trapz(crossing['cost'], x), rtol=1.0e-12)
+        assert np.isclose(prob['comp.num_anchors'], np.trapz(1.0 / prob['comp.dx_anchor'], x),
+                          rtol=1.0e-12)
+        assert np.isclose(prob['comp.t_max'], crossing['t'][n // 2], rtol=1.0e-12)
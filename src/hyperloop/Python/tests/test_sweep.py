@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from openmdao.api import Group, Problem
+
+from hyperloop.Python.tools.sweep import sweep
+from hyperloop.Python.pod.pod_mach import PodMach, pod_mach_sizing
+from hyperloop.Python.boundary_layer_sensitivity import BoundaryLayerSensitivity, boundary_layer_sizing
+
+def create_problem(component):
+    root = Group()
+    prob = Problem(root)
+    prob.root.add('comp', component)
+    return prob
+
+class TestSweep(object):
+    def test_case1_boundary_layer_grid(self):
+
+        A_pod = np.linspace(2, 3, 3)
+        delta_star = np.linspace(.02, .12, 5)
+        res = sweep(boundary_layer_sizing, [('A_pod', A_pod), ('delta_star', delta_star)], dict(L=22.0))
+
+        assert res.dims == ('A_pod', 'delta_star')
+        assert res['A_tube'].shape == (3, 5)
+
+        prob = create_problem(BoundaryLayerSensitivity())
+        prob.setup(check=False)
+        prob['comp.L'] = 22.0
+        for i, A in enumerate(A_pod):
+            for j, d in enumerate(delta_star):
+                prob['comp.A_pod'] = A
+                prob['comp.delta_star'] = d
+                prob.run()
+                assert np.isclose(res['A_tube'][i, j], prob['comp.A_tube'], rtol=1.0e-12)
+                assert np.isclose(res['pwr_comp'][i, j], prob['comp.pwr_comp'], rtol=1.0e-12)
+
+        cut = res.sel(A_pod=2.5)
+        assert cut.dims == ('delta_star',)
+        assert np.allclose(cut['A_tube'], res['A_tube'][1])
+
+    def test_case2_pod_mach_grid(self):
+
+        res = sweep(pod_mach_sizing, [('M_pod', [.6, .7, .8]), ('L', [20.0, 30.0]), ('p_tube', [500.0, 850.0])])
+        assert res.dims == ('M_pod', 'L', 'p_tube') and res.shape == (3, 2, 2)
+
+        # a plain dict has no axis order on python 2
+        with pytest.raises(TypeError):
+            sweep(pod_mach_sizing, {'M_pod': [.6, .7, .8], 'L': [20.0, 30.0]})
+
+        prob = create_problem(PodMach())
+        prob.setup(check=False)
+        prob['comp.M_pod'] = .7
+        prob['comp.L'] = 30.0
+        prob['comp.p_tube'] = 500.0
+        prob.run()
+
+        point = res.sel(M_pod=.7, L=30.0, p_tube=500.0)
+        for name in ('A_tube', 'A_inlet', 'A_bypass', 'Re', 'pwr_comp'):
+            assert np.isclose(point[name], prob['comp.' + name], rtol=1.0e-12)
@@ -0,0 +1,54 @@
+import numpy as np
+
+from hyperloop.Python.pod.cycle import thermo_tables
+from hyperloop.Python.pod.cycle.ideal_gas import FrozenAirThermo, _IdealElement, get_air_thermo
+from hyperloop.Python.tools.startup_benchmark import tube_and_pod_problem
+
+class TestThermoTables(object):
+    def test_case1_registry(self):
+
+        calls = []
+
+        def build():
+            calls.append(1)
+            return {'a': np.arange(3)}
+
+        key = thermo_tables.table_key('test', 1.0, 2.0)
+        a1 = thermo_tables.shared_tables(key, build)
+        a2 = thermo_tables.shared_tables(key, build)
+
+        assert len(calls) == 1
+        assert a1['a'] is a2['a']
+        assert not a1['a'].flags.writeable
+        assert a1['a'].dtype == float
+
+    def test_case2_tube_and_pod_shares_tables(self):
+
+        t1 = get_air_thermo()
+        assert get_air_thermo().h_table is t1.h_table
+        assert FrozenAirThermo().coeffs is t1.coeffs
+        assert not t1.h_table.flags.writeable and not t1.coeffs.flags.writeable
+        assert np.isclose(t1.T_from_h(t1.h(500.0)), 500.0, rtol=1.0e-12)
+        assert FrozenAirThermo(dT=2.0).h_table is not t1.h_table
+
+        prob = tube_and_pod_problem('ideal')
+        prob.setup(check=False)
+
+        elements = [s for s in prob.root.subsystems(recurse=True) if isinstance(s, _IdealElement)]
+        assert len(elements) > 4
+        assert all(e.thermo.h_table is t1.h_table for e in elements)
+
+    def test_case3_unshared(self):
+
+        shared = get_air_thermo()
+        thermo_tables.SHARED = False
+        try:
+            t1 = get_air_thermo()
+            t2 = get_air_thermo()
+        finally:
+            thermo_tables.SHARED = True
+
+        assert t1.h_table is not t2.h_table and t1.h_table is not shared.h_table
+        assert np.array_equal(t1.h_table, shared.h_table)
+        assert not t1.h_table.flags.writeable
+        assert get_air_thermo().h_table is shared.h_table
@@ -0,0 +1,22 @@
+import os
+import numpy as np
+
+from hyperloop.Python.tools.startup_benchmark import tube_and_pod_problem
+
+class TestTubeAndPod(object):
+    def test_case1_fleet_pod_period(self):
+
+        prob = tube_and_pod_problem(thermo='ideal', fleet_sim=True)
+        prob.setup(check=False, out_stream=open(os.devnull, 'w'))
+
+        # one pod_period sets the departures of the fleet, the tube and the cost
+        num_pods = []
+        for pod_period in (120.0, 240.0):
+            prob['des_vars.pod_period'] = pod_period
+            prob.run()
+            assert np.isclose(prob['TubeAndPod.fleet.pod_period'], pod_period)
+            assert np.isclose(prob['TubeAndPod.cost.pod_period'], pod_period)
+            assert np.isclose(prob['TubeAndPod.cost.fleet_size'], prob['TubeAndPod.fleet.num_pods'])
+            num_pods.append(prob['TubeAndPod.cost.num_pods'])
+
+        assert num_pods[1] < num_pods[0]
@@ -4,11 +4,99 @@ import numpy as np
 from openmdao.api import IndepVarComp, Component, Group, Problem, ExecComp
 import matplotlib.pylab as plt
 
+from hyperloop.Python.energy_tariff import HOURS_PER_YEAR, annual_demand, annual_energy_cost, operating_hours
+
+def cost_model(p):
+	'''
+	Cost outputs of TicketCost from a mapping p of its params, in the same units.
+	Arrays broadcast, so many cost scenarios can be evaluated in one call. If p has an
+	hourly_energy_cost curve, the daily propulsion energy is spread over the hours of
+	the day by prop_demand, and the pod and vacuum energy over the operating hours, and
+	each is costed hour by hour over the year.
+	'''
+
+	land_cost = p['land_cost']
+	water_cost = p['water_cost']
+	pod_cost= p['pod_cost']
+	capital_cost = p['capital_cost']
+	energy_cost = p['energy_cost']
+	ib = p['ib']
+	bm = p['bm']
+	operating_time = p['operating_time']
+	JtokWh = p['JtokWh']
+	m_pod = p['m_pod']
+	n_passengers = p['n_passengers']
+	pod_period = p['pod_period']
+	avg_speed = p['avg_speed']
+	track_length = p['track_length']
+	land_length = p['land_length']
+	water_length = p['water_length']
+	pod_power = -1.0*p['pod_power']
+	prop_power = p['prop_power']
+	vac_power = p['vac_power']
+	steady_vac_power = -1.0*p['steady_vac_power']
+	vf = p['vf']
+	g = p['g']
+	Cd = p['Cd']
+	S = p['S']
+	p_tunnel = p['p_tunnel']
+	T_tunnel = p['T_tunnel']
+	R = p['R']
+	eta = p['eta']
+	D_mag = p['D_mag']
+	thrust_time = p['thrust_time']
+	prop_period = p['prop_period']
+	num_thrust = p['num_thrust']
+	fleet_size = p['fleet_size']
+
+	length_cost = ((water_length/track_length)*water_cost) + ((land_length/track_length)*land_cost)
+	pod_frequency = 1.0/pod_period
+	num_pods = np.where(fleet_size > 0.0, fleet_size, np.ceil((track_length/avg_speed)*pod_frequency))
+	flights_per_pod = (operating_time*pod_frequency)/num_pods
+	energy_per_flight = pod_power*(track_length/avg_speed)*.9
+	pod_energy = energy_per_flight*flights_per_pod*num_pods*JtokWh
+	vac_energy = steady_vac_power*operating_time*JtokWh
+
+	rho = p_tunnel/(R*T_tunnel)
+	start_distance = (vf**2)/(2*g)
+	start_energy = ((m_pod*g+D_mag)*start_distance + (.5*Cd*rho*g*S*(start_distance**2)))/eta
+
+	prop_energy = (num_thrust*thrust_time*prop_power + start_energy)*flights_per_pod*num_pods*JtokWh
+	tube_energy = prop_energy + vac_energy
+
+	if 'hourly_energy_cost' in p:
+		window = operating_hours(operating_time, p['start_hour'])
+		prop_cost = _annual_cost(p['hourly_energy_cost'], prop_energy, annual_demand(p['prop_demand']))
+		vac_cost = _annual_cost(p['hourly_energy_cost'], vac_energy, window)
+		pod_energy_cost = _annual_cost(p['hourly_energy_cost'], pod_energy, window)
+	else:
+		prop_cost = prop_energy*energy_cost*365
+		vac_cost = vac_energy*energy_cost*365
+		pod_energy_cost = pod_energy*energy_cost*365
+
+	return {'num_pods': num_pods,
+			'prop_energy_cost': prop_cost,
+			'tube_energy_cost': prop_cost + vac_cost,
+			'total_energy_cost': pod_energy_cost + prop_cost + vac_cost,
+			'ticket_cost': (length_cost*(track_length/1000.0) + pod_cost*num_pods + capital_cost*(1.0+ib) + \
+				pod_energy_cost + prop_cost + vac_cost)/(n_passengers*pod_frequency*bm*365.0*24.0*3600.0)}
+
+def _annual_cost(price, daily_energy, shape):
+	'''
+	Annual cost (USD) of a daily energy (kWh) drawn over the hours of the year in proportion to shape.
+	'''
+	# the shape is the same for every scenario, so it is costed once and scaled
+	shape = np.asarray(shape, dtype=float)
+	return daily_energy*365.0*annual_energy_cost(price, shape)/np.sum(shape, axis=-1)
+
+
 class TicketCost(Component):
 	'''
 	Notes
 	-------
 	This Component takes into account various cost figures from the system model and combines them to estimate tickt cost per passenger.
+	With tariff=True electricity is priced by an hourly curve for the year instead of a single energy_cost,
+	against an hourly demand: the propulsion energy follows prop_demand and the pod and vacuum energy the operating hours.
 
 	Params
 	-------
@@ -68,6 +156,15 @@ class TicketCost(Component):
 		Time spent during a propulsive section. Default value is 1.5 s
 	prop_period : float
 		distance between pripulsion sections. Defualt value is 25.0e3 km
+	fleet_size : float
+		Number of pods, e.g. from mission.fleet_simulation. Default value is 0, which estimates it as ceil(trip time/pod_period)
+	hourly_energy_cost : ndarray
+		Only with tariff=True. Price of electricity for every hour of the year, e.g. from energy_tariff. Replaces energy_cost
+	start_hour : float
+		Only with tariff=True. Hour of the day operations start. Default value is 6.0 h
+	prop_demand : ndarray
+		Only with tariff=True. Propulsion power in every hour of the day, e.g. energy_tariff.hourly_profile of
+		tube.booster_power. Only its shape is used, scaled to the daily propulsion energy. Default is the default operating hours
 
 	Returns
 	-------
@@ -77,7 +174,7 @@ class TicketCost(Component):
 		cost of energy used by propulsion section per year. Default value is 0.0 USD
 
 	'''
-	def __init__(self):
+	def __init__(self, tariff=False):
 
 		super(TicketCost, self).__init__()
 
@@ -113,6 +210,11 @@ class TicketCost(Component):
 		self.add_param('thrust_time', val = 1.5, desc = 'Time that pod is over propulsive section', units = 's')
 		self.add_param('prop_period', val = 25.0e3, desc = 'distance between propulsive sections', units = 'm')
 		self.add_param('num_thrust', val = 10.0, desc = 'Number of booster sections along track', units = 'unitless')
+		self.add_param('fleet_size', val = 0.0, desc = 'Number of pods from a fleet simulation, 0 to estimate it', units = 'unitless')
+		if tariff:
+			self.add_param('hourly_energy_cost', val = np.full(HOURS_PER_YEAR, .13), desc = 'Hourly cost of electricity', units = 'USD/kW/h')
+			self.add_param('start_hour', val = 6.0, desc = 'Hour of the day operations start', units = 'h')
+			self.add_param('prop_demand', val = operating_hours(16.0*3600.0, 6.0)[:24], desc = 'Propulsion power in every hour of the day', units = 'kW')
 
 		self.add_output('num_pods', val = 0.0, desc = 'Number of Pods', units = 'unitless')
 		self.add_output('ticket_cost', val = 0.0, desc = 'Ticket cost', units = 'USD')
@@ -122,60 +224,8 @@ class TicketCost(Component):
 
 	def solve_nonlinear(self, p, u,r):
 
-		land_cost = p['land_cost']
-		water_cost = p['water_cost']
-		pod_cost= p['pod_cost']
-		capital_cost = p['capital_cost']
-		energy_cost = p['energy_cost']
-		ib = p['ib']
-		bm = p['bm']
-		operating_time = p['operating_time']
-		JtokWh = p['JtokWh']
-		m_pod = p['m_pod']
-		n_passengers = p['n_passengers']
-		pod_period = p['pod_period']
-		avg_speed = p['avg_speed']
-		track_length = p['track_length']
-		land_length = p['land_length']
-		water_length = p['water_length']
-		pod_power = -1.0*p['pod_power']
-		prop_power = p['prop_power']
-		vac_power = p['vac_power']
-		steady_vac_power = -1.0*p['steady_vac_power']
-		vf = p['vf']
-		g = p['g']
-		Cd = p['Cd']
-		S = p['S']
-		p_tunnel = p['p_tunnel']
-		T_tunnel = p['T_tunnel']
-		R = p['R']
-		eta = p['eta']
-		D_mag = p['D_mag']
-		thrust_time = p['thrust_time']
-		prop_period = p['prop_period']
-		num_thrust = p['num_thrust']
-
-		length_cost = ((water_length/track_length)*water_cost) + ((land_length/track_length)*land_cost)
-		pod_frequency = 1.0/pod_period
-		num_pods = np.ceil((track_length/avg_speed)*pod_frequency)
-		flights_per_pod = (operating_time*pod_frequency)/num_pods
-		energy_per_flight = pod_power*(track_length/avg_speed)*.9
-		pod_energy = energy_per_flight*flights_per_pod*num_pods*JtokWh
-		vac_energy = steady_vac_power*operating_time*JtokWh
-
-		rho = p_tunnel/(R*T_tunnel)
-		start_distance = (vf**2)/(2*g)
-		start_energy = ((m_pod*g+D_mag)*start_distance + (.5*Cd*rho*g*S*(start_distance**2)))/eta
-
-		prop_energy = (num_thrust*thrust_time*prop_power + start_energy)*flights_per_pod*num_pods*JtokWh
-		tube_energy = prop_energy + vac_energy
-
-		u['num_pods'] = num_pods
-		u['prop_energy_cost'] = prop_energy*energy_cost*365
-		u['tube_energy_cost'] = tube_energy*energy_cost*365
-		u['total_energy_cost'] = (pod_energy+tube_energy)*energy_cost*365
-		u['ticket_cost'] = cost_ticket = (length_cost*(track_length/1000.0) + pod_cost*num_pods + capital_cost*(1.0+ib) + \
-			energy_cost*(tube_energy + pod_energy)*365.0)/(n_passengers*pod_frequency*bm*365.0*24.0*3600.0)
+		for name, val in cost_model(p).items():
+			u[name] = val
 
 if __name__ == '__main__':
 
@@ -0,0 +1,166 @@
+"""
+Calorically perfect gas relations for one dimensional compressible flow:
+isentropic flow, normal shocks and Fanno flow, with inverse area-Mach and
+mass flow-Mach solvers.
+
+Every function works elementwise on NumPy arrays (and on plain floats), so the
+components that use them can evaluate many operating points at once.
+"""
+from __future__ import print_function
+import numpy as np
+
+
+def T_Tt(M, gam=1.4):
+    """Static to total temperature ratio"""
+    return 1.0 / (1.0 + .5 * (gam - 1.0) * M**2)
+
+
+def P_Pt(M, gam=1.4):
+    """Static to total pressure ratio"""
+    return T_Tt(M, gam)**(gam / (gam - 1.0))
+
+
+def rho_rhot(M, gam=1.4):
+    """Static to total density ratio"""
+    return T_Tt(M, gam)**(1.0 / (gam - 1.0))
+
+
+def area_ratio(M, gam=1.4):
+    """
+    Isentropic area ratio A/A* of a flow at Mach number M, where A* is the sonic area.
+    """
+    g_exp = (gam + 1.0) / (2.0 * (gam - 1.0))
+    return (2.0 / (gam + 1.0) * (1.0 + .5 * (gam - 1.0) * M**2))**g_exp / M
+
+
+def mach_to_area(M1, M2, gam=1.4):
+    """
+    Area ratio A2/A1 of an isentropic stream tube going from Mach number M1 to M2.
+    """
+    g_exp = (gam + 1.0) / (2.0 * (gam - 1.0))
+    return (M1 / M2) * ((1.0 + .5 * (gam - 1.0) * M2**2) / (1.0 + .5 * (gam - 1.0) * M1**2))**g_exp
+
+
+def mass_flow_param(M, gam=1.4):
+    """
+    Corrected flow per unit area, W*sqrt(R*Tt)/(A*Pt), of a flow at Mach number M.
+    """
+    return np.sqrt(gam) * M * T_Tt(M, gam)**((gam + 1.0) / (2.0 * (gam - 1.0)))
+
+
+def mach_from_area_ratio(AR, gam=1.4, supersonic=False, tol=1.0e-12, maxiter=50):
+    """
+    Mach number of an isentropic flow with area ratio A/A* = AR, on the subsonic or
+    supersonic branch.
+
+    Newton's method in ln(M) on ln(A/A*), which is nearly linear in ln(M) away from
+    M = 1, started from the asymptotic solutions of each branch and the expansion
+    about M = 1. AR is clipped to 1 from below (sonic).
+
+    Parameters
+    ----------
+    AR : array_like
+        Area ratio A/A* (unitless)
+    gam : float or array_like
+        Ratio of specific heats
+    supersonic : bool or array_like
+        Branch of the solution
+    tol : float
+        Convergence tolerance on ln(M)
+    maxiter : int
+        Maximum number of Newton iterations
+
+    Returns
+    -------
+    M : ndarray
+        Mach number, same shape as the broadcast inputs
+    """
+    AR, gam, supersonic = np.broadcast_arrays(np.asarray(AR, dtype=float), np.asarray(gam, dtype=float),
+                                              np.asarray(supersonic, dtype=bool))
+    lnAR = np.log(np.maximum(AR, 1.0))
+    g_exp = (gam + 1.0) / (2.0 * (gam - 1.0))
+
+    # ln(A/A*) ~ 2/(gam+1)*(M-1)**2 near M = 1
+    dM = np.sqrt(.5 * (gam + 1.0) * lnAR)
+    # A/A* ~ ((gam+1)/2)**-g_exp / M subsonic, ~ ((gam-1)/(gam+1))**g_exp * M**(2/(gam-1)) supersonic
+    M_sub = np.maximum(np.exp(-lnAR - g_exp * np.log(.5 * (gam + 1.0))), 1.0 - dM)
+    M_sup = np.minimum(np.exp(.5 * (gam - 1.0) * (lnAR - g_exp * np.log((gam - 1.0) / (gam + 1.0)))), 1.0 + dM)
+    x = np.log(np.where(supersonic, M_sup, M_sub))
+
+    sign = np.where(supersonic, 1.0, -1.0)
+    sonic = lnAR <= 0.0
+    x = np.where(sonic, 0.0, x)
+    for _ in range(maxiter):
+        M = np.exp(x)
+        f = np.log(area_ratio(M, gam)) - lnAR
+        df = (M**2 - 1.0) / (1.0 + .5 * (gam - 1.0) * M**2)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dx = np.where(sonic, 0.0, -f / df)
+        # never step across M = 1 onto the other branch
+        x_new = np.where(sign * (x + dx) > 0.0, x + dx, .5 * x)
+        converged = np.all(np.abs(x_new - x) < tol)
+        x = x_new
+        if converged:
+            break
+
+    return np.exp(x)
+
+
+def mach_from_mass_flow(W, A, Pt, Tt, gam=1.4, R=287.0, supersonic=False, **kwargs):
+    """
+    Mach number of a flow of W (kg/s) through area A (m**2) at total pressure Pt (Pa)
+    and total temperature Tt (K). Flows above the choking limit of A return M = 1.
+    """
+    # mass_flow_param(1)/mass_flow_param(M) = A/A*
+    AR = Pt * A * mass_flow_param(1.0, gam) / (W * np.sqrt(R * Tt))
+    return mach_from_area_ratio(AR, gam, supersonic, **kwargs)
+
+
+def normal_shock(M1, gam=1.4):
+    """
+    Conditions behind a normal shock with upstream Mach number M1 >= 1.
+
+    Returns
+    -------
+    M2, P2_P1, T2_T1, rho2_rho1, Pt2_Pt1 : ndarray
+        Downstream Mach number and the static pressure, temperature, density and
+        total pressure ratios across the shock
+    """
+    M1sq = M1**2
+    M2 = np.sqrt((1.0 + .5 * (gam - 1.0) * M1sq) / (gam * M1sq - .5 * (gam - 1.0)))
+    P2_P1 = 1.0 + 2.0 * gam / (gam + 1.0) * (M1sq - 1.0)
+    rho2_rho1 = (gam + 1.0) * M1sq / ((gam - 1.0) * M1sq + 2.0)
+    T2_T1 = P2_P1 / rho2_rho1
+    Pt2_Pt1 = P2_P1 * P_Pt(M1, gam) / P_Pt(M2, gam)
+    return M2, P2_P1, T2_T1, rho2_rho1, Pt2_Pt1
+
+
+def fanno(M, gam=1.4):
+    """
+    Fanno flow (adiabatic duct flow with wall friction) relative to the choked state.
+
+    Returns
+    -------
+    fL_D, P_Pstar, T_Tstar, Pt_Ptstar, V_Vstar : ndarray
+        Friction length 4*f*L*/D to choking and the static pressure, temperature,
+        total pressure and velocity ratios to their sonic values
+    """
+    M2 = M**2
+    k = (gam + 1.0) / (2.0 + (gam - 1.0) * M2)
+    fL_D = (1.0 - M2) / (gam * M2) + (gam + 1.0) / (2.0 * gam) * np.log(M2 * k)
+    T_Tstar = k
+    P_Pstar = np.sqrt(k) / M
+    V_Vstar = M * np.sqrt(k)
+    Pt_Ptstar = area_ratio(M, gam)
+    return fL_D, P_Pstar, T_Tstar, Pt_Ptstar, V_Vstar
+
+
+if __name__ == '__main__':
+
+    AR = np.array([1.0, 1.01, 1.5, 3.0, 10.0, 100.0])
+    M_sub = mach_from_area_ratio(AR)
+    M_sup = mach_from_area_ratio(AR, supersonic=True)
+
+    print('%10s %10s %10s' % ('A/A*', 'M sub', 'M sup'))
+    for i in range(len(AR)):
+        print('%10.3f %10.6f %10.6f' % (AR[i], M_sub[i], M_sup[i]))
@@ -0,0 +1,148 @@
+"""
+Startup benchmark for TubeAndPod: times table setup, group construction and
+Problem.setup() in a fresh interpreter, the way each worker process of a sweep
+would pay for them.
+
+Cases
+-----
+janaf : pycycle chemical equilibrium thermo (skipped if pycycle is not installed)
+ideal : frozen air thermo, with its tables built once by preload() and shared by
+    every flow element (see pod.cycle.thermo_tables)
+ideal_unshared : frozen air thermo, with the tables built by every flow element
+"""
+from __future__ import print_function
+import os
+import sys
+import json
+import subprocess
+
+# Design variables of the TubeAndPod run script, and the TubeAndPod variables they set
+DES_VARS = (('tube_pressure', 850.0, 'Pa', 'tube_pressure'),
+            ('pressure_initial', 760.2, 'torr', 'pressure_initial'),
+            ('num_pods', 18.0, None, 'num_pods'),
+            ('pwr', 18.5, 'kW', 'pwr'),
+            ('speed', 163333.3, 'L/min', 'speed'),
+            ('time_down', 1440.0, 'min', 'time_down'),
+            ('gamma', .8, 'unitless', 'gamma'),
+            ('pump_weight', 715.0, 'kg', 'pump_weight'),
+            ('electricity_price', 0.13, 'USD/(kW*h)', 'electricity_price'),
+            ('tube_thickness', .0415014, 'm', 'tube_thickness'),
+            ('tube_length', 480000.0, 'm', 'tube_length'),
+            ('vf', 286.85, 'm/s', 'vf'),
+            ('v0', 286.85 - 15.0, 'm/s', 'v0'),
+            ('time_thrust', 1.5, 's', 'time_thrust'),
+            ('pod_mach', .8, 'unitless', 'pod_mach'),
+            ('comp_inlet_area', 2.3884, 'm**2', 'comp_inlet_area'),
+            ('comp_PR', 6.0, 'unitless', 'comp.map.PRdes'),
+            ('PsE', 0.05588, 'psi', 'nozzle.Ps_exhaust'),
+            ('des_time', 1.0, None, 'des_time'),
+            ('time_of_flight', 1.0, None, 'time_of_flight'),
+            ('motor_max_current', 800.0, None, 'motor_max_current'),
+            ('motor_LD_ratio', 0.83, None, 'motor_LD_ratio'),
+            ('motor_oversize_factor', 1.0, None, 'motor_oversize_factor'),
+            ('inverter_efficiency', 1.0, None, 'inverter_efficiency'),
+            ('battery_cross_section_area', 15000.0, 'cm**2', 'battery_cross_section_area'),
+            ('n_passengers', 28.0, None, 'n_passengers'),
+            ('A_payload', 2.3248, 'm**2', 'A_payload'),
+            ('r_pylon', 0.232, 'm', 'r_pylon'),
+            ('h', 10.0, 'm', 'h'),
+            ('vel_b', 23.0, 'm/s', 'vel_b'),
+            ('h_lev', 0.01, 'm', 'h_lev'),
+            ('vel', 286.86, 'm/s', 'vel'),
+            ('pod_period', 120.0, 's', 'pod_period'),
+            ('ib', .04, None, 'cost.ib'),
+            ('bm', 20.0, 'yr', 'cost.bm'),
+            ('track_length', 600.0, 'km', 'track_length'),
+            ('avg_speed', 286.86, 'm/s', 'cost.avg_speed'),
+            ('depth', 10.0, 'm', 'depth'),
+            ('land_length', 600.0e3, 'm', 'land_length'),
+            ('water_length', 0.0e3, 'm', 'water_length'),
+            ('W', 1.0, 'kg/s', 'fl_start.W'),
+            ('operating_time', 16.0 * 3600.0, 's', 'operating_time'))
+
+_SNIPPET = """
+import json, time, warnings
+warnings.simplefilter('ignore')
+t0 = time.time()
+from hyperloop.Python.tools.startup_benchmark import tube_and_pod_problem
+import hyperloop.Python.tube_and_pod
+from hyperloop.Python.pod.cycle import thermo_tables
+thermo_tables.SHARED = %(shared)r
+t1 = time.time()
+if %(thermo)r == 'ideal' and %(shared)r:
+    thermo_tables.preload()
+t2 = time.time()
+prob = tube_and_pod_problem(%(thermo)r)
+t3 = time.time()
+prob.setup(check=False, out_stream=open(%(devnull)r, 'w'))
+t4 = time.time()
+print(json.dumps({'import': t1 - t0, 'tables': t2 - t1, 'construct': t3 - t2, 'setup': t4 - t3}))
+"""
+
+
+def tube_and_pod_problem(thermo='janaf', fleet_sim=False):
+    """
+    Problem with a TubeAndPod and the design variables of its run script, not set up yet.
+    """
+    from openmdao.api import Problem, Group, IndepVarComp
+    from hyperloop.Python.tube_and_pod import TubeAndPod
+
+    prob = Problem()
+    root = prob.root = Group()
+    root.add('TubeAndPod', TubeAndPod(thermo=thermo, fleet_sim=fleet_sim))
+
+    params = []
+    for name, val, units, target in DES_VARS:
+        params.append((name, val, {'units': units}) if units else (name, val))
+        root.connect('des_vars.' + name, 'TubeAndPod.' + target)
+    root.add('des_vars', IndepVarComp(params))
+
+    return prob
+
+
+def _run_case(thermo, shared=True):
+    snippet = _SNIPPET % {'thermo': thermo, 'shared': shared, 'devnull': os.devnull}
+    with open(os.devnull, 'w') as devnull:
+        out = subprocess.check_output([sys.executable, '-c', snippet], stderr=devnull)
+    return json.loads(out.decode('utf-8').strip().splitlines()[-1])
+
+
+def have_pycycle():
+    try:
+        import pycycle
+    except ImportError:
+        return False
+    return True
+
+
+def run_benchmark(repeat=3):
+    """
+    Runs every case repeat times, each in a new interpreter.
+
+    Returns
+    -------
+    dict
+        case name -> dict of the best time (s) of each phase
+    """
+    cases = [('ideal', 'ideal', True), ('ideal_unshared', 'ideal', False)]
+    if have_pycycle():
+        cases.insert(0, ('janaf', 'janaf', True))
+
+    results = {}
+    for name, thermo, shared in cases:
+        runs = [_run_case(thermo, shared) for _ in range(repeat)]
+        results[name] = dict((k, min(r[k] for r in runs)) for k in runs[0])
+
+    return results
+
+
+if __name__ == '__main__':
+
+    results = run_benchmark()
+
+    print('%-15s %10s %10s %10s %10s %10s' % ('case', 'import', 'tables', 'construct', 'setup', 'total'))
+    for name in ('janaf', 'ideal', 'ideal_unshared'):
+        if name in results:
+            r = results[name]
+            print('%-15s %10.4f %10.4f %10.4f %10.4f %10.4f' % (name, r['import'], r['tables'], r['construct'],
+                                                                   r['setup'], sum(r.values())))
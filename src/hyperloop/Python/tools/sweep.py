@@ -0,0 +1,139 @@
+"""
+Grid sweeps of broadcasting model functions, such as pod_mach_sizing and
+boundary_layer_sizing.
+
+Each swept input is a 1D array laid along its own axis, so one call of the model
+evaluates the full N-dimensional grid. The result keeps the axis names and values
+with the outputs, in the spirit of an xarray Dataset, and converts to one when
+xarray is installed.
+"""
+from __future__ import print_function
+from collections import OrderedDict
+import numpy as np
+
+
+class SweepResult(object):
+    """
+    Outputs of a grid sweep, labelled by the swept inputs.
+
+    Attributes
+    ----------
+    dims : tuple
+        Names of the swept inputs, in axis order
+    coords : OrderedDict
+        Values of each swept input
+    data_vars : OrderedDict
+        Outputs of the model, each with shape (len(coords[d]) for d in dims)
+    """
+
+    def __init__(self, dims, coords, data_vars):
+        self.dims = tuple(dims)
+        self.coords = coords
+        self.data_vars = data_vars
+
+    @property
+    def shape(self):
+        return tuple(len(self.coords[d]) for d in self.dims)
+
+    def __getitem__(self, name):
+        if name in self.data_vars:
+            return self.data_vars[name]
+        return self.coords[name]
+
+    def __contains__(self, name):
+        return name in self.data_vars or name in self.coords
+
+    def sel(self, **indexers):
+        """
+        Sub-grid at the given values of some of the swept inputs, matched to the
+        nearest grid value. Scalar values drop their axis, arrays keep it.
+        """
+        dims = []
+        coords = OrderedDict()
+        data_vars = OrderedDict(self.data_vars)
+        ax = 0
+        for d in self.dims:
+            if d not in indexers:
+                dims.append(d)
+                coords[d] = self.coords[d]
+                ax += 1
+                continue
+
+            # one axis at a time, so several array indexers give an outer product
+            v = np.asarray(indexers[d], dtype=float)
+            i = np.argmin(np.abs(self.coords[d][:, np.newaxis] - v.ravel()), axis=0)
+            if v.ndim == 0:
+                i = i[0]
+            for k in data_vars:
+                data_vars[k] = np.take(data_vars[k], i, axis=ax)
+            if v.ndim:
+                dims.append(d)
+                coords[d] = self.coords[d][i]
+                ax += 1
+
+        return SweepResult(dims, coords, data_vars)
+
+    def to_xarray(self):
+        """
+        The same result as an xarray.Dataset. Requires xarray.
+        """
+        try:
+            import xarray
+        except ImportError:
+            raise ImportError('xarray is required for SweepResult.to_xarray')
+
+        return xarray.Dataset(dict((k, (self.dims, v)) for k, v in self.data_vars.items()),
+                              coords=self.coords)
+
+
+def sweep(func, axes, fixed=None):
+    """
+    Evaluate a broadcasting function on the full grid of the swept inputs.
+
+    Parameters
+    ----------
+    func : callable
+        Model function returning a dict of outputs, with arguments that broadcast
+        against each other
+    axes : sequence
+        (name, values) pairs of the swept arguments, each a 1D array of values, or an
+        OrderedDict of them. The grid axes follow this order
+    fixed : dict
+        Arguments held constant over the grid
+
+    Returns
+    -------
+    SweepResult
+        Every output broadcast to the full grid shape
+
+    Examples
+    --------
+    >>> res = sweep(boundary_layer_sizing, [('A_pod', np.linspace(2, 3, 3)),
+    ...                                     ('delta_star', np.linspace(.02, .12, 50))], dict(L=22.0))
+    >>> res['A_tube'].shape
+    (3, 50)
+    """
+    if isinstance(axes, dict) and not isinstance(axes, OrderedDict):
+        if len(axes) > 1:
+            raise TypeError('The order of the sweep axes must be given, as (name, values) pairs or an OrderedDict')
+    axes = list(axes.items()) if isinstance(axes, dict) else list(axes)
+
+    kwargs = dict(fixed or {})
+    coords = OrderedDict()
+    n = len(axes)
+    for ax, (name, values) in enumerate(axes):
+        values = np.atleast_1d(np.asarray(values, dtype=float))
+        if values.ndim != 1:
+            raise ValueError("Sweep axis '%s' must be one dimensional" % name)
+        if name in coords:
+            raise ValueError("Sweep axis '%s' is given twice" % name)
+        coords[name] = values
+        shape = [1] * n
+        shape[ax] = len(values)
+        kwargs[name] = values.reshape(shape)
+
+    out = func(**kwargs)
+
+    shape = tuple(len(v) for v in coords.values())
+    data_vars = OrderedDict((k, np.broadcast_to(out[k], shape)) for k in sorted(out))
+    return SweepResult(coords.keys(), coords, data_vars)
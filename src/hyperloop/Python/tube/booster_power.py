@@ -0,0 +1,222 @@
+"""
+Electrical power drawn by the booster stations over an operating day.
+
+TubePower and TicketCost charge propulsion energy as an average over the day. For
+the grid connections the peaks matter: every pod passing a booster draws prop_power
+for thrust_time, and pods dispatched at the same time in both directions pass the
+same stations together.
+
+Pass times follow from the departure schedule (e.g. mission.fleet_simulation) and
+the boost, coast and brake kinematics of a trip. The energy of every pass is binned
+exactly onto a uniform time grid, by accumulating ramps of cumulative energy with
+np.bincount, for all stations at once.
+"""
+from __future__ import print_function
+import numpy as np
+from openmdao.api import Component, Group, Problem
+
+from hyperloop.Python.mission.fleet_simulation import simulate_fleet, trip_profile
+
+
+def time_at(x, track_length, vf, a_boost=9.81, a_brake=9.81):
+    """
+    Time (s) after departure at which a pod reaches a distance x (m) along the track.
+    """
+    t_boost, t_coast, t_brake = trip_profile(track_length, vf, a_boost, a_brake)
+    v_peak = a_boost * t_boost
+    x_boost = .5 * v_peak * t_boost
+    x_coast = x_boost + v_peak * t_coast
+    x = np.asarray(x, dtype=float)
+
+    # distance left to the stop, for the braking phase
+    x_left = np.clip(track_length - x, 0.0, None)
+    return np.where(x <= x_boost, np.sqrt(2.0 * np.clip(x, 0.0, None) / a_boost),
+                    np.where(x <= x_coast, t_boost + (x - x_boost) / max(v_peak, 1.0e-12),
+                             t_boost + t_coast + t_brake - np.sqrt(2.0 * x_left / a_brake)))
+
+
+def _binned_energy(start, duration, power, row, num_rows, num_bins, dt):
+    """
+    Energy (J) per row and time bin of pulses of constant power, from their start
+    times, durations and rows. Each pulse is a ramp of cumulative energy, so the
+    binning is exact for pulses shorter or longer than dt.
+    """
+    energy = np.zeros((num_rows, num_bins + 1))
+    size = num_rows * (num_bins + 2)
+    for t0, sign in ((start, 1.0), (start + duration, -1.0)):
+        k0 = np.clip(np.ceil(t0 / dt).astype(int), 0, num_bins + 1)
+        index = (row * (num_bins + 2) + k0).ravel()
+        w = sign * np.broadcast_to(power, t0.shape).ravel()
+
+        # cumulative energy at the grid edges k >= k0 is w*(k*dt - t0)
+        slope = np.cumsum(np.bincount(index, weights=w, minlength=size).reshape(num_rows, -1), axis=1)
+        offset = np.cumsum(np.bincount(index, weights=w * t0.ravel(), minlength=size).reshape(num_rows, -1), axis=1)
+        k = np.arange(num_bins + 1)
+        energy += slope[:, :-1] * k * dt - offset[:, :-1]
+
+    return np.diff(energy, axis=1)
+
+
+def booster_power(depart, direction, station_x, track_length=600.0e3, vf=286.86, prop_power=350.0e3,
+                  thrust_time=1.5, launch_energy=0.0, a_boost=9.81, a_brake=9.81, dt=1.0, t_end=None):
+    """
+    Power time series of the booster stations and terminals.
+
+    Parameters
+    ----------
+    depart : ndarray
+        Departure times of the trips (s)
+    direction : ndarray
+        Direction of each trip, 0 from the terminal at x=0 and 1 from the terminal at x=track_length
+    station_x : ndarray
+        Positions of the booster stations along the track (m). A station boosts both tubes
+    track_length : float
+        Length of the route (m)
+    vf : float
+        Cruise speed (m/s)
+    prop_power : float
+        Power of a booster while a pod passes (W)
+    thrust_time : float
+        Time a pod spends on a booster (s)
+    launch_energy : float
+        Energy drawn by the departure terminal to launch a pod to vf (J), spread over the boost
+    a_boost, a_brake : float
+        Launch acceleration and braking deceleration (m/s**2)
+    dt : float
+        Time resolution (s)
+    t_end : float
+        End of the time grid (s). Default is the last arrival
+
+    Returns
+    -------
+    dict
+        t (start of each time bin), station_power with one row per station and
+        terminal_power with one row per terminal (W, averaged over each bin), total_power,
+        peak_power, mean_power and energy (J) of the whole system
+    """
+    depart = np.asarray(depart, dtype=float)
+    direction = np.asarray(direction, dtype=int)
+    station_x = np.atleast_1d(np.asarray(station_x, dtype=float))
+    num_stations = len(station_x)
+
+    t_boost = trip_profile(track_length, vf, a_boost, a_brake)[0]
+    t_trip = sum(trip_profile(track_length, vf, a_boost, a_brake))
+    if t_end is None:
+        t_end = depart.max() + t_trip if len(depart) else 0.0
+    num_bins = int(np.ceil(t_end / dt))
+
+    # pass times of every trip over every station, centred on the booster
+    x_travelled = np.where(direction == 0, station_x[:, np.newaxis], track_length - station_x[:, np.newaxis])
+    passes = depart + time_at(x_travelled, track_length, vf, a_boost, a_brake) - .5 * thrust_time
+    stations = np.broadcast_to(np.arange(num_stations)[:, np.newaxis], passes.shape)
+    station_power = _binned_energy(passes, thrust_time, prop_power, stations, num_stations, num_bins, dt) / dt
+
+    launch = launch_energy / t_boost if t_boost > 0.0 else 0.0
+    terminal_power = _binned_energy(depart, t_boost, launch, direction, 2, num_bins, dt) / dt
+
+    total_power = station_power.sum(axis=0) + terminal_power.sum(axis=0)
+    return {'t': np.arange(num_bins) * dt,
+            'station_power': station_power,
+            'terminal_power': terminal_power,
+            'total_power': total_power,
+            'peak_power': total_power.max() if num_bins else 0.0,
+            'mean_power': total_power.mean() if num_bins else 0.0,
+            'energy': total_power.sum() * dt}
+
+
+class BoosterPower(Component):
+    """
+    Params
+    ------
+    operating_time : float
+        Operating time per day (s)
+    pod_period : float
+        Time between departures from each terminal (s)
+    track_length : float
+        Length of the route (m)
+    vf : float
+        Pod top speed (m/s)
+    prop_power : float
+        Power of a booster while a pod passes (W)
+    thrust_time : float
+        Time a pod spends on a booster (s)
+    num_thrust : float
+        Number of booster stations, evenly spaced along the track
+    launch_energy : float
+        Energy to launch a pod at a terminal (J)
+
+    Returns
+    -------
+    peak_power : float
+        Peak power of all stations and terminals (W)
+    mean_power : float
+        Mean power of all stations and terminals over the day (W)
+    peak_station_power : float
+        Largest peak of a single booster station (W)
+    peak_terminal_power : float
+        Largest peak of a single terminal (W)
+
+    Notes
+    -----
+    The departures come from simulate_fleet with the fleet sized to the timetable and
+    the time series has a 1 s resolution. The outputs are piecewise constant in the
+    schedule params, so the component uses finite differences.
+    """
+
+    def __init__(self):
+        super(BoosterPower, self).__init__()
+        self.deriv_options['type'] = 'fd'
+
+        self.add_param('operating_time', val=16.0 * 3600.0, units='s', desc='operating time per day')
+        self.add_param('pod_period', val=120.0, units='s', desc='time between departures')
+        self.add_param('track_length', val=600.0e3, units='m', desc='track length')
+        self.add_param('vf', val=286.86, units='m/s', desc='pod top speed')
+        self.add_param('prop_power', val=350.0e3, units='W', desc='power of a booster section')
+        self.add_param('thrust_time', val=1.5, units='s', desc='time on a booster section')
+        self.add_param('num_thrust', val=10.0, desc='number of booster sections')
+        self.add_param('launch_energy', val=0.0, units='J', desc='energy to launch a pod')
+
+        self.add_output('peak_power', val=0.0, units='W', desc='peak power of the system')
+        self.add_output('mean_power', val=0.0, units='W', desc='mean power of the system')
+        self.add_output('peak_station_power', val=0.0, units='W', desc='peak power of a booster station')
+        self.add_output('peak_terminal_power', val=0.0, units='W', desc='peak power of a terminal')
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        track_length = params['track_length']
+        fleet = simulate_fleet(params['operating_time'], params['pod_period'], track_length, params['vf'])
+
+        n = int(params['num_thrust'])
+        station_x = (np.arange(n) + .5) * track_length / n
+        res = booster_power(fleet['depart'], fleet['direction'], station_x, track_length, params['vf'],
+                            params['prop_power'], params['thrust_time'], params['launch_energy'])
+
+        unknowns['peak_power'] = res['peak_power']
+        unknowns['mean_power'] = res['mean_power']
+        unknowns['peak_station_power'] = res['station_power'].max()
+        unknowns['peak_terminal_power'] = res['terminal_power'].max()
+
+
+if __name__ == '__main__':
+    import time
+
+    fleet = simulate_fleet(pod_period=30.0, num_berths=12)
+    station_x = np.linspace(25.0e3, 575.0e3, 24)
+
+    t0 = time.time()
+    res = booster_power(fleet['depart'], fleet['direction'], station_x, launch_energy=1.0e8)
+    t1 = time.time()
+
+    print('%d stations x %d s computed in %f s' % (len(station_x), len(res['t']), t1 - t0))
+    print('peak power                         %f MW' % (res['peak_power'] / 1.0e6))
+    print('mean power                         %f MW' % (res['mean_power'] / 1.0e6))
+    print('peak of a single station           %f MW' % (res['station_power'].max() / 1.0e6))
+
+    top = Problem()
+    root = top.root = Group()
+    root.add('p', BoosterPower())
+    top.setup()
+    top.run()
+
+    print('\n')
+    print('peak power at the default timetable %f MW' % (top['p.peak_power'] / 1.0e6))
+    print('mean power at the default timetable %f MW' % (top['p.mean_power'] / 1.0e6))
@@ -0,0 +1,332 @@
+"""
+Continuous beam finite element model of the elevated tube over N pylon spans.
+Replaces the simply supported single span formulas of TubeAndPylon
+(5qL^4/384EI, qL^2/8) when the continuity over the pylons matters.
+"""
+from __future__ import print_function
+
+import numpy as np
+from scipy.linalg import cholesky_banded, cho_solve_banded
+from openmdao.api import IndepVarComp, Component, Group, Problem
+
+
+class ContinuousBeamSolver(object):
+    """
+    Euler-Bernoulli beam elements over equal spans with pinned supports at every pylon.
+
+    The stiffness matrix is assembled in banded storage (half bandwidth 3) and factorized
+    once with a banded Cholesky decomposition. Any number of load cases, each with pods
+    at arbitrary positions on top of the tube self weight, reuse that factorization.
+    Nodal displacements and element end forces of the Hermite elements are exact, so
+    moments and deflections inside the elements are recovered analytically.
+
+    Parameters
+    ----------
+    num_spans : int
+        Number of pylon spans
+    dx : float
+        Span length (m)
+    EI : float
+        Bending stiffness of the tube (N*m**2)
+    q : float
+        Distributed self weight of the tube (N/m)
+    elems_per_span : int
+        Number of elements in each span
+    """
+
+    def __init__(self, num_spans, dx, EI, q, elems_per_span=1):
+        self.num_spans = num_spans
+        self.dx = dx
+        self.EI = EI
+        self.q = q
+        self.elems_per_span = elems_per_span
+
+        self.num_elems = num_spans * elems_per_span
+        self.le = dx / elems_per_span
+        self.num_dof = 2 * (self.num_elems + 1)
+
+        L = self.le
+        self.ke = (EI / L**3) * np.array([[12.0, 6.0 * L, -12.0, 6.0 * L],
+                                          [6.0 * L, 4.0 * L**2, -6.0 * L, 2.0 * L**2],
+                                          [-12.0, -6.0 * L, 12.0, -6.0 * L],
+                                          [6.0 * L, 2.0 * L**2, -6.0 * L, 4.0 * L**2]])
+        self.fq = q * np.array([L / 2.0, L**2 / 12.0, L / 2.0, -L**2 / 12.0])
+
+        # Upper banded storage, ab[3 + i - j, j] = K[i, j]
+        ne = self.num_elems
+        ab = np.zeros((4, self.num_dof))
+        for i in range(4):
+            for j in range(i, 4):
+                ab[3 + i - j, j:j + 2 * ne:2] += self.ke[i, j]
+
+        # Pinned supports at the pylons, replace the w rows and columns by identity
+        self.support_dof = 2 * elems_per_span * np.arange(num_spans + 1)
+        for k in range(1, 4):
+            ab[3 - k, self.support_dof] = 0.0
+            cols = self.support_dof + k
+            cols = cols[cols < self.num_dof]
+            ab[3 - k, cols] = 0.0
+        ab[3, self.support_dof] = 1.0
+
+        self.cb = cholesky_banded(ab, lower=False)
+
+    def _hermite(self, xi):
+        L = self.le
+        return np.array([1.0 - 3.0 * xi**2 + 2.0 * xi**3,
+                         L * (xi - 2.0 * xi**2 + xi**3),
+                         3.0 * xi**2 - 2.0 * xi**3,
+                         L * (-xi**2 + xi**3)])
+
+    def _locate(self, pod_x):
+        s = np.clip(pod_x / self.le, 0.0, self.num_elems)
+        e = np.minimum(np.floor(s).astype(int), self.num_elems - 1)
+        return e, (s - e) * self.le
+
+    def solve(self, pod_x, P):
+        """
+        Solves all load cases with the stored factorization.
+
+        Parameters
+        ----------
+        pod_x : ndarray
+            Pod positions along the beam, shape (num_loads,) or (num_loads, pods_per_case) (m)
+        P : float
+            Weight of each pod (N)
+
+        Returns
+        -------
+        results : dict
+            Per load case 'delta' (max deflection, m), 'M_sag' and 'M_hog' (max sagging and
+            hogging moment, N*m), 'R' (pylon reactions, shape (num_loads, num_spans+1), N),
+            and the nodal displacements 'd', shape (num_dof, num_loads)
+        """
+        pod_x = np.atleast_1d(np.asarray(pod_x, dtype=float))
+        if pod_x.ndim == 1:
+            pod_x = pod_x[:, None]
+        nl, npods = pod_x.shape
+        ne = self.num_elems
+        L = self.le
+        EI = self.EI
+        q = self.q
+
+        e_pod, a_pod = self._locate(pod_x)
+        case = np.repeat(np.arange(nl)[:, None], npods, axis=1)
+        N = self._hermite(a_pod / L)
+
+        # Element equivalent loads, shape (4, num_elems, num_loads)
+        f_eq = np.zeros((4, ne, nl))
+        f_eq += self.fq[:, None, None]
+        for i in range(4):
+            np.add.at(f_eq[i], (e_pod, case), P * N[i])
+
+        F = np.zeros((self.num_dof, nl))
+        F[0:-2:2] += f_eq[0]
+        F[1:-2:2] += f_eq[1]
+        F[2::2] += f_eq[2]
+        F[3::2] += f_eq[3]
+        F[self.support_dof] = 0.0
+
+        d = cho_solve_banded((self.cb, False), F)
+
+        # Element end forces acting on each element
+        de = np.array([d[0:-2:2], d[1:-2:2], d[2::2], d[3::2]])
+        f = np.einsum('ij,jel->iel', self.ke, de) - f_eq
+        f1, m1 = f[0], f[1]
+
+        # Sagging moment M(x) = m1 - f1*x - q*x**2/2 - sum(P*(x - a) for x > a)
+        def moment(x):
+            M = m1 - f1 * x - q * x**2 / 2.0
+            for k in range(npods):
+                in_e = e_pod[:, k][None, :] == np.arange(ne)[:, None]
+                M = M - P * np.maximum(x - a_pod[:, k][None, :], 0.0) * in_e
+            return M
+
+        # Pods ahead of or behind each element's zero shear point
+        pod_in_e = np.zeros((ne, nl))
+        np.add.at(pod_in_e, (e_pod, case), P)
+        candidates = [np.zeros((ne, nl)), L * np.ones((ne, nl)),
+                      np.clip(-f1 / q, 0.0, L), np.clip(-(f1 + pod_in_e) / q, 0.0, L)]
+        for k in range(npods):
+            a_k = np.full((ne, nl), 0.0)
+            a_k[e_pod[:, k], np.arange(nl)] = a_pod[:, k]
+            candidates.append(a_k)
+        M = np.array([moment(x) for x in candidates])
+
+        # Deflection at element midpoints and pods, Hermite interpolation plus the exact
+        # fixed-fixed particular solution of the loads inside the element
+        def deflection(x):
+            w = np.einsum('iel,iel->el', self._hermite(x / L), de)
+            w = w + q * x**2 * (L - x)**2 / (24.0 * EI)
+            for k in range(npods):
+                a = a_pod[:, k][None, :] * np.ones((ne, 1))
+                b = L - a
+                in_e = e_pod[:, k][None, :] == np.arange(ne)[:, None]
+                left = P * b**2 * x**2 * (3.0 * a * L - 3.0 * a * x - b * x) / (6.0 * EI * L**3)
+                xr = L - x
+                right = P * a**2 * xr**2 * (3.0 * b * L - 3.0 * b * xr - a * xr) / (6.0 * EI * L**3)
+                w = w + in_e * np.where(x <= a, left, right)
+            return w
+
+        w_pts = [.5 * L * np.ones((ne, nl))] + candidates[4:]
+        w = np.array([deflection(x) for x in w_pts])
+
+        # Pylon reactions, upward positive
+        fw = np.zeros((ne + 1, nl))
+        fw[:-1] += f[0]
+        fw[1:] += f[2]
+        R = -fw[::self.elems_per_span].T
+
+        results = {}
+        results['d'] = d
+        results['delta'] = np.max(w, axis=(0, 1))
+        results['M_sag'] = np.max(M, axis=(0, 1))
+        results['M_hog'] = -np.min(M, axis=(0, 1))
+        results['R'] = R
+        return results
+
+
+class ContinuousBeam(Component):
+    """
+    Notes
+    -----
+    Continuous beam model of the tube over num_spans pylon spans with a pod point load.
+    Each entry of pod_x is a separate load case, all cases share one factorization of the
+    banded stiffness matrix. The factorization is kept between runs until the tube
+    geometry, material or span length change.
+
+    Params
+    ------
+    tube_area : float
+        Inner tube area. Default is 41.0 m**2
+    t : float
+        Thickness of the tube. Default value is 50 mm
+    dx : float
+        Distance between pylons. Default value is 50 m
+    rho_tube : float
+        Density of tube material. Default is 7820 kg/m**3
+    E_tube : float
+        Young's modulus of tube material. Default value is 200e9 Pa
+    m_pod : float
+        Total mass of pod. Default value is 3100 kg
+    p_tunnel : float
+        Pressure of air in tube. Default value is 850 Pa
+    p_ambient : float
+        Pressure of atmosphere. Default value is 101.3e3 Pa
+    g : float
+        Gravitational acceleration. Default value is 9.81 m/s**2
+    pod_x : ndarray
+        Pod position of each load case in m
+
+    Returns
+    -------
+    delta : ndarray
+        Maximum deflection of each load case in m
+    M_max : ndarray
+        Maximum sagging or hogging moment of each load case in N*m
+    R_max : ndarray
+        Largest pylon reaction of each load case in N
+    max_delta : float
+        Maximum deflection over all load cases in m
+    max_moment : float
+        Maximum moment over all load cases in N*m
+    max_R : float
+        Largest pylon reaction over all load cases in N
+    von_mises : float
+        Von Mises stress in the tube under the maximum moment in Pa
+    """
+
+    def __init__(self, num_spans=10, elems_per_span=1, num_loads=10):
+        super(ContinuousBeam, self).__init__()
+
+        self.num_spans = num_spans
+        self.elems_per_span = elems_per_span
+        self._solver = None
+        self._solver_key = None
+
+        self.add_param('tube_area', val=41.0, units='m**2', desc='inner tube area')
+        self.add_param('t', val=.05, units='m', desc='tube thickness')
+        self.add_param('dx', val=50.0, units='m', desc='distance between pylons')
+        self.add_param('rho_tube', val=7820.0, units='kg/m**3', desc='density of steel')
+        self.add_param('E_tube', val=200.0 * (10**9), units='Pa', desc='Young\'s Modulus of tube')
+        self.add_param('m_pod', val=3100.0, units='kg', desc='mass of pod')
+        self.add_param('p_tunnel', val=850.0, units='Pa', desc='Tunnel Pressure')
+        self.add_param('p_ambient', val=101300.0, units='Pa', desc='Ambient Pressure')
+        self.add_param('g', val=9.81, units='m/s**2', desc='gravity')
+        self.add_param('pod_x',
+                       val=np.linspace(0.0, 50.0 * num_spans, num_loads),
+                       units='m',
+                       desc='pod position of each load case')
+
+        self.add_output('delta', val=np.zeros(num_loads), units='m', desc='max deflection')
+        self.add_output('M_max', val=np.zeros(num_loads), units='N*m', desc='max moment')
+        self.add_output('R_max', val=np.zeros(num_loads), units='N', desc='max pylon reaction')
+        self.add_output('max_delta', val=0.0, units='m', desc='max deflection of all cases')
+        self.add_output('max_moment', val=0.0, units='N*m', desc='max moment of all cases')
+        self.add_output('max_R', val=0.0, units='N', desc='max pylon reaction of all cases')
+        self.add_output('von_mises', val=0.0, units='Pa', desc='max Von Mises Stress')
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        tube_area = params['tube_area']
+        t = params['t']
+        dx = params['dx']
+        rho_tube = params['rho_tube']
+        E_tube = params['E_tube']
+        g = params['g']
+        dp = params['p_ambient'] - params['p_tunnel']
+
+        r = np.sqrt(tube_area / np.pi)
+        q = rho_tube * np.pi * (((r + t)**2) - (r**2)) * g
+        I_tube = (np.pi / 4.0) * (((r + t)**4) - (r**4))
+
+        key = (float(dx), float(E_tube * I_tube), float(q))
+        if key != self._solver_key:
+            self._solver = ContinuousBeamSolver(self.num_spans, dx, E_tube * I_tube, q,
+                                                elems_per_span=self.elems_per_span)
+            self._solver_key = key
+
+        res = self._solver.solve(params['pod_x'], params['m_pod'] * g)
+
+        M_max = np.maximum(res['M_sag'], res['M_hog'])
+        M = np.max(M_max)
+        sig_theta = (dp * r) / t
+        sig_axial = ((dp * r) / (2 * t)) + ((M * r) / I_tube)
+
+        unknowns['delta'] = res['delta']
+        unknowns['M_max'] = M_max
+        unknowns['R_max'] = np.max(res['R'], axis=1)
+        unknowns['max_delta'] = np.max(res['delta'])
+        unknowns['max_moment'] = M
+        unknowns['max_R'] = np.max(res['R'])
+        unknowns['von_mises'] = np.sqrt((((sig_theta**2) + (sig_axial**2) + (
+            (sig_axial - sig_theta)**2)) / 2.0))
+
+if __name__ == '__main__':
+    import time
+
+    top = Problem()
+    root = top.root = Group()
+    root.add('p', ContinuousBeam(num_spans=20, num_loads=201))
+
+    top.setup()
+    top['p.pod_x'] = np.linspace(0.0, 1000.0, 201)
+    top['p.m_pod'] = 15000.0
+    top.run()
+
+    print('\n')
+    print('max deflection is %6.4f mm' % (top['p.max_delta'] * 1.0e3))
+    print('max moment is %6.2f kN*m' % (top['p.max_moment'] / 1.0e3))
+    print('max pylon reaction is %6.2f kN' % (top['p.max_R'] / 1.0e3))
+    print('Von Mises stress is %6.3f MPa' % (top['p.von_mises'] / 1.0e6))
+
+    # Scaling to a full route
+    r = np.sqrt(41.0 / np.pi)
+    EI = 200.0e9 * (np.pi / 4.0) * (((r + .05)**4) - (r**4))
+    q = 7820.0 * np.pi * (((r + .05)**2) - (r**2)) * 9.81
+
+    t0 = time.time()
+    solver = ContinuousBeamSolver(100000, 50.0, EI, q)
+    t1 = time.time()
+    res = solver.solve(np.linspace(0.0, 5.0e6, 20), 15000.0 * 9.81)
+    t2 = time.time()
+    print('\n')
+    print('100000 spans: factorization %.3f s, 20 load cases %.3f s' % (t1 - t0, t2 - t1))
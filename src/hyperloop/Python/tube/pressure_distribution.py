@@ -0,0 +1,246 @@
+"""
+Steady pressure distribution along the tube with discrete pump stations
+and distributed seal leakage. Replaces the single control volume used by
+SteadyStateVacuum when pump station spacing is being traded.
+"""
+from __future__ import print_function
+
+import numpy as np
+from scipy.linalg import solve_banded
+from openmdao.api import IndepVarComp, Component, Group, Problem
+
+
+def solve_tube_pressure(x, leak, pump_x, pump_speed, K, RT, tol=1.0e-10, maxiter=50):
+    """
+    Solves the steady 1D tube pressure for a set of pump stations.
+
+    Leakage and pump throughputs are balanced against laminar (Poiseuille) flow
+    along the tube, Q = -K*d(p**2)/dx, discretized with one control volume per node.
+    The pump sinks S*p make the system nonlinear in u = p**2, so it is solved
+    with Newton's method. Each Newton step is a tridiagonal solve.
+
+    Parameters
+    ----------
+    x : ndarray
+        Uniformly spaced node positions along the tube (m)
+    leak : ndarray
+        Leakage mass flow per unit length at each node (kg/(s*m))
+    pump_x : ndarray
+        Position of each pump station (m)
+    pump_speed : ndarray
+        Volumetric pumping speed of each station (m**3/s)
+    K : float
+        Tube flow coefficient pi*r**4/(16*mu) (m**4/(Pa*s))
+    RT : float
+        Gas constant times tube temperature (J/kg)
+
+    Returns
+    -------
+    p : ndarray
+        Static pressure at each node (Pa)
+    pump_W : ndarray
+        Mass flow removed by each pump station (kg/s)
+    """
+    x = np.asarray(x, dtype=float)
+    pump_x = np.atleast_1d(np.asarray(pump_x, dtype=float))
+    pump_speed = np.atleast_1d(np.asarray(pump_speed, dtype=float))
+    nn = len(x)
+    h = x[1] - x[0]
+
+    # Control volume lengths, half cells at the closed ends
+    vol = np.full(nn, h)
+    vol[0] = vol[-1] = .5 * h
+    b = leak * vol * RT  # leakage throughput (Pa*m**3/s)
+
+    # Tridiagonal graph Laplacian in banded storage, sealed ends
+    c = K / h
+    ab = np.zeros((3, nn))
+    ab[0, 1:] = -c
+    ab[2, :-1] = -c
+    ab[1, :] = 2.0 * c
+    ab[1, 0] = ab[1, -1] = c
+
+    # Linear interpolation weights of each pump onto its two neighbouring nodes
+    s = np.clip((pump_x - x[0]) / h, 0.0, nn - 1.0)
+    i0 = np.minimum(np.floor(s).astype(int), nn - 2)
+    w1 = s - i0
+    w0 = 1.0 - w1
+
+    u = np.full(nn, (np.sum(b) / np.sum(pump_speed))**2)
+
+    for _ in range(maxiter):
+        u_pump = w0 * u[i0] + w1 * u[i0 + 1]
+        p_pump = np.sqrt(u_pump)
+
+        sink = np.zeros(nn)
+        np.add.at(sink, i0, w0 * pump_speed * p_pump)
+        np.add.at(sink, i0 + 1, w1 * pump_speed * p_pump)
+
+        F = c * np.append(u[:-1] - u[1:], 0.0) - c * np.append(0.0, u[:-1] - u[1:]) + sink - b
+
+        # Jacobian of each pump sink is a 2x2 block on its neighbouring nodes
+        dS = pump_speed / (2.0 * p_pump)
+        J = ab.copy()
+        np.add.at(J[1], i0, dS * w0 * w0)
+        np.add.at(J[1], i0 + 1, dS * w1 * w1)
+        np.add.at(J[0], i0 + 1, dS * w0 * w1)
+        np.add.at(J[2], i0, dS * w0 * w1)
+
+        du = solve_banded((1, 1), J, -F)
+        u = np.maximum(u + du, 1.0e-6 * u)
+
+        if np.max(np.abs(du) / u) < tol:
+            break
+
+    p = np.sqrt(u)
+    pump_W = pump_speed * np.sqrt(w0 * u[i0] + w1 * u[i0 + 1]) / RT
+
+    return p, pump_W
+
+
+class TubePressureDistribution(Component):
+    """
+    Notes
+    -----
+    Computes the steady state pressure distribution along the tube for pump stations
+    placed at arbitrary positions and leakage distributed along the tube seals.
+    Flow along the tube is laminar, so throughput is proportional to the gradient of p**2.
+    The pump power assumes isothermal compression from the local tube pressure to ambient.
+
+    Params
+    ------
+    tube_area : float
+        Inner cross sectional area of tube. Default value is 41.0 m**2
+    tube_length : float
+        Length of tube. Default value is 480.0e3 m
+    T : float
+        Tube temperature. Default value is 320.0 K
+    R : float
+        Ideal gas constant. Default value is 287.0 J/(kg*K)
+    mu : float
+        Dynamic viscosity of air. Default value is 1.846e-5 kg/(m*s)
+    p_ambient : float
+        Pump discharge pressure. Default value is 101.3e3 Pa
+    pump_eff : float
+        Isothermal efficiency of the pumps. Default value is .2
+    leak_rate : ndarray
+        Leakage mass flow per unit length at each node. Default is .1 kg/s spread over the tube
+    pump_x : ndarray
+        Position of each pump station along the tube. Default is evenly spaced stations
+    pump_speed : ndarray
+        Volumetric pumping speed of each station. Default value is 2.72 m**3/s
+
+    Returns
+    -------
+    x : ndarray
+        Node positions along the tube in m
+    p : ndarray
+        Tube pressure at each node in Pa
+    p_max : float
+        Maximum tube pressure in Pa
+    p_mean : float
+        Length averaged tube pressure in Pa
+    pump_W : ndarray
+        Mass flow removed by each pump station in kg/s
+    pump_power : float
+        Total shaft power of all pump stations in W
+
+    References
+    ----------
+    [1] Umrath, Walter, Dr. Fundamentals of Vacuum Technology. N.p.: Oerlikon Leybold Vacuum, n.d. Print.
+    """
+
+    def __init__(self, num_nodes=2001, num_pumps=20):
+        super(TubePressureDistribution, self).__init__()
+
+        self.num_nodes = num_nodes
+        self.num_pumps = num_pumps
+
+        tube_length = 480.0e3
+
+        self.add_param('tube_area', val=41.0, desc='tube inner area', units='m**2')
+        self.add_param('tube_length', val=tube_length, desc='length of tube', units='m')
+        self.add_param('T', val=320.0, desc='tube temperature', units='K')
+        self.add_param('R', val=287.0, desc='ideal gas constant', units='J/(kg*K)')
+        self.add_param('mu', val=1.846e-5, desc='dynamic viscosity', units='kg/(m*s)')
+        self.add_param('p_ambient', val=101.3e3, desc='pump discharge pressure', units='Pa')
+        self.add_param('pump_eff', val=.2, desc='isothermal efficiency of pumps')
+        self.add_param('leak_rate',
+                       val=(.1 / tube_length) * np.ones(num_nodes),
+                       desc='leakage mass flow per unit length',
+                       units='kg/(s*m)')
+        self.add_param('pump_x',
+                       val=(np.arange(num_pumps) + .5) * (tube_length / num_pumps),
+                       desc='position of pump stations',
+                       units='m')
+        self.add_param('pump_speed',
+                       val=2.72 * np.ones(num_pumps),
+                       desc='volumetric pumping speed of each station',
+                       units='m**3/s')
+
+        self.add_output('x', val=np.zeros(num_nodes), desc='node positions', units='m')
+        self.add_output('p', val=np.zeros(num_nodes), desc='tube pressure', units='Pa')
+        self.add_output('p_max', val=0.0, desc='maximum tube pressure', units='Pa')
+        self.add_output('p_mean', val=0.0, desc='average tube pressure', units='Pa')
+        self.add_output('pump_W',
+                        val=np.zeros(num_pumps),
+                        desc='mass flow removed by each pump station',
+                        units='kg/s')
+        self.add_output('pump_power', val=0.0, desc='total pump power', units='W')
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        tube_area = params['tube_area']
+        tube_length = params['tube_length']
+        T = params['T']
+        R = params['R']
+        mu = params['mu']
+        p_ambient = params['p_ambient']
+        pump_eff = params['pump_eff']
+
+        r = np.sqrt(tube_area / np.pi)
+        K = (np.pi * (r**4)) / (16.0 * mu)  #Poiseuille flow coefficient for throughput
+        x = np.linspace(0.0, tube_length, self.num_nodes)
+
+        p, pump_W = solve_tube_pressure(x, params['leak_rate'], params['pump_x'],
+                                        params['pump_speed'], K, R * T)
+
+        p_pump = pump_W * R * T / params['pump_speed']
+
+        unknowns['x'] = x
+        unknowns['p'] = p
+        unknowns['p_max'] = np.max(p)
+        unknowns['p_mean'] = np.trapz(p, x) / tube_length
+        unknowns['pump_W'] = pump_W
+        unknowns['pump_power'] = np.sum(pump_W * R * T * np.log(p_ambient / p_pump)) / pump_eff
+
+if __name__ == '__main__':
+    import time
+
+    top = Problem()
+    root = top.root = Group()
+
+    root.add('p', TubePressureDistribution())
+
+    top.setup()
+    top.run()
+
+    print('\n')
+    print('Maximum tube pressure is %f Pa' % top['p.p_max'])
+    print('Average tube pressure is %f Pa' % top['p.p_mean'])
+    print('Total pump power is %f kW' % (top['p.pump_power'] / 1.0e3))
+
+    # Station spacing trade for a 500 km tube
+    L = 500.0e3
+    x = np.linspace(0.0, L, 5001)
+    r = np.sqrt(41.0 / np.pi)
+    K = (np.pi * (r**4)) / (16.0 * 1.846e-5)
+    leak = (.1 / L) * np.ones(len(x))
+
+    print('\n')
+    for spacing in [10.0e3, 25.0e3, 50.0e3, 100.0e3]:
+        n = int(L / spacing)
+        pump_x = (np.arange(n) + .5) * spacing
+        t0 = time.time()
+        p, pump_W = solve_tube_pressure(x, leak, pump_x, 2.72 * np.ones(n), K, 287.0 * 320.0)
+        print('spacing %6.1f km: p_max %8.3f Pa (%.2f ms)' % (spacing / 1.0e3, np.max(p),
+                                                            (time.time() - t0) * 1.0e3))
@@ -0,0 +1,332 @@
+"""
+Evaluates the elevated tube and pylons span by span along a route profile.
+Pylon height is taken from the track and terrain elevation at every pylon
+instead of one representative height for the whole line.
+"""
+from __future__ import print_function
+
+import numpy as np
+from openmdao.api import IndepVarComp, Component, Group, Problem
+
+
+def evaluate_route_spans(x, ground_elev, track_elev, tube_area, t, r_pylon, m_pod,
+                         rho_tube=7820.0, E_tube=200.0e9, v_tube=.3, Su_tube=152.0e6, unit_cost_tube=.3307,
+                         p_tunnel=850.0, p_ambient=101300.0, alpha_tube=0.0, dT_tube=0.0,
+                         rho_pylon=2400.0, E_pylon=41.0e9, Su_pylon=40.0e6, sf=1.5,
+                         unit_cost_pylon=.05, h_min=1.0, g=9.81):
+    """
+    Vectorized span by span evaluation of TubeAndPylon along a route.
+
+    Pylons are spaced by the TubeAndPylon pylon yield condition starting at x[0].
+    Each pylon height is the track to ground clearance at that pylon, no lower than
+    h_min. Pylon reactions follow the TubeAndPylon convention the spacing is derived from,
+    so a pylon between two full spans on level ground is loaded exactly to Su_pylon/sf.
+    Pylons that would buckle under their reaction are thickened to the Euler buckling
+    radius, pylons whose compressive stress still exceeds Su_pylon/sf, e.g. under the longer
+    tube of a graded span, are flagged as pylon_yielding. Spans whose Von Mises stress
+    exceeds Su_tube/sf are flagged as yielding.
+
+    Parameters
+    ----------
+    x : ndarray
+        Distance along the route of each profile sample (m)
+    ground_elev : ndarray
+        Terrain elevation at each profile sample (m)
+    track_elev : ndarray
+        Tube centerline elevation at each profile sample (m)
+
+    Returns
+    -------
+    spans : dict
+        Per span arrays 'x0', 'x1', 'dx', 'von_mises', 'yielding', 'delta', 'tube_cost', per
+        pylon arrays 'x_pylon', 'h', 'R', 'r_pylon', 'm_pylon', 'pylon_cost', 'buckling',
+        'pylon_yielding' and the tube buckling thickness 't_crit'
+    """
+    x = np.asarray(x, dtype=float)
+    ground_elev = np.asarray(ground_elev, dtype=float)
+    track_elev = np.asarray(track_elev, dtype=float)
+
+    r = np.sqrt(tube_area / np.pi)
+    m_prime = rho_tube * np.pi * (((r + t)**2) - (r**2))
+    q = m_prime * g
+    dp = p_ambient - p_tunnel
+    I_tube = (np.pi / 4.0) * (((r + t)**4) - (r**4))
+
+    dx = ((2 * (Su_pylon / sf) * np.pi * (r_pylon**2)) - m_pod * g) / (m_prime * g)
+    if dx <= 0.0:
+        raise ValueError('Pylon radius %f m cannot carry the pod mass' % r_pylon)
+
+    # Pylon stations, the last span is cut short at the end of the route
+    x_pylon = np.append(np.arange(x[0], x[-1], dx), x[-1])
+    z_track = np.interp(x_pylon, x, track_elev)
+    h = np.maximum(z_track - np.interp(x_pylon, x, ground_elev), h_min)
+
+    # Spans follow the track grade, only the normal component of the weight bends the tube
+    L = np.diff(x_pylon)
+    cos_grade = L / np.sqrt(L**2 + np.diff(z_track)**2)
+    L_tube = L / cos_grade
+
+    M = (q * cos_grade * ((L_tube**2) / 8.0)) + (m_pod * g * cos_grade * (L_tube / 2.0))
+    sig_theta = (dp * r) / t
+    sig_axial = ((dp * r) / (2 * t)) + ((M * r) / I_tube) + alpha_tube * E_tube * dT_tube
+    von_mises = np.sqrt((((sig_theta**2) + (sig_axial**2) + ((sig_axial - sig_theta)**2)) / 2.0))
+    delta = (5.0 * q * cos_grade * (L_tube**4)) / (384.0 * E_tube * I_tube)
+
+    # Same reaction as TubeAndPylon, .5*q*dx + .5*m_pod*g, with dx the mean of the adjacent spans
+    R = .25 * q * (np.append(L_tube, 0.0) + np.append(0.0, L_tube)) + .5 * m_pod * g
+    r_buckle = ((R * 16.0 * (h**2)) / ((np.pi**3) * E_pylon))**.25
+    buckling = r_buckle > r_pylon
+    r_span_pylon = np.maximum(r_pylon, r_buckle)
+    m_pylon = rho_pylon * np.pi * (r_span_pylon**2) * h
+
+    # the spacing puts level interior pylons on the limit, allow for round off
+    sig_pylon = R / (np.pi * (r_span_pylon**2))
+    pylon_yielding = sig_pylon > (Su_pylon / sf) * (1.0 + 1.0e-9)
+
+    spans = {}
+    spans['x0'] = x_pylon[:-1]
+    spans['x1'] = x_pylon[1:]
+    spans['dx'] = L
+    spans['von_mises'] = von_mises
+    spans['yielding'] = von_mises > Su_tube / sf
+    spans['delta'] = delta
+    spans['tube_cost'] = unit_cost_tube * m_prime * L_tube
+    spans['x_pylon'] = x_pylon
+    spans['h'] = h
+    spans['R'] = R
+    spans['r_pylon'] = r_span_pylon
+    spans['m_pylon'] = m_pylon
+    spans['pylon_cost'] = unit_cost_pylon * m_pylon
+    spans['buckling'] = buckling
+    spans['pylon_yielding'] = pylon_yielding
+    spans['t_crit'] = r * (((4.0 * dp * (1.0 - (v_tube**2))) / E_tube)**(1.0 / 3.0))
+
+    return spans
+
+
+def bin_route_cost(spans, edges):
+    """
+    Bins span tube cost and pylon cost into route intervals.
+
+    The tube cost of a span is spread over the intervals by their overlap with the span,
+    pylon costs fall in the interval of the pylon.
+
+    Parameters
+    ----------
+    spans : dict
+        Output of evaluate_route_spans
+    edges : ndarray
+        Interval boundaries along the route (m), e.g. every km
+
+    Returns
+    -------
+    cost : ndarray
+        Material cost of each interval per unit length (USD/m)
+    """
+    n = len(edges) - 1
+    i_pylon = np.clip(np.searchsorted(edges, spans['x_pylon'], side='right') - 1, 0, n - 1)
+
+    # cumulative tube cost is linear within a span
+    tube = np.interp(edges, spans['x_pylon'], np.append(0.0, np.cumsum(spans['tube_cost'])))
+    cost = np.diff(tube) + np.bincount(i_pylon, weights=spans['pylon_cost'], minlength=n)
+
+    return cost / np.diff(edges)
+
+
+class RouteStructure(Component):
+    """
+    Notes
+    -----
+    Evaluates tube stress, deflection, pylon mass and material cost for every span
+    along a sampled terrain and track profile. Pylon spacing comes from the same pylon
+    yield condition as TubeAndPylon, pylon height from the track clearance at each pylon.
+    Where the tallest pylons would buckle they are thickened to the Euler buckling radius,
+    pylons still above the pylon compressive limit are counted in num_pylon_yielding.
+
+    Params
+    ------
+    x : ndarray
+        Distance along the route of each profile sample in m
+    ground_elev : ndarray
+        Terrain elevation at each profile sample in m
+    track_elev : ndarray
+        Tube centerline elevation at each profile sample in m
+    tube_area : float
+        Inner tube area. Default is 41.0 m**2
+    t : float
+        Thickness of the tube. Default value is 50 mm
+    r_pylon : float
+        Radius of each pylon. Default value is 1.1 m
+    m_pod : float
+        Total mass of pod. Default value is 3100 kg
+    h_min : float
+        Minimum pylon height. Default value is 1.0 m
+    rho_tube, E_tube, v_tube, Su_tube, sf, unit_cost_tube, p_tunnel, p_ambient,
+    alpha_tube, dT_tube, rho_pylon, E_pylon, Su_pylon, unit_cost_pylon, g : float
+        Material and loading parameters, same as TubeAndPylon
+
+    Returns
+    -------
+    total_material_cost : float
+        Total tube and pylon material cost of the route in USD
+    segment_cost : ndarray
+        Material cost per unit length of each profile interval in USD/m
+    max_von_mises : float
+        Von Mises stress of the governing span in Pa
+    x_governing : float
+        Location of the span with the highest Von Mises stress in m
+    num_yielding : float
+        Number of spans with Von Mises stress above Su_tube/sf
+    t_crit : float
+        Minimum tube thickness to satisfy vacuum tube buckling condition in m
+    max_delta : float
+        Largest deflection between pylons in m
+    max_h : float
+        Tallest pylon on the route in m
+    num_pylons : float
+        Number of pylons along the route
+    num_buckling : float
+        Number of pylons thickened to satisfy pylon buckling
+    num_pylon_yielding : float
+        Number of pylons with compressive stress above Su_pylon/sf
+    total_pylon_mass : float
+        Mass of all pylons in kg
+
+    Notes
+    -----
+    [1] USA. NASA. Buckling of Thin-Walled Circular Cylinders. N.p.: n.p., n.d. Web. 13 June 2016.
+    """
+
+    def __init__(self, num_points=601):
+        super(RouteStructure, self).__init__()
+
+        self.add_param('x', val=np.linspace(0.0, 600.0e3, num_points), units='m',
+                       desc='distance along route')
+        self.add_param('ground_elev', val=np.zeros(num_points), units='m',
+                       desc='terrain elevation')
+        self.add_param('track_elev', val=10.0 * np.ones(num_points), units='m',
+                       desc='tube centerline elevation')
+
+        self.add_param('tube_area', val=41.0, units='m**2', desc='inner tube area')
+        self.add_param('t', val=.05, units='m', desc='tube thickness')
+        self.add_param('r_pylon', val=1.1, units='m', desc='pylon radius')
+        self.add_param('m_pod', val=3100.0, units='kg', desc='mass of pod')
+        self.add_param('h_min', val=1.0, units='m', desc='minimum pylon height')
+
+        self.add_param('rho_tube', val=7820.0, units='kg/m**3', desc='density of steel')
+        self.add_param('E_tube', val=200.0 * (10**9), units='Pa', desc='Young\'s Modulus of tube')
+        self.add_param('v_tube', val=.3, desc='Poisson\'s ratio of tube')
+        self.add_param('Su_tube', val=152.0e6, units='Pa', desc='ultimate strength of tube')
+        self.add_param('sf', val=1.5, desc='safety factor')
+        self.add_param('g', val=9.81, units='m/s**2', desc='gravity')
+        self.add_param('unit_cost_tube', val=.3307, units='USD/kg',
+                       desc='cost of tube materials per unit mass')
+        self.add_param('p_tunnel', val=850.0, units='Pa', desc='Tunnel Pressure')
+        self.add_param('p_ambient', val=101300.0, units='Pa', desc='Ambient Pressure')
+        self.add_param('alpha_tube', val=0.0, desc='Coefficient of Thermal Expansion of tube')
+        self.add_param('dT_tube', val=0.0, units='K', desc='Temperature change')
+        self.add_param('rho_pylon', val=2400.0, units='kg/m**3', desc='density of pylon material')
+        self.add_param('E_pylon', val=41.0 * (10**9), units='Pa', desc='Young\'s Modulus of pylon')
+        self.add_param('Su_pylon', val=40.0 * (10**6), units='Pa', desc='ultimate strength_pylon')
+        self.add_param('unit_cost_pylon', val=.05, units='USD/kg',
+                       desc='cost of pylon materials per unit mass')
+
+        self.add_output('total_material_cost', val=0.0, units='USD', desc='route material cost')
+        self.add_output('segment_cost', val=np.zeros(num_points - 1), units='USD/m',
+                        desc='material cost of each profile interval')
+        self.add_output('max_von_mises', val=0.0, units='Pa', desc='governing Von Mises stress')
+        self.add_output('x_governing', val=0.0, units='m', desc='location of governing span')
+        self.add_output('num_yielding', val=0.0, desc='number of spans above the tube yield stress')
+        self.add_output('t_crit', val=0.0, units='m', desc='minimum tube thickness for tube buckling')
+        self.add_output('max_delta', val=0.0, units='m', desc='max deflection inbetween pylons')
+        self.add_output('max_h', val=0.0, units='m', desc='tallest pylon')
+        self.add_output('num_pylons', val=0.0, desc='number of pylons')
+        self.add_output('num_buckling', val=0.0, desc='number of pylons sized by buckling')
+        self.add_output('num_pylon_yielding', val=0.0,
+                        desc='number of pylons above the pylon compressive stress')
+        self.add_output('total_pylon_mass', val=0.0, units='kg', desc='mass of all pylons')
+
+    def solve_nonlinear(self, params, unknowns, resids):
+
+        spans = evaluate_route_spans(params['x'], params['ground_elev'], params['track_elev'],
+                                     params['tube_area'], params['t'], params['r_pylon'],
+                                     params['m_pod'],
+                                     rho_tube=params['rho_tube'],
+                                     E_tube=params['E_tube'],
+                                     v_tube=params['v_tube'],
+                                     Su_tube=params['Su_tube'],
+                                     unit_cost_tube=params['unit_cost_tube'],
+                                     p_tunnel=params['p_tunnel'],
+                                     p_ambient=params['p_ambient'],
+                                     alpha_tube=params['alpha_tube'],
+                                     dT_tube=params['dT_tube'],
+                                     rho_pylon=params['rho_pylon'],
+                                     E_pylon=params['E_pylon'],
+                                     Su_pylon=params['Su_pylon'],
+                                     sf=params['sf'],
+                                     unit_cost_pylon=params['unit_cost_pylon'],
+                                     h_min=params['h_min'],
+                                     g=params['g'])
+
+        i_gov = np.argmax(spans['von_mises'])
+
+        unknowns['total_material_cost'] = np.sum(spans['tube_cost']) + np.sum(spans['pylon_cost'])
+        unknowns['segment_cost'] = bin_route_cost(spans, params['x'])
+        unknowns['max_von_mises'] = spans['von_mises'][i_gov]
+        unknowns['x_governing'] = .5 * (spans['x0'][i_gov] + spans['x1'][i_gov])
+        unknowns['num_yielding'] = np.sum(spans['yielding'])
+        unknowns['t_crit'] = spans['t_crit']
+        unknowns['max_delta'] = np.max(spans['delta'])
+        unknowns['max_h'] = np.max(spans['h'])
+        unknowns['num_pylons'] = len(spans['h'])
+        unknowns['num_buckling'] = np.sum(spans['buckling'])
+        unknowns['num_pylon_yielding'] = np.sum(spans['pylon_yielding'])
+        unknowns['total_pylon_mass'] = np.sum(spans['m_pylon'])
+
+if __name__ == '__main__':
+    import os
+    from scipy import interpolate
+
+    # Sample the USGS terrain along a straight line across the data set
+    data_file_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..',
+                                  'mission', 'usgs_data.npz')
+    usgs_file = np.load(data_file_path)
+    interpolant = interpolate.RectBivariateSpline(usgs_file['Longitude'], usgs_file['Latitude'],
+                                                  usgs_file['Elevation'])
+
+    n = 601
+    lon = np.linspace(-121.9, -118.1, n)
+    lat = np.linspace(34.1, 37.9, n)
+    dist = np.append(0.0, np.cumsum(np.sqrt((np.diff(lat) * 111.2e3)**2 +
+                                            (np.diff(lon) * 111.2e3 * np.cos(np.radians(lat[1:])))**2)))
+    ground = np.maximum(interpolant.ev(lon, lat), 0.0)
+
+    # Track follows a smoothed terrain profile with 10 m clearance
+    kernel = np.ones(31) / 31.0
+    track = np.maximum(np.convolve(np.pad(ground, 15, mode='edge'), kernel, mode='valid'), ground) + 10.0
+
+    top = Problem()
+    root = top.root = Group()
+    root.add('p', RouteStructure(num_points=n))
+
+    top.setup()
+    top['p.x'] = dist
+    top['p.ground_elev'] = ground
+    top['p.track_elev'] = track
+    top['p.m_pod'] = 15000.0
+    top['p.tube_area'] = 41.0
+    top['p.r_pylon'] = .2
+
+    top.run()
+
+    print('\n')
+    print('route length is %6.1f km' % (dist[-1] / 1.0e3))
+    print('total material cost is $%6.3f billion' % (top['p.total_material_cost'] / 1.0e9))
+    print('average material cost is $%6.2f/m' % (top['p.total_material_cost'] / dist[-1]))
+    print('number of pylons is %d, %d sized by buckling, %d above the pylon compressive stress' %
+          (top['p.num_pylons'], top['p.num_buckling'], top['p.num_pylon_yielding']))
+    print('tallest pylon is %6.1f m' % top['p.max_h'])
+    print('%d spans above the tube yield stress, tube buckling thickness %6.4f m' %
+          (top['p.num_yielding'], top['p.t_crit']))
+    print('governing span at %6.1f km, Von Mises stress %6.3f MPa' %
+          (top['p.x_governing'] / 1.0e3, top['p.max_von_mises'] / 1.0e6))
@@ -9,11 +9,17 @@ from openmdao.solvers.scipy_gmres import ScipyGMRES
 from openmdao.units.units import convert_units as cu
 from openmdao.api import Problem, LinearGaussSeidel, ExecComp
 
-from pycycle.components import Compressor, FlowStart
-from pycycle.species_data import janaf
-from pycycle.connect_flow import connect_flow
-from pycycle.constants import AIR_FUEL_MIX, AIR_MIX
-from pycycle.constants import R_UNIVERSAL_ENG, R_UNIVERSAL_SI
+try:
+    from pycycle.components import Compressor, FlowStart
+    from pycycle.species_data import janaf
+    from pycycle.connect_flow import connect_flow
+    from pycycle.constants import AIR_FUEL_MIX, AIR_MIX
+    from pycycle.constants import R_UNIVERSAL_ENG, R_UNIVERSAL_SI
+except ImportError:
+    # pycycle is only needed for thermo='janaf'
+    janaf = None
+
+from hyperloop.Python.pod.cycle.ideal_gas import IdealFlowStart, IdealCompressor, connect_ideal_flow
 
 from openmdao.solvers.ln_gauss_seidel import LinearGaussSeidel
 from openmdao.solvers.ln_direct import DirectSolver
@@ -50,10 +56,13 @@ class SteadyStateVacuum(Group):
 
     Notes
     -----
+    thermo selects pycycle chemical equilibrium air ('janaf') or the frozen air elements
+    of ideal_gas.py ('ideal').
+
     [1] see https://github.com/jcchin/pycycle2/wiki
     """
 
-    def __init__(self):
+    def __init__(self, thermo='janaf'):
         super(SteadyStateVacuum, self).__init__()
 
         des_vars = (('ram_recovery', 0.99),
@@ -70,15 +79,24 @@ class SteadyStateVacuum(Group):
 
         self.add('input_vars',IndepVarComp(des_vars))
 
-        self.add('fl_start', FlowStart(thermo_data=janaf, elements=AIR_MIX))
-        # internal flow
-        self.add('comp', Compressor(thermo_data=janaf, elements=AIR_MIX))
+        if thermo == 'janaf':
+            if janaf is None:
+                raise ImportError("pycycle is required for thermo='janaf'")
+            self.add('fl_start', FlowStart(thermo_data=janaf, elements=AIR_MIX))
+            # internal flow
+            self.add('comp', Compressor(thermo_data=janaf, elements=AIR_MIX))
+            connect_flow(self, 'fl_start.Fl_O', 'comp.Fl_I')
+        elif thermo == 'ideal':
+            self.add('fl_start', IdealFlowStart())
+            # internal flow
+            self.add('comp', IdealCompressor())
+            connect_ideal_flow(self, 'fl_start.Fl_O', 'comp.Fl_I')
+        else:
+            raise ValueError("thermo must be 'janaf' or 'ideal', got '%s'" % thermo)
+
         self.add('q', ExecComp('Prc = Pa/Ps'), promotes = ['Prc', 'Pa'])
         self.add('q1', ExecComp('m_dot = 3*(A_tube*L_pod)*(1/pod_period)*(850.0/(287.0*320.0))'), promotes = ['m_dot', 'pod_period', 'A_tube', 'L_pod'])
 
-        # connect components
-        connect_flow(self, 'fl_start.Fl_O', 'comp.Fl_I')
-
         self.connect('input_vars.effDes', 'comp.map.effDes')
         self.connect('input_vars.comp_MN', 'comp.MN_target')
         self.connect('input_vars.shaft_Nmech', 'comp.Nmech')
@@ -66,21 +66,194 @@ class SubmergedTube(Component):
 		'''
 		t = (p*r)/(Su/SF); p = pa + rho*g*h; F_buoyant/L = rho*A_tube*g
 		'''
-		p_ambient = p['Pa'] + p['rho_water']*p['depth']*p['g']
-		dp = p_ambient - p['p_tube']
-		r = np.sqrt(p['A_tube']/np.pi)
-		t = ((p_ambient-p['p_tube'])*r)/(p['Su']/p['SF'])
-		t_crit = r * (((4.0 * dp * (1.0 - (p['v_tube']**2))) / p['E_tube'])**(1.0 / 3.0))
-		
-		if t>t_crit:
-			u['t'] = t
-		else:
-			u['t'] = t_crit
+		t, t_crit, m_prime = size_submerged_tube(p['A_tube'], p['depth'], p_tube = p['p_tube'], Su = p['Su'],
+			SF = p['SF'], E_tube = p['E_tube'], v_tube = p['v_tube'], rho_water = p['rho_water'],
+			rho_tube = p['rho_tube'], g = p['g'], Pa = p['Pa'])
+
+		u['t'] = t
 		u['dF_buoyancy'] = p['rho_water']*p['g']*p['A_tube']
-		u['material_cost'] = (np.pi*((r+u['t'])**2)-p['A_tube'])*p['rho_tube']*p['unit_cost_tube']
-		u['m_prime'] = (np.pi*((r+u['t'])**2)-p['A_tube'])*p['rho_tube']
+		u['material_cost'] = m_prime*p['unit_cost_tube']
+		u['m_prime'] = m_prime
 		u['t_crit'] = t_crit
 
+def size_submerged_tube(A_tube, depth, p_tube = 850.0, Su = 400.0e6, SF = 5.0, E_tube = 200.0e9, v_tube = .33,
+	rho_water = 1025.0, rho_tube = 7800.0, g = 9.81, Pa = 101.3e3):
+	'''
+	Wall thickness of the submerged tube, the larger of the hoop yield and buckling thicknesses.
+	All inputs broadcast, so depth may be a whole profile or a trade grid.
+
+	Returns
+	-------
+	t : ndarray
+		Tube thickness in m
+	t_crit : ndarray
+		Critical buckling thickness in m
+	m_prime : ndarray
+		Tube mass per unit length in kg/m
+	'''
+	p_ambient = Pa + rho_water*depth*g
+	dp = p_ambient - p_tube
+	r = np.sqrt(A_tube/np.pi)
+	t_yield = (dp*r)/(Su/SF)
+	t_crit = r * (((4.0 * dp * (1.0 - (v_tube**2))) / E_tube)**(1.0 / 3.0))
+	t = np.maximum(t_yield, t_crit)
+	m_prime = (np.pi*((r+t)**2)-A_tube)*rho_tube
+
+	return t, t_crit, m_prime
+
+def evaluate_crossing(x, depth, A_tube, p_tube = 850.0, Su = 400.0e6, SF = 5.0, E_tube = 200.0e9, v_tube = .33,
+	rho_water = 1025.0, rho_tube = 7800.0, g = 9.81, Pa = 101.3e3, unit_cost_tube = .3307, r_anchor = .1,
+	h_anchor = 10.0, Su_anchor = 152.0e6, sf_anchor = 1.5, rho_anchor = 7820.0, unit_cost_anchor = .3307):
+	'''
+	Sizes the tube at every sample of a bathymetry profile and integrates the material cost
+	over the crossing.
+
+	Net uplift is the buoyancy of the displaced volume less the tube weight. Where it is positive
+	the tube is held down by anchor tethers of radius r_anchor and length h_anchor, spaced as far
+	apart as the tether strength allows, as in UnderwaterOptimization.
+
+	Parameters
+	----------
+	x : ndarray
+		Distance along the crossing in m
+	depth : ndarray
+		Tube depth below the surface at each sample in m
+	A_tube : float
+		Inner cross sectional area of tube in m**2
+
+	Returns
+	-------
+	crossing : dict
+		Per sample 't', 't_crit', 'm_prime', 'dF_buoyancy' (net uplift, N/m), 'dx_anchor' (m) and
+		'cost' (USD/m), and the integrated 'tube_cost', 'anchor_cost', 'total_cost' (USD) and
+		'num_anchors'
+	'''
+	x = np.asarray(x, dtype = float)
+	depth = np.asarray(depth, dtype = float)
+
+	t, t_crit, m_prime = size_submerged_tube(A_tube, depth, p_tube = p_tube, Su = Su, SF = SF, E_tube = E_tube,
+		v_tube = v_tube, rho_water = rho_water, rho_tube = rho_tube, g = g, Pa = Pa)
+
+	r = np.sqrt(A_tube/np.pi)
+	dF_buoyancy = rho_water*np.pi*((r+t)**2)*g - m_prime*g
+
+	# Tether spacing, negatively buoyant sections rest on the seabed without anchors
+	F_anchor = 2.0*(Su_anchor/sf_anchor)*np.pi*(r_anchor**2)
+	anchors_per_m = np.maximum(dF_buoyancy, 0.0)/F_anchor
+	with np.errstate(divide = 'ignore'):
+		dx_anchor = np.where(anchors_per_m > 0.0, 1.0/anchors_per_m, np.inf)
+
+	m_anchor = rho_anchor*np.pi*(r_anchor**2)*h_anchor
+	tube_cost = m_prime*unit_cost_tube
+	anchor_cost = unit_cost_anchor*m_anchor*anchors_per_m
+
+	crossing = {}
+	crossing['t'] = t
+	crossing['t_crit'] = t_crit
+	crossing['m_prime'] = m_prime
+	crossing['dF_buoyancy'] = dF_buoyancy
+	crossing['dx_anchor'] = dx_anchor
+	crossing['cost'] = tube_cost + anchor_cost
+	crossing['tube_cost'] = np.trapz(tube_cost, x)
+	crossing['anchor_cost'] = np.trapz(anchor_cost, x)
+	crossing['total_cost'] = crossing['tube_cost'] + crossing['anchor_cost']
+	crossing['num_anchors'] = np.trapz(anchors_per_m, x)
+
+	return crossing
+
+class SubmergedCrossing(Component):
+	'''
+	Notes
+	-------
+	Bathymetry resolved version of SubmergedTube. The tube is sized at every sample of the depth
+	profile and the material cost is integrated over the crossing.
+
+	Params
+	-------
+
+	x : ndarray
+		Distance along the crossing. Default is 10 km sampled every 10 m
+	depth : ndarray
+		Tube depth at each sample. Default value is 10.0 m
+	A_tube : float
+		Cross sectional area of tube. Default valut is 30 m**2
+	p_tube : float
+		Tube pressure. Default valut is 850 Pa
+	Su : float
+		Ultimate strength pf tube material. Default valut is 400.0e6 Pa
+	SF : float
+		Tube safety factor. Default valut is 5.0
+	r_anchor : float
+		Radius of the anchor tethers. Default value is .1 m
+	h_anchor : float
+		Length of the anchor tethers. Default value is 10.0 m
+	unit_cost_tube : float
+		Cost of tube materials per unit mass. Default value is .3307 USD/kg
+
+	Returns
+	-------
+	t : ndarray
+		Tube thickness at each sample in m
+	dx_anchor : ndarray
+		Anchor spacing at each sample in m
+	t_max : float
+		Largest tube thickness along the crossing in m
+	tube_cost : float
+		Tube material cost of the crossing in USD
+	anchor_cost : float
+		Anchor material cost of the crossing in USD
+	total_cost : float
+		Total material cost of the crossing in USD
+	num_anchors : float
+		Number of anchors along the crossing
+	'''
+	def __init__(self, num_points = 1001):
+		super(SubmergedCrossing, self).__init__()
+
+		self.add_param('x', val = np.linspace(0.0, 10.0e3, num_points), desc = 'Distance along crossing', units = 'm')
+		self.add_param('depth', val = 10.0*np.ones(num_points), desc = 'Tunnel depth underwater', units = 'm')
+		self.add_param('A_tube', val = 30.0, desc = 'Tube cross sectional area', units = 'm**2')
+		self.add_param('p_tube', val = 850.0, desc = 'Tube pressure', units = 'Pa')
+		self.add_param('Su', val = 400.0e6, desc = 'Tube material yield strength', units = 'Pa')
+		self.add_param('E_tube', val = 200.0e9, desc = 'Young\'s Modulus of the tube', units = 'Pa')
+		self.add_param('v_tube', val = .33, desc = 'Poissoin\'s ratio of the tube')
+		self.add_param('SF', val = 5.0, desc = 'Safety factor', units = 'unitless')
+		self.add_param('rho_water', val = 1025.0, desc = 'Density of sea wateer', units = 'kg/m**3')
+		self.add_param('rho_tube', val = 7800.0, desc = 'Density of tube material', units = 'kg/m**3')
+		self.add_param('g', val = 9.81, desc = 'Gravity', units = 'm/s**2')
+		self.add_param('Pa', val = 101.3e3, desc = 'Ambient pressure at sea level', units = 'Pa')
+		self.add_param('unit_cost_tube', val = .3307, desc = 'Cost of tube material per unit mass', units = 'USD/kg')
+		self.add_param('r_anchor', val = .1, desc = 'Anchor tether radius', units = 'm')
+		self.add_param('h_anchor', val = 10.0, desc = 'Anchor tether length', units = 'm')
+		self.add_param('Su_anchor', val = 152.0e6, desc = 'Anchor tether strength', units = 'Pa')
+		self.add_param('sf_anchor', val = 1.5, desc = 'Anchor safety factor')
+		self.add_param('rho_anchor', val = 7820.0, desc = 'Density of anchor material', units = 'kg/m**3')
+		self.add_param('unit_cost_anchor', val = .3307, desc = 'Cost of anchor material per unit mass', units = 'USD/kg')
+
+		self.add_output('t', val = np.zeros(num_points), desc = 'Tube thickness', units = 'm')
+		self.add_output('dx_anchor', val = np.zeros(num_points), desc = 'Anchor spacing', units = 'm')
+		self.add_output('t_max', val = 1.0, desc = 'Largest tube thickness', units = 'm')
+		self.add_output('tube_cost', val = 1.0, desc = 'Tube material cost of crossing', units = 'USD')
+		self.add_output('anchor_cost', val = 1.0, desc = 'Anchor material cost of crossing', units = 'USD')
+		self.add_output('total_cost', val = 1.0, desc = 'Material cost of crossing', units = 'USD')
+		self.add_output('num_anchors', val = 1.0, desc = 'Number of anchors')
+
+	def solve_nonlinear(self, p, u, r):
+
+		crossing = evaluate_crossing(p['x'], p['depth'], p['A_tube'], p_tube = p['p_tube'], Su = p['Su'], SF = p['SF'],
+			E_tube = p['E_tube'], v_tube = p['v_tube'], rho_water = p['rho_water'], rho_tube = p['rho_tube'],
+			g = p['g'], Pa = p['Pa'], unit_cost_tube = p['unit_cost_tube'], r_anchor = p['r_anchor'],
+			h_anchor = p['h_anchor'], Su_anchor = p['Su_anchor'], sf_anchor = p['sf_anchor'],
+			rho_anchor = p['rho_anchor'], unit_cost_anchor = p['unit_cost_anchor'])
+
+		u['t'] = crossing['t']
+		u['dx_anchor'] = crossing['dx_anchor']
+		u['t_max'] = np.max(crossing['t'])
+		u['tube_cost'] = crossing['tube_cost']
+		u['anchor_cost'] = crossing['anchor_cost']
+		u['total_cost'] = crossing['total_cost']
+		u['num_anchors'] = crossing['num_anchors']
+
 if __name__ == '__main__':
 	top = Problem()
 	root = top.root = Group()
@@ -100,21 +273,10 @@ if __name__ == '__main__':
 	depth = np.linspace(20.0, 60.0, num = 3)
 	A_tube = np.linspace(20.0, 50.0, num = 30)
 
-	cost = np.zeros((len(depth), len(A_tube)))
-	t = np.zeros((len(depth), len(A_tube)))
-
-	for i in range(len(A_tube)):
-		for j in range(len(depth)):
-			top['p.A_tube'] = A_tube[i]
-			top['p.depth'] = depth[j]
-
-			top.run()
+	t, t_crit, m_prime = size_submerged_tube(A_tube[np.newaxis, :], depth[:, np.newaxis], p_tube = 850.0)
+	cost = m_prime*.3307
 
-			t[j,i] = top['p.t']
-			cost[j,i] = top['p.material_cost']
-
-
-		# writer.writerow((A_tube[i], t[0,i], t[1,i], t[2,i], cost[0,i], cost[1,i], cost[2,i]))
+	# writer.writerow((A_tube[i], t[0,i], t[1,i], t[2,i], cost[0,i], cost[1,i], cost[2,i]))
 
 	# f.close()
 	line1, = plt.plot(A_tube, t[0,:], 'b-', linewidth = 2.0, label = 'depth = 20 m')
@@ -133,5 +295,16 @@ if __name__ == '__main__':
 	plt.grid('on')
 	plt.legend(handles = [line1, line2, line3], loc = 2)
 	plt.show()
+
+	top['p.A_tube'] = A_tube[-1]
+	top['p.depth'] = depth[-1]
+	top.run()
 	print(top['p.t_crit'])
 
+	# Crossing with a bathymetry profile sampled every 5 m
+	x = np.linspace(0.0, 50.0e3, 10001)
+	profile = 40.0 + 20.0*np.sin(np.pi*x/50.0e3)**2
+	crossing = evaluate_crossing(x, profile, 30.0)
+	print('crossing material cost is %f million USD' % (crossing['total_cost']/1.0e6))
+	print('number of anchors is %f' % crossing['num_anchors'])
+
@@ -79,9 +79,14 @@ class TubeGroup(Group):
     -------
     temp_boundary : float
         Ambient temperature inside tube (K)
+
+    Notes
+    -----
+    thermo selects the flow elements of SteadyStateVacuum, 'janaf' for pycycle or 'ideal'
+    for the frozen composition air of ideal_gas.
     """
 
-    def __init__(self):
+    def __init__(self, thermo='janaf'):
         super(TubeGroup, self).__init__()
 
         # Adding in components to Tube Group
@@ -114,7 +119,7 @@ class TubeGroup(Group):
         self.add('TubePower', TubePower(), promotes=['num_thrust',
                                                      'time_thrust'])
 
-        self.add('SteadyStateVacuum', SteadyStateVacuum(), promotes = ['fl_start.W', 'comp.power', 'pod_period', 'L_pod'])
+        self.add('SteadyStateVacuum', SteadyStateVacuum(thermo=thermo), promotes = ['fl_start.W', 'comp.power', 'pod_period', 'L_pod'])
 
         self.add('SubmergedTube', SubmergedTube(), promotes = ['depth'])
 
@@ -7,6 +7,8 @@ from math import pi
 
 import numpy as np
 
+from hyperloop.Python.energy_tariff import HOURS_PER_YEAR, annual_energy_cost, operating_hours
+
 class Vacuum(Component):
     """
     Params
@@ -31,6 +33,12 @@ class Vacuum(Component):
         Operational percentage of the pump per day. Default value is 0.8.
     pump_weight : float
         Weight of one pump. Default value is 715.0.
+    hourly_electricity_price : ndarray
+        Only with tariff=True. Cost of electricity for every hour of the year, replacing
+        electricity_price.
+    start_hour : float
+        Only with tariff=True. Hour of the day the pumps start. They run for gamma of
+        every day, and are costed hour by hour. Default value is 6.0.
 
     Returns
     -------
@@ -53,7 +61,7 @@ class Vacuum(Component):
     Umrath, Walter, Dr. Fundamentals of Vacuum Technology. N.p.: Oerlikon Leybold Vacuum, n.d. Print.
     """
 
-    def __init__(self):
+    def __init__(self, tariff=False):
         super(Vacuum, self).__init__()
 
         # Inputs
@@ -84,6 +92,15 @@ class Vacuum(Component):
                        715.0,
                        desc='weight of one pump',
                        units='kg')
+        if tariff:
+            self.add_param('hourly_electricity_price',
+                           np.full(HOURS_PER_YEAR, 0.13),
+                           desc='cost of electricity for every hour of the year',
+                           units='USD/(kW*h)')
+            self.add_param('start_hour',
+                           6.0,
+                           desc='hour of the day the pumps start',
+                           units='h')
         # self.add_param('opt',100000.0, desc= 'operating time of the motor', units='mins')
 
         # Outputs
@@ -128,8 +145,13 @@ class Vacuum(Component):
         energy_tot = params['pwr'] * n * (params['gamma'] * 86400.0)
 
         # Cost to Run the Vacuum for One Year
-        unknowns['cost_annual'] = energy_tot * 365.0 * params['electricity_price'] / (
-            1000.0 * 60.0 * 60.0 * (1.0 / 1000.0))
+        if 'hourly_electricity_price' in params:
+            # the pumps draw their power in the hours they run, gamma of every day
+            demand = params['pwr'] * n * operating_hours(params['gamma'] * 86400.0, params['start_hour'])
+            unknowns['cost_annual'] = annual_energy_cost(params['hourly_electricity_price'], demand)
+        else:
+            unknowns['cost_annual'] = energy_tot * 365.0 * params['electricity_price'] / (
+                1000.0 * 60.0 * 60.0 * (1.0 / 1000.0))
 
         # Total weight of all of the pumps.
         unknowns['weight_tot'] = params['pump_weight'] * n
@@ -7,9 +7,9 @@ from __future__ import print_function
 from openmdao.core.problem import Problem
 from openmdao.core.group import Group
 from openmdao.core.component import Component
-import math
+import numpy as np
 from collections import namedtuple
-from Python.tools import io_helper
+from hyperloop.Python.tools import io_helper
 
 
 class DefaultsHandler(object):
@@ -44,6 +44,14 @@ class DefaultsHandler(object):
                     print(getattr(self, attr))
 
 
+def tunnel_cost(length, diameter=2.23):
+    """
+    Total cost (USD) of a tunnel of length (km) and diameter (m), from the regression
+    of conventional subway excavation data of TunnelCost.
+    """
+    return 1000000 * 10**(1.10 + (0.933 * np.log10(length)) + (0.614 * np.log10(diameter)))
+
+
 class TunnelCost(Component):
     """
     Params
@@ -104,9 +112,7 @@ class TunnelCost(Component):
         # TODO for final publish store all citations in common document not inline
         # formula taken from conventional subway excavation data
         # https://www.researchgate.net/publication/233926915_Planning_level_tunnel_cost_estimation_based_on_statistical_analysis_of_historical_data
-        unknowns[defaults.cost.name] = 1000000 * math.pow(10, (
-            1.10 + (0.933 * math.log10(params[defaults.len.name])) +
-            (0.614 * math.log10(params[defaults.diam.name]))))
+        unknowns[defaults.cost.name] = tunnel_cost(params[defaults.len.name], params[defaults.diam.name])
 
     def print_results(self):
         print("{} ({}): {}".format(defaults.diam.name, defaults.diam.unit,
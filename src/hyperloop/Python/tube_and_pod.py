@@ -7,12 +7,13 @@ from hyperloop.Python.tube.tube_group import TubeGroup
 from hyperloop.Python.pod.pod_group import PodGroup
 from hyperloop.Python.ticket_cost import TicketCost
 from hyperloop.Python.sample_mission import SampleMission
+from hyperloop.Python.mission.fleet_simulation import FleetSimulation
 
 import numpy as np 
 import matplotlib.pylab as plt 
 
 class TubeAndPod(Group):
-    def __init__(self):
+    def __init__(self, cycle_table=None, thermo='janaf', fleet_sim=False):
         """
         Params
         ------
@@ -78,19 +79,29 @@ class TubeAndPod(Group):
         total_pod_mass : float
             Pod Mass (kg)
 
+        Notes
+        -----
+        cycle_table and thermo are passed to PodGroup, and thermo to TubeGroup.
+        fleet_sim adds a FleetSimulation of the operating day, whose fleet size
+        replaces the num_pods estimate of TicketCost. Its max_pods_in_tube can be
+        connected to num_pods for the tube heat load.
+        With thermo='ideal' every flow path of the pod and tube shares one set of
+        air tables (see pod.cycle.thermo_tables).
+
         References
         ----------
         .. [1] Friend, Paul. Magnetic Levitation Train Technology 1. Thesis.
            Bradley University, 2004. N.p.: n.p., n.d. Print.
         """
         super(TubeAndPod, self).__init__()
-        self.add('pod', PodGroup(), promotes=['pod_mach', 'tube_pressure', 'comp.map.PRdes',
-                                              'nozzle.Ps_exhaust', 'comp_inlet_area', 'des_time',
-                                              'time_of_flight', 'motor_max_current', 'motor_LD_ratio',
-                                              'motor_oversize_factor', 'inverter_efficiency', 'battery_cross_section_area',
-                                              'n_passengers', 'A_payload', 'S', 'total_pod_mass', 'vel_b',
-                                              'h_lev', 'vel', 'mag_drag', 'L_pod'])
-        self.add('tube', TubeGroup(), promotes=['pressure_initial', 'pwr', 'num_pods',
+        self.add('pod', PodGroup(cycle_table=cycle_table, thermo=thermo),
+                 promotes=['pod_mach', 'tube_pressure', 'comp.map.PRdes',
+                           'nozzle.Ps_exhaust', 'comp_inlet_area', 'des_time',
+                           'time_of_flight', 'motor_max_current', 'motor_LD_ratio',
+                           'motor_oversize_factor', 'inverter_efficiency', 'battery_cross_section_area',
+                           'n_passengers', 'A_payload', 'S', 'total_pod_mass', 'vel_b',
+                           'h_lev', 'vel', 'mag_drag', 'L_pod'])
+        self.add('tube', TubeGroup(thermo=thermo), promotes=['pressure_initial', 'pwr', 'num_pods',
                                               'speed', 'time_down', 'gamma', 'pump_weight',
                                               'electricity_price', 'tube_thickness', 'r_pylon',
                                               'tube_length', 'h', 'vf', 'v0', 'time_thrust', 
@@ -103,6 +114,9 @@ class TubeAndPod(Group):
         #                                       'h_lev', 'vel', 'mag_drag', 'L_pod'])
         self.add('cost', TicketCost(), promotes = ['land_length', 'water_length', 'track_length', 'operating_time'])
         self.add('mission', SampleMission())
+        if fleet_sim:
+            self.add('fleet', FleetSimulation(), promotes=['operating_time', 'track_length', 'pod_period', 'vf'])
+            self.connect('fleet.num_pods', 'cost.fleet_size')
 
         # Connects promoted group level params
         self.connect('tube_pressure', ['tube.p_tunnel', 'cost.p_tunnel', 'mission.p_tunnel'])
@@ -228,7 +242,7 @@ if __name__ == '__main__':
     prob.root.connect('des_vars.vel_b', 'TubeAndPod.vel_b')
     prob.root.connect('des_vars.h_lev', 'TubeAndPod.h_lev')
     prob.root.connect('des_vars.vel', 'TubeAndPod.vel')
-    prob.root.connect('des_vars.pod_period', 'TubeAndPod.cost.pod_period')
+    prob.root.connect('des_vars.pod_period', 'TubeAndPod.pod_period')
     prob.root.connect('des_vars.ib', 'TubeAndPod.cost.ib')
     prob.root.connect('des_vars.bm', 'TubeAndPod.cost.bm')
     prob.root.connect('des_vars.track_length', 'TubeAndPod.track_length')